@@ -0,0 +1,124 @@
+"""
+Benchmark: single-pass EV grammar vs the old multi-pass parse_ev_spread.
+
+Runs both parsers over a corpus of EV strings (one per line, see
+``data/ev_strings.txt``), reports throughput and where their outputs differ. Every difference on the
+bundled corpus is an intended fix listed in ``DOCUMENTED_DIFFERENCES``; any
+other difference is a regression:
+
+    python benchmarks/bench_ev_parsing.py
+    python benchmarks/bench_ev_parsing.py --corpus my_strings.txt --repeat 500 --show-diffs
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils.utils import parse_ev_spread, parse_ev_spread_detailed  # noqa: E402
+import legacy_ev_parsing  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "ev_strings.txt")
+
+# Strings of the bundled corpus the grammar intentionally parses differently
+_NOTE_CALCULATED = "note.com calculated stats, read by the legacy grid parser as stats and scaled down"
+_SHOWDOWN = "Showdown-style 'value stat' pairs, read by the legacy loose letter fallback"
+_COMBINED = "combined letter prefix, read by the legacy parser as its second letter only"
+DOCUMENTED_DIFFERENCES = {
+    "H181(148)-A×↓-B131(124)-C184↑(116)-D112(4)-S119(116)": _NOTE_CALCULATED,
+    "H175(252)-A120(252)↑-B100(4)-C95×-D95×-S70×": _NOTE_CALCULATED,
+    "H207(252)-A×-B101(4)-C143(252)↑-D105-S120": _NOTE_CALCULATED,
+    "H202(244)-A156↑(252)-B100-C×-D90(12)-S137": _NOTE_CALCULATED,
+    "ＨＰ：252　こうげき：0　ぼうぎょ：4　とくこう：252　とくぼう：0　すばやさ：0": "full-width colons were missed",
+    "HP: 4, Attack: 252, Defense: 0, Sp. Atk: 0, Sp. Def: 0, Speed: 252": "'Sp. Atk' labels were missed",
+    "44 HP / 4 Def / 252 SpA / 28 SpD / 180 Spe": _SHOWDOWN,
+    "236 HP / 4 Atk / 52 Def / 4 SpD / 212 Spe": _SHOWDOWN,
+    "EVs: 252 HP / 4 SpD / 252 Spe": _SHOWDOWN,
+    # Same EVs. The legacy grid parser counted "HP" twice (two HP patterns), so
+    # three labels passed its four-stat minimum as "japanese_grid_low_*"; three
+    # labels are now a plain label spread with the bare validation status.
+    "HP 252 Atk 252 Spe 4": "three labels are not a grid (source type only)",
+    # Combined letter prefixes: the legacy letter fallback read only the second
+    # letter (CS252 -> S252). Both letters get the value now; like any three
+    # letters worth 400+ EVs, "AS252 H4" is reported as a calculated-stat line.
+    "CS252": _COMBINED,
+    "AS252 H4": _COMBINED,
+    "HS252 B4": _COMBINED,
+    "HB252 S4": _COMBINED,
+}
+
+
+def load_corpus(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip() and not line.startswith("#")]
+
+
+def compare_with_legacy(corpus: List[str]) -> List[Tuple[str, Tuple, Tuple]]:
+    """(string, legacy output, grammar output) for every string the parsers disagree on"""
+    diffs = []
+    for text in corpus:
+        new_evs, new_status, _ = parse_ev_spread_detailed(text)
+        old = legacy_ev_parsing.parse_ev_spread(text)
+        if (new_evs, new_status) != old:
+            diffs.append((text, old, (new_evs, new_status)))
+    return diffs
+
+
+def time_parser(parse: Callable, corpus: List[str], repeat: int) -> float:
+    """Best-of-three seconds for ``repeat`` passes over the corpus"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in corpus:
+                parse(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark EV spread parsing")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="EV strings, one per line")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the corpus per timing run")
+    parser.add_argument("--show-diffs", action="store_true", help="Print every string the parsers disagree on")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print("Empty corpus")
+        return 1
+
+    formats = {}
+    for text in corpus:
+        ev_format = parse_ev_spread_detailed(text)[2]
+        formats[ev_format] = formats.get(ev_format, 0) + 1
+    diffs = compare_with_legacy(corpus)
+    value_matches = len(corpus) - sum(old[0] != new[0] for _, old, new in diffs)
+    status_matches = len(corpus) - sum(old[1] != new[1] for _, old, new in diffs)
+    undocumented = [diff for diff in diffs if diff[0] not in DOCUMENTED_DIFFERENCES]
+
+    legacy_time = time_parser(legacy_ev_parsing.parse_ev_spread, corpus, args.repeat)
+    grammar_time = time_parser(parse_ev_spread, corpus, args.repeat)
+    parsed = len(corpus) * args.repeat
+
+    print(f"{len(corpus)} strings x {args.repeat} passes")
+    print(f"{'parser':10} {'strings/s':>12} {'us/string':>10}")
+    for name, seconds in (("legacy", legacy_time), ("grammar", grammar_time)):
+        print(f"{name:10} {parsed / seconds:12,.0f} {seconds / parsed * 1e6:10.1f}")
+    print(f"speed-up: {legacy_time / grammar_time:.1f}x\n")
+
+    print("formats: " + ", ".join(f"{name}={count}" for name, count in sorted(formats.items())))
+    print(f"same EVs as legacy: {value_matches}/{len(corpus)}, same source type: {status_matches}/{len(corpus)}")
+    print(f"differences: {len(diffs) - len(undocumented)} documented, {len(undocumented)} undocumented")
+    for text, old, new in diffs if args.show_diffs else undocumented:
+        reason = DOCUMENTED_DIFFERENCES.get(text, "UNDOCUMENTED")
+        print(f"\n  {text}  [{reason}]\n    legacy : {old[0]} {old[1]}\n    grammar: {new[0]} {new[1]}")
+    return 1 if undocumented else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Benchmark: batch EV validation vs one validate_and_fix_evs call per spread.
+
+Generates a library of random spreads (mostly competitive, some noisy) and
+re-validates it both ways:
+
+    python benchmarks/bench_ev_validation.py
+    python benchmarks/bench_ev_validation.py --spreads 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.ev_validation import status_names, validate_ev_batch  # noqa: E402
+from utils.utils import validate_and_fix_evs  # noqa: E402
+
+STATS = ("HP", "Atk", "Def", "SpA", "SpD", "Spe")
+
+
+def make_library(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    spreads = rng.integers(0, 64, (count, 6)) * 4 * (rng.random((count, 6)) < 0.5)
+    noisy = rng.random(count) < 0.1
+    spreads[noisy] = rng.integers(-10, 300, (int(noisy.sum()), 6))
+    return spreads
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark batch EV validation")
+    parser.add_argument("--spreads", type=int, default=20000, help="Number of stored spreads to re-validate")
+    args = parser.parse_args(argv)
+
+    library = make_library(args.spreads)
+    rows = [dict(zip(STATS, row)) for row in library.tolist()]
+
+    start = time.perf_counter()
+    scalar = [validate_and_fix_evs(row) for row in rows]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fixed, codes, _ = validate_ev_batch(library)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(
+        list(evs.values()) != batch_evs or status != batch_status
+        for (evs, status), batch_evs, batch_status in zip(scalar, fixed.tolist(), status_names(codes))
+    )
+    print(f"{args.spreads} spreads")
+    print(f"scalar: {scalar_time * 1000:10.1f} ms")
+    print(f"batch : {batch_time * 1000:10.1f} ms  ({scalar_time / batch_time:.0f}x)")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Benchmark: original vs prepared (cropped/downscaled/recompressed) vision payloads.
+
+Reports, per fixture image, the upload payload size (raw and base64), the time
+spent preparing it and - with ``--vision`` and a Gemini API key - the vision
+round-trip latency and whether the EV spreads read from the image still match
+the expected ones.
+
+Fixtures are either generated (synthetic team cards with known EV spreads,
+deterministic) or loaded from a directory containing images plus an
+``expected.json`` mapping file names to lists of "H/A/B/C/D/S" spreads:
+
+    python benchmarks/bench_image_preparation.py
+    python benchmarks/bench_image_preparation.py --fixtures path/to/cards --vision
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.image_preparation import prepare_image_for_vision  # noqa: E402
+
+# Synthetic team cards: six Pokemon with known spreads on a large PNG canvas
+SYNTHETIC_TEAM = [
+    ("Koraidon", (4, 252, 0, 0, 0, 252)),
+    ("Flutter Mane", (4, 0, 0, 252, 0, 252)),
+    ("Incineroar", (252, 4, 100, 0, 148, 4)),
+    ("Rillaboom", (244, 252, 0, 0, 12, 0)),
+    ("Urshifu", (4, 252, 0, 0, 0, 252)),
+    ("Amoonguss", (252, 0, 156, 0, 100, 0)),
+]
+SYNTHETIC_SIZES = [(1920, 1080), (2560, 1440), (3000, 4000)]
+
+
+def _load_font(size: int):
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def generate_team_card(width: int, height: int, border: int = 0) -> bytes:
+    """Render a synthetic team card PNG (optionally letterboxed)"""
+    # Gradient background, like the in-game team preview screens
+    gradient = Image.linear_gradient("L").resize((width, height))
+    card = Image.merge("RGB", (gradient.point(lambda v: 20 + v // 6),
+                               gradient.point(lambda v: 28 + v // 5),
+                               gradient.point(lambda v: 60 + v // 3)))
+    draw = ImageDraw.Draw(card)
+    font = _load_font(max(14, height // 28))
+
+    columns, rows = 3, 2
+    cell_w = (width - 2 * border) // columns
+    cell_h = (height - 2 * border) // rows
+    for index, (name, evs) in enumerate(SYNTHETIC_TEAM):
+        x = border + (index % columns) * cell_w
+        y = border + (index // columns) * cell_h
+        draw.rectangle([x + 8, y + 8, x + cell_w - 8, y + cell_h - 8], fill=(48, 56, 80), outline=(200, 200, 220))
+        draw.text((x + 24, y + 24), name, fill=(255, 255, 255), font=font)
+        spread = "H{} A{} B{} C{} D{} S{}".format(*evs)
+        draw.text((x + 24, y + 24 + font.size * 2), spread, fill=(255, 230, 120), font=font)
+        draw.text((x + 24, y + 24 + font.size * 4), "/".join(map(str, evs)), fill=(180, 220, 255), font=font)
+
+    if border:
+        framed = Image.new("RGB", card.size, (255, 255, 255))
+        framed.paste(card.crop((border, border, width - border, height - border)), (border, border))
+        card = framed
+
+    buffer = BytesIO()
+    card.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def synthetic_fixtures() -> List[Tuple[str, bytes, List[str]]]:
+    expected = ["/".join(map(str, evs)) for _, evs in SYNTHETIC_TEAM]
+    fixtures = []
+    for width, height in SYNTHETIC_SIZES:
+        fixtures.append((f"synthetic_{width}x{height}.png", generate_team_card(width, height), expected))
+    fixtures.append(("synthetic_letterboxed.png", generate_team_card(2560, 1440, border=240), expected))
+    return fixtures
+
+
+def load_fixtures(directory: str) -> List[Tuple[str, bytes, List[str]]]:
+    expected_path = os.path.join(directory, "expected.json")
+    expected: Dict[str, List[str]] = {}
+    if os.path.exists(expected_path):
+        with open(expected_path, encoding="utf-8") as f:
+            expected = json.load(f)
+
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith((".png", ".jpg", ".jpeg", ".webp", ".gif")):
+            with open(os.path.join(directory, name), "rb") as f:
+                fixtures.append((name, f.read(), expected.get(name, [])))
+    return fixtures
+
+
+def _spread_accuracy(analysis: str, expected: List[str]) -> Optional[float]:
+    """Fraction of expected spreads found by the image EV extractor"""
+    if not expected:
+        return None
+    from utils.image_analyzer import extract_ev_spreads_from_image_analysis
+
+    found = {spread["format"] for spread in extract_ev_spreads_from_image_analysis(analysis)}
+    return sum(1 for spread in expected if spread in found) / len(expected)
+
+
+def _vision_model():
+    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return None
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel("gemini-2.5-flash")
+
+
+def run(fixtures: List[Tuple[str, bytes, List[str]]], use_vision: bool, repeat: int) -> int:
+    vision_model = _vision_model() if use_vision else None
+    if use_vision and vision_model is None:
+        print("No GOOGLE_API_KEY/GEMINI_API_KEY set - skipping latency/accuracy against the vision model\n")
+
+    if vision_model is not None:
+        from utils.image_analyzer import analyze_image_with_vision
+
+    header = f"{'fixture':34} {'orig KB':>9} {'prep KB':>9} {'b64 KB':>9} {'saved':>7} {'prep ms':>8}  size"
+    print(header)
+    print("-" * len(header))
+
+    totals = {"original": 0, "prepared": 0}
+    accuracy = {"original": [], "prepared": []}
+    latency = {"original": [], "prepared": []}
+
+    for name, data, expected in fixtures:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            prepared = prepare_image_for_vision(data)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        totals["original"] += len(data)
+        totals["prepared"] += len(prepared.data)
+        saved = 100 * prepared.byte_savings / len(data) if data else 0
+        print(f"{name[:34]:34} {len(data) / 1024:9.1f} {len(prepared.data) / 1024:9.1f} "
+              f"{len(prepared.to_base64()) / 1024:9.1f} {saved:6.1f}% {statistics.median(timings):8.1f}  "
+              f"{prepared.original_size[0]}x{prepared.original_size[1]} -> {prepared.size[0]}x{prepared.size[1]}"
+              f" {prepared.mime_type}")
+
+        if vision_model is None:
+            continue
+
+        image_format = (Image.open(BytesIO(data)).format or "PNG").lower()
+        encoded = base64.b64encode(data).decode("utf-8")
+        for variant, prepare in (("original", False), ("prepared", True)):
+            start = time.perf_counter()
+            analysis = analyze_image_with_vision(encoded, image_format, vision_model, prepare_image=prepare)
+            latency[variant].append(time.perf_counter() - start)
+            score = _spread_accuracy(analysis, expected)
+            if score is not None:
+                accuracy[variant].append(score)
+
+    print("-" * len(header))
+    if totals["original"]:
+        print(f"Total payload: {totals['original'] / 1024:.1f} KB -> {totals['prepared'] / 1024:.1f} KB "
+              f"({100 * (1 - totals['prepared'] / totals['original']):.1f}% smaller)")
+
+    if vision_model is not None:
+        for variant in ("original", "prepared"):
+            mean_latency = statistics.mean(latency[variant]) if latency[variant] else 0.0
+            mean_accuracy = (f"{100 * statistics.mean(accuracy[variant]):.1f}%"
+                             if accuracy[variant] else "n/a (no expected spreads)")
+            print(f"{variant:>9}: vision latency {mean_latency:.2f}s, EV spread accuracy {mean_accuracy}")
+    else:
+        print("EV extraction accuracy: skipped (run with --vision and an API key)")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vision payload preparation benchmark")
+    parser.add_argument("--fixtures", help="Directory of team card images (+ expected.json); default: synthetic set")
+    parser.add_argument("--vision", action="store_true", help="Also call Gemini Vision to compare latency and accuracy")
+    parser.add_argument("--repeat", type=int, default=3, help="Preparation timing repetitions per image")
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures()
+    if not fixtures:
+        print("No fixture images found")
+        return 1
+    return run(fixtures, args.vision, max(1, args.repeat))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Benchmark and fuzz suite for the EV parsers and extractors.
+
+Covers parse_ev_spread, parse_calculated_stat_format,
+parse_japanese_grid_format, extract_ev_spreads_from_image_analysis and
+GeminiVGCAnalyzer._detect_content_formats. Inputs are the real strings in
+``data/ev_strings.txt`` and article / vision-output snippets in
+``data/article_snippets.txt``, plus synthetic variants of each: full-width
+digits and letters, mixed separators, inserted noise, truncation and long
+noisy documents.
+
+The run reports throughput and worst-case latency per target and how many
+real strings parse differently once written in full-width characters
+(informational), then checks scaling: every target is timed on pathological inputs (open ``.*?`` chains,
+long digit runs, repeated labels) at two sizes. A target whose time per
+character grows with the input is super-linear and fails the run, as does
+any exception raised by a target.
+
+    python benchmarks/ev_fuzz.py
+    python benchmarks/ev_fuzz.py --variants 20 --seed 7 --max-growth 2.5
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.utils import (  # noqa: E402
+    parse_calculated_stat_format,
+    parse_ev_spread,
+    parse_japanese_grid_format,
+)
+from utils.image_analyzer import extract_ev_spreads_from_image_analysis  # noqa: E402
+from core.analyzer import GeminiVGCAnalyzer  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+EV_STRINGS = os.path.join(DATA_DIR, "ev_strings.txt")
+ARTICLE_SNIPPETS = os.path.join(DATA_DIR, "article_snippets.txt")
+
+FULL_WIDTH_DIGITS = str.maketrans("0123456789", "０１２３４５６７８９")
+# Printable ASCII to the full-width forms used by Japanese IMEs
+FULL_WIDTH_ASCII = str.maketrans({chr(code): chr(code + 0xFEE0) for code in range(0x21, 0x7F)})
+SEPARATORS = ["/", "／", "-", "ー", "・", " ", "　", "\t", "|", ", ", "\n"]
+NOISE_TOKENS = [
+    "調整", "最速", "確定耐え", "努力値", "実数値", "ＨＰ", "こうげき", "すばやさ", "H", "A", "S",
+    "252", "4", "(", ")", "↑", "×", ":", "：", "/", "！", "😊", " ", "\n", "の", "です。", "Lv50",
+]
+
+# Pathological building blocks: repeated n times, with no closing token the patterns look for
+GROWTH_FAMILIES = {
+    "open_hp_chain": "HP 252 ",
+    "open_full_width_hp": "ＨＰ：1 ",
+    "open_calc_header": "実数値：",
+    "letter_labels": "H1 ",
+    "open_parentheses": "H(",
+    "slash_digits": "1/",
+    "digit_run": "2",
+    "prose": "最速ジャラランガ抜き",
+    "mixed_noise": "ＨＰ252・こうげき(×↑/努力値：H",
+}
+
+Target = Callable[[str], object]
+
+
+def load_targets() -> Dict[str, Target]:
+    """The five entry points under test, as one-argument callables"""
+    logging.getLogger("core.analyzer").setLevel(logging.WARNING)
+    # _detect_content_formats does not use instance state; skip the API setup in __init__
+    analyzer = object.__new__(GeminiVGCAnalyzer)
+    return {
+        "parse_ev_spread": parse_ev_spread,
+        "parse_calculated_stat_format": parse_calculated_stat_format,
+        "parse_japanese_grid_format": parse_japanese_grid_format,
+        "extract_ev_spreads_from_image_analysis": extract_ev_spreads_from_image_analysis,
+        "_detect_content_formats": analyzer._detect_content_formats,
+    }
+
+
+def load_lines(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip() and not line.startswith("#")]
+
+
+def load_snippets(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        text = "".join(line for line in f if not line.startswith("#"))
+    return [snippet.strip() for snippet in text.split("\n---\n") if snippet.strip()]
+
+
+def mix_separators(text: str, rng: random.Random) -> str:
+    return "".join(rng.choice(SEPARATORS) if char in "/- " else char for char in text)
+
+
+def add_noise(text: str, rng: random.Random, tokens: int = 8) -> str:
+    chars = list(text)
+    for _ in range(tokens):
+        chars.insert(rng.randint(0, len(chars)), rng.choice(NOISE_TOKENS))
+    return "".join(chars)
+
+
+def noisy_document(snippets: List[str], rng: random.Random, length: int) -> str:
+    """Snippets and noise glued together up to ``length`` characters"""
+    parts, size = [], 0
+    while size < length:
+        part = rng.choice(snippets) if rng.random() < 0.3 else add_noise("", rng, rng.randint(5, 40))
+        parts.append(part)
+        size += len(part)
+    return "\n".join(parts)[:length]
+
+
+def build_corpus(seed: int = 0, variants: int = 5, long_length: int = 20000) -> List[Tuple[str, str]]:
+    """
+    Real inputs plus synthetic variants
+
+    Returns:
+        (kind, text) pairs; kind names the source or the transformation
+    """
+    rng = random.Random(seed)
+    originals = [("ev_string", text) for text in load_lines(EV_STRINGS)]
+    originals += [("snippet", text) for text in load_snippets(ARTICLE_SNIPPETS)]
+    snippets = [text for _, text in originals]
+
+    corpus = list(originals)
+    for _, text in originals:
+        corpus.append(("full_width_digits", text.translate(FULL_WIDTH_DIGITS)))
+        corpus.append(("full_width_ascii", text.translate(FULL_WIDTH_ASCII)))
+        for _ in range(variants):
+            corpus.append(("mixed_separators", mix_separators(text, rng)))
+            corpus.append(("noise", add_noise(text, rng)))
+            corpus.append(("truncated", text[:rng.randint(0, len(text))]))
+    for _ in range(variants):
+        corpus.append(("long_noisy", noisy_document(snippets, rng, long_length)))
+    return corpus
+
+
+def run_corpus(target: Target, corpus: List[Tuple[str, str]]) -> Dict[str, object]:
+    """Time every input once; collect throughput, the slowest input and any exceptions"""
+    total_time = 0.0
+    worst = (0.0, "", "")
+    errors = []
+    for kind, text in corpus:
+        start = time.perf_counter()
+        try:
+            target(text)
+        except Exception as e:
+            errors.append((kind, text, repr(e)))
+        elapsed = time.perf_counter() - start
+        total_time += elapsed
+        if elapsed > worst[0]:
+            worst = (elapsed, kind, text)
+    characters = sum(len(text) for _, text in corpus)
+    return {
+        "calls_per_second": len(corpus) / total_time if total_time else float("inf"),
+        "chars_per_second": characters / total_time if total_time else float("inf"),
+        "worst_seconds": worst[0],
+        "worst_kind": worst[1],
+        "worst_input": worst[2],
+        "errors": errors,
+    }
+
+
+def width_mismatches(target: Target, texts: List[str], table: Dict[int, str]) -> List[str]:
+    """Inputs whose full-width variant (``table``) gives a different result than the original"""
+    return [text for text in texts if target(text) != target(text.translate(table))]
+
+
+def _best_time(target: Target, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        target(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth_factor(target: Target, unit: str, small_length: int = 2000, scale: int = 8, repeat: int = 3) -> float:
+    """
+    How much the time per character grows when the input gets ``scale`` times longer
+
+    About 1 for linear scanning, about ``scale`` for quadratic behaviour.
+    """
+    small = unit * max(1, small_length // len(unit))
+    large = unit * (len(small) // len(unit) * scale)
+    small_time = _best_time(target, small, repeat)
+    large_time = _best_time(target, large, repeat)
+    return (large_time / len(large)) / max(small_time / len(small), 1e-9)
+
+
+def check_scaling(targets: Dict[str, Target], max_growth: float, small_length: int = 2000,
+                  scale: int = 8) -> List[Tuple[str, str, float]]:
+    """
+    Growth factor of every target on every pathological family
+
+    A measurement above ``max_growth`` is repeated once, so a single noisy
+    timing does not fail the run.
+
+    Returns:
+        (target, family, growth factor) for every combination
+    """
+    results = []
+    for name, target in targets.items():
+        for family, unit in GROWTH_FAMILIES.items():
+            growth = growth_factor(target, unit, small_length, scale)
+            if growth > max_growth:
+                growth = min(growth, growth_factor(target, unit, small_length, scale))
+            results.append((name, family, growth))
+    return results
+
+
+def _preview(text: str, width: int = 60) -> str:
+    text = text.replace("\n", "⏎")
+    return text if len(text) <= width else f"{text[:width]}… ({len(text)} chars)"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark and fuzz the EV parsers")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic variants")
+    parser.add_argument("--variants", type=int, default=5, help="Random variants per real input and transformation")
+    parser.add_argument("--long-length", type=int, default=20000, help="Characters per long noisy document")
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="Largest allowed growth of time per character for an 8x longer input")
+    parser.add_argument("--skip-scaling", action="store_true", help="Only run the fuzz corpus")
+    args = parser.parse_args(argv)
+
+    targets = load_targets()
+    corpus = build_corpus(args.seed, args.variants, args.long_length)
+    print(f"{len(corpus)} inputs, {sum(len(text) for _, text in corpus):,} characters\n")
+
+    failed = False
+    print(f"{'target':40} {'calls/s':>10} {'KB/s':>10} {'worst ms':>9}  worst input")
+    for name, target in targets.items():
+        stats = run_corpus(target, corpus)
+        print(f"{name:40} {stats['calls_per_second']:10,.0f} {stats['chars_per_second'] / 1000:10,.0f} "
+              f"{stats['worst_seconds'] * 1000:9.2f}  [{stats['worst_kind']}] {_preview(stats['worst_input'])}")
+        for kind, text, error in stats["errors"]:
+            failed = True
+            print(f"  ERROR [{kind}] {error}: {_preview(text)}")
+
+    ev_strings = load_lines(EV_STRINGS)
+    print("\nWidth invariance (real EV strings whose full-width variant parses differently)")
+    for name in ("parse_ev_spread", "parse_calculated_stat_format", "parse_japanese_grid_format"):
+        digits = width_mismatches(targets[name], ev_strings, FULL_WIDTH_DIGITS)
+        letters = width_mismatches(targets[name], ev_strings, FULL_WIDTH_ASCII)
+        print(f"{name:40} digits {len(digits):3}/{len(ev_strings)}   digits+letters {len(letters):3}/{len(ev_strings)}")
+
+    if not args.skip_scaling:
+        print(f"\nScaling (time per character, 8x longer input; fail above {args.max_growth:.1f}x)")
+        for name, family, growth in check_scaling(targets, args.max_growth):
+            super_linear = growth > args.max_growth
+            failed |= super_linear
+            if super_linear:
+                print(f"  SUPER-LINEAR {name:40} {family:20} {growth:6.1f}x")
+        if not failed:
+            print("  all targets scale linearly")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Evaluation of the local team-card classifier (utils.image_classifier).
+
+Runs the classifier over labelled images and reports precision, recall and
+the share of vision calls avoided at a range of thresholds, plus the
+per-image feature time. Fixtures are a directory laid out as
+
+    <dir>/team_card/*.png|jpg|webp    images that should reach the vision model
+    <dir>/other/*.png|jpg|webp        banners, photos, icons, ...
+
+or, by default, a deterministic synthetic set (``--write-fixtures DIR`` saves
+it in that layout):
+
+    python benchmarks/eval_team_card_classifier.py
+    python benchmarks/eval_team_card_classifier.py --fixtures path/to/labelled --verbose
+
+The app ships with the gate off (Config.VISION_CLASSIFIER_THRESHOLD = 0). Pick
+a threshold from a run on real article images (phone photos of rental
+screens included) that keeps team-card recall near 1, not from the synthetic
+set.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from utils.image_classifier import (  # noqa: E402
+    CANDIDATE_TEAM_CARD_THRESHOLD,
+    extract_image_features,
+    team_card_probability_from_features,
+)
+
+LABELS = ("team_card", "other")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+THRESHOLDS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7)
+
+POKEMON = ["Koraidon", "Flutter Mane", "Incineroar", "Rillaboom", "Urshifu", "Amoonguss"]
+MOVES = ["Protect", "Fake Out", "Flare Blitz", "Moonblast", "Spore", "Grassy Glide", "Close Combat"]
+
+
+def _font(size: int):
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _encode(img: Image.Image, image_format: str = "PNG") -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format=image_format, **({"quality": 85} if image_format == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+def _stat_card(rng: np.random.Generator, width: int, height: int, columns: int, rows: int) -> Image.Image:
+    """Grid of Pokemon panels with names, moves and EV lines"""
+    background = tuple(int(v) for v in rng.integers(10, 70, 3))
+    panel = tuple(int(v) for v in rng.integers(40, 110, 3))
+    img = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(img)
+    cell_w, cell_h = width // columns, height // rows
+    font = _font(max(12, cell_h // 12))
+    for index in range(columns * rows):
+        x, y = (index % columns) * cell_w, (index // columns) * cell_h
+        draw.rounded_rectangle([x + 6, y + 6, x + cell_w - 6, y + cell_h - 6], radius=10, fill=panel,
+                               outline=(220, 220, 230))
+        line_y = y + 14
+        draw.text((x + 16, line_y), POKEMON[index % len(POKEMON)], fill=(255, 255, 255), font=font)
+        evs = rng.choice([4, 252, 0, 156, 100], 6)
+        for text in ["H{} A{} B{} C{} D{} S{}".format(*evs)] + list(rng.choice(MOVES, 4)):
+            line_y += int(font.size * 1.4)
+            if line_y + font.size > y + cell_h - 8:
+                break
+            draw.text((x + 16, line_y), str(text), fill=(235, 235, 200), font=font)
+    return img
+
+
+def _photo(rng: np.random.Generator, width: int, height: int) -> Image.Image:
+    """Smooth, colourful photo-like image"""
+    small = rng.integers(0, 255, size=(height // 16 + 1, width // 16 + 1, 3), dtype=np.uint8)
+    img = Image.fromarray(small).resize((width, height), Image.BICUBIC)
+    noise = rng.normal(0, 6, size=(height, width, 3))
+    pixels = np.clip(np.asarray(img, dtype=np.float32) + noise, 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels).filter(ImageFilter.GaussianBlur(1.5))
+
+
+def _banner(rng: np.random.Generator, width: int, height: int) -> Image.Image:
+    """Flat-colour header banner with a large title"""
+    img = Image.new("RGB", (width, height), tuple(int(v) for v in rng.integers(0, 255, 3)))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([0, height * 2 // 3, width, height], fill=tuple(int(v) for v in rng.integers(0, 255, 3)))
+    draw.text((width // 12, height // 5), "VGC BLOG", fill=(255, 255, 255), font=_font(height // 3))
+    return img
+
+
+def _avatar(rng: np.random.Generator, size: int) -> Image.Image:
+    img = Image.new("RGB", (size, size), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse([size // 8, size // 8, size * 7 // 8, size * 7 // 8], fill=tuple(int(v) for v in rng.integers(0, 255, 3)))
+    return img
+
+
+def synthetic_fixtures(seed: int = 38) -> List[Tuple[str, bytes, str]]:
+    rng = np.random.default_rng(seed)
+    fixtures = []
+    for index in range(6):
+        fixtures.append((f"card_grid_{index}.png", _encode(_stat_card(rng, 1280, 720, 3, 2)), "team_card"))
+        fixtures.append((f"rental_{index}.jpg", _encode(_stat_card(rng, 1920, 1080, 2, 3), "JPEG"), "team_card"))
+        fixtures.append((f"tall_card_{index}.png", _encode(_stat_card(rng, 600, 2400, 1, 6)), "team_card"))
+        fixtures.append((f"photo_{index}.jpg", _encode(_photo(rng, 1200, 800), "JPEG"), "other"))
+        fixtures.append((f"banner_{index}.png", _encode(_banner(rng, 1500, 400)), "other"))
+        fixtures.append((f"avatar_{index}.png", _encode(_avatar(rng, 400)), "other"))
+    return fixtures
+
+
+def load_fixtures(directory: str) -> List[Tuple[str, bytes, str]]:
+    fixtures = []
+    for label in LABELS:
+        label_dir = os.path.join(directory, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for name in sorted(os.listdir(label_dir)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                with open(os.path.join(label_dir, name), "rb") as f:
+                    fixtures.append((f"{label}/{name}", f.read(), label))
+    return fixtures
+
+
+def write_fixtures(fixtures: List[Tuple[str, bytes, str]], directory: str):
+    for name, data, label in fixtures:
+        os.makedirs(os.path.join(directory, label), exist_ok=True)
+        with open(os.path.join(directory, label, os.path.basename(name)), "wb") as f:
+            f.write(data)
+
+
+def evaluate(fixtures: List[Tuple[str, bytes, str]], verbose: bool = False) -> int:
+    scored = []
+    timings = []
+    for name, data, label in fixtures:
+        start = time.perf_counter()
+        features = extract_image_features(data)
+        timings.append((time.perf_counter() - start) * 1000)
+        probability = team_card_probability_from_features(features) if features else None
+        scored.append((name, label, probability))
+        if verbose:
+            shown = f"{probability:.3f}" if probability is not None else "n/a"
+            detail = " ".join(f"{key}={value:.3f}" for key, value in (features or {}).items())
+            print(f"{label:9} {shown:>6}  {name}  {detail}")
+
+    positives = sum(1 for _, label, _ in scored if label == "team_card")
+    print(f"\n{len(scored)} images ({positives} team cards), "
+          f"feature time median {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms\n")
+
+    print(f"{'threshold':>9} {'precision':>9} {'recall':>7} {'F1':>6} {'vision calls':>13} {'avoided':>8}")
+    for threshold in sorted(set(THRESHOLDS + (CANDIDATE_TEAM_CARD_THRESHOLD,))):
+        # Undecodable images are passed to vision (the gate never drops what it cannot read)
+        predicted = [(label, probability is None or probability >= threshold) for _, label, probability in scored]
+        true_positive = sum(1 for label, passed in predicted if passed and label == "team_card")
+        passed_total = sum(1 for _, passed in predicted if passed)
+        precision = true_positive / passed_total if passed_total else 0.0
+        recall = true_positive / positives if positives else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        marker = "  <- candidate" if threshold == CANDIDATE_TEAM_CARD_THRESHOLD else ""
+        print(f"{threshold:9.2f} {precision:9.2f} {recall:7.2f} {f1:6.2f} {passed_total:>7}/{len(scored):<5} "
+              f"{100 * (1 - passed_total / len(scored)):7.1f}%{marker}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate the local team-card classifier")
+    parser.add_argument("--fixtures", help="Labelled directory (team_card/ and other/); default: synthetic set")
+    parser.add_argument("--write-fixtures", help="Save the synthetic set in the labelled layout and exit")
+    parser.add_argument("--verbose", action="store_true", help="Print per-image probability and features")
+    args = parser.parse_args(argv)
+
+    if args.write_fixtures:
+        write_fixtures(synthetic_fixtures(), args.write_fixtures)
+        print(f"Wrote synthetic fixtures to {args.write_fixtures}")
+        return 0
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures()
+    if not fixtures:
+        print("No labelled images found")
+        return 1
+    return evaluate(fixtures, args.verbose)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,5 +5,13 @@ Core VGC analysis logic and Pokemon processing.
 from .analyzer import GeminiVGCAnalyzer
 from .scraper import ArticleScraper
 from .pokemon_validator import PokemonValidator
+from .site_adapters import SiteAdapter, SiteAdapterRegistry, register_adapter
 
-__all__ = ['GeminiVGCAnalyzer', 'ArticleScraper', 'PokemonValidator']
\ No newline at end of file
+__all__ = [
+    'GeminiVGCAnalyzer',
+    'ArticleScraper',
+    'PokemonValidator',
+    'SiteAdapter',
+    'SiteAdapterRegistry',
+    'register_adapter'
+]
@@ -3,6 +3,7 @@ Core VGC analysis engine using Google Gemini AI.
 """
 
 import json
+import os
 import re
 import logging
 from typing import Dict, Optional, Any, List
@@ -55,24 +56,35 @@ try:
     from utils.image_analyzer import (
         extract_images_from_url,
         filter_vgc_images,
+        gate_vision_candidates,
         analyze_image_with_vision,
+        analyze_images_cached,
+        release_image_payloads,
         extract_ev_spreads_from_image_analysis
     )
+    from utils.vision_cache import VisionCache, DEFAULT_VISION_CACHE_PATH
 except ImportError:
     try:
         from src.utils.image_analyzer import (
             extract_images_from_url,
             filter_vgc_images,
+            gate_vision_candidates,
             analyze_image_with_vision,
+            analyze_images_cached,
+            release_image_payloads,
             extract_ev_spreads_from_image_analysis
         )
+        from src.utils.vision_cache import VisionCache, DEFAULT_VISION_CACHE_PATH
     except ImportError:
         # Fallback image analysis functions
-        def extract_images_from_url(url):
+        def extract_images_from_url(url, max_images=10, page=None):
             return []
         
         def filter_vgc_images(images):
             return images
+
+        def gate_vision_candidates(images, threshold=0.0):
+            return images
         
         def analyze_image_with_vision(image, model):
             return "Image analysis not available"
@@ -80,6 +92,44 @@ except ImportError:
         def extract_ev_spreads_from_image_analysis(analysis):
             return {}
 
+        def analyze_images_cached(images, vision_model, cache=None, prepare_image=True, batch=True):
+            return [("Image analysis not available", []) for _ in images]
+
+        def release_image_payloads(images):
+            pass
+
+        VisionCache = None
+        DEFAULT_VISION_CACHE_PATH = None
+
+def _pokemon_name_key(name: str) -> str:
+    """Comparison key for Pokemon names from the text analysis and from vision headers"""
+    return re.sub(r"[\W_]", "", (name or "").lower())
+
+
+def _take_image_spread(pokemon_name: str, spreads: List[Dict[str, Any]], team_keys: set) -> Optional[Dict[str, Any]]:
+    """
+    Pop the image EV spread to use for one team member
+
+    Spreads the scanner associated with this Pokemon (their "pokemon" field,
+    exact name first, then same base species) win; otherwise the first spread
+    not associated with another team member. ``spreads`` is ordered by
+    confidence, so the first match is the most confident.
+    """
+    owners = [spread.get("pokemon") or "" for spread in spreads]
+    if pokemon_name:
+        name_key = _pokemon_name_key(pokemon_name)
+        base_key = _pokemon_name_key(pokemon_name.split("-")[0])
+        for same in (lambda owner: _pokemon_name_key(owner) == name_key,
+                     lambda owner: _pokemon_name_key(owner.split("-")[0]) == base_key):
+            for index, owner in enumerate(owners):
+                if owner and same(owner):
+                    return spreads.pop(index)
+    for index, owner in enumerate(owners):
+        if not owner or _pokemon_name_key(owner) not in team_keys:
+            return spreads.pop(index)
+    return None
+
+
 # Configure logging for analysis pipeline debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -273,6 +323,35 @@ class GeminiVGCAnalyzer:
         # Initialize helper components
         self.scraper = ArticleScraper()
         self.pokemon_validator = PokemonValidator()
+        self.vision_cache = self._open_vision_cache()
+        self._load_suggestion_popularity()
+
+    @staticmethod
+    def _open_vision_cache():
+        """
+        Open the persistent vision cache ($VGC_VISION_CACHE_PATH or the default
+        location); returns None when caching is disabled or unavailable
+        """
+        if VisionCache is None or not getattr(Config, "CACHE_ENABLED", False):
+            return None
+        try:
+            return VisionCache(
+                os.getenv("VGC_VISION_CACHE_PATH") or DEFAULT_VISION_CACHE_PATH,
+                max_entries=getattr(Config, "VISION_CACHE_MAX_ENTRIES", 5000),
+                ttl_seconds=getattr(Config, "VISION_CACHE_TTL_HOURS", 24 * 30) * 3600,
+            )
+        except Exception as e:
+            logger.warning(f"Vision cache unavailable, analysing every image: {e}")
+            return None
+
+    def _load_suggestion_popularity(self):
+        """Rank name suggestions by how often each Pokemon appears in the vision cache"""
+        if self.vision_cache is None or not hasattr(self.pokemon_validator, "update_suggestion_popularity"):
+            return
+        try:
+            self.pokemon_validator.update_suggestion_popularity(self.vision_cache.pokemon_counts())
+        except Exception as e:
+            logger.warning(f"Could not load Pokemon popularity from the vision cache: {e}")
 
     def validate_url(self, url: str) -> bool:
         """Validate if URL is accessible and potentially contains VGC content"""
@@ -425,8 +504,9 @@ class GeminiVGCAnalyzer:
             Dictionary containing image analysis results or None if failed
         """
         try:
-            # Extract images from URL
-            all_images = extract_images_from_url(url, max_images=10)
+            # Extract images from URL, reusing the page the scraper already fetched
+            page = self.scraper.get_page(url)
+            all_images = extract_images_from_url(url, max_images=10, page=page)
             
             if not all_images:
                 return None
@@ -437,6 +517,11 @@ class GeminiVGCAnalyzer:
             if not vgc_images:
                 # If no VGC-specific images found, try a few of the best general images
                 vgc_images = all_images[:3]
+
+            # Local pixel classifier: banners and photos never reach the paid vision model
+            vgc_images = gate_vision_candidates(
+                vgc_images, threshold=getattr(Config, "VISION_CLASSIFIER_THRESHOLD", 0.0)
+            )
             
             analyzed_images = []
             extracted_data = {
@@ -445,32 +530,36 @@ class GeminiVGCAnalyzer:
                 "strategy_insights": []
             }
             
-            # Analyze each image
-            for image_info in vgc_images:
-                try:
-                    if image_info.get('data') and image_info.get('format'):
-                        # Analyze image with vision model
-                        vision_analysis = analyze_image_with_vision(
-                            image_info['data'], 
-                            image_info['format'], 
-                            self.vision_model
-                        )
-                        
-                        if vision_analysis:
-                            analyzed_images.append({
-                                'url': image_info.get('url', ''),
-                                'analysis': vision_analysis,
-                                'confidence': image_info.get('confidence_score', 0.5)
-                            })
-                            
-                            # Extract EV spreads from analysis
-                            ev_spreads = extract_ev_spreads_from_image_analysis(vision_analysis)
-                            if ev_spreads:
-                                extracted_data["ev_spreads"].extend(ev_spreads)
-                                
-                except Exception as img_error:
-                    # Skip this image but continue with others
-                    continue
+            # Analyze all images together: cached ones skip the model, the rest
+            # share batched vision requests (results come back in image order)
+            analyzable = [
+                image for image in vgc_images
+                if (image.get('content') or image.get('data')) and image.get('format')
+            ]
+            try:
+                image_results = analyze_images_cached(
+                    analyzable,
+                    self.vision_model,
+                    cache=getattr(self, "vision_cache", None),
+                )
+            except Exception as batch_error:
+                logger.warning(f"Image analysis failed: {batch_error}")
+                image_results = []
+            finally:
+                # Only metadata is needed from here on - free the image bytes
+                release_image_payloads(all_images)
+
+            for image_info, (vision_analysis, ev_spreads) in zip(analyzable, image_results):
+                if vision_analysis:
+                    analyzed_images.append({
+                        'url': image_info.get('url', ''),
+                        'analysis': vision_analysis,
+                        'confidence': image_info.get('confidence_score', 0.5)
+                    })
+
+                    # EV spreads extracted from the analysis (stored alongside it in the cache)
+                    if ev_spreads:
+                        extracted_data["ev_spreads"].extend(ev_spreads)
             
             if analyzed_images:
                 extracted_data["analyzed_images"] = analyzed_images
@@ -512,6 +601,7 @@ class GeminiVGCAnalyzer:
                                     reverse=True)
             
             ev_assignment_log = []
+            team_keys = {_pokemon_name_key(member.get("name", "")) for member in pokemon_team}
             
             for i, pokemon in enumerate(pokemon_team):
                 # Analyze current EV situation for this Pokemon
@@ -529,10 +619,13 @@ class GeminiVGCAnalyzer:
                     isinstance(current_evs, str) and len(current_evs) < 3,  # Too short to be real EV spread
                 ])
                 
-                # ULTRA-STRICT: Assign image EV spread with validation against generation
+                best_image_spread = None
                 if needs_image_evs and sorted_image_evs:
-                    best_image_spread = sorted_image_evs.pop(0)  # Take highest confidence spread
-                    
+                    # Spread read under this Pokemon's header first, else the most confident unclaimed one
+                    best_image_spread = _take_image_spread(pokemon.get("name", ""), sorted_image_evs, team_keys)
+
+                # ULTRA-STRICT: Assign image EV spread with validation against generation
+                if best_image_spread is not None:
                     # Additional validation to prevent AI generation
                     spread_total = best_image_spread.get("total", 0)
                     
@@ -675,7 +768,16 @@ class GeminiVGCAnalyzer:
         # Technical calculation format
         if re.search(r'実数値\s*[:：]', content):
             # Look for 努力値: within next few lines after 実数値:
-            tech_matches = len(re.findall(r'実数値.*?努力値', content, re.DOTALL))
+            # (same count as re.findall(r'実数値.*?努力値', re.DOTALL), without
+            # rescanning the rest of the text from every unmatched 実数値)
+            tech_matches = 0
+            position = content.find('実数値')
+            while position != -1:
+                end = content.find('努力値', position + len('実数値'))
+                if end == -1:
+                    break
+                tech_matches += 1
+                position = content.find('実数値', end + len('努力値'))
             format_scores["technical_calc"] += tech_matches * 0.4
         
         # Japanese grid format
@@ -692,7 +794,7 @@ class GeminiVGCAnalyzer:
         # Standard slash format
         slash_patterns = [
             r'HP\s*[:：]\s*\d+\s*/\s*Attack',
-            r'\d+/\d+/\d+/\d+/\d+/\d+',  # Standard 6-number format
+            r'(?<!\d)\d+/\d+/\d+/\d+/\d+/\d+',  # Standard 6-number format (whole digit runs only)
         ]
         for pattern in slash_patterns:
             matches = len(re.findall(pattern, content))
@@ -1456,9 +1558,9 @@ When you see these moves, you can be 100% certain of the Pokemon:
 - コライドン = Koraidon (Fighting/Dragon legendary - orange)
 - ミライドン = Miraidon (Electric/Dragon legendary - purple)  
 - テツノカイナ = Iron Hands (Fighting/Electric paradox)
-- イーユイ = Wo-Chien (Dark/Grass Ruin legendary)
+- チオンジェン = Wo-Chien (Dark/Grass Ruin legendary)
 - パオジアン = Chien-Pao (Dark/Ice Ruin legendary)
-- チオンジェン = Chi-Yu (Dark/Fire Ruin legendary)
+- イーユイ = Chi-Yu (Dark/Fire Ruin legendary)
 - ディンルー = Ting-Lu (Dark/Ground Ruin legendary)
 
 **OGERPON FORMS - CRITICAL IDENTIFICATION:**
@@ -1509,10 +1611,10 @@ HISUIAN REGIONAL FORMS - CRITICAL FOR VGC:
 - ヒスイバクフーン = Typhlosion-Hisui
 
 TREASURES OF RUIN - EXACT IDENTIFICATION:
-- チオンジェン = Chi-Yu (Fire/Dark - goldfish-like legendary)
+- イーユイ = Chi-Yu (Fire/Dark - goldfish-like legendary)
 - パオジアン = Chien-Pao (Dark/Ice - cat-like legendary)
 - ディンルー = Ting-Lu (Dark/Ground - deer-like legendary) 
-- イーユイ = Wo-Chien (Dark/Grass - snail-like legendary)
+- チオンジェン = Wo-Chien (Dark/Grass - snail-like legendary)
 
 FORME IDENTIFICATION - THERIAN vs INCARNATE:
 - トルネロス (れいじゅうフォルム) = Tornadus-Therian (Flying/Flying)
@@ -1541,8 +1643,8 @@ DO NOT CONFUSE THESE POKEMON:
 - ザシアン = Zacian (Sword legendary)
 NEVER confuse "ザマ" mentions with Zacian - "ザマ" ALWAYS refers to Zamazenta!
 
-- Chi-Yu ≠ Chien-Pao (チオンジェン = Chi-Yu, パオジアン = Chien-Pao)
-- Ting-Lu ≠ Wo-Chien (ディンルー = Ting-Lu, イーユイ = Wo-Chien)
+- Chi-Yu ≠ Chien-Pao (イーユイ = Chi-Yu, パオジアン = Chien-Pao)
+- Ting-Lu ≠ Wo-Chien (ディンルー = Ting-Lu, チオンジェン = Wo-Chien)
 - Tornadus-Incarnate ≠ Tornadus-Therian (different forms, different stats)
 
 CRITICAL: テツノブジン = Iron Valiant (NEVER "Iron Shaman" or any other name)
@@ -0,0 +1,332 @@
+"""
+Compressed, content-addressed archive of raw article responses.
+
+Every response the scraper processes can optionally be written here: the raw
+bytes are compressed (zstd when the ``zstandard`` package is installed,
+gzip otherwise) and stored under their SHA-256 digest, while a SQLite index
+records the URL, status code, headers, encoding and fetch time. Identical
+pages fetched more than once share a single blob.
+
+The archive lets extraction changes (note.com / Hatenablog cleaners, scoring
+tweaks, ...) be re-run over previously fetched articles without touching the
+network:
+
+    python -m core.html_archive reextract <archive_dir> --output results.jsonl
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency - gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.sqlite"
+OBJECTS_DIRNAME = "objects"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    status_code INTEGER,
+    encoding TEXT,
+    headers TEXT,
+    digest TEXT NOT NULL REFERENCES blobs(digest),
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_url ON responses(url);
+"""
+
+
+class ArchivedResponse:
+    """
+    Minimal stand-in for ``requests.Response`` rebuilt from the archive
+
+    Exposes the attributes ``ArticleScraper._process_response_content`` reads
+    (``content``, ``url``, ``encoding``, ``text``, ``headers``, ``status_code``).
+    """
+
+    def __init__(self, content: bytes, url: str, status_code: int = 200,
+                 encoding: Optional[str] = None, headers: Optional[Dict[str, str]] = None,
+                 record_id: Optional[int] = None, fetched_at: Optional[float] = None):
+        self.content = content
+        self.url = url
+        self.status_code = status_code
+        self.encoding = encoding
+        self.headers = headers or {}
+        self.record_id = record_id
+        self.fetched_at = fetched_at
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def raise_for_status(self):
+        """Archived responses were already accepted when they were stored"""
+        return None
+
+
+class HTMLArchive:
+    """Content-addressed store of raw HTML responses with a SQLite index"""
+
+    def __init__(self, root: str, codec: Optional[str] = None):
+        """
+        Open (or create) an archive directory
+
+        Args:
+            root: Archive directory
+            codec: "zstd" or "gzip"; defaults to zstd when available
+        """
+        if codec is None:
+            codec = "zstd" if zstandard is not None else "gzip"
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("zstd codec requested but the zstandard package is not installed")
+        if codec not in ("zstd", "gzip"):
+            raise ValueError(f"Unsupported archive codec: {codec}")
+
+        self.root = root
+        self.codec = codec
+        self.index_path = os.path.join(root, INDEX_FILENAME)
+        os.makedirs(os.path.join(root, OBJECTS_DIRNAME), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path, timeout=30)
+
+    def _blob_path(self, digest: str, codec: str) -> str:
+        extension = "zst" if codec == "zstd" else "gz"
+        return os.path.join(self.root, OBJECTS_DIRNAME, digest[:2], f"{digest[2:]}.{extension}")
+
+    @staticmethod
+    def _compress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=9)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("Archive blob is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def store_bytes(self, content: bytes) -> str:
+        """
+        Store raw bytes under their SHA-256 digest (deduplicated)
+
+        Returns:
+            Hex digest of the content
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone():
+                return digest
+
+            compressed = self._compress(content, self.codec)
+            path = self._blob_path(digest, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so a crashed write never leaves a truncated blob
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, codec, size, stored_size) VALUES (?, ?, ?, ?)",
+                (digest, self.codec, len(content), len(compressed)),
+            )
+        return digest
+
+    def store_response(self, response) -> int:
+        """
+        Archive a ``requests.Response`` (or anything with the same attributes)
+
+        Returns:
+            ID of the new index record
+        """
+        digest = self.store_bytes(response.content)
+        headers = dict(getattr(response, "headers", {}) or {})
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO responses (url, status_code, encoding, headers, digest, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    response.url,
+                    getattr(response, "status_code", None),
+                    getattr(response, "encoding", None),
+                    json.dumps(headers, ensure_ascii=False),
+                    digest,
+                    time.time(),
+                ),
+            )
+            return cursor.lastrowid
+
+    def load_bytes(self, digest: str) -> bytes:
+        """Return the raw bytes stored under a digest"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT codec FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown archive digest: {digest}")
+        with open(self._blob_path(digest, row[0]), "rb") as f:
+            return self._decompress(f.read(), row[0])
+
+    def load_response(self, record_id: int) -> ArchivedResponse:
+        """Rebuild an archived response by index record ID"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT url, status_code, encoding, headers, digest, fetched_at FROM responses WHERE id = ?",
+                (record_id,),
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown archive record: {record_id}")
+
+        url, status_code, encoding, headers, digest, fetched_at = row
+        return ArchivedResponse(
+            content=self.load_bytes(digest),
+            url=url,
+            status_code=status_code,
+            encoding=encoding,
+            headers=json.loads(headers) if headers else {},
+            record_id=record_id,
+            fetched_at=fetched_at,
+        )
+
+    def record_ids(self, latest_per_url: bool = True) -> List[int]:
+        """
+        List archived record IDs
+
+        Args:
+            latest_per_url: Only return the most recent record for each URL
+        """
+        query = (
+            "SELECT MAX(id) FROM responses GROUP BY url ORDER BY MAX(id)"
+            if latest_per_url
+            else "SELECT id FROM responses ORDER BY id"
+        )
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(query)]
+
+    def iter_responses(self, latest_per_url: bool = True) -> Iterator[ArchivedResponse]:
+        """Yield archived responses in insertion order"""
+        for record_id in self.record_ids(latest_per_url):
+            yield self.load_response(record_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Record/blob counts and raw vs stored byte totals"""
+        with self._connect() as conn:
+            records = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            blobs, size, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+            ).fetchone()
+        return {"records": records, "blobs": blobs, "raw_bytes": size, "stored_bytes": stored}
+
+
+def _reextract_record(archive_root: str, record_id: int) -> Dict[str, Any]:
+    """Worker: replay one archived response through the current extraction code"""
+    try:
+        from core.scraper import ArticleScraper
+    except ImportError:
+        from src.core.scraper import ArticleScraper
+
+    response = HTMLArchive(archive_root).load_response(record_id)
+    result = {"id": record_id, "url": response.url, "content": None, "error": None}
+    start = time.perf_counter()
+    scraper = ArticleScraper()
+    scraper.archive = None  # Replays must not write new records
+    try:
+        result["content"] = scraper._process_response_content(response)
+    except Exception as e:
+        result["error"] = str(e)
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def reextract_archive(archive_root: str, workers: Optional[int] = None,
+                      latest_per_url: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Replay every archived response through the extraction pipeline offline
+
+    Args:
+        archive_root: Archive directory
+        workers: Worker processes (defaults to all CPU cores; 1 runs in-process)
+        latest_per_url: Only replay the newest record for each URL
+
+    Yields:
+        One result dict per record (id, url, content, error, elapsed_ms), in record order
+    """
+    record_ids = HTMLArchive(archive_root).record_ids(latest_per_url)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(record_ids) <= 1:
+        for record_id in record_ids:
+            yield _reextract_record(archive_root, record_id)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_reextract_record, [archive_root] * len(record_ids), record_ids)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for archive maintenance"""
+    parser = argparse.ArgumentParser(description="Raw HTML archive tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reextract = subparsers.add_parser("reextract", help="Re-run extraction over archived pages")
+    reextract.add_argument("archive_dir")
+    reextract.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    reextract.add_argument("--all-records", action="store_true", help="Replay every record, not just the latest per URL")
+    reextract.add_argument("--output", help="Write JSON lines with the extracted content to this file")
+
+    stats = subparsers.add_parser("stats", help="Show archive size statistics")
+    stats.add_argument("archive_dir")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print(json.dumps(HTMLArchive(args.archive_dir).stats(), indent=2))
+        return 0
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    succeeded = failed = 0
+    start = time.perf_counter()
+    try:
+        for result in reextract_archive(args.archive_dir, args.workers, not args.all_records):
+            if result["content"]:
+                succeeded += 1
+            else:
+                failed += 1
+                logger.warning(f"Re-extraction failed for {result['url']}: {result['error'] or 'no content'}")
+            if output:
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if output:
+            output.close()
+
+    print(f"Re-extracted {succeeded + failed} pages ({succeeded} ok, {failed} failed) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+note.com structured-data fast path.
+
+note.com article pages are heavy SPA shells; the same article is available as
+a small JSON document from note's public API (``/api/v3/notes/<key>``), with
+the body as clean HTML and the eyecatch image URL. ``fetch_note_article``
+turns that response into a ``PageArtifact`` whose tree is just the article,
+so text extraction and image discovery skip the page shell entirely. Callers
+fall back to the HTML pipeline when it returns None.
+"""
+
+import html
+import json
+import logging
+import re
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    from utils.page_artifact import PageArtifact
+except ImportError:
+    from src.utils.page_artifact import PageArtifact
+
+logger = logging.getLogger(__name__)
+
+NOTE_API_BASE = "https://note.com/api/v3/notes/"
+
+# https://note.com/<creator>/n/<key>, https://note.com/n/<key>, .../notes/<key>
+_NOTE_KEY_PATTERN = re.compile(r"/(?:n|notes)/(n[0-9a-z]+)(?:/|$)")
+
+_API_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json",
+    "Accept-Language": "ja,en-US;q=0.9,en;q=0.8",
+}
+
+
+def extract_note_key(url: str) -> Optional[str]:
+    """Return the note key (e.g. "n1a2b3c4d5e6") from a note.com article URL"""
+    try:
+        path = urlparse(url).path
+    except ValueError:
+        return None
+    match = _NOTE_KEY_PATTERN.search(path)
+    return match.group(1) if match else None
+
+
+def build_article_html(note: Dict[str, Any]) -> str:
+    """Wrap the API's body HTML with the title and eyecatch image"""
+    title = html.escape(note.get("name") or "")
+    parts = ["<html><body><article>"]
+    if title:
+        parts.append(f"<h1>{title}</h1>")
+    eyecatch = note.get("eyecatch")
+    if eyecatch:
+        parts.append(f'<img src="{html.escape(eyecatch, quote=True)}" alt="{title}">')
+    parts.append(note.get("body") or "")
+    parts.append("</article></body></html>")
+    return "".join(parts)
+
+
+def fetch_note_article(url: str, timeout: int = 10, api_base: Optional[str] = None) -> Optional[PageArtifact]:
+    """
+    Fetch a note.com article through the public note API
+
+    Args:
+        url: note.com article URL
+        timeout: Request timeout in seconds
+        api_base: API endpoint prefix (defaults to NOTE_API_BASE)
+
+    Returns:
+        PageArtifact for the article body, or None if the fast path is unavailable
+        (unrecognised URL, API error, missing body)
+    """
+    key = extract_note_key(url)
+    if not key:
+        return None
+
+    try:
+        response = requests.get(f"{api_base or NOTE_API_BASE}{key}", headers=_API_HEADERS, timeout=timeout)
+        if response.status_code != 200:
+            logger.info(f"note API returned {response.status_code} for {key}, using HTML pipeline")
+            return None
+        payload = json.loads(response.content.decode("utf-8"))
+    except (requests.RequestException, ValueError) as e:
+        logger.info(f"note API unavailable for {key} ({e}), using HTML pipeline")
+        return None
+
+    note = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(note, dict) or not note.get("body"):
+        # Paid or deleted articles can come back without a body
+        return None
+
+    return PageArtifact(
+        url=url,
+        final_url=note.get("note_url") or url,
+        content=response.content,
+        text=build_article_html(note),
+        encoding="utf-8",
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        structured=note,
+    )
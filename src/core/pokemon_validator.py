@@ -3,10 +3,61 @@ Pokemon validation and name correction utilities.
 """
 
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
-# Import Pokemon name translations (will need to update path)
-# from ..utils.config import POKEMON_NAME_TRANSLATIONS
+try:
+    from utils.config import POKEMON_NAME_TRANSLATIONS
+    from utils.learnsets import get_learnset_index
+    from utils.name_resolver import PokemonNameResolver, SubstringRule
+    from utils.name_suggestions import DEFAULT_SUGGESTION_LIMIT, SuggestionIndex
+    from utils.pokedex import get_pokedex
+    from utils.stat_translator import StatAbbreviationTranslator
+except ImportError:
+    from src.utils.config import POKEMON_NAME_TRANSLATIONS
+    from src.utils.learnsets import get_learnset_index
+    from src.utils.name_resolver import PokemonNameResolver, SubstringRule
+    from src.utils.name_suggestions import DEFAULT_SUGGESTION_LIMIT, SuggestionIndex
+    from src.utils.pokedex import get_pokedex
+    from src.utils.stat_translator import StatAbbreviationTranslator
+
+# Substring corrections, in priority order; the first rule whose trigger
+# occurs in the name decides it
+NAME_CORRECTION_RULES = (
+    # Common Gholdengo variations
+    SubstringRule("gholdengo", ("gholdengo", "ガルデンゴ", "サーフゴー"), "Gholdengo"),
+    # Treasures of Ruin confusions
+    SubstringRule("chi-yu", ("chi-yu", "イーユイ"), "Chi-Yu"),
+    SubstringRule("chien-pao", ("chien-pao", "パオジアン"), "Chien-Pao"),
+    SubstringRule("ting-lu", ("ting-lu", "ディンルー"), "Ting-Lu"),
+    SubstringRule("wo-chien", ("wo-chien", "チオンジェン"), "Wo-Chien"),
+    # Ogerpon masks
+    SubstringRule("ogerpon", ("ogerpon",), "Ogerpon", (
+        (("wellspring", "いどのめん"), "Ogerpon-Wellspring"),
+        (("hearthflame", "かまどのめん"), "Ogerpon-Hearthflame"),
+        (("cornerstone", "いしずえのめん"), "Ogerpon-Cornerstone"),
+    )),
+    # Forces of Nature: Tornadus defaults to Incarnate, the others to Therian (VGC usage)
+    SubstringRule("tornadus", ("tornadus", "トルネロス"), "Tornadus-Incarnate", (
+        (("therian", "れいじゅうフォルム"), "Tornadus-Therian"),
+    )),
+    SubstringRule("landorus", ("landorus", "ランドロス"), "Landorus-Therian", (
+        (("incarnate", "けしんフォルム"), "Landorus-Incarnate"),
+    )),
+    SubstringRule("thundurus", ("thundurus", "ボルトロス"), "Thundurus-Therian", (
+        (("incarnate", "けしんフォルム"), "Thundurus-Incarnate"),
+    )),
+    # Ursaluna form disambiguation
+    SubstringRule("ursaluna", ("ursaluna", "ガチグマ"), "Ursaluna", (
+        (("bloodmoon", "blood moon", "アカツキ"), "Ursaluna-Bloodmoon"),
+    )),
+    # Hisuian forms; no default, an unknown Hisuian name is left alone
+    SubstringRule("hisui", ("hisui", "ヒスイ"), None, (
+        (("arcanine", "ウインディ"), "Arcanine-Hisui"),
+        (("zoroark", "ゾロアーク"), "Zoroark-Hisui"),
+        (("growlithe", "ガーディ"), "Growlithe-Hisui"),
+        (("typhlosion", "バクフーン"), "Typhlosion-Hisui"),
+    )),
+)
 
 
 class PokemonValidator:
@@ -23,10 +74,10 @@ class PokemonValidator:
             'テツノカイナ': 'Iron Hands',
             'ハバタクカミ': 'Flutter Mane',
             'オーガポン': 'Ogerpon',
-            'チオンジェン': 'Chi-Yu',
+            'イーユイ': 'Chi-Yu',
             'パオジアン': 'Chien-Pao',
             'ディンルー': 'Ting-Lu',
-            'イーユイ': 'Wo-Chien',
+            'チオンジェン': 'Wo-Chien',
             
             # CRITICAL FIXES: Missing Pokemon
             'オーロンゲ': 'Grimmsnarl',  # CRITICAL: Was completely missing
@@ -43,8 +94,8 @@ class PokemonValidator:
             'テツノカイナ': 'Iron Hands',
             'テツノワダチ': 'Iron Treads',
             'テツノイバラ': 'Iron Thorns',
-            'テツノコウベ': 'Iron Crown',
-            'テツノイサハ': 'Iron Boulder',
+            'テツノカシラ': 'Iron Crown',
+            'テツノイワオ': 'Iron Boulder',
             
             # Romanization variants
             'Ugatsuhomura': 'Gouging Fire',
@@ -131,6 +182,31 @@ class PokemonValidator:
             'ボルトロス (けしんフォルム)': 'Thundurus-Incarnate',
         }
         
+        # Bundled Pokedex: canonical names and official Japanese names
+        self.pokedex = get_pokedex()
+        pokedex_names = self.pokedex.japanese_names()
+        # The config table also holds non-species terms (テラ -> Tera, メガ -> Mega);
+        # only entries naming a species the Pokedex knows are used as corrections
+        config_names = {
+            original: corrected for original, corrected in POKEMON_NAME_TRANSLATIONS.items()
+            if corrected in self.pokedex
+        }
+
+        # Exact tables first (form corrections win over plain translations), then the substring rules
+        self.name_resolver = PokemonNameResolver(
+            [
+                ("form_corrections", self.form_corrections),
+                ("pokemon_name_translations", self.pokemon_name_translations),
+                ("config", config_names),
+                ("pokedex", pokedex_names),
+            ],
+            NAME_CORRECTION_RULES,
+        )
+        self.suggestion_index = SuggestionIndex(
+            [*self.form_corrections.items(), *self.pokemon_name_translations.items(),
+             *config_names.items(), *pokedex_names.items()]
+        )
+        
         # Paradox Pokemon that should NEVER have form suffixes
         self.paradox_pokemon = {
             'Iron Valiant', 'Flutter Mane', 'Iron Hands', 'Iron Moth',
@@ -138,6 +214,9 @@ class PokemonValidator:
             'Brute Bonnet', 'Iron Treads', 'Iron Bundle', 'Iron Jugulis'
         }
         
+        # Species x move bitsets: move legality and species-by-moveset lookups
+        self.learnsets = get_learnset_index()
+        
         # SIGNATURE MOVE VALIDATION DATABASE - ULTRA-CRITICAL for restricted Pokemon identification
         self.signature_moves = {
             # Calyrex Forms - CRITICAL to distinguish from Kyurem
@@ -371,6 +450,7 @@ class PokemonValidator:
             '4n': 'multiple of 4',
             '8n': 'multiple of 8',
         }
+        self.stat_translator = StatAbbreviationTranslator(self.stat_abbreviations)
 
     def fix_pokemon_name_translations(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -478,138 +558,7 @@ class PokemonValidator:
         Returns:
             Text with stat abbreviations translated to English
         """
-        if not text:
-            return text
-        
-        
-        # Create a working copy of the text
-        translated_text = text
-        
-        # Sort stat abbreviations by length (longest first) to avoid partial matches
-        # E.g., "CS" should be matched before "C" or "S" individually
-        sorted_abbreviations = sorted(self.stat_abbreviations.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        import re
-        
-        changes_made = 0
-        
-        for japanese_term, english_term in sorted_abbreviations:
-            # Skip very long terms that are unlikely to be abbreviations in this context
-            if len(japanese_term) > 10:
-                continue
-            
-            # Skip single letters that are likely common English words in certain contexts
-            if len(japanese_term) == 1:
-                # Check if this single letter appears in contexts that suggest it's not a stat
-                common_english_contexts = [
-                    rf'\b{japanese_term}\s+(?:lot|bit|few|many|good|bad|great|strong|weak|nice|cool)',
-                    rf'\b(?:what|such|quite|very|really|pretty|rather)\s+{japanese_term}\s',
-                    rf'\b{japanese_term}(?:bout|way|fter|gain|lso|ccording|bout|nd)\b',
-                    rf'\b(?:as|is|was|am|are|be|an|or|of|to|in|on|at|by|for|with|about)\s+{japanese_term}\s+(?:and|or|the|a|an|of|to|in|on|at|by|for|with|about|but|so|if|when|where|while|because|though|although|since|unless|until|before|after|during)',
-                ]
-                # Skip if any common English pattern is found
-                should_skip = any(re.search(pattern, translated_text, re.IGNORECASE) for pattern in common_english_contexts)
-                if should_skip:
-                    continue
-                
-            # Create patterns for different contexts where stat abbreviations appear
-            patterns = [
-                # Pattern 1: Stat abbreviation followed by colon (e.g., "S: Fastest Urshifu")
-                rf'\b{re.escape(japanese_term)}:',
-                # Pattern 2: Stat abbreviation with numbers (e.g., "H252", "B4")
-                rf'\b{re.escape(japanese_term)}(?=\d)',
-                # Pattern 3: Stat abbreviation followed by space and word (e.g., "CS max")
-                rf'\b{re.escape(japanese_term)}(?=\s+(?:max|極|振り|投資|調整|意識))',
-                # Pattern 4: Stat abbreviation in specific stat contexts - simplified
-                rf'(?:lower|raise|invest)\s+{re.escape(japanese_term)}(?=\s|$|\.)',
-                # Pattern 5: Stat abbreviation at start of sentence
-                rf'^{re.escape(japanese_term)}(?=\s|:)',
-                # Pattern 6: Stat abbreviation with Japanese particles
-                rf'{re.escape(japanese_term)}(?=[をにはがと])',
-                # Pattern 7: More conservative context matching for single letters
-                rf'(?<=lower)\s+{re.escape(japanese_term)}(?=\s+(?:too|much))',
-            ]
-            
-            for i, pattern in enumerate(patterns):
-                # Check if pattern matches before trying to replace
-                if re.search(pattern, translated_text, flags=re.IGNORECASE):
-                    
-                    # Replace the pattern with the English translation
-                    def replace_func(match):
-                        matched_text = match.group()
-                        
-                        # Preserve punctuation and formatting
-                        if matched_text.endswith(':'):
-                            return f"{english_term}:"
-                        elif re.search(r'\d', matched_text):
-                            # For patterns like H252, B4, etc., extract the number
-                            number_match = re.search(r'\d+', matched_text)
-                            if number_match:
-                                number = number_match.group()
-                                return f"{number} {english_term}"
-                        elif i == 3:  # Pattern 4: context words like "lower H"
-                            # Extract context word and preserve it
-                            context_match = re.search(r'(lower|raise|invest)\s+', matched_text, re.IGNORECASE)
-                            if context_match:
-                                context_word = context_match.group(1)
-                                return f"{context_word} {english_term}"
-                            else:
-                                return english_term
-                        else:
-                            return english_term
-                    
-                    old_text = translated_text
-                    translated_text = re.sub(pattern, replace_func, translated_text, flags=re.IGNORECASE)
-                    if translated_text != old_text:
-                        changes_made += 1
-        
-        
-        # Post-processing: Clean up common issues
-        translated_text = self._clean_up_stat_translation(translated_text)
-        
-        return translated_text
-    
-    def _clean_up_stat_translation(self, text: str) -> str:
-        """
-        Clean up common translation artifacts and improve readability
-        
-        Args:
-            text: Text that may have translation artifacts
-            
-        Returns:
-            Cleaned up text
-        """
-        if not text:
-            return text
-        
-        # Define cleanup patterns
-        cleanup_patterns = [
-            # Fix double spaces
-            (r'\s+', ' '),
-            # Fix spacing around punctuation
-            (r'\s+([,.!?;:])', r'\1'),
-            (r'([,.!?;:])\s*([a-zA-Z])', r'\1 \2'),
-            # Capitalize first letter after periods
-            (r'(\. )([a-z])', lambda m: m.group(1) + m.group(2).upper()),
-            # Fix common word combinations
-            (r'Special Attack and Speed max', 'max Special Attack and Speed'),
-            (r'Attack and Speed max', 'max Attack and Speed'),
-            (r'HP and Defense max', 'max HP and Defense'),
-            # Fix "max" positioning
-            (r'(\w+) max\.', r'max \1.'),
-            # Standardize technical terms
-            (r'multiple of 11 HP', 'HP multiple of 11'),
-            (r'1 less than multiple of 16 HP', 'HP 1 less than multiple of 16'),
-        ]
-        
-        cleaned_text = text
-        for pattern, replacement in cleanup_patterns:
-            if callable(replacement):
-                cleaned_text = re.sub(pattern, replacement, cleaned_text)
-            else:
-                cleaned_text = re.sub(pattern, replacement, cleaned_text)
-        
-        return cleaned_text.strip()
+        return self.stat_translator.translate(text)
     
     def validate_pokemon_moves_consistency(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -659,15 +608,23 @@ class PokemonValidator:
                         # No signature or distinguishing moves - this might be misidentified
                         validation_notes.append(f"{pokemon_name}: WARNING - No signature moves detected")
                 
-                # CRITICAL: Check for potential Calyrex vs Kyurem confusion
-                confusion_check = self._check_calyrex_kyurem_confusion(pokemon_name, pokemon_moves)
-                if confusion_check:
-                    validation_notes.append(confusion_check)
-                    # Apply correction if confident
-                    corrected_name = self._suggest_correct_identification(pokemon_name, pokemon_moves)
-                    if corrected_name and corrected_name != pokemon_name:
+                # CRITICAL: Signature moves of another species mean it was misidentified
+                # (Calyrex vs Kyurem forms) or a move was mistranslated
+                illegal_moves = (self.learnsets.illegal_moves(pokemon_name, pokemon_moves)
+                                 if isinstance(pokemon_moves, list) else None)
+                if illegal_moves:
+                    corrected_name = self._suggest_correct_identification(pokemon_name, pokemon_moves, illegal_moves)
+                    if corrected_name != pokemon_name:
+                        validation_notes.append(
+                            f"CRITICAL: {pokemon_name} cannot learn {', '.join(illegal_moves)} "
+                            f"(should be {corrected_name})"
+                        )
                         corrections_made.append(f"Corrected {pokemon_name} → {corrected_name} based on moves")
                         pokemon["name"] = corrected_name
+                    else:
+                        validation_notes.append(
+                            f"{pokemon_name}: WARNING - cannot learn {', '.join(illegal_moves)}"
+                        )
         
         # Add validation notes to result
         if validation_notes or corrections_made:
@@ -681,41 +638,35 @@ class PokemonValidator:
         
         return result
     
-    def _check_calyrex_kyurem_confusion(self, pokemon_name: str, moves: List[str]) -> str:
-        """Check for specific Calyrex vs Kyurem confusion based on moves"""
-        if not moves:
-            return ""
-        
-        # Check Calyrex-Ice vs Kyurem-White confusion
-        if pokemon_name in ['Calyrex-Ice', 'Kyurem-White']:
-            if 'Glacial Lance' in moves:
-                if pokemon_name == 'Kyurem-White':
-                    return "CRITICAL: Pokemon has Glacial Lance but identified as Kyurem-White (should be Calyrex-Ice)"
-            elif 'Ice Burn' in moves:
-                if pokemon_name == 'Calyrex-Ice':
-                    return "CRITICAL: Pokemon has Ice Burn but identified as Calyrex-Ice (should be Kyurem-White)"
+    def _suggest_correct_identification(self, pokemon_name: str, moves: List[str],
+                                        illegal_moves: List[str]) -> str:
+        """
+        Suggest correct Pokemon identification based on its moves
         
-        # Check Calyrex-Shadow vs Kyurem-Black confusion  
-        if pokemon_name in ['Calyrex-Shadow', 'Kyurem-Black']:
-            if 'Astral Barrage' in moves:
-                if pokemon_name == 'Kyurem-Black':
-                    return "CRITICAL: Pokemon has Astral Barrage but identified as Kyurem-Black (should be Calyrex-Shadow)"
-            elif 'Freeze Shock' in moves:
-                if pokemon_name == 'Calyrex-Shadow':
-                    return "CRITICAL: Pokemon has Freeze Shock but identified as Calyrex-Shadow (should be Kyurem-Black)"
+        The candidates are the species that learn every illegal (signature)
+        move. When several share them (Fusion Flare: Reshiram and
+        Kyurem-White), the curated movepools decide: the candidate that learns
+        the most of the whole moveset.
         
-        return ""
-    
-    def _suggest_correct_identification(self, pokemon_name: str, moves: List[str]) -> str:
-        """Suggest correct Pokemon identification based on signature moves"""
-        if not moves:
+        Args:
+            pokemon_name: Identified Pokemon
+            moves: Its moves
+            illegal_moves: The moves it cannot learn (signature moves of other species)
+            
+        Returns:
+            The best candidate, or pokemon_name when there is none or the
+            best candidates are tied
+        """
+        if not illegal_moves:
             return pokemon_name
         
-        # Check all signature moves for a match
-        for correct_name, move_data in self.signature_moves.items():
-            signature_moves = move_data['signature_moves']
-            if any(move in moves for move in signature_moves):
-                return correct_name
+        ranked = self.learnsets.rank_species(moves, limit=len(self.learnsets.species))
+        candidates = [
+            (name, count) for name, count in ranked
+            if all(self.learnsets.learns(name, move) for move in illegal_moves)
+        ]
+        if len(candidates) == 1 or (candidates and candidates[0][1] > candidates[1][1]):
+            return candidates[0][0]
         
         return pokemon_name
     
@@ -788,87 +739,24 @@ class PokemonValidator:
         Returns:
             Corrected Pokemon name
         """
+        return self.resolve_pokemon_name(name)[0]
+    
+    def resolve_pokemon_name(self, name: str) -> Tuple[str, Optional[str]]:
+        """
+        Correct a Pokemon name and report which rule did it
+        
+        Args:
+            name: Original Pokemon name
+            
+        Returns:
+            (corrected name, rule) - rule is "exact:<table>", "substring:<rule>"
+            or None when the name was left as is
+        """
         # Handle None or empty names
         if not name or name in ["Unknown", "Unknown Pokemon"]:
-            return name
-        
-        # First check exact form matches
-        if name in self.form_corrections:
-            return self.form_corrections[name]
-        
-        # Check direct translations
-        if name in self.pokemon_name_translations:
-            return self.pokemon_name_translations[name]
-        
-        # Handle partial matches and common errors
-        name_lower = name.lower()
-        
-        # Fix common Gholdengo variations
-        if any(variant in name_lower for variant in ['gholdengo', 'ガルデンゴ', 'サーフゴー']):
-            return 'Gholdengo'
-        
-        # Fix Treasures of Ruin confusions
-        if 'chi-yu' in name_lower or 'チオンジェン' in name:
-            return 'Chi-Yu'
-        if 'chien-pao' in name_lower or 'パオジアン' in name:
-            return 'Chien-Pao'
-        if 'ting-lu' in name_lower or 'ディンルー' in name:
-            return 'Ting-Lu'
-        if 'wo-chien' in name_lower or 'イーユイ' in name:
-            return 'Wo-Chien'
-        
-        # Fix Ogerpon forms
-        if 'ogerpon' in name_lower:
-            if 'wellspring' in name_lower or 'いどのめん' in name:
-                return 'Ogerpon-Wellspring'
-            elif 'hearthflame' in name_lower or 'かまどのめん' in name:
-                return 'Ogerpon-Hearthflame'
-            elif 'cornerstone' in name_lower or 'いしずえのめん' in name:
-                return 'Ogerpon-Cornerstone'
-            else:
-                return 'Ogerpon'  # Base form
+            return name, None
         
-        # Fix Forces of Nature forms
-        if 'tornadus' in name_lower or 'トルネロス' in name:
-            if 'therian' in name_lower or 'れいじゅうフォルム' in name:
-                return 'Tornadus-Therian'
-            else:
-                return 'Tornadus-Incarnate'  # Default
-        
-        if 'landorus' in name_lower or 'ランドロス' in name:
-            if 'incarnate' in name_lower or 'けしんフォルム' in name:
-                return 'Landorus-Incarnate'
-            else:
-                return 'Landorus-Therian'  # Default for VGC
-        
-        if 'thundurus' in name_lower or 'ボルトロス' in name:
-            if 'incarnate' in name_lower or 'けしんフォルム' in name:
-                return 'Thundurus-Incarnate'
-            else:
-                return 'Thundurus-Therian'  # Default for VGC
-        
-        # Enhanced Ursaluna form disambiguation
-        if 'ursaluna' in name_lower or 'ガチグマ' in name:
-            # Check for Bloodmoon indicators
-            bloodmoon_indicators = ['bloodmoon', 'blood moon', 'アカツキ', '（アカツキ）', '(アカツキ)']
-            if any(indicator in name_lower or indicator in name for indicator in bloodmoon_indicators):
-                return 'Ursaluna-Bloodmoon'
-            else:
-                return 'Ursaluna'  # Regular form
-        
-        # Fix Hisuian forms
-        if 'hisui' in name_lower or 'ヒスイ' in name:
-            if 'arcanine' in name_lower or 'ウインディ' in name:
-                return 'Arcanine-Hisui'
-            elif 'zoroark' in name_lower or 'ゾロアーク' in name:
-                return 'Zoroark-Hisui'
-            elif 'growlithe' in name_lower or 'ガーディ' in name:
-                return 'Growlithe-Hisui'
-            elif 'typhlosion' in name_lower or 'バクフーン' in name:
-                return 'Typhlosion-Hisui'
-        
-        # If no corrections needed, return original
-        return name
+        return self.name_resolver.resolve(name)
     
     def _validate_paradox_forms(self, pokemon_name: str) -> str:
         """Check for invalid Paradox Pokemon forms"""
@@ -968,30 +856,31 @@ class PokemonValidator:
         
         return ""
     
-    def get_pokemon_suggestions(self, partial_name: str) -> List[str]:
+    def get_pokemon_suggestions(self, partial_name: str, limit: int = DEFAULT_SUGGESTION_LIMIT) -> List[str]:
         """
         Get Pokemon name suggestions based on partial input
         
+        Matches English, kana (either script, any width) and romaji input,
+        tolerates typos, and ranks by how often a Pokemon appears in stored
+        analyses (see update_suggestion_popularity).
+        
         Args:
             partial_name: Partial Pokemon name
+            limit: Maximum number of suggestions
             
         Returns:
-            List of suggested Pokemon names
+            List of suggested Pokemon names, best match first
         """
-        suggestions = []
-        partial_lower = partial_name.lower()
-        
-        # Search through Japanese names
-        for japanese, english in self.pokemon_name_translations.items():
-            if partial_lower in japanese.lower() or partial_lower in english.lower():
-                suggestions.append(english)
-        
-        # Search through form corrections
-        for form_jp, form_en in self.form_corrections.items():
-            if partial_lower in form_jp.lower() or partial_lower in form_en.lower():
-                suggestions.append(form_en)
+        return self.suggestion_index.suggest(partial_name, limit)
+    
+    def update_suggestion_popularity(self, counts: Dict[str, float]):
+        """
+        Rank suggestions by popularity
         
-        return list(set(suggestions))  # Remove duplicates
+        Args:
+            counts: Pokemon name -> number of appearances in stored analyses
+        """
+        self.suggestion_index.set_popularity(counts)
     
     def is_valid_pokemon_name(self, name: str) -> bool:
         """
@@ -1006,6 +895,9 @@ class PokemonValidator:
         if not name or name in ["Unknown", "Unknown Pokemon", "Not specified"]:
             return False
         
+        if name in self.pokedex:
+            return True
+        
         # Check if it's in our translation dictionaries
         if name in self.pokemon_name_translations.values():
             return True
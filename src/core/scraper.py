@@ -2,24 +2,103 @@
 Article scraper for VGC content with robust multi-strategy approach.
 """
 
+import os
 import re
 import requests
-from bs4 import BeautifulSoup
 from typing import Optional
 import time
 import logging
 
+try:
+    from utils.keyword_automaton import KeywordAutomaton
+    from utils.page_artifact import PageArtifact
+except ImportError:
+    from src.utils.keyword_automaton import KeywordAutomaton
+    from src.utils.page_artifact import PageArtifact
+
+try:
+    from core.html_archive import HTMLArchive
+    from core.site_adapters import (
+        DEFAULT_REGISTRY, HATENABLOG_ADAPTER, NOTE_COM_ADAPTER, SiteAdapter, SiteAdapterRegistry
+    )
+except ImportError:
+    from src.core.html_archive import HTMLArchive
+    from src.core.site_adapters import (
+        DEFAULT_REGISTRY, HATENABLOG_ADAPTER, NOTE_COM_ADAPTER, SiteAdapter, SiteAdapterRegistry
+    )
+
 # Configure logging for debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ULTRA-ENHANCED VGC/Pokemon content indicators (2025 comprehensive)
+VGC_CONTENT_INDICATORS = {
+    # ULTRA HIGH VALUE - Core VGC terms
+    'vgc': 20, 'ポケモン': 18, '構築': 15, 'チーム': 12, 'ダブル': 12,
+    'regulation': 15, 'pokemon': 12, 
+    
+    # HIGH VALUE - Competitive terms
+    '努力値': 10, '調整': 10, 'ランクマ': 10, 'バトル': 8, 'tournament': 10,
+    'ev': 10, 'battle': 8, 'double': 8, 'team': 8,
+    
+    # MEDIUM-HIGH VALUE - Stat/build terms
+    'とくこう': 8, 'すばやさ': 8, 'こうげき': 8, 'ぼうぎょ': 8, 'とくぼう': 8,
+    'nature': 6, 'ability': 6, '特性': 8, '性格': 8, '持ち物': 8,
+    
+    # MEDIUM VALUE - Game mechanics
+    'item': 5, 'move': 5, 'tera': 8, 'テラス': 8, 'dynamax': 6, 'ダイマックス': 6,
+    
+    # NOTE.COM SPECIFIC - Common article patterns
+    '最終': 8, '順位': 6, 'シーズン': 8, '使用': 6, '採用': 6,
+    'final': 6, 'season': 6, 'ranking': 6,
+    
+    # POKEMON NAMES - Ultra high value (popular VGC Pokemon)
+    'ガブリアス': 12, 'ランドロス': 12, 'ガオガエン': 12, 'エルフーン': 10,
+    'パオジアン': 12, 'チオンジェン': 12, 'ディンルー': 10, 'イーユイ': 10,
+    'テツノ': 10, 'ハバタクカミ': 10, 'サーフゴー': 10, 'コライドン': 12,
+    'ミライドン': 12, 'ザマゼンタ': 12, 'ザシアン': 12, 'モロバレル': 8,
+    
+    # ENGLISH POKEMON NAMES
+    'garchomp': 10, 'landorus': 10, 'incineroar': 10, 'whimsicott': 8,
+    'chien-pao': 10, 'chi-yu': 10, 'gholdengo': 10, 'flutter mane': 10,
+    'koraidon': 10, 'miraidon': 10, 'zamazenta': 10, 'zacian': 10
+}
+
+# Penalised by _calculate_content_score when present
+UI_INDICATORS = ['login', 'signup', 'follow', 'share', 'menu', 'navigation', 'footer', 'header']
+
+# Compiled once at import; scoring runs hundreds of times per page
+_VGC_CONTENT_AUTOMATON = KeywordAutomaton(VGC_CONTENT_INDICATORS)
+_UI_INDICATOR_AUTOMATON = KeywordAutomaton(UI_INDICATORS)
+
 
 class ArticleScraper:
     """Enhanced article content scraper with robust dynamic content handling"""
 
-    def __init__(self):
-        """Initialize the scraper"""
-        pass
+    def __init__(self, archive: Optional[HTMLArchive] = None,
+                 adapters: Optional[SiteAdapterRegistry] = None):
+        """
+        Initialize the scraper
+
+        Args:
+            archive: Optional raw HTML archive; every processed response is stored
+                in it for offline re-extraction. Defaults to an archive at
+                $VGC_HTML_ARCHIVE_DIR when that variable is set.
+            adapters: Site adapter registry (defaults to the shared registry
+                with the note.com and Hatenablog adapters)
+        """
+        if archive is None and os.getenv("VGC_HTML_ARCHIVE_DIR"):
+            archive = HTMLArchive(os.environ["VGC_HTML_ARCHIVE_DIR"])
+        self.archive = archive
+        self.adapters = adapters if adapters is not None else DEFAULT_REGISTRY
+
+        # Most recently processed page, reused by image discovery (see get_page)
+        self.last_page: Optional[PageArtifact] = None
+
+        # Per-element text/score memo for the document currently being processed.
+        # Keyed by (id(element), separator); the element itself is kept in the
+        # entry so its id cannot be reused while the cache is alive.
+        self._element_cache = {}
 
     def validate_url(self, url: str) -> bool:
         """
@@ -37,6 +116,20 @@ class ArticleScraper:
         except Exception:
             return False
 
+    def get_page(self, url: str) -> Optional[PageArtifact]:
+        """
+        Return the already-fetched page for a URL, if this scraper processed it
+
+        Args:
+            url: Requested or final URL of the page
+
+        Returns:
+            PageArtifact with the raw bytes, decoded HTML and parsed tree, or None
+        """
+        if self.last_page is not None and self.last_page.matches(url):
+            return self.last_page
+        return None
+
     def scrape_article(self, url: str) -> Optional[str]:
         """
         Enhanced article content scraper with robust dynamic content handling
@@ -50,6 +143,18 @@ class ArticleScraper:
         if not self.validate_url(url):
             raise ValueError("Invalid or inaccessible URL")
 
+        # Structured-data fast path (e.g. the note API) before any HTML download
+        adapter = self.adapters.for_url(url)
+        if adapter and adapter.fast_path:
+            try:
+                content = self._scrape_with_fast_path(url, adapter)
+                if content and len(content.strip()) > 50:
+                    logger.info(f"Success with {adapter.name} fast path: extracted {len(content)} characters")
+                    return content
+                logger.info(f"{adapter.name} fast path unavailable, using HTML strategies")
+            except Exception as e:
+                logger.warning(f"{adapter.name} fast path failed: {str(e)}")
+
         # Try multiple scraping strategies with increasing aggressiveness
         strategies = [
             self._scrape_with_standard_headers,
@@ -57,6 +162,13 @@ class ArticleScraper:
             self._scrape_with_japanese_headers,
             self._scrape_with_session_retry
         ]
+
+        # Site adapters can promote the strategy that works best for their platform
+        if adapter and adapter.preferred_strategy:
+            preferred = getattr(self, f"_scrape_with_{adapter.preferred_strategy}", None)
+            if preferred in strategies:
+                strategies.remove(preferred)
+                strategies.insert(0, preferred)
         
         for strategy_func in strategies:
             try:
@@ -75,6 +187,27 @@ class ArticleScraper:
         
         raise ValueError("All scraping strategies failed to extract meaningful content")
 
+    def _request_timeout(self, url: str, default: int) -> int:
+        """Per-domain request timeout from the site adapter, else the strategy default"""
+        adapter = self.adapters.for_url(url)
+        if adapter and adapter.timeout:
+            return adapter.timeout
+        return default
+
+    def _scrape_with_fast_path(self, url: str, adapter: SiteAdapter) -> Optional[str]:
+        """Article text from the adapter's structured-data source, bypassing the HTML page"""
+        page = adapter.fast_path(url, self._request_timeout(url, 10))
+        if page is None:
+            return None
+
+        # Shared with image discovery like any fetched page
+        self.last_page = page
+
+        # The structured body is already just the article - one line per block
+        text = page.soup.get_text(separator="\n", strip=True)
+        text = adapter.clean(text)
+        return text if adapter.validate(text) else None
+
     def _scrape_with_standard_headers(self, url: str) -> Optional[str]:
         """Standard scraping approach with comprehensive headers"""
         headers = {
@@ -98,7 +231,7 @@ class ArticleScraper:
             "Pragma": "no-cache"
         }
 
-        response = requests.get(url, headers=headers, timeout=20)
+        response = requests.get(url, headers=headers, timeout=self._request_timeout(url, 20))
         response.raise_for_status()
         return self._process_response_content(response)
     
@@ -117,7 +250,7 @@ class ArticleScraper:
             "Upgrade-Insecure-Requests": "1",
         }
 
-        response = requests.get(url, headers=headers, timeout=20)
+        response = requests.get(url, headers=headers, timeout=self._request_timeout(url, 20))
         response.raise_for_status()
         return self._process_response_content(response)
     
@@ -141,7 +274,7 @@ class ArticleScraper:
             "Referer": "https://www.google.com/"
         }
 
-        response = requests.get(url, headers=headers, timeout=25)
+        response = requests.get(url, headers=headers, timeout=self._request_timeout(url, 25))
         response.raise_for_status()
         return self._process_response_content(response)
     
@@ -164,12 +297,12 @@ class ArticleScraper:
         
         try:
             # Sometimes note.com requires a session establishment
-            session.get(url, headers=headers, timeout=15)
+            session.get(url, headers=headers, timeout=self._request_timeout(url, 15))
             
             # Second request for actual content
             time.sleep(2)  # Brief delay for dynamic content
             
-            response = session.get(url, headers=headers, timeout=25)
+            response = session.get(url, headers=headers, timeout=self._request_timeout(url, 25))
             response.raise_for_status()
             return self._process_response_content(response)
         finally:
@@ -177,6 +310,15 @@ class ArticleScraper:
     
     def _process_response_content(self, response) -> Optional[str]:
         """Enhanced content processing from HTTP response with note.com specialization"""
+        self._element_cache = {}
+
+        # Keep the raw response for offline re-extraction (never fails the scrape)
+        if self.archive is not None:
+            try:
+                self.archive.store_response(response)
+            except Exception as e:
+                logger.warning(f"Failed to archive response for {response.url}: {e}")
+
         try:
             
             # Enhanced encoding detection and handling with special Hatenablog support
@@ -200,35 +342,32 @@ class ArticleScraper:
                         # Final fallback to response.text with encoding set
                         html_content = response.text
             
-            # Additional encoding fix for Hatenablog domains
-            if any(domain in response.url for domain in ["hatenablog.com", "hatenablog.jp", "hatenadiary.jp"]):
+            adapter = self.adapters.for_url(response.url)
+
+            # Additional encoding fix for sites that need it (e.g. Hatenablog)
+            if adapter and adapter.normalize_html:
                 # Ensure proper Unicode normalization for Japanese content
                 import unicodedata
                 html_content = unicodedata.normalize('NFKC', html_content)
 
-            soup = BeautifulSoup(html_content, "html.parser")
-            
-            # Special handling for note.com articles (critical improvement)
-            if "note.com" in response.url:
-                logger.info("Detected note.com URL, using specialized extraction")
-                note_content = self._extract_note_com_content_specialized(soup)
-                if note_content:
-                    logger.info(f"Note.com specialized extraction successful: {len(note_content)} characters")
-                    logger.debug(f"Note.com content preview: {note_content[:300]}...")
-                    return note_content
+            # Parse once; the artifact is shared with image discovery
+            page = PageArtifact.from_response(response, text=html_content)
+            self.last_page = page
+            soup = page.soup
+            
+            # Site-specific extraction (note.com, Hatenablog, ... - see site_adapters)
+            if adapter:
+                logger.info(f"Detected {adapter.name} URL, using specialized extraction")
+                site_content = self._extract_with_adapter(soup, adapter)
+                if site_content:
+                    logger.info(f"{adapter.name} specialized extraction successful: {len(site_content)} characters")
+                    logger.debug(f"{adapter.name} content preview: {site_content[:300]}...")
+                    return site_content
                 else:
-                    logger.warning("Note.com specialized extraction failed, falling back to generic extraction")
-
-            # Special handling for Hatenablog articles (NEW - addresses missing Hatenablog support)
-            if any(domain in response.url for domain in ["hatenablog.com", "hatenablog.jp", "hatenadiary.jp"]):
-                logger.info("Detected Hatenablog URL, using specialized extraction")
-                hatenablog_content = self._extract_hatenablog_content_specialized(soup)
-                if hatenablog_content:
-                    logger.info(f"Hatenablog specialized extraction successful: {len(hatenablog_content)} characters")
-                    logger.debug(f"Hatenablog content preview: {hatenablog_content[:300]}...")
-                    return hatenablog_content
-                else:
-                    logger.warning("Hatenablog specialized extraction failed, falling back to generic extraction")
+                    logger.warning(f"{adapter.name} specialized extraction failed, falling back to generic extraction")
+
+            # Image discovery must still see the unmodified page
+            page.snapshot_images()
 
             # Remove unwanted elements but be more selective for dynamic content
             for element in soup(
@@ -237,6 +376,9 @@ class ArticleScraper:
             ):
                 element.decompose()
 
+            # Texts cached by the specialized extractors are stale after decompose()
+            self._element_cache = {}
+
             # ENHANCED CONTENT EXTRACTION with more aggressive strategies
             main_content = self._extract_main_content_enhanced(soup)
             
@@ -323,9 +465,8 @@ class ArticleScraper:
                 if elements:
                     # Try to find the one with the most meaningful content
                     for element in elements:
-                        text_content = element.get_text(strip=True)
                         # Enhanced validation - check for Pokemon/VGC content indicators
-                        content_score = self._calculate_content_score(text_content)
+                        content_score = self._get_element_score(element)
                         if content_score > 50:  # Higher threshold for better content
                             main_content = element
                             break
@@ -347,8 +488,7 @@ class ArticleScraper:
                 try:
                     candidate = soup.select_one(selector)
                     if candidate:
-                        text_preview = candidate.get_text(strip=True)
-                        content_score = self._calculate_content_score(text_preview)
+                        content_score = self._get_element_score(candidate)
                         if content_score > 15:  # Even lower threshold for generic selectors
                             main_content = candidate
                             break
@@ -363,9 +503,9 @@ class ArticleScraper:
             
             for div in all_divs:
                 try:
-                    text = div.get_text(strip=True)
+                    text = self._get_element_text(div)
                     if len(text) > 300:  # Require substantial content
-                        content_score = self._calculate_content_score(text)
+                        content_score = self._get_element_score(div)
                         if content_score > best_score:
                             best_score = content_score
                             best_candidate = div
@@ -381,6 +521,23 @@ class ArticleScraper:
 
         return main_content
     
+    def _get_element_text(self, element, separator: str = "") -> str:
+        """Return element.get_text(separator, strip=True), memoized per element"""
+        key = (id(element), separator)
+        entry = self._element_cache.get(key)
+        if entry is None:
+            entry = [element, element.get_text(separator=separator, strip=True), None]
+            self._element_cache[key] = entry
+        return entry[1]
+
+    def _get_element_score(self, element, separator: str = "") -> int:
+        """Return the content score of an element's text, memoized per element"""
+        self._get_element_text(element, separator)
+        entry = self._element_cache[(id(element), separator)]
+        if entry[2] is None:
+            entry[2] = self._calculate_content_score(entry[1])
+        return entry[2]
+
     def _calculate_content_score(self, text: str) -> int:
         """Calculate content quality score for article text"""
         if not text or len(text) < 50:
@@ -391,53 +548,16 @@ class ArticleScraper:
         # Length bonus (up to 1000 chars = 10 points)
         score += min(len(text) // 100, 10)
         
-        # ULTRA-ENHANCED VGC/Pokemon content indicators (2025 comprehensive)
-        vgc_indicators = {
-            # ULTRA HIGH VALUE - Core VGC terms
-            'vgc': 20, 'ポケモン': 18, '構築': 15, 'チーム': 12, 'ダブル': 12,
-            'regulation': 15, 'pokemon': 12, 
-            
-            # HIGH VALUE - Competitive terms
-            '努力値': 10, '調整': 10, 'ランクマ': 10, 'バトル': 8, 'tournament': 10,
-            'ev': 10, 'battle': 8, 'double': 8, 'team': 8,
-            
-            # MEDIUM-HIGH VALUE - Stat/build terms
-            'とくこう': 8, 'すばやさ': 8, 'こうげき': 8, 'ぼうぎょ': 8, 'とくぼう': 8,
-            'nature': 6, 'ability': 6, '特性': 8, '性格': 8, '持ち物': 8,
-            
-            # MEDIUM VALUE - Game mechanics
-            'item': 5, 'move': 5, 'tera': 8, 'テラス': 8, 'dynamax': 6, 'ダイマックス': 6,
-            
-            # NOTE.COM SPECIFIC - Common article patterns
-            '最終': 8, '順位': 6, 'シーズン': 8, '使用': 6, '採用': 6,
-            'final': 6, 'season': 6, 'ranking': 6,
-            
-            # POKEMON NAMES - Ultra high value (popular VGC Pokemon)
-            'ガブリアス': 12, 'ランドロス': 12, 'ガオガエン': 12, 'エルフーン': 10,
-            'パオジアン': 12, 'チオンジェン': 12, 'ディンルー': 10, 'イーユイ': 10,
-            'テツノ': 10, 'ハバタクカミ': 10, 'サーフゴー': 10, 'コライドン': 12,
-            'ミライドン': 12, 'ザマゼンタ': 12, 'ザシアン': 12, 'モロバレル': 8,
-            
-            # ENGLISH POKEMON NAMES
-            'garchomp': 10, 'landorus': 10, 'incineroar': 10, 'whimsicott': 8,
-            'chien-pao': 10, 'chi-yu': 10, 'gholdengo': 10, 'flutter mane': 10,
-            'koraidon': 10, 'miraidon': 10, 'zamazenta': 10, 'zacian': 10
-        }
-        
+        # Single pass over the text for every indicator (see KeywordAutomaton)
         text_lower = text.lower()
-        for indicator, value in vgc_indicators.items():
-            count = text_lower.count(indicator.lower())
-            score += count * value
+        score += _VGC_CONTENT_AUTOMATON.score(text_lower, prepared=True)
         
         # Japanese character bonus (indicates Japanese content)
         japanese_chars = sum(1 for char in text[:1000] if ord(char) > 127)
         score += japanese_chars // 10
         
         # Penalty for likely UI/navigation content
-        ui_indicators = ['login', 'signup', 'follow', 'share', 'menu', 'navigation', 'footer', 'header']
-        for indicator in ui_indicators:
-            if indicator in text_lower:
-                score -= 10
+        score -= 10 * len(_UI_INDICATOR_AUTOMATON.find_present(text_lower, prepared=True))
         
         # Penalty for very repetitive content
         words = text_lower.split()
@@ -599,75 +719,58 @@ class ArticleScraper:
         
         return ui_lines / max(1, len(lines))
     
-    def _extract_note_com_content_specialized(self, soup) -> Optional[str]:
+    def _extract_with_adapter(self, soup, adapter: SiteAdapter) -> Optional[str]:
         """
-        ULTRA-SPECIALIZED note.com content extraction optimized for Pokemon VGC articles
-        This method specifically targets the unique DOM structure of note.com articles
+        Site-specific content extraction driven by a SiteAdapter
+
+        STRATEGY 1 picks the best-scoring element among the adapter's selectors;
+        STRATEGY 2 falls back to a broad search over generic containers. Both
+        run the adapter's cleaning pipeline and validation hook.
         """
         try:
-            # STRATEGY 1: Direct content extraction using ultra-specific note.com patterns
-            ultra_specific_selectors = [
-                # Most recent note.com article structure (high priority)
-                "div.note-common-styles__textnote-body",
-                "div[data-testid='article-body'] .note-common-styles",
-                ".o-noteContentText",
-                
-                # Content within article containers
-                "article .note-common-styles__textnote-body",
-                "main .note-common-styles__textnote-body",
-                
-                # Text modules (note.com uses modular content)
-                "div[data-module='TextModule'] .note-common-styles",
-                ".js-textBody .note-common-styles",
-                
-                # Fallback patterns
-                ".note-common-styles:not([class*='header']):not([class*='nav'])",
-            ]
-            
+            # STRATEGY 1: Direct content extraction using the platform's selectors
             best_content = None
             best_score = 0
             
-            for selector in ultra_specific_selectors:
+            for selector, elements in adapter.select(soup):
                 try:
-                    elements = soup.select(selector)
-                    logger.info(f"Trying note.com selector: {selector} - found {len(elements)} elements")
+                    logger.info(f"Trying {adapter.name} selector: {selector} - found {len(elements)} elements")
                     for element in elements:
-                        text_content = element.get_text(separator=" ", strip=True)
-                        if len(text_content) > 100:  # Minimum length threshold
+                        text_content = self._get_element_text(element, separator=" ")
+                        if len(text_content) > adapter.min_element_chars:  # Minimum length threshold
                             # Score this content for VGC relevance
-                            content_score = self._calculate_content_score(text_content)
-                            logger.debug(f"Element content score: {content_score} for {len(text_content)} chars")
+                            content_score = self._get_element_score(element, separator=" ")
+                            logger.debug(f"{adapter.name} element content score: {content_score} for {len(text_content)} chars")
                             if content_score > best_score:
                                 best_score = content_score
                                 best_content = element
-                                logger.info(f"New best content found with score {best_score}")
+                                logger.info(f"New best {adapter.name} content found with score {best_score}")
                 except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
+                    logger.debug(f"{adapter.name} selector {selector} failed: {e}")
                     continue
             
-            if best_content:
+            if best_content and best_score > adapter.min_best_score:
                 # Extract and clean the content
-                text = best_content.get_text(separator=" ", strip=True)
-                
-                # Advanced note.com text cleaning
-                text = self._clean_note_com_content_specialized(text)
+                text = self._get_element_text(best_content, separator=" ")
+                text = adapter.clean(text)
                 
                 # Validate that we got meaningful content
-                if self._validate_note_com_content(text):
+                if adapter.validate(text):
                     return text
             
             # STRATEGY 2: If direct extraction failed, try broader content search
             # Look for any element with substantial Japanese VGC content
-            all_potential_elements = soup.find_all(['div', 'section', 'article'])
+            all_potential_elements = soup.find_all(list(adapter.broad_search_tags))
             
             for element in all_potential_elements:
                 try:
-                    text = element.get_text(separator=" ", strip=True)
-                    if len(text) > 200:  # Longer content for broader search
-                        content_score = self._calculate_content_score(text)
-                        if content_score > 50:  # High threshold for VGC content
-                            cleaned_text = self._clean_note_com_content_specialized(text)
-                            if self._validate_note_com_content(cleaned_text):
+                    text = self._get_element_text(element, separator=" ")
+                    if len(text) > adapter.broad_min_chars:  # Longer content for broader search
+                        content_score = self._get_element_score(element, separator=" ")
+                        if content_score > adapter.broad_min_score:
+                            cleaned_text = adapter.clean(text)
+                            if adapter.validate(cleaned_text):
+                                logger.info(f"{adapter.name} broad search successful with score {content_score}")
                                 return cleaned_text
                 except Exception:
                     continue
@@ -675,252 +778,29 @@ class ArticleScraper:
             return None
             
         except Exception as e:
-            print(f"Note.com specialized extraction failed: {e}")
+            logger.error(f"{adapter.name} specialized extraction failed: {e}")
             return None
-    
+
+    def _extract_note_com_content_specialized(self, soup) -> Optional[str]:
+        """note.com extraction (see NOTE_COM_ADAPTER)"""
+        return self._extract_with_adapter(soup, NOTE_COM_ADAPTER)
+
     def _clean_note_com_content_specialized(self, text: str) -> str:
         """Ultra-specialized cleaning for note.com Pokemon VGC content"""
-        if not text:
-            return text
-        
-        # Remove note.com specific boilerplate with enhanced patterns
-        note_com_removal_patterns = [
-            r"note\.com.*?",
-            r"記事を読む.*?",
-            r"続きを読む.*?",
-            r"もっと見る.*?",
-            r"フォロー.*?する.*?",
-            r"いいね.*?",
-            r"コメント.*?",
-            r"シェア.*?",
-            r"購読.*?",
-            r"ログイン.*?",
-            r"会員登録.*?",
-            r"有料記事.*?",
-            r"プレミアム.*?",
-            r"\d+年\d+月\d+日.*?更新",
-            r"更新日時.*?",
-            r"投稿日.*?",
-            r"著者.*?",
-            r"タグ.*?",
-            r"カテゴリ.*?",
-        ]
-        
-        lines = text.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Skip lines matching removal patterns
-            should_skip = False
-            for pattern in note_com_removal_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
-            
-            # Skip very short lines that are likely navigation
-            if len(line) < 3:
-                should_skip = True
-            
-            # Skip lines that are just numbers or symbols
-            if re.match(r'^[\d\s\-\/\(\)\.]+$', line):
-                should_skip = True
-                
-            if not should_skip:
-                cleaned_lines.append(line)
-        
-        # Join and normalize whitespace
-        result = '\n'.join(cleaned_lines)
-        
-        # Final cleanup
-        import unicodedata
-        result = unicodedata.normalize('NFKC', result)
-        result = re.sub(r'\s+', ' ', result)
-        result = re.sub(r'\n\s*\n', '\n', result)
-        
-        return result.strip()
-    
+        return NOTE_COM_ADAPTER.clean(text)
+
     def _validate_note_com_content(self, text: str) -> bool:
         """Validate that extracted note.com content exists and is not empty"""
-        # Simple validation: just check that we have actual content
-        # All the complex thresholds were unnecessary for large VGC articles
-        return bool(text and text.strip())
+        return NOTE_COM_ADAPTER.validate(text)
 
     def _extract_hatenablog_content_specialized(self, soup) -> Optional[str]:
-        """
-        SPECIALIZED Hatenablog content extraction optimized for Pokemon VGC articles
-        Addresses the missing Hatenablog support that was causing scraping failures
-        """
-        try:
-            # STRATEGY 1: Hatenablog-specific article content selectors
-            hatenablog_specific_selectors = [
-                # Primary Hatenablog article content selectors
-                ".entry-content",  # Main article content container
-                ".entry-body",     # Article body content
-                ".entry-inner",    # Inner content wrapper
-                
-                # Alternative Hatenablog patterns
-                ".hatena-body",    # Hatena blog body
-                ".entry-content-container",  # Content container
-                "#main-content .entry-content",  # Main content area
-                
-                # More specific Hatenablog selectors
-                "article .entry-content",
-                "main .entry-content", 
-                ".hentry .entry-content",  # hentry is common in Hatenablog
-                ".post-content",
-                ".blog-entry-content",
-                
-                # Fallback selectors for various Hatenablog themes
-                ".entry",
-                ".post-body",
-                ".article-body",
-                "#content .entry-content"
-            ]
-            
-            best_content = None
-            best_score = 0
-            
-            for selector in hatenablog_specific_selectors:
-                try:
-                    elements = soup.select(selector)
-                    logger.info(f"Trying Hatenablog selector: {selector} - found {len(elements)} elements")
-                    for element in elements:
-                        text_content = element.get_text(separator=" ", strip=True)
-                        if len(text_content) > 200:  # Minimum length threshold
-                            # Score this content for VGC relevance
-                            content_score = self._calculate_content_score(text_content)
-                            logger.debug(f"Hatenablog element content score: {content_score} for {len(text_content)} chars")
-                            if content_score > best_score:
-                                best_score = content_score
-                                best_content = element
-                                logger.info(f"New best Hatenablog content found with score {best_score}")
-                except Exception as e:
-                    logger.debug(f"Hatenablog selector {selector} failed: {e}")
-                    continue
-            
-            if best_content and best_score > 20:  # FIXED: Reduced from 30 to 20 for better compatibility
-                # Extract and clean the content
-                text = best_content.get_text(separator=" ", strip=True)
-                
-                # Specialized Hatenablog text cleaning
-                text = self._clean_hatenablog_content_specialized(text)
-                
-                # Validate that we got meaningful VGC content
-                if self._validate_hatenablog_content(text):
-                    return text
-            
-            # STRATEGY 2: If direct extraction failed, try broader content search
-            # Look for any element with substantial Japanese VGC content
-            all_potential_elements = soup.find_all(['div', 'section', 'article', 'main'])
-            
-            for element in all_potential_elements:
-                try:
-                    text = element.get_text(separator=" ", strip=True)
-                    if len(text) > 250:  # FIXED: Reduced from 300 to 250 for better compatibility
-                        content_score = self._calculate_content_score(text)
-                        if content_score > 40:  # FIXED: Reduced from 60 to 40 for broader compatibility
-                            cleaned_text = self._clean_hatenablog_content_specialized(text)
-                            if self._validate_hatenablog_content(cleaned_text):
-                                logger.info(f"Hatenablog broad search successful with score {content_score}")
-                                return cleaned_text
-                except Exception:
-                    continue
-                    
-            return None
-            
-        except Exception as e:
-            logger.error(f"Hatenablog specialized extraction failed: {e}")
-            return None
-    
+        """Hatenablog extraction (see HATENABLOG_ADAPTER)"""
+        return self._extract_with_adapter(soup, HATENABLOG_ADAPTER)
+
     def _clean_hatenablog_content_specialized(self, text: str) -> str:
         """Ultra-specialized cleaning for Hatenablog Pokemon VGC content"""
-        if not text:
-            return text
-        
-        # Remove Hatenablog specific boilerplate and UI elements
-        hatenablog_removal_patterns = [
-            # Hatenablog-specific UI elements
-            r"はてなブログ.*?",
-            r"hatena.*?blog.*?",
-            r"ブログトップ.*?",
-            r"記事一覧.*?",
-            r"プロフィール.*?",
-            r"読者になる.*?",
-            r"購読する.*?",
-            r"スター.*?",
-            r"ブックマーク.*?",
-            r"コメント.*?を書く",
-            r"シェア.*?",
-            r"ツイート.*?",
-            r"はてブ.*?",
-            
-            # Date and metadata patterns
-            r"\d{4}-\d{2}-\d{2}.*?\d{2}:\d{2}.*?",
-            r"投稿日.*?",
-            r"更新日.*?",
-            r"カテゴリ.*?",
-            r"タグ.*?",
-            
-            # Navigation and sidebar elements
-            r"前の記事.*?",
-            r"次の記事.*?",
-            r"関連記事.*?",
-            r"おすすめ記事.*?",
-            r"人気記事.*?",
-            r"最新記事.*?",
-            r"アーカイブ.*?",
-            
-            # Common Hatenablog widgets and ads
-            r"サイドバー.*?",
-            r"フッター.*?",
-            r"ヘッダー.*?",
-            r"広告.*?",
-            r"スポンサー.*?",
-        ]
-        
-        lines = text.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Skip lines matching removal patterns
-            should_skip = False
-            for pattern in hatenablog_removal_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
-            
-            # Skip very short lines that are likely navigation/UI
-            if len(line) < 5:
-                should_skip = True
-            
-            # Skip lines that are just dates, numbers, or symbols
-            if re.match(r'^[\d\s\-\/\(\)\.:\→←]+$', line):
-                should_skip = True
-                
-            if not should_skip:
-                cleaned_lines.append(line)
-        
-        # Join and normalize whitespace
-        result = '\n'.join(cleaned_lines)
-        
-        # Final cleanup
-        import unicodedata
-        result = unicodedata.normalize('NFKC', result)
-        result = re.sub(r'\s+', ' ', result)
-        result = re.sub(r'\n\s*\n', '\n', result)
-        
-        return result.strip()
-    
+        return HATENABLOG_ADAPTER.clean(text)
+
     def _validate_hatenablog_content(self, text: str) -> bool:
         """Validate that extracted Hatenablog content exists and is not empty"""
-        # Simple validation: just check that we have actual content
-        # All the complex thresholds were unnecessary for large VGC articles
-        return bool(text and text.strip())
\ No newline at end of file
+        return HATENABLOG_ADAPTER.validate(text)
@@ -0,0 +1,320 @@
+"""
+Site adapters for platform-specific article extraction.
+
+Each supported blog platform (note.com, Hatenablog, ...) is described by a
+``SiteAdapter``: its host suffixes, precompiled content selectors, cleaning
+pipeline, validation hook and per-domain tuning (preferred scraping strategy,
+request timeout, content thresholds). ``ArticleScraper`` looks the adapter up
+by host in a ``SiteAdapterRegistry``; the lookup walks the labels of the host
+name (``a.b.hatenablog.com`` -> ``b.hatenablog.com`` -> ``hatenablog.com``)
+so its cost depends on the host, not on how many sites are registered.
+
+Adding a platform is a matter of registering another adapter:
+
+    register_adapter(SiteAdapter(
+        name="Ameblo",
+        host_suffixes=("ameblo.jp",),
+        selectors=("[data-uranus-component='entryBody']", ".skin-entryBody"),
+        removal_patterns=(r"いいね.*?", r"フォロー.*?"),
+    ))
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import soupsieve
+
+from .note_api import fetch_note_article
+
+
+@dataclass
+class SiteAdapter:
+    """Extraction settings and hooks for one blog platform"""
+
+    name: str
+    host_suffixes: Tuple[str, ...]
+
+    # STRATEGY 1: best-scoring element among the platform's content selectors
+    selectors: Sequence[str] = ()
+    min_element_chars: int = 100
+    min_best_score: int = 0
+
+    # STRATEGY 2: broad search over generic containers
+    broad_search_tags: Sequence[str] = ("div", "section", "article")
+    broad_min_chars: int = 200
+    broad_min_score: int = 50
+
+    # Cleaning pipeline (line-based boilerplate removal)
+    removal_patterns: Sequence[str] = ()
+    min_line_length: int = 3
+    symbol_line_pattern: str = r'^[\d\s\-\/\(\)\.]+$'
+
+    # Per-domain tuning
+    normalize_html: bool = False  # NFKC-normalize the raw HTML before parsing
+    preferred_strategy: Optional[str] = None  # e.g. "japanese_headers" -> _scrape_with_japanese_headers
+    timeout: Optional[int] = None  # Overrides each strategy's default request timeout
+
+    # Optional hooks replacing the default pipeline / validation
+    cleaner: Optional[Callable[[str], str]] = None
+    validator: Optional[Callable[[str], bool]] = None
+
+    # Optional structured-data fetcher tried before downloading the HTML page:
+    # (url, timeout) -> PageArtifact of the article body, or None to fall back
+    fast_path: Optional[Callable[[str, int], Optional[Any]]] = None
+
+    compiled_selectors: List[Tuple[str, object]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.host_suffixes = tuple(suffix.lower().lstrip(".") for suffix in self.host_suffixes)
+
+        # Precompile once instead of re-parsing selectors on every page
+        self.compiled_selectors = []
+        for selector in self.selectors:
+            try:
+                self.compiled_selectors.append((selector, soupsieve.compile(selector)))
+            except Exception:
+                # Unsupported selector syntax - skip it rather than fail every page
+                continue
+
+        self._removal_regex = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in self.removal_patterns), re.IGNORECASE)
+            if self.removal_patterns else None
+        )
+        self._symbol_line_regex = re.compile(self.symbol_line_pattern)
+
+    def select(self, soup) -> List[Tuple[str, list]]:
+        """Run every precompiled selector against the document"""
+        results = []
+        for selector, compiled in self.compiled_selectors:
+            results.append((selector, compiled.select(soup)))
+        return results
+
+    def clean(self, text: str) -> str:
+        """Remove platform boilerplate lines and normalize whitespace"""
+        if self.cleaner is not None:
+            return self.cleaner(text)
+        if not text:
+            return text
+
+        cleaned_lines = []
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+
+            # Skip lines matching removal patterns
+            if self._removal_regex is not None and self._removal_regex.search(line):
+                continue
+
+            # Skip very short lines that are likely navigation/UI
+            if len(line) < self.min_line_length:
+                continue
+
+            # Skip lines that are just numbers, dates or symbols
+            if self._symbol_line_regex.match(line):
+                continue
+
+            cleaned_lines.append(line)
+
+        # Join and normalize whitespace
+        result = '\n'.join(cleaned_lines)
+        result = unicodedata.normalize('NFKC', result)
+        result = re.sub(r'\s+', ' ', result)
+        result = re.sub(r'\n\s*\n', '\n', result)
+
+        return result.strip()
+
+    def validate(self, text: str) -> bool:
+        """Validate that extracted content exists and is not empty"""
+        if self.validator is not None:
+            return self.validator(text)
+        # Simple validation: just check that we have actual content
+        # All the complex thresholds were unnecessary for large VGC articles
+        return bool(text and text.strip())
+
+
+class SiteAdapterRegistry:
+    """Maps host suffixes to site adapters"""
+
+    def __init__(self, adapters: Sequence[SiteAdapter] = ()):
+        self._by_suffix: Dict[str, SiteAdapter] = {}
+        for adapter in adapters:
+            self.register(adapter)
+
+    def register(self, adapter: SiteAdapter) -> SiteAdapter:
+        """Register (or replace) an adapter for all of its host suffixes"""
+        for suffix in adapter.host_suffixes:
+            self._by_suffix[suffix] = adapter
+        return adapter
+
+    def for_host(self, host: Optional[str]) -> Optional[SiteAdapter]:
+        """Return the adapter for the longest registered suffix of a host"""
+        if not host:
+            return None
+        host = host.lower().rstrip(".")
+        while True:
+            adapter = self._by_suffix.get(host)
+            if adapter is not None:
+                return adapter
+            dot = host.find(".")
+            if dot == -1:
+                return None
+            host = host[dot + 1:]
+
+    def for_url(self, url: Optional[str]) -> Optional[SiteAdapter]:
+        """Return the adapter for a URL's host, if any"""
+        if not url:
+            return None
+        try:
+            return self.for_host(urlparse(url).hostname)
+        except ValueError:
+            return None
+
+    def adapters(self) -> List[SiteAdapter]:
+        """All registered adapters (each listed once)"""
+        return list({id(adapter): adapter for adapter in self._by_suffix.values()}.values())
+
+
+NOTE_COM_ADAPTER = SiteAdapter(
+    name="note.com",
+    host_suffixes=("note.com",),
+    selectors=(
+        # Most recent note.com article structure (high priority)
+        "div.note-common-styles__textnote-body",
+        "div[data-testid='article-body'] .note-common-styles",
+        ".o-noteContentText",
+
+        # Content within article containers
+        "article .note-common-styles__textnote-body",
+        "main .note-common-styles__textnote-body",
+
+        # Text modules (note.com uses modular content)
+        "div[data-module='TextModule'] .note-common-styles",
+        ".js-textBody .note-common-styles",
+
+        # Fallback patterns
+        ".note-common-styles:not([class*='header']):not([class*='nav'])",
+    ),
+    min_element_chars=100,
+    min_best_score=0,
+    broad_search_tags=("div", "section", "article"),
+    broad_min_chars=200,
+    broad_min_score=50,  # High threshold for VGC content
+    removal_patterns=(
+        r"note\.com.*?",
+        r"記事を読む.*?",
+        r"続きを読む.*?",
+        r"もっと見る.*?",
+        r"フォロー.*?する.*?",
+        r"いいね.*?",
+        r"コメント.*?",
+        r"シェア.*?",
+        r"購読.*?",
+        r"ログイン.*?",
+        r"会員登録.*?",
+        r"有料記事.*?",
+        r"プレミアム.*?",
+        r"\d+年\d+月\d+日.*?更新",
+        r"更新日時.*?",
+        r"投稿日.*?",
+        r"著者.*?",
+        r"タグ.*?",
+        r"カテゴリ.*?",
+    ),
+    min_line_length=3,
+    symbol_line_pattern=r'^[\d\s\-\/\(\)\.]+$',
+    # Article body + images straight from the note API (no SPA shell)
+    fast_path=fetch_note_article,
+)
+
+HATENABLOG_ADAPTER = SiteAdapter(
+    name="Hatenablog",
+    host_suffixes=("hatenablog.com", "hatenablog.jp", "hatenadiary.jp"),
+    selectors=(
+        # Primary Hatenablog article content selectors
+        ".entry-content",  # Main article content container
+        ".entry-body",     # Article body content
+        ".entry-inner",    # Inner content wrapper
+
+        # Alternative Hatenablog patterns
+        ".hatena-body",    # Hatena blog body
+        ".entry-content-container",  # Content container
+        "#main-content .entry-content",  # Main content area
+
+        # More specific Hatenablog selectors
+        "article .entry-content",
+        "main .entry-content",
+        ".hentry .entry-content",  # hentry is common in Hatenablog
+        ".post-content",
+        ".blog-entry-content",
+
+        # Fallback selectors for various Hatenablog themes
+        ".entry",
+        ".post-body",
+        ".article-body",
+        "#content .entry-content",
+    ),
+    min_element_chars=200,
+    min_best_score=20,  # FIXED: Reduced from 30 to 20 for better compatibility
+    broad_search_tags=("div", "section", "article", "main"),
+    broad_min_chars=250,  # FIXED: Reduced from 300 to 250 for better compatibility
+    broad_min_score=40,  # FIXED: Reduced from 60 to 40 for broader compatibility
+    removal_patterns=(
+        # Hatenablog-specific UI elements
+        r"はてなブログ.*?",
+        r"hatena.*?blog.*?",
+        r"ブログトップ.*?",
+        r"記事一覧.*?",
+        r"プロフィール.*?",
+        r"読者になる.*?",
+        r"購読する.*?",
+        r"スター.*?",
+        r"ブックマーク.*?",
+        r"コメント.*?を書く",
+        r"シェア.*?",
+        r"ツイート.*?",
+        r"はてブ.*?",
+
+        # Date and metadata patterns
+        r"\d{4}-\d{2}-\d{2}.*?\d{2}:\d{2}.*?",
+        r"投稿日.*?",
+        r"更新日.*?",
+        r"カテゴリ.*?",
+        r"タグ.*?",
+
+        # Navigation and sidebar elements
+        r"前の記事.*?",
+        r"次の記事.*?",
+        r"関連記事.*?",
+        r"おすすめ記事.*?",
+        r"人気記事.*?",
+        r"最新記事.*?",
+        r"アーカイブ.*?",
+
+        # Common Hatenablog widgets and ads
+        r"サイドバー.*?",
+        r"フッター.*?",
+        r"ヘッダー.*?",
+        r"広告.*?",
+        r"スポンサー.*?",
+    ),
+    min_line_length=5,
+    symbol_line_pattern=r'^[\d\s\-\/\(\)\.:\→←]+$',
+    # Ensure proper Unicode normalization for Japanese content
+    normalize_html=True,
+)
+
+DEFAULT_REGISTRY = SiteAdapterRegistry([NOTE_COM_ADAPTER, HATENABLOG_ADAPTER])
+
+
+def register_adapter(adapter: SiteAdapter) -> SiteAdapter:
+    """Register an adapter with the default registry used by ArticleScraper"""
+    return DEFAULT_REGISTRY.register(adapter)
+
+
+def get_adapter_for_url(url: Optional[str]) -> Optional[SiteAdapter]:
+    """Look up the default registry's adapter for a URL"""
+    return DEFAULT_REGISTRY.for_url(url)
@@ -20,6 +20,12 @@ class Config:
     # Cache Settings
     CACHE_ENABLED = True
     CACHE_TTL_HOURS = 24
+    VISION_CACHE_TTL_HOURS = 24 * 30  # Team card analyses stay valid much longer than articles
+    VISION_CACHE_MAX_ENTRIES = 5000
+
+    # Local team-card classifier: images below this probability never reach the vision model.
+    # 0 disables the gate; see image_classifier.DEFAULT_TEAM_CARD_THRESHOLD before raising it
+    VISION_CLASSIFIER_THRESHOLD = 0.0
 
     # Logging Settings
     LOG_LEVEL = "INFO"
@@ -116,13 +122,13 @@ POKEMON_NAME_TRANSLATIONS = {
     "KaiPao": "Chien-Pao",
     "Chien Pao": "Chien-Pao",
     "Chienpao": "Chien-Pao",
-    "チオンジェン": "Chi-Yu",
+    "イーユイ": "Chi-Yu",
     "Chi Yu": "Chi-Yu",
     "ChiYu": "Chi-Yu",
     "ディンルー": "Ting-Lu",
     "Ting Lu": "Ting-Lu",
     "TingLu": "Ting-Lu",
-    "イーユイ": "Wo-Chien",
+    "チオンジェン": "Wo-Chien",
     "Wo Chien": "Wo-Chien",
     "WoChien": "Wo-Chien",
     
@@ -300,7 +306,7 @@ POKEMON_NAME_TRANSLATIONS = {
     "Sandy-Shocks": "Sandy Shocks",
     "アラブルタケ": "Brute Bonnet",
     "Brute-Bonnet": "Brute Bonnet",
-    "サケブシッポ": "Roaring Moon",
+    "サケブシッポ": "Scream Tail",
     "Roaring-Moon": "Roaring Moon",
     "トドロクツキ": "Roaring Moon",
     
@@ -312,8 +318,10 @@ POKEMON_NAME_TRANSLATIONS = {
     "テツノカイナ": "Iron Hands",
     "テツノワダチ": "Iron Treads",
     "テツノイバラ": "Iron Thorns",
-    "テツノコウベ": "Iron Crown",
-    "テツノイサハ": "Iron Boulder",
+    "テツノコウベ": "Iron Jugulis",
+    "テツノイサハ": "Iron Leaves",
+    "テツノカシラ": "Iron Crown",
+    "テツノイワオ": "Iron Boulder",
     
     # Romanization variants for Gouging Fire
     "Ugatsuhomura": "Gouging Fire",
@@ -321,11 +329,12 @@ POKEMON_NAME_TRANSLATIONS = {
     "ugatsu homura": "Gouging Fire",
     
     # Popular Gen 9 Pokemon
-    "ドオー": "Dondozo",
+    "ヘイラッシャ": "Dondozo",
+    "ドオー": "Clodsire",
     "シャリタツ": "Tatsugiri",
     "カラミンゴ": "Flamigo",
     "オリーヴァ": "Arboliva", 
-    "マフィティフ": "Maschiff",
+    "マフィティフ": "Mabosstiff",
     "マスカーニャ": "Meowscarada",
     "ラウドボーン": "Skeledirge",
     "ウェーニバル": "Quaquaval",
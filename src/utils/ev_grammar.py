@@ -0,0 +1,254 @@
+"""
+Single-pass tokenizer and grammar for EV spread strings.
+
+EV spreads reach the app in several notations:
+
+- calculated stats (note.com / liberty-note): ``H181(148)-A×↓-B131(124)-C184↑(116)``
+  where the number in parentheses is the EV and ``↑↓×`` mark the nature
+- stat labels (team cards, Japanese grids): ``H252 A0 B4 C252 D0 S0``,
+  ``ＨＰ: 252 こうげき: 0``, ``HP: 252 / Atk: 0 / ...``
+- value before stat name (Showdown style): ``252 HP / 4 Def / 252 SpA``
+- bare slash separated: ``252/0/4/252/0/0``
+- combined letter prefixes (Japanese shorthand): ``CS252 H4`` is C252 S252 H4
+
+Instead of trying one regex family per notation, ``scan_ev_string`` runs one
+precompiled pattern over the string once and sorts every token into the
+notation it belongs to; ``classify_ev_scan`` then picks the notation with the
+same priorities the old parser cascade used. Validation of the resulting
+spread stays in ``utils.validate_and_fix_evs``.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+STAT_KEYS = ("HP", "Atk", "Def", "SpA", "SpD", "Spe")
+STAT_LETTERS = {"H": "HP", "A": "Atk", "B": "Def", "C": "SpA", "D": "SpD", "S": "Spe"}
+
+# Spellings of each stat. Spaces and dots inside a spelling are optional
+# ("Sp.A", "Sp A", "SpA"); matching is case-insensitive.
+STAT_WORDS = {
+    "HP": ["ＨＰ", "HP", "ヒットポイント", "体力"],
+    "Atk": ["こうげき", "攻撃", "アタック", "物理攻撃", "Attack", "Atk"],
+    "Def": ["ぼうぎょ", "防御", "ディフェンス", "物理防御", "Defense", "Def"],
+    "SpA": ["とくこう", "特攻", "特殊攻撃", "とくしゅこうげき", "Sp.A", "Sp.Atk", "Special Attack"],
+    "SpD": ["とくぼう", "特防", "特殊防御", "とくしゅぼうぎょ", "Sp.D", "Sp.Def", "Special Defense"],
+    "Spe": ["すばやさ", "素早さ", "素早", "スピード", "速さ", "Speed", "Spe"],
+}
+
+# Notations classify_ev_scan can report, in the order they are tried
+EV_FORMATS = ("calculated_stat", "japanese_grid", "stat_names", "slash", "stat_labels")
+
+MAX_EV = 252
+_NATURE_SYMBOLS = "↑↓×"
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[\s.]", "", word).lower()
+
+
+def _word_pattern(word: str) -> str:
+    return "".join(r"\.?\s*" if char in " ." else re.escape(char) for char in word)
+
+
+_WORD_LOOKUP = {_normalize_word(word): stat for stat, words in STAT_WORDS.items() for word in words}
+
+# Longest spelling first, so "特殊攻撃" wins over "攻撃" and "Speed" over "Spe"
+_WORDS = "|".join(
+    _word_pattern(word)
+    for word in sorted((word for words in STAT_WORDS.values() for word in words), key=len, reverse=True)
+)
+_LETTER = r"(?<![A-Za-z])[HABCDS](?![A-Za-z])"
+# Two upper-case stat letters sharing one value (CS252, HB252); the letters
+# must be in HABCDS order, which scan_ev_string checks
+_LETTER_GROUP = r"(?<![A-Za-z])(?-i:[HABCDS]{2})(?![A-Za-z])"
+# Characters a token can start with; lets the scanner skip prose quickly
+_TOKEN_START = "".join(sorted(
+    {word[0].lower() for words in STAT_WORDS.values() for word in words}
+    | {word[0].upper() for words in STAT_WORDS.values() for word in words}
+    | set(STAT_LETTERS) | set("habcds/")
+))
+
+# One pattern, one pass. At a given position calculated-stat tokens are tried
+# before plain letter labels, and "value name" pairs before bare numbers. Each
+# branch is one outer named group, so ``match.lastgroup`` names the token kind.
+EV_TOKEN_PATTERN = re.compile(
+    rf"""
+    (?=[\d{re.escape(_TOKEN_START)}])
+    (?:
+      (?P<calc>(?P<calc_letter>{_LETTER})(?P<calc_stat>\d{{1,3}})?(?P<calc_pre>[{_NATURE_SYMBOLS}]*)
+          [(（](?P<calc_ev>\d{{1,3}})?[)）](?P<calc_post>[{_NATURE_SYMBOLS}]*))
+    | (?P<named>(?P<named_value>\d+)[ \t]*(?P<named_word>{_WORDS}))
+    | (?P<word>(?P<word_name>{_WORDS})[:：\s]*(?P<word_value>\d+)?(?P<word_nature>[{_NATURE_SYMBOLS}]*))
+    | (?P<combined>(?P<combined_names>{_LETTER_GROUP})[:：]?(?P<combined_value>\d+))
+    | (?P<letter>(?P<letter_name>{_LETTER})[:：\s]*(?P<letter_value>\d+)?(?P<letter_nature>[{_NATURE_SYMBOLS}]*))
+    | (?P<number>\d+)
+    | (?P<slash>/)
+    )
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+
+@dataclass
+class EVScan:
+    """Everything one pass over an EV string found, grouped by notation"""
+
+    # EVs in parentheses after a stat letter (H181(148)); first per stat
+    calculated: Dict[str, int] = field(default_factory=dict)
+    has_parentheses: bool = False
+    # Stat label (word or letter) followed by an EV (HP: 252, H252); first valid per stat
+    labelled: Dict[str, int] = field(default_factory=dict)
+    # Only the letter labels (H252 A0 ..., CS252); first valid per stat
+    letters: Dict[str, int] = field(default_factory=dict)
+    # First number after each letter, whatever its size: the calculated stat
+    # of H181(148) / H207 B101 lines, or a last-resort EV reading
+    letters_any: Dict[str, int] = field(default_factory=dict)
+    # Value followed by a stat name (252 HP); first valid per stat
+    named: Dict[str, int] = field(default_factory=dict)
+    # Digits of each "/"-separated part; only collected when there are exactly six parts
+    slash_parts: List[str] = field(default_factory=lambda: [""])
+    nature_boosts: List[str] = field(default_factory=list)
+    nature_reductions: List[str] = field(default_factory=list)
+    # Stats marked × (no investment)
+    uninvested: List[str] = field(default_factory=list)
+
+
+def _word_stat(word: str) -> str:
+    stat = _WORD_LOOKUP.get(word.lower())
+    return stat if stat is not None else _WORD_LOOKUP[_normalize_word(word)]
+
+
+def _note_nature(scan: EVScan, stat: str, symbols: str):
+    if not symbols:
+        return
+    if "×" in symbols:
+        scan.uninvested.append(stat)
+    if "↑" in symbols:
+        scan.nature_boosts.append(stat)
+    elif "↓" in symbols:
+        scan.nature_reductions.append(stat)
+
+
+def _note_letter_value(scan: EVScan, stat: str, value: int):
+    scan.letters_any.setdefault(stat, value)
+    if value <= MAX_EV:
+        scan.labelled.setdefault(stat, value)
+        scan.letters.setdefault(stat, value)
+
+
+def _is_letter_group(letters: str) -> bool:
+    """True for stat letters in HABCDS order without repeats (CS, HB), not SA or HH"""
+    order = [list(STAT_LETTERS).index(letter) for letter in letters.upper()]
+    return all(a < b for a, b in zip(order, order[1:]))
+
+
+def scan_ev_string(text: str) -> EVScan:
+    """
+    Tokenize an EV string in one pass
+
+    Args:
+        text: EV spread in any supported notation
+
+    Returns:
+        EVScan with the values each notation reads from the string
+    """
+    scan = EVScan()
+    # Slash-separated parts only matter for the six-value notation
+    track_parts = text.count("/") == 5
+    for match in EV_TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "number":
+            if track_parts:
+                scan.slash_parts[-1] += match.group()
+        elif kind == "slash":
+            scan.slash_parts.append("")
+        elif kind == "letter":
+            stat = STAT_LETTERS[match.group("letter_name").upper()]
+            value = match.group("letter_value")
+            if value is not None:
+                if track_parts:
+                    scan.slash_parts[-1] += value
+                _note_letter_value(scan, stat, int(value))
+            _note_nature(scan, stat, match.group("letter_nature"))
+        elif kind == "combined":
+            value = match.group("combined_value")
+            if track_parts:
+                scan.slash_parts[-1] += value
+            letters = match.group("combined_names")
+            if _is_letter_group(letters):
+                for letter in letters:
+                    _note_letter_value(scan, STAT_LETTERS[letter], int(value))
+        elif kind == "word":
+            stat = _word_stat(match.group("word_name"))
+            value = match.group("word_value")
+            if value is not None:
+                if track_parts:
+                    scan.slash_parts[-1] += value
+                if int(value) <= MAX_EV:
+                    scan.labelled.setdefault(stat, int(value))
+            _note_nature(scan, stat, match.group("word_nature"))
+        elif kind == "named":
+            stat = _word_stat(match.group("named_word"))
+            value = match.group("named_value")
+            if track_parts:
+                scan.slash_parts[-1] += value
+            if int(value) <= MAX_EV:
+                scan.named.setdefault(stat, int(value))
+        else:
+            stat = STAT_LETTERS[match.group("calc_letter").upper()]
+            scan.has_parentheses = True
+            stat_value, ev = match.group("calc_stat"), match.group("calc_ev")
+            if track_parts:
+                scan.slash_parts[-1] += (stat_value or "") + (ev or "")
+            if stat_value:
+                scan.letters_any.setdefault(stat, int(stat_value))
+            if ev is not None and int(ev) <= MAX_EV:
+                scan.calculated.setdefault(stat, int(ev))
+            _note_nature(scan, stat, match.group("calc_pre") + match.group("calc_post"))
+    return scan
+
+
+def _spread(values: Dict[str, int]) -> Dict[str, int]:
+    return {stat: values.get(stat, 0) for stat in STAT_KEYS}
+
+
+def is_calculated_stat_match(values: Dict[str, int]) -> bool:
+    """Acceptance rule of the calculated-stat notation: 4+ stats, or 3 with a 400+ EV investment"""
+    return len(values) >= 4 or (len(values) >= 3 and sum(values.values()) >= 400)
+
+
+def classify_ev_scan(scan: EVScan) -> Tuple[Optional[str], Dict[str, int], int]:
+    """
+    Pick the notation of a scanned EV string
+
+    Priorities follow the original parser cascade: calculated stats with
+    parentheses, labelled grids (4+ stats), letter-only calculated stats,
+    "value name" pairs, six slash-separated values, and finally whatever
+    stat labels were seen.
+
+    Returns:
+        (format name from EV_FORMATS or None, raw EVs for all six stats, stats found)
+    """
+    if scan.has_parentheses and is_calculated_stat_match(scan.calculated):
+        return "calculated_stat", _spread(scan.calculated), len(scan.calculated)
+
+    if len(scan.labelled) >= 4:
+        return "japanese_grid", _spread(scan.labelled), len(scan.labelled)
+
+    if is_calculated_stat_match(scan.letters):
+        return "calculated_stat", _spread(scan.letters), len(scan.letters)
+
+    if any(value > 0 for value in scan.named.values()):
+        return "stat_names", _spread(scan.named), len(scan.named)
+
+    if len(scan.slash_parts) == 6:
+        values = {stat: int(digits) for stat, digits in zip(STAT_KEYS, scan.slash_parts) if digits}
+        return "slash", _spread(values), len(values)
+
+    # Fewer than four labels (H252 S252, HP 252 Atk 252); letters keep oversized values for validation
+    labels = {**scan.labelled, **scan.letters_any}
+    if labels:
+        return "stat_labels", _spread(labels), len(labels)
+
+    return None, _spread({}), 0
@@ -0,0 +1,334 @@
+"""
+Single-pass EV spread scanner for vision-model output.
+
+The vision text of a team card (or of a whole batch of tiled / batched
+images) lists several Pokemon, each with its EV spread in whatever notation
+the card used. ``scan_ev_spreads`` walks that text once with one compiled
+pattern: the EV tokens of ``ev_grammar`` plus Pokemon headers
+(``POKEMON #1: Flutter Mane``, ``1. 白バドレックス @ ...``, ``【ガオガエン】``).
+
+Consecutive stat tokens are grouped into runs; a run ends at a header, a
+blank line, a long gap, a repeated stat or a switch between labelled and
+bare-number notation. Every run that forms a valid spread becomes an
+``EVSpreadRecord`` with its source offsets and the Pokemon whose header
+precedes it, so callers can pair spreads with team members directly.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import POKEMON_NAME_TRANSLATIONS
+from .ev_grammar import EV_TOKEN_PATTERN, MAX_EV, STAT_KEYS, STAT_LETTERS, STAT_WORDS, scan_ev_string
+from .stat_engine import evs_from_stat_scan, get_stat_engine
+
+MAX_TOTAL = 508
+# Longest stretch of other text allowed between two tokens of one spread
+MAX_TOKEN_GAP = 30
+# Minimum stats in a run: calculated-stat lines and labelled lines
+MIN_CALCULATED_STATS = 4
+MIN_LABELLED_STATS = 4
+# ...or after an EV keyword ("努力値：B4 C252 S252")
+MIN_KEYWORD_STATS = 3
+
+CONFIDENCE_RANK = {"high": 3, "medium": 2, "low": 1}
+
+_SLASH_SEPARATORS = set("/-／－ー・")
+_EV_KEYWORD = re.compile(
+    r"(?:努力値|個体値調整|EV配分|振り分け|ステ振り|EV\s*Spread|EVs?)\s*[:：]?\s*$", re.IGNORECASE
+)
+# A header name ends at the first number or at a stat token after a space
+_NAME_END = re.compile(r"\s+\S*\d|[\d:：/]")
+_WORD_STATS = {re.sub(r"[\s.]", "", word).lower(): stat for stat, words in STAT_WORDS.items() for word in words}
+
+# Pokemon headers, tried before the EV tokens at every position. Numbered
+# headers only consume their number, so the rest of the line is still scanned
+# ("Pokemon 1: H252/A0/B4/C252/D0/S0").
+_HEADER_PATTERN = r"""
+    (?P<header>
+      ^[ \t>*\-]*POK[EÉ]MON[ \t]*\#?[ \t]*\d{1,2}[ \t]*[:：.][ \t]*(?=(?P<header_name>[^\n@＠(（\[|]*))
+    | ^[ \t>*\-]*\d{1,2}[.)．][ \t]*(?=(?P<list_name>[^\n@＠(（\[|:：]+))
+    | 【(?P<bracket_name>[^】\n]{1,30})】
+    )
+"""
+
+SPREAD_SCAN_PATTERN = re.compile(
+    f"{_HEADER_PATTERN}|{EV_TOKEN_PATTERN.pattern}",
+    re.VERBOSE | re.IGNORECASE | re.MULTILINE,
+)
+
+
+@dataclass
+class EVSpreadRecord:
+    """One EV spread found in vision text"""
+
+    values: Tuple[int, ...]  # HP, Atk, Def, SpA, SpD, Spe
+    format_type: str  # calculated_stat_format, slash_format, space_format, japanese_format
+    confidence: str  # high / medium / low
+    start: int  # Offsets of the spread in the scanned text
+    end: int
+    raw_match: str
+    pokemon: Optional[str] = None  # Name from the nearest preceding Pokemon header
+
+    @property
+    def total(self) -> int:
+        return sum(self.values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Spread dict as stored in the vision cache and consumed by the analyzer merge"""
+        non_zero = sum(1 for value in self.values if value > 0)
+        return {
+            "hp": self.values[0],
+            "attack": self.values[1],
+            "defense": self.values[2],
+            "special_attack": self.values[3],
+            "special_defense": self.values[4],
+            "speed": self.values[5],
+            "total": self.total,
+            "format": "/".join(map(str, self.values)),
+            "confidence": self.confidence,
+            "format_type": self.format_type,
+            "raw_match": self.raw_match[:100],  # Store first 100 chars of original match
+            "is_valid": True,
+            "validation_notes": f"Total: {self.total}, Non-zero stats: {non_zero}, Format: {self.format_type}",
+            "pokemon": self.pokemon,
+            "start": self.start,
+            "end": self.end,
+        }
+
+
+def spread_confidence(ev_values: List[int], format_type: str) -> Optional[str]:
+    """
+    Validate a spread read from vision text and rate it
+
+    Rejects anything that cannot be EVs (over 508 in total, a stat over 252,
+    values that are not multiples of 4, all zeros) and spreads showing
+    several signs of being generated rather than read.
+
+    Returns:
+        "high", "medium" or "low", or None if the spread is rejected
+    """
+    total = sum(ev_values)
+    if total > MAX_TOTAL or total == 0:
+        return None
+    if any(ev % 4 != 0 or ev > MAX_EV for ev in ev_values):
+        return None
+
+    # BALANCED ANTI-GENERATION: only reject when several suspicious indicators agree
+    non_zero_values = [ev for ev in ev_values if ev > 0]
+    suspicious_indicators = 0
+    if total == MAX_TOTAL and all(ev in (0, 4, 252) for ev in ev_values):
+        suspicious_indicators += 1
+    if len(non_zero_values) >= 3 and all(ev == non_zero_values[0] for ev in non_zero_values):
+        suspicious_indicators += 1
+    if ev_values.count(252) >= 3:
+        suspicious_indicators += 1
+    if suspicious_indicators >= 2:
+        return None
+
+    confidence = "low"
+    if total >= 500 and format_type in ("slash_format", "japanese_format"):
+        confidence = "high"
+    elif total >= 400 and format_type in ("japanese_format", "calculated_stat_format", "slash_format"):
+        confidence = "medium"
+    elif total >= 300 and format_type == "slash_format":
+        confidence = "medium"
+
+    # Common competitive totals with a reasonable distribution
+    if total in (500, 504, 508) and ev_values.count(252) <= 2:
+        confidence = {"medium": "high", "low": "medium"}.get(confidence, confidence)
+    return confidence
+
+
+def _header_pokemon(match: "re.Match") -> Optional[str]:
+    """English name of a header's Pokemon, or None if a list / bracket item is not a Pokemon"""
+    kind = next(group for group in ("header_name", "list_name", "bracket_name") if match.group(group) is not None)
+    # The name ends where the line's stats begin
+    name = _NAME_END.split(match.group(kind), 1)[0].strip(" \t*_-")
+    if len(name) < 2:
+        return None
+    name = POKEMON_NAME_TRANSLATIONS.get(name, name)
+    # Explicit "POKEMON #n:" headers are trusted; list items and brackets must name a known Pokemon
+    if kind != "header_name" and get_stat_engine().species_index(name) is None:
+        return None
+    return name
+
+
+class _Run:
+    """Stat tokens of one spread being collected"""
+
+    __slots__ = ("kind", "values", "numbers", "letter_stats", "start", "end", "labelled_kinds", "calculated",
+                 "separators_only")
+
+    def __init__(self, kind: str, start: int):
+        self.kind = kind  # "labelled" or "numbers"
+        self.values: Dict[str, int] = {}
+        self.numbers: List[int] = []
+        self.letter_stats = set()  # Stats given by a bare letter token (B100, C×)
+        self.start = start
+        self.end = start
+        self.labelled_kinds = set()
+        self.calculated = False
+        self.separators_only = True  # Only "/" or "-" between the tokens so far
+
+
+def _exact_stat_line_evs(run: _Run, text: str, pokemon: Optional[str]) -> Optional[Dict[str, int]]:
+    """Exact EVs of a letter-labelled stat line (H202(252)-A136-..., 実数値 H202 A136 ...) of a known Pokemon"""
+    if not pokemon or not run.labelled_kinds <= {"letter", "calc"}:
+        return None
+    return evs_from_stat_scan(scan_ev_string(text[run.start:run.end]), pokemon)
+
+
+def _close_run(run: Optional[_Run], text: str, pokemon: Optional[str]) -> Optional[EVSpreadRecord]:
+    if run is None:
+        return None
+    if run.kind == "numbers":
+        if len(run.numbers) != len(STAT_KEYS):
+            return None
+        run.values = dict(zip(STAT_KEYS, run.numbers))
+        format_type = "slash_format"
+    else:
+        found = len(run.values)
+        keyword = _EV_KEYWORD.search(text, max(0, run.start - 16), run.start) is not None
+        exact = _exact_stat_line_evs(run, text, pokemon)
+        if exact is not None:
+            run.values = exact
+            format_type = "calculated_stat_format"
+        elif run.calculated:
+            if found < MIN_CALCULATED_STATS:
+                return None
+            # Next to H181(148) tokens a bare B131 is a stat without investment
+            for stat in run.letter_stats:
+                run.values[stat] = 0
+            format_type = "calculated_stat_format"
+        elif found < (MIN_KEYWORD_STATS if keyword else MIN_LABELLED_STATS):
+            return None
+        elif "word" in run.labelled_kinds:
+            format_type = "japanese_format"
+        elif run.separators_only and found == len(STAT_KEYS):
+            format_type = "slash_format"  # H252/A0/B4/C252/D0/S0
+        else:
+            format_type = "space_format"
+
+    values = [run.values.get(stat, 0) for stat in STAT_KEYS]
+    confidence = spread_confidence(values, format_type)
+    if confidence is None:
+        return None
+    return EVSpreadRecord(tuple(values), format_type, confidence, run.start, run.end,
+                          text[run.start:run.end], pokemon)
+
+
+def _token_stat_value(match: "re.Match", kind: str) -> Tuple[Optional[str], Optional[int], bool]:
+    """(stat, EV, is calculated-stat token) of an EV token; EV is None for bare labels"""
+    if kind == "calc":
+        ev = match.group("calc_ev")
+        return STAT_LETTERS[match.group("calc_letter").upper()], int(ev) if ev else 0, True
+    if kind == "letter":
+        value = match.group("letter_value")
+        uninvested = "×" in match.group("letter_nature")
+        stat = STAT_LETTERS[match.group("letter_name").upper()]
+        if value is None:
+            return stat, 0 if uninvested else None, False
+        return stat, int(value), False
+    if kind == "word":
+        value = match.group("word_value")
+        stat = _WORD_STATS.get(re.sub(r"[\s.]", "", match.group("word_name")).lower())
+        return stat, int(value) if value is not None else None, False
+    if kind == "named":
+        stat = _WORD_STATS.get(re.sub(r"[\s.]", "", match.group("named_word")).lower())
+        return stat, int(match.group("named_value")), False
+    return None, None, False
+
+
+def scan_ev_spreads(text: str) -> Iterator[EVSpreadRecord]:
+    """
+    Scan vision text once and yield every valid EV spread in source order
+
+    Args:
+        text: Raw vision-model output (one image, or several joined)
+
+    Yields:
+        EVSpreadRecord for each run of stat tokens that forms a valid spread
+    """
+    pokemon: Optional[str] = None
+    run: Optional[_Run] = None
+
+    for match in SPREAD_SCAN_PATTERN.finditer(text or ""):
+        kind = match.lastgroup
+        if kind in ("header", "header_name", "list_name", "bracket_name"):
+            record = _close_run(run, text, pokemon)
+            if record:
+                yield record
+            run = None
+            named = _header_pokemon(match)
+            if named or match.group("header_name") is not None:
+                pokemon = named
+            continue
+        if kind == "slash":
+            continue
+
+        if kind == "number":
+            digits = match.group()
+            token_kind, stat, value, calculated = "numbers", None, int(digits) if len(digits) <= 3 else None, False
+        else:
+            token_kind = "labelled"
+            stat, value, calculated = _token_stat_value(match, kind)
+            if value is None and not calculated:
+                continue  # A label without a value ("S:最速") is prose
+            if stat is None:
+                continue
+
+        if run is not None:
+            gap = text[run.end:match.start()]
+            new_run = (
+                token_kind != run.kind
+                or len(gap) > MAX_TOKEN_GAP
+                or "\n\n" in gap
+                or (stat is not None and stat in run.values)
+                or (token_kind == "numbers" and (value is None or gap.strip() not in _SLASH_SEPARATORS))
+            )
+            if new_run:
+                record = _close_run(run, text, pokemon)
+                if record:
+                    yield record
+                run = None
+            elif gap.strip() not in _SLASH_SEPARATORS:
+                run.separators_only = False
+
+        if token_kind == "numbers" and value is None:
+            continue  # Digit runs longer than three digits are not EVs
+        if run is None:
+            run = _Run(token_kind, match.start())
+        if token_kind == "numbers":
+            run.numbers.append(value)
+        else:
+            run.values[stat] = value
+            run.labelled_kinds.add(kind)
+            if kind == "letter":
+                run.letter_stats.add(stat)
+            run.calculated |= calculated
+        run.end = match.end()
+
+    record = _close_run(run, text, pokemon)
+    if record:
+        yield record
+
+
+def deduplicate_ev_spreads(records: Iterable[EVSpreadRecord]) -> List[EVSpreadRecord]:
+    """
+    Drop repeated spreads of the same Pokemon, keeping the most confident reading
+
+    Vision output often states a spread twice ("H252 A0 B4 ... → Validated:
+    252/0/4/..."). Identical spreads of different Pokemon are kept apart.
+    Records keep the position of their first occurrence.
+    """
+    unique: Dict[Tuple[Tuple[int, ...], Optional[str]], EVSpreadRecord] = {}
+    for record in records:
+        key = (record.values, record.pokemon)
+        existing = unique.get(key)
+        if existing is None:
+            unique[key] = record
+        elif CONFIDENCE_RANK[record.confidence] > CONFIDENCE_RANK[existing.confidence]:
+            unique[key] = EVSpreadRecord(record.values, record.format_type, record.confidence,
+                                         existing.start, existing.end, existing.raw_match, record.pokemon)
+    return list(unique.values())
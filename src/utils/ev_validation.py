@@ -0,0 +1,134 @@
+"""
+Vectorised EV spread validation for whole libraries of spreads.
+
+``utils.validate_and_fix_evs`` and ``utils.analyze_competitive_ev_pattern``
+check one dict at a time. Re-validating every stored spread after a rules
+change means tens of thousands of calls, so this module applies the same
+phases to an (N, 6) array in a handful of NumPy operations:
+
+1. clamp negative values to 0 and values above 252 to 252
+2. scale totals above 508 down proportionally (``max(4, int(ev * factor))``)
+3. round values that are not multiples of 4 to the nearest multiple
+4. score the competitive pattern of the result
+
+Results are identical to the scalar functions, row by row; statuses come
+back as codes into ``EV_STATUSES`` ("valid_high", "adjusted_low", ...).
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .ev_grammar import STAT_KEYS
+
+MAX_EV = 252
+MAX_TOTAL = 508
+LIKELY_STATS_TOTAL = 600
+LOW_TOTAL = 100
+COMMON_TOTALS = (508, 504, 500, 496, 492)
+
+# Status code = kind index * len(CONFIDENCE_LEVELS) + confidence level index
+STATUS_KINDS = ("valid", "minor_fixes", "questionable", "adjusted")
+CONFIDENCE_LEVELS = ("high", "medium", "low")
+EV_STATUSES = tuple(f"{kind}_{level}" for kind in STATUS_KINDS for level in CONFIDENCE_LEVELS)
+VALID, MINOR_FIXES, QUESTIONABLE, ADJUSTED = range(len(STATUS_KINDS))
+
+
+def _as_spread_array(evs) -> np.ndarray:
+    array = np.asarray(evs, dtype=np.int64)
+    if array.ndim != 2 or array.shape[1] != len(STAT_KEYS):
+        raise ValueError(f"Expected an (N, {len(STAT_KEYS)}) array of EVs, got shape {array.shape}")
+    return array
+
+
+def analyze_competitive_ev_pattern_batch(evs, totals=None) -> Dict[str, np.ndarray]:
+    """
+    Batch version of utils.analyze_competitive_ev_pattern
+
+    Args:
+        evs: (N, 6) EV array
+        totals: (N,) EV totals; row sums when omitted
+
+    Returns:
+        Dict of (N,) boolean arrays: is_common_pattern, has_max_investments,
+        reasonable_distribution
+    """
+    evs = _as_spread_array(evs)
+    totals = evs.sum(axis=1) if totals is None else np.asarray(totals)
+    non_zero = (evs > 0).sum(axis=1)
+    max_investments = (evs >= MAX_EV).sum(axis=1)
+
+    common = (np.isin(totals, COMMON_TOTALS) & (non_zero >= 2)) | ((max_investments == 2) & (totals >= 500))
+    reasonable = ((non_zero >= 2) & (non_zero <= 4)) | ((max_investments == 1) & (totals >= 200) & (totals <= 400))
+    return {
+        "is_common_pattern": common,
+        "has_max_investments": max_investments >= 1,
+        "reasonable_distribution": reasonable,
+    }
+
+
+def validate_ev_batch(evs) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batch version of utils.validate_and_fix_evs
+
+    Args:
+        evs: (N, 6) array of raw EVs in HP/Atk/Def/SpA/SpD/Spe order
+
+    Returns:
+        Tuple of (fixed (N, 6) EVs, (N,) status codes into EV_STATUSES,
+        (N,) confidence scores)
+
+    Raises:
+        ValueError: If the input is not an (N, 6) array
+    """
+    raw = _as_spread_array(evs)
+    original_total = raw.sum(axis=1)
+
+    # PHASE 1: Clamp
+    negative = raw < 0
+    capped = raw > MAX_EV
+    fixed = np.clip(raw, 0, MAX_EV)
+    score = 100 - 15 * negative.sum(axis=1) - 10 * capped.sum(axis=1)
+
+    # PHASE 2: Totals (scaling uses the pre-clamp total, the low-total check the clamped one)
+    scaled = original_total > MAX_TOTAL
+    likely_stats = original_total > LIKELY_STATS_TOTAL
+    low_total = ~scaled & (fixed.sum(axis=1) < LOW_TOTAL)
+    factor = np.divide(MAX_TOTAL, original_total, out=np.ones(len(raw)), where=scaled)
+    scaled_values = np.maximum(4, np.floor(fixed * factor[:, None]).astype(np.int64))
+    fixed = np.where(scaled[:, None] & (fixed > 0), scaled_values, fixed)
+    score -= 50 * likely_stats + 20 * scaled + 25 * low_total
+
+    # PHASE 3: Round to multiples of 4
+    remainder = fixed % 4
+    rounded = (fixed > 0) & (remainder != 0)
+    fixed = np.where(rounded, fixed - remainder + np.where(remainder >= 2, 4, 0), fixed)
+    rounded_count = rounded.sum(axis=1)
+    score -= 5 * rounded_count
+
+    # PHASE 4: Competitive patterns
+    patterns = analyze_competitive_ev_pattern_batch(fixed)
+    score += 10 * patterns["is_common_pattern"] + 5 * patterns["has_max_investments"]
+    score += np.where(patterns["reasonable_distribution"], 5, -10)
+
+    # PHASE 5: Status
+    level = np.where(score >= 80, 0, np.where(score >= 50, 1, 2))
+    issue_count = negative.sum(axis=1) + capped.sum(axis=1) + scaled + likely_stats + low_total + rounded_count
+    kind = np.select(
+        [issue_count == 0, (issue_count == 1) & (rounded_count == 1), likely_stats | low_total],
+        [VALID, MINOR_FIXES, QUESTIONABLE],
+        default=ADJUSTED,
+    )
+    return fixed, (kind * len(CONFIDENCE_LEVELS) + level).astype(np.int8), score.astype(np.int32)
+
+
+def status_names(codes) -> List[str]:
+    """Status strings ("valid_high", ...) for an array of status codes"""
+    return [EV_STATUSES[code] for code in np.asarray(codes).tolist()]
+
+
+def spreads_to_array(spreads: List[Dict[str, int]]) -> np.ndarray:
+    """(N, 6) EV array from EV dicts; missing stats count as 0"""
+    return np.array([[spread.get(stat, 0) for stat in STAT_KEYS] for spread in spreads], dtype=np.int64).reshape(
+        len(spreads), len(STAT_KEYS)
+    )
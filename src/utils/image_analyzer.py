@@ -3,166 +3,425 @@ VGC Image Analysis module for Pokemon team analysis from screenshots and team ca
 """
 
 import base64
+import hashlib
 import re
 import requests
-from bs4 import BeautifulSoup
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
 from PIL import Image
-from typing import Dict, List, Optional, Any
-from urllib.parse import urljoin
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from urllib.parse import urlparse
 import google.generativeai as genai
-from .config import EV_STAT_TRANSLATIONS, NATURE_TRANSLATIONS, ABILITY_TRANSLATIONS, MOVE_NAME_TRANSLATIONS
+from .config import Config, EV_STAT_TRANSLATIONS, NATURE_TRANSLATIONS, ABILITY_TRANSLATIONS, MOVE_NAME_TRANSLATIONS
+from .keyword_automaton import KeywordAutomaton
+from .page_artifact import PageArtifact
+from .image_preparation import prepare_image_for_vision
+from .image_hashing import dhash, deduplicate_images, is_near_duplicate
+from .vision_cache import VisionCache
+from .image_tiling import MAX_TILES_PER_IMAGE, is_tall_image, split_tall_image
+from .image_classifier import DEFAULT_TEAM_CARD_THRESHOLD, team_card_probability
+from .image_sources import select_image_url
+from .image_record import ImagePayload, ImageRecord, image_bytes
+from .ev_spread_scanner import deduplicate_ev_spreads, scan_ev_spreads
+
+
+# Image URL/alt/title indicators that suggest a team card
+TEAM_CARD_INDICATORS = [
+    # Core VGC terms
+    "team", "pokemon", "vgc", "party", "チーム", "ポケモン", "構築",
+    
+    # Note.com specific patterns
+    "DvCIsNZXzyA2irhdlucjKOGR",  # Known note.com team card pattern
+    "rental", "レンタル", "build", "lineup", "note", "st-note",
+    
+    # Hatenablog specific patterns
+    "hatenablog", "hatena", "blog", "entry", "ブログ", "記事",
+    
+    # Japanese VGC terms and EV indicators
+    "ダブルバトル", "ダブル", "バトル", "調整", "努力値", "実数値",
+    "とくこう", "すばやさ", "こうげき", "ぼうぎょ", "とくぼう",
+    "最速", "準速", "4振り", "252", "244", "236", # Common EV values
+    "乱数1発", "確定1発", "耐え", "抜き", # Calc terms
+    
+    # Pokemon names that frequently appear in team cards
+    "ガブリアス", "ランドロス", "ガオガエン", "エルフーン", "パオジアン",
+    "テツノ", "ザマゼンタ", "ザシアン", "コライドン", "ミライドン",
+    "ハバタクカミ", "サーフゴー", "ドラパルト", "イエッサン", "ウインディ",
+    
+    # Items and moves that indicate team cards
+    "こだわりメガネ", "きあいのタスキ", "とつげきチョッキ", "たべのこし",
+    "まもる", "ねこだまし", "じしん", "10まんボルト"
+]
 
+# Extra weight for core VGC terms
+TEAM_CARD_CORE_INDICATORS = ["team", "pokemon", "vgc", "チーム", "ポケモン", "構築"]
 
-def extract_images_from_url(url: str, max_images: int = 10) -> List[Dict[str, Any]]:
-    """Extract images from webpage that might contain VGC data with note.com optimization"""
-    images = []
+# Extra weight for EV indicators (high priority for our goal)
+TEAM_CARD_EV_INDICATORS = ["努力値", "実数値", "調整", "252", "244", "236"]
+
+
+def _build_team_card_automaton() -> KeywordAutomaton:
+    """Each indicator present scores 1, plus 2 for core terms and 3 for EV terms"""
+    weights = {}
+    for indicator in TEAM_CARD_INDICATORS:
+        weights[indicator] = 1
+        if indicator in TEAM_CARD_CORE_INDICATORS:
+            weights[indicator] += 2
+        if indicator in TEAM_CARD_EV_INDICATORS:
+            weights[indicator] += 3
+    return KeywordAutomaton(weights)
+
+
+_TEAM_CARD_AUTOMATON = _build_team_card_automaton()
+
+
+# Concurrent image download limits (see iter_images_from_url)
+IMAGE_DOWNLOAD_WORKERS = 8
+IMAGE_DOWNLOADS_PER_HOST = 4
+IMAGE_DOWNLOAD_BYTE_BUDGET = 40 * 1024 * 1024  # Total bytes per article
+IMAGE_DOWNLOAD_TIMEOUT = 15
+IMAGE_DOWNLOAD_CHUNK_SIZE = 16 * 1024
+IMAGE_HEADER_SNIFF_LIMIT = 64 * 1024  # Give up sniffing (and read the whole image) past this
+
+_IMAGE_REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+class _ByteBudget:
+    """Thread-safe byte allowance shared by all downloads of one article"""
+
+    def __init__(self, limit: int):
+        self.remaining = limit
+        self._lock = threading.Lock()
+
+    def consume(self, size: int) -> bool:
+        """Reserve bytes; False once the budget is exhausted"""
+        with self._lock:
+            if size > self.remaining:
+                self.remaining = 0
+                return False
+            self.remaining -= size
+            return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining <= 0
+
+
+def is_too_small_for_team_card(width: int, height: int, is_japanese_vgc_asset: bool = False) -> bool:
+    """
+    Minimum-dimension rule shared by the <img> attribute check and the header sniffer
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        is_japanese_vgc_asset: note.com / Hatenablog asset (stricter floor, these
+            sites serve many small decorative images)
+    """
+    # More lenient for Japanese VGC sites
+    if is_japanese_vgc_asset:
+        return width < 300 or height < 200  # Lenient for Japanese sites
+    return width < 100 or height < 100
+
+
+def sniff_image_header(data: bytes) -> Optional[Tuple[str, Tuple[int, int]]]:
+    """
+    Read format and dimensions from the first bytes of an image
+
+    PIL only parses the header on open, so a partial download is enough for
+    PNG/GIF/WebP and for JPEGs whose metadata fits in the prefix.
+
+    Returns:
+        (format, (width, height)) or None if the prefix is not decodable yet
+    """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        with Image.open(BytesIO(data)) as img:
+            return img.format, img.size
+    except Exception:
+        return None
 
-        soup = BeautifulSoup(response.text, "html.parser")
 
-        # Find all images
-        img_tags = soup.find_all("img")
+def _collect_image_candidates(img_tags: List[Any], base_url: str, max_candidates: int) -> List[Dict[str, Any]]:
+    """
+    Score <img> tags from URL/alt/title and drop obviously small images
 
-        # Prioritize note.com team card images
-        note_com_images = []
-        other_images = []
+    Nothing is downloaded here; the returned candidates are in document order.
+    """
+    candidates = []
+    seen_urls = set()
+
+    for img_tag in img_tags[:max_candidates]:
+        try:
+            # Best rendition from src/srcset/<picture>/lazy-load attributes (absolute URL)
+            img_url = select_image_url(img_tag, base_url)
+            if not img_url:
+                continue
+            if img_url in seen_urls:
+                continue  # Same image embedded twice - download it once
+            seen_urls.add(img_url)
+
+            # ULTRA-ENHANCED priority scoring for note.com and hatenablog team images
+            is_note_com_asset = "assets.st-note.com" in img_url
+            is_hatenablog_asset = any(domain in img_url for domain in ["hatenablog.jp", "hatena.ne.jp", "hatenablog.com"])
+
+            url_lower = img_url.lower()
+            alt_text = img_tag.get("alt", "").lower()
+            title_text = img_tag.get("title", "").lower()
+            combined_text = f"{url_lower} {alt_text} {title_text}"
+
+            # Enhanced team card detection with scoring (one pass over all indicators)
+            team_card_score = _TEAM_CARD_AUTOMATON.score_present(combined_text, prepared=True)
+
+            # Domain-specific scoring bonuses
+            if is_note_com_asset:
+                team_card_score += 2  # Note.com assets get priority
+            if is_hatenablog_asset:
+                team_card_score += 2  # Hatenablog assets get priority
+            
+            is_likely_team_card = team_card_score >= 1
+
+            # Skip very small images but be more lenient for Japanese VGC sites
+            width = img_tag.get("width")
+            height = img_tag.get("height")
+            skip_small = False
+
+            if width and height:
+                try:
+                    skip_small = is_too_small_for_team_card(
+                        int(width), int(height), is_note_com_asset or is_hatenablog_asset
+                    )
+                except:
+                    pass
+
+            if skip_small:
+                continue
+
+            candidates.append({
+                "url": img_url,
+                "alt_text": img_tag.get("alt", ""),
+                "title": img_tag.get("title", ""),
+                "is_note_com_asset": is_note_com_asset,
+                "is_hatenablog_asset": is_hatenablog_asset,
+                "is_likely_team_card": is_likely_team_card,
+                "team_card_score": team_card_score,
+            })
+        except Exception:
+            continue
+
+    return candidates
+
+
+def _download_candidate_image(candidate: Dict[str, Any], host_slots: Dict[str, threading.Semaphore],
+                              budget: _ByteBudget, cancelled: threading.Event,
+                              timeout: int = IMAGE_DOWNLOAD_TIMEOUT) -> Optional[ImageRecord]:
+    """
+    Stream one candidate image and build its image record
+
+    Returns None for failed, too-small, over-budget or cancelled downloads.
+    """
+    if cancelled.is_set() or budget.exhausted:
+        return None
+
+    img_url = candidate["url"]
+    is_japanese_vgc_asset = candidate["is_note_com_asset"] or candidate["is_hatenablog_asset"]
+    header_info = None
+
+    with host_slots[urlparse(img_url).netloc]:
+        if cancelled.is_set():
+            return None
+
+        img_response = requests.get(img_url, headers=_IMAGE_REQUEST_HEADERS, timeout=timeout, stream=True)
+        try:
+            if img_response.status_code != 200:
+                return None
+
+            # Skip if too small in bytes (likely not a team card) - before reading the body
+            declared_size = img_response.headers.get("content-length")
+            if declared_size and declared_size.isdigit() and int(declared_size) < 5000:
+                return None
+
+            chunks = []
+            received = 0
+            for chunk in img_response.iter_content(chunk_size=IMAGE_DOWNLOAD_CHUNK_SIZE):
+                # Abort mid-transfer once enough images were found or the budget ran out
+                if cancelled.is_set() or not budget.consume(len(chunk)):
+                    return None
+                chunks.append(chunk)
+                received += len(chunk)
+
+                # Sniff format/dimensions from the first KB and abort small images early
+                if header_info is None and received <= IMAGE_HEADER_SNIFF_LIMIT:
+                    header_info = sniff_image_header(b"".join(chunks))
+                    if header_info is not None:
+                        width, height = header_info[1]
+                        if is_too_small_for_team_card(width, height, is_japanese_vgc_asset):
+                            return None
+            content = b"".join(chunks)
+            content_type = img_response.headers.get("content-type", "")
+        finally:
+            img_response.close()
+
+    # Skip if too small in bytes (likely not a team card)
+    if len(content) < 5000:  # Less than 5KB
+        return None
 
-        for img_tag in img_tags[: max_images * 2]:  # Check more images initially
+    # Get image info (already known from the header unless sniffing failed)
+    if header_info is not None:
+        img_format, img_size = header_info
+    else:
+        try:
+            pil_img = Image.open(BytesIO(content))
+            img_format = pil_img.format
+            img_size = pil_img.size
+        except:
+            img_format = "unknown"
+            img_size = (0, 0)
+
+    # Raw bytes only - base64 is produced when the image is sent to Gemini
+    return ImageRecord(
+        content,
+        url=img_url,
+        format=img_format,
+        size=img_size,
+        alt_text=candidate["alt_text"],
+        title=candidate["title"],
+        content_type=content_type,
+        is_note_com_asset=candidate["is_note_com_asset"],
+        is_hatenablog_asset=candidate["is_hatenablog_asset"],
+        is_likely_team_card=candidate["is_likely_team_card"],
+        team_card_score=candidate["team_card_score"],
+        file_size=len(content),
+        sha256=hashlib.sha256(content).hexdigest(),  # Vision cache key
+        dhash=dhash(content),  # Perceptual hash for near-duplicate collapsing
+        # Local pixel classifier, only scored while the vision gate is on
+        team_card_probability=team_card_probability(content) if Config.VISION_CLASSIFIER_THRESHOLD > 0 else None,
+    )
+
+
+def iter_images_from_url(url: str, max_images: int = 10, page: Optional[PageArtifact] = None,
+                         max_workers: int = IMAGE_DOWNLOAD_WORKERS,
+                         per_host_limit: int = IMAGE_DOWNLOADS_PER_HOST,
+                         byte_budget: int = IMAGE_DOWNLOAD_BYTE_BUDGET) -> Iterator[ImageRecord]:
+    """
+    Download candidate images concurrently and yield them best-first
+
+    Candidates are ranked best-first (priority assets and highest team card
+    score) and submitted in that order, at most ``per_host_limit`` transfers run against one host, and all
+    transfers share a ``byte_budget``. Near-duplicate copies of an image
+    already yielded (thumbnail, OGP and inline copies of one team card) are
+    still yielded, so deduplicate_images can keep the best copy, but do not
+    count as usable images. An image is yielded once every better candidate
+    has been resolved, so the ``max_images`` usable images kept are the best
+    ranked ones rather than the fastest to download. Once they have been
+    yielded - or the consumer stops iterating - queued downloads are cancelled
+    and in-flight ones abort at their next chunk.
+
+    Args:
+        url: Article URL
+        max_images: Stop after this many distinct usable images
+        page: Already-fetched page from ArticleScraper (avoids re-downloading the article)
+        max_workers: Concurrent downloads overall
+        per_host_limit: Concurrent downloads per image host
+        byte_budget: Maximum image bytes downloaded for the article
+
+    Yields:
+        Image records (see extract_images_from_url) in candidate rank order
+    """
+    if page is None:
+        response = requests.get(url, headers=_IMAGE_REQUEST_HEADERS, timeout=30)
+        response.raise_for_status()
+        page = PageArtifact.from_response(response, url=url)
+
+    # Resolve relative image URLs against the post-redirect address
+    base_url = page.final_url or url
+
+    # Check more images initially
+    candidates = _collect_image_candidates(page.image_tags(), base_url, max_images * 2)
+    if not candidates:
+        return
+
+    # Best candidates first, so they are the ones in flight when we stop early
+    candidates.sort(
+        key=lambda c: (c["is_note_com_asset"] or c["is_hatenablog_asset"] or c["is_likely_team_card"],
+                       c["team_card_score"]),
+        reverse=True,
+    )
+
+    # One slot pool per image host, created up front so workers never race on it
+    host_slots = {}
+    for candidate in candidates:
+        host = urlparse(candidate["url"]).netloc
+        if host not in host_slots:
+            host_slots[host] = threading.BoundedSemaphore(per_host_limit)
+    budget = _ByteBudget(byte_budget)
+    cancelled = threading.Event()
+    distinct: List[ImageRecord] = []
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(candidates))))
+    futures = {
+        executor.submit(_download_candidate_image, candidate, host_slots, budget, cancelled): rank
+        for rank, candidate in enumerate(candidates)
+    }
+    resolved: Dict[int, Optional[ImageRecord]] = {}
+    next_rank = 0
+    try:
+        for future in as_completed(futures):
             try:
-                img_src = img_tag.get("src")
-                if not img_src:
+                resolved[futures[future]] = future.result()
+            except Exception:
+                resolved[futures[future]] = None
+
+            # A better candidate still downloading holds back the ones ranked after it
+            while next_rank in resolved:
+                image_info = resolved.pop(next_rank)
+                next_rank += 1
+                if image_info is None:
                     continue
 
-                # Convert relative URLs to absolute
-                img_url = urljoin(url, img_src)
-
-                # ULTRA-ENHANCED priority scoring for note.com and hatenablog team images
-                is_note_com_asset = "assets.st-note.com" in img_url
-                is_hatenablog_asset = any(domain in img_url for domain in ["hatenablog.jp", "hatena.ne.jp", "hatenablog.com"])
-                is_likely_team_card = False
-
-                # COMPREHENSIVE team card indicators for Japanese VGC sites
-                team_indicators = [
-                    # Core VGC terms
-                    "team", "pokemon", "vgc", "party", "チーム", "ポケモン", "構築",
-                    
-                    # Note.com specific patterns
-                    "DvCIsNZXzyA2irhdlucjKOGR",  # Known note.com team card pattern
-                    "rental", "レンタル", "build", "lineup", "note", "st-note",
-                    
-                    # Hatenablog specific patterns
-                    "hatenablog", "hatena", "blog", "entry", "ブログ", "記事",
-                    
-                    # Japanese VGC terms and EV indicators
-                    "ダブルバトル", "ダブル", "バトル", "調整", "努力値", "実数値",
-                    "とくこう", "すばやさ", "こうげき", "ぼうぎょ", "とくぼう",
-                    "最速", "準速", "4振り", "252", "244", "236", # Common EV values
-                    "乱数1発", "確定1発", "耐え", "抜き", # Calc terms
-                    
-                    # Pokemon names that frequently appear in team cards
-                    "ガブリアス", "ランドロス", "ガオガエン", "エルフーン", "パオジアン",
-                    "テツノ", "ザマゼンタ", "ザシアン", "コライドン", "ミライドン",
-                    "ハバタクカミ", "サーフゴー", "ドラパルト", "イエッサン", "ウインディ",
-                    
-                    # Items and moves that indicate team cards
-                    "こだわりメガネ", "きあいのタスキ", "とつげきチョッキ", "たべのこし",
-                    "まもる", "ねこだまし", "じしん", "10まんボルト"
-                ]
-                
-                url_lower = img_url.lower()
-                alt_text = img_tag.get("alt", "").lower()
-                title_text = img_tag.get("title", "").lower()
-                combined_text = f"{url_lower} {alt_text} {title_text}"
-
-                # Enhanced team card detection with scoring
-                team_card_score = 0
-                for indicator in team_indicators:
-                    if indicator.lower() in combined_text:
-                        team_card_score += 1
-                        # Extra weight for core VGC terms
-                        if indicator in ["team", "pokemon", "vgc", "チーム", "ポケモン", "構築"]:
-                            team_card_score += 2
-                        # Extra weight for EV indicators (high priority for our goal)
-                        if indicator in ["努力値", "実数値", "調整", "252", "244", "236"]:
-                            team_card_score += 3
-                
-                # Domain-specific scoring bonuses
-                if is_note_com_asset:
-                    team_card_score += 2  # Note.com assets get priority
-                if is_hatenablog_asset:
-                    team_card_score += 2  # Hatenablog assets get priority
-                
-                is_likely_team_card = team_card_score >= 1
-
-                # Skip very small images but be more lenient for Japanese VGC sites
-                width = img_tag.get("width")
-                height = img_tag.get("height")
-                skip_small = False
-
-                if width and height:
-                    try:
-                        w, h = int(width), int(height)
-                        # More lenient for Japanese VGC sites
-                        if is_note_com_asset or is_hatenablog_asset:
-                            if w < 300 or h < 200:  # Lenient for Japanese sites
-                                skip_small = True
-                        else:
-                            if w < 100 or h < 100:
-                                skip_small = True
-                    except:
-                        pass
-
-                if skip_small:
-                    continue
+                if not any(is_near_duplicate(image_info, kept) for kept in distinct):
+                    distinct.append(image_info)
+                yield image_info
+                if len(distinct) >= max_images:
+                    return
+    finally:
+        # Stop queued and in-flight transfers (also runs when the consumer stops early)
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_images_from_url(url: str, max_images: int = 10,
+                            page: Optional[PageArtifact] = None) -> List[ImageRecord]:
+    """
+    Extract images from webpage that might contain VGC data with note.com optimization
+
+    Args:
+        url: Article URL
+        max_images: Maximum number of images to return
+        page: Already-fetched page from ArticleScraper; when given, the article
+            HTML is not downloaded or parsed again
+
+    Returns:
+        List of image records (raw bytes in ``content``, near-duplicate copies
+        collapsed), likely team cards first
+    """
+    images = []
+    try:
+        # Prioritize note.com team card images
+        note_com_images = []
+        other_images = []
 
-                # Download and process image
-                img_response = requests.get(img_url, headers=headers, timeout=15)
-                if img_response.status_code == 200:
-                    # Skip if too small in bytes (likely not a team card)
-                    if len(img_response.content) < 5000:  # Less than 5KB
-                        continue
-
-                    # Convert to base64 for Gemini Vision
-                    img_data = base64.b64encode(img_response.content).decode("utf-8")
-
-                    # Get image info
-                    try:
-                        pil_img = Image.open(BytesIO(img_response.content))
-                        img_format = pil_img.format
-                        img_size = pil_img.size
-                    except:
-                        img_format = "unknown"
-                        img_size = (0, 0)
-
-                    image_info = {
-                        "url": img_url,
-                        "data": img_data,
-                        "format": img_format,
-                        "size": img_size,
-                        "alt_text": img_tag.get("alt", ""),
-                        "title": img_tag.get("title", ""),
-                        "content_type": img_response.headers.get("content-type", ""),
-                        "is_note_com_asset": is_note_com_asset,
-                        "is_hatenablog_asset": is_hatenablog_asset,
-                        "is_likely_team_card": is_likely_team_card,
-                        "team_card_score": team_card_score,
-                        "file_size": len(img_response.content),
-                    }
-
-                    # Prioritize Japanese VGC site assets and likely team cards
-                    if is_note_com_asset or is_hatenablog_asset or is_likely_team_card:
-                        note_com_images.append(image_info)
-                    else:
-                        other_images.append(image_info)
-
-            except Exception as e:
-                continue
+        # Thumbnail / OGP / inline copies of one team card collapse to the largest copy
+        # (duplicates do not count towards max_images while downloading)
+        downloaded = deduplicate_images(list(iter_images_from_url(url, max_images=max_images, page=page)))
+
+        for image_info in downloaded:
+            # Prioritize Japanese VGC site assets and likely team cards
+            if image_info["is_note_com_asset"] or image_info["is_hatenablog_asset"] or image_info["is_likely_team_card"]:
+                note_com_images.append(image_info)
+            else:
+                other_images.append(image_info)
 
         # Sort priority images by team card score (highest first)
         note_com_images.sort(key=lambda x: x["team_card_score"], reverse=True)
@@ -591,9 +850,9 @@ For Pokemon Position #1, #2, #3, #4, #5, #6:
 - リザードン = Charizard
 - ニンフィア = Sylveon
 - パオジアン = Chien-Pao
-- チオンジェン = Chi-Yu
+- イーユイ = Chi-Yu
 - ディンルー = Ting-Lu
-- イーユイ = Wo-Chien
+- チオンジェン = Wo-Chien
 
 **CRITICAL MISSING POKEMON (Recently Misidentified):**
 - ゴルデンゴ = Gholdengo (Gen 9 Steel/Ghost - golden surfboard-like Pokemon)
@@ -731,14 +990,38 @@ POKEPASTE READINESS:
 '''
 
 
-def analyze_image_with_vision(image_data: str, image_format: str, vision_model) -> str:
-    """Analyze a single image using Gemini Vision"""
+def _build_vision_image_part(image_data: ImagePayload, image_format: str,
+                             prepare_image: bool = True) -> Dict[str, str]:
+    """
+    Inline image part for a Gemini request (prepared payload unless disabled or failing)
+
+    This is the API boundary: the only place image bytes are base64-encoded.
+    """
+    if prepare_image:
+        try:
+            prepared = prepare_image_for_vision(image_bytes(image_data), image_format=image_format)
+            return {"mime_type": prepared.mime_type, "data": prepared.to_base64()}
+        except Exception:
+            pass  # Send the original image
+    if not isinstance(image_data, str):
+        image_data = base64.b64encode(image_data).decode("utf-8")
+    return {"mime_type": f"image/{image_format.lower()}", "data": image_data}
+
+
+def analyze_image_with_vision(image_data: ImagePayload, image_format: str, vision_model,
+                              prepare_image: bool = True) -> str:
+    """
+    Analyze a single image using Gemini Vision
+
+    Args:
+        image_data: Raw image bytes (or a legacy base64 string)
+        image_format: PIL format name of the image (e.g. "PNG")
+        vision_model: Gemini model
+        prepare_image: Crop/downscale/recompress before upload (see image_preparation)
+    """
     try:
         # Prepare image for Gemini
-        image_part = {
-            "mime_type": f"image/{image_format.lower()}",
-            "data": image_data,
-        }
+        image_part = _build_vision_image_part(image_data, image_format, prepare_image)
 
         vision_prompt = get_vision_analysis_prompt()
 
@@ -754,269 +1037,402 @@ def analyze_image_with_vision(image_data: str, image_format: str, vision_model)
         return f"Vision analysis error: {str(e)}"
 
 
-def extract_ev_spreads_from_image_analysis(image_analysis: str) -> List[Dict[str, Any]]:
-    """Enhanced EV spread extraction with comprehensive Japanese pattern recognition and calculated stat format"""
-    ev_spreads = []
-    
-    # PRIORITY 1: Calculated stat format (liberty-note.com style) - NEW!
-    calc_stat_patterns = [
-        r"([HABCDS])(?:\d+)?\((\d+)\)([↑↓×]?)",  # H181(148)↑ or H(148)
-        r"([HABCDS])\((\d+)\)([↑↓×]?)",  # H(148)×
-        r"([HABCDS])(\d+)([↑↓×])",  # H148↑ (without parentheses)
-    ]
-    
-    for pattern in calc_stat_patterns:
-        matches = re.finditer(pattern, image_analysis, re.UNICODE | re.IGNORECASE)
-        stat_groups = []
-        
-        for match in matches:
-            stat_groups.append(match.groups())
-        
-        # If we found multiple stat groups, try to form a complete EV spread
-        if len(stat_groups) >= 4:  # Need at least 4 stats for reasonable confidence
-            ev_values = [0, 0, 0, 0, 0, 0]
-            stat_mapping = {'H': 0, 'A': 1, 'B': 2, 'C': 3, 'D': 4, 'S': 5}
-            
-            valid_stats = 0
-            for stat_letter, ev_value, nature_symbol in stat_groups:
-                if stat_letter.upper() in stat_mapping:
-                    try:
-                        ev_int = int(ev_value)
-                        if 0 <= ev_int <= 252:
-                            ev_values[stat_mapping[stat_letter.upper()]] = ev_int
-                            valid_stats += 1
-                    except (ValueError, IndexError):
-                        continue
-            
-            if valid_stats >= 4:
-                spread_dict = _create_ev_spread_dict(ev_values, "calculated_stat_format", f"calc_format_{len(stat_groups)}_stats")
-                if spread_dict:
-                    ev_spreads.append(spread_dict)
-    
-    # PRIORITY 2: Standard slash-separated format (most reliable)
-    slash_patterns = [
-        r"(\d{1,3})[\/\-](\d{1,3})[\/\-](\d{1,3})[\/\-](\d{1,3})[\/\-](\d{1,3})[\/\-](\d{1,3})",  # 252/0/4/252/0/0
-        r"H(\d{1,3})[\/\-]A(\d{1,3})[\/\-]B(\d{1,3})[\/\-]C(\d{1,3})[\/\-]D(\d{1,3})[\/\-]S(\d{1,3})",  # H252/A0/B4...
-    ]
-    
-    for pattern in slash_patterns:
-        matches = re.finditer(pattern, image_analysis, re.IGNORECASE)
-        for match in matches:
-            ev_values = [int(x) for x in match.groups()]
-            if len(ev_values) == 6:
-                spread_dict = _create_ev_spread_dict(ev_values, "slash_format", match.group())
-                if spread_dict:
-                    ev_spreads.append(spread_dict)
-    
-    # PRIORITY 2: Space-separated format with stat abbreviations (ULTRA-ENHANCED FOR JAPANESE HYBRID FORMAT)
-    space_patterns = [
-        # CRITICAL: Japanese hybrid format (努力値：H252 A4 B156 format) - USER'S EXACT CASE
-        r"(?:努力値|個体値調整|EV配分|調整|EV)[：:\s]\s*H(\d{1,3})\s+A(\d{1,3})\s+B(\d{1,3})\s+C(\d{1,3})\s+D(\d{1,3})\s+S(\d{1,3})",
-        r"(?:努力値|個体値調整|EV配分|調整|EV)[：:\s]\s*H(\d{1,3})\s*A(\d{1,3})\s*B(\d{1,3})\s*C(\d{1,3})\s*D(\d{1,3})\s*S(\d{1,3})",  # Optional spaces
-        # Enhanced Japanese variations
-        r"(?:努力値振り|EV振り|振り分け)[：:\s]\s*H(\d{1,3})\s*A(\d{1,3})\s*B(\d{1,3})\s*C(\d{1,3})\s*D(\d{1,3})\s*S(\d{1,3})",
-        r"(?:実数値調整|ステ振り)[：:\s]\s*H(\d{1,3})\s*A(\d{1,3})\s*B(\d{1,3})\s*C(\d{1,3})\s*D(\d{1,3})\s*S(\d{1,3})",
-        # Standard abbreviated format
-        r"H(\d{1,3})\s+A(\d{1,3})\s+B(\d{1,3})\s+C(\d{1,3})\s+D(\d{1,3})\s+S(\d{1,3})",  # H252 A0 B4 C252 D0 S0
-        r"H(\d{1,3})\s*A(\d{1,3})\s*B(\d{1,3})\s*C(\d{1,3})\s*D(\d{1,3})\s*S(\d{1,3})",  # Flexible spacing
-        # Alternative format with HP/Atk names
-        r"(\d{1,3})HP\s+(\d{1,3})Atk?\s+(\d{1,3})Def?\s+(\d{1,3})SpA?\s+(\d{1,3})SpD?\s+(\d{1,3})Spe?",  # 252HP 0Atk 4Def...
-    ]
-    
-    for pattern in space_patterns:
-        matches = re.finditer(pattern, image_analysis, re.IGNORECASE)
-        for match in matches:
-            ev_values = [int(x) for x in match.groups()]
-            if len(ev_values) == 6:
-                spread_dict = _create_ev_spread_dict(ev_values, "space_format", match.group())
-                if spread_dict:
-                    ev_spreads.append(spread_dict)
-    
-    # PRIORITY 2.5: Additional Japanese format variations
-    additional_japanese_patterns = [
-        # Table/grid format commonly used in note.com
-        r"HP[:：]\s*(\d{1,3})\s*こうげき[:：]\s*(\d{1,3})\s*ぼうぎょ[:：]\s*(\d{1,3})\s*とくこう[:：]\s*(\d{1,3})\s*とくぼう[:：]\s*(\d{1,3})\s*すばやさ[:：]\s*(\d{1,3})",
-        # Bullet point format
-        r"[・•]\s*HP\s*(\d{1,3})\s*[・•]\s*こうげき\s*(\d{1,3})\s*[・•]\s*ぼうぎょ\s*(\d{1,3})\s*[・•]\s*とくこう\s*(\d{1,3})\s*[・•]\s*とくぼう\s*(\d{1,3})\s*[・•]\s*すばやさ\s*(\d{1,3})",
-        # Bracket format
-        r"\[HP(\d{1,3})\]\s*\[A(\d{1,3})\]\s*\[B(\d{1,3})\]\s*\[C(\d{1,3})\]\s*\[D(\d{1,3})\]\s*\[S(\d{1,3})\]",
-        # Line break separated with Japanese stats
-        r"ＨＰ\s*[:：]?\s*(\d{1,3}).*?こうげき\s*[:：]?\s*(\d{1,3}).*?ぼうぎょ\s*[:：]?\s*(\d{1,3}).*?とくこう\s*[:：]?\s*(\d{1,3}).*?とくぼう\s*[:：]?\s*(\d{1,3}).*?すばやさ\s*[:：]?\s*(\d{1,3})",
-    ]
-    
-    for pattern in additional_japanese_patterns:
-        matches = re.finditer(pattern, image_analysis, re.IGNORECASE | re.DOTALL)
-        for match in matches:
-            ev_values = [int(x) for x in match.groups()]
-            if len(ev_values) == 6:
-                spread_dict = _create_ev_spread_dict(ev_values, "japanese_table_format", match.group())
-                if spread_dict:
-                    ev_spreads.append(spread_dict)
-    
-    # PRIORITY 3: Japanese stat name patterns (CRITICAL for note.com)
-    japanese_patterns = [
-        # Full Japanese stat names with colons/spaces
-        r"(?:ＨＰ|HP)[:\s]*(\d{1,3}).*?(?:こうげき|攻撃)[:\s]*(\d{1,3}).*?(?:ぼうぎょ|防御)[:\s]*(\d{1,3}).*?(?:とくこう|特攻|特殊攻撃)[:\s]*(\d{1,3}).*?(?:とくぼう|特防|特殊防御)[:\s]*(\d{1,3}).*?(?:すばやさ|素早さ|素早)[:\s]*(\d{1,3})",
-        
-        # Compact Japanese format
-        r"ＨＰ(\d{1,3})\s*こうげき(\d{1,3})\s*ぼうぎょ(\d{1,3})\s*とくこう(\d{1,3})\s*とくぼう(\d{1,3})\s*すばやさ(\d{1,3})",
-        
-        # Mixed Japanese/English
-        r"(?:HP|ＨＰ)(\d{1,3})\s*(?:A|こうげき)(\d{1,3})\s*(?:B|ぼうぎょ)(\d{1,3})\s*(?:C|とくこう)(\d{1,3})\s*(?:D|とくぼう)(\d{1,3})\s*(?:S|すばやさ)(\d{1,3})",
+# Batched vision requests: one prompt for several images
+VISION_BATCH_MAX_IMAGES = 4
+# Gemini rejects requests over 20MB of inline data; leave room for the prompt
+VISION_BATCH_MAX_BYTES = 16 * 1024 * 1024
+_BATCH_MARKER_PATTERN = re.compile(r"^[ \t>*#]*<<<IMAGE (\d+)>>>[ \t*#]*$", re.MULTILINE)
+
+
+def get_batch_vision_instructions(image_count: int) -> str:
+    """Header telling the model to answer per image, with markers that map answers back"""
+    return f'''
+**BATCH MODE: {image_count} IMAGES**
+You are given {image_count} separate images, each introduced by a label "IMAGE n".
+Analyze every image independently with the instructions below - never mix
+Pokemon or EV data between images.
+
+Structure your answer as one section per image, in order. Start each section
+with a line containing only the marker <<<IMAGE n>>> (n = the image number),
+followed by the complete analysis of that image in the format below.
+If an image contains no team data, still output its marker and say so.
+'''
+
+
+def plan_vision_batches(payload_sizes: List[int], max_images: int = VISION_BATCH_MAX_IMAGES,
+                        max_bytes: int = VISION_BATCH_MAX_BYTES) -> List[List[int]]:
+    """
+    Group images into request batches that respect count and payload limits
+
+    Args:
+        payload_sizes: Encoded (base64) payload size of each image
+        max_images: Maximum images per request
+        max_bytes: Maximum total payload per request
+
+    Returns:
+        Batches of indexes into payload_sizes, in input order; an image larger
+        than max_bytes gets a batch of its own
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_bytes = 0
+    for index, size in enumerate(payload_sizes):
+        if current and (len(current) >= max_images or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(index)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def split_batch_response(text: str, image_count: int) -> List[Optional[str]]:
+    """
+    Split a batched vision response into per-image analyses
+
+    Returns:
+        One entry per image (in order); None where the model left out an image
+    """
+    sections: List[Optional[str]] = [None] * image_count
+    markers = list(_BATCH_MARKER_PATTERN.finditer(text or ""))
+    for position, marker in enumerate(markers):
+        number = int(marker.group(1))
+        if not 1 <= number <= image_count or sections[number - 1] is not None:
+            continue
+        end = markers[position + 1].start() if position + 1 < len(markers) else len(text)
+        section = text[marker.end():end].strip()
+        if section:
+            sections[number - 1] = section
+    return sections
+
+
+def _analyze_prepared_batch(image_parts: List[Dict[str, str]], vision_model) -> List[Optional[str]]:
+    """One multimodal request for several prepared images; raises on API errors"""
+    contents: List[Any] = [get_batch_vision_instructions(len(image_parts)) + get_vision_analysis_prompt()]
+    for number, image_part in enumerate(image_parts, 1):
+        contents.append(f"IMAGE {number}:")
+        contents.append(image_part)
+
+    response = vision_model.generate_content(contents)
+    return split_batch_response(response.text if response else "", len(image_parts))
+
+
+# Errors that mean the request was too big: worth retrying in smaller batches
+_PAYLOAD_SIZE_MARKERS = ("payload size", "request payload", "request size", "too large", "413",
+                         "exceeds the maximum number of tokens")
+# Errors that mean the API refuses more requests for now: retrying only makes it worse
+_RATE_LIMIT_MARKERS = ("429", "rate limit", "rate_limit", "too many requests", "quota",
+                       "resource has been exhausted", "resource_exhausted", "resourceexhausted")
+
+
+def _classify_vision_error(error) -> Optional[str]:
+    """
+    Classify a vision request failure
+
+    Args:
+        error: The exception raised, or the failure string of analyze_image_with_vision
+
+    Returns:
+        "rate_limit" for rate limit/quota errors (including APILimitError),
+        "payload_size" for oversized requests, otherwise None
+    """
+    name = type(error).__name__ if isinstance(error, Exception) else ""
+    message = str(error).lower()
+    if name in ("APILimitError", "ResourceExhausted", "TooManyRequests") or any(
+        marker in message for marker in _RATE_LIMIT_MARKERS
+    ):
+        return "rate_limit"
+    if name in ("PayloadTooLarge", "RequestEntityTooLarge") or any(
+        marker in message for marker in _PAYLOAD_SIZE_MARKERS
+    ):
+        return "payload_size"
+    return None
+
+
+def analyze_images_with_vision(images: List[Tuple[ImagePayload, str]], vision_model, prepare_image: bool = True,
+                               max_batch_images: int = VISION_BATCH_MAX_IMAGES,
+                               max_batch_bytes: int = VISION_BATCH_MAX_BYTES) -> List[str]:
+    """
+    Analyze several images with as few vision requests as possible
+
+    Images are packed into batches (see plan_vision_batches) that share one
+    copy of the analysis prompt. A batch rejected as too large is split in
+    half and retried; images the model skipped in its answer are analyzed on
+    their own. Other failures are not retried, and after a rate limit or quota
+    error no further requests are sent: the remaining images get the error.
+
+    Args:
+        images: (raw image bytes or legacy base64 string, PIL format name) pairs
+        vision_model: Gemini model
+        prepare_image: Crop/downscale/recompress before upload
+        max_batch_images: Maximum images per request
+        max_batch_bytes: Maximum inline payload per request
+
+    Returns:
+        One analysis text per input image, in input order (same failure
+        strings as analyze_image_with_vision)
+    """
+    image_parts = [_build_vision_image_part(data, image_format, prepare_image) for data, image_format in images]
+    results: List[Optional[str]] = [None] * len(images)
+    rate_limit_error: Optional[str] = None
+
+    def run(indexes: List[int]):
+        nonlocal rate_limit_error
+        if rate_limit_error is not None:
+            for index in indexes:
+                results[index] = rate_limit_error
+            return
+        if len(indexes) == 1:
+            index = indexes[0]
+            # Already prepared - send as is
+            results[index] = analyze_image_with_vision(
+                image_parts[index]["data"], image_parts[index]["mime_type"].split("/")[-1], vision_model,
+                prepare_image=False,
+            )
+            if results[index].startswith("Vision analysis error:") and (
+                _classify_vision_error(results[index]) == "rate_limit"
+            ):
+                rate_limit_error = results[index]
+            return
+        try:
+            sections = _analyze_prepared_batch([image_parts[i] for i in indexes], vision_model)
+        except Exception as e:
+            error_kind = _classify_vision_error(e)
+            if error_kind == "payload_size":
+                middle = len(indexes) // 2
+                run(indexes[:middle])
+                run(indexes[middle:])
+                return
+            if error_kind == "rate_limit":
+                rate_limit_error = f"Vision analysis error: {str(e)}"
+            for index in indexes:
+                results[index] = f"Vision analysis error: {str(e)}"
+            return
+        for index, section in zip(indexes, sections):
+            results[index] = section
+        for index in indexes:
+            if results[index] is None:
+                run([index])
+
+    payload_sizes = [len(part["data"]) for part in image_parts]
+    for batch in plan_vision_batches(payload_sizes, max_batch_images, max_batch_bytes):
+        run(batch)
+
+    return [result if result is not None else "No analysis results from vision model" for result in results]
+
+
+TILE_ANALYSIS_WORKERS = 4
+
+
+def analyze_tiled_image(image_data: ImagePayload, image_format: str, vision_model, prepare_image: bool = True,
+                        max_tiles: int = MAX_TILES_PER_IMAGE,
+                        max_workers: int = TILE_ANALYSIS_WORKERS) -> Optional[str]:
+    """
+    Analyze a tall team card panel by panel
+
+    The image is split into per-Pokemon tiles (see image_tiling), each tile is
+    analyzed at full resolution in parallel, and the tile analyses are merged
+    top to bottom into one text for EV extraction.
+
+    Args:
+        image_data: Raw image bytes (or a legacy base64 string)
+        image_format: PIL format name of the image
+        vision_model: Gemini model
+        prepare_image: Crop/downscale/recompress each tile before upload
+        max_tiles: Cap on tiles (and vision calls) for the image
+        max_workers: Tiles analyzed concurrently
+
+    Returns:
+        Merged analysis, or None if the image is not tall enough to tile. If
+        some tiles failed, the analysis of the others starts with
+        "Partial vision analysis:" and is not cached
+    """
+    tiles = split_tall_image(image_bytes(image_data), max_tiles=max_tiles)
+    if not tiles:
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tiles)))) as executor:
+        analyses = list(executor.map(
+            lambda tile: analyze_image_with_vision(tile, "PNG", vision_model, prepare_image), tiles
+        ))
+
+    successful = [
+        (number, analysis) for number, analysis in enumerate(analyses, 1)
+        if analysis and not analysis.startswith(_VISION_FAILURE_PREFIXES)
     ]
-    
-    for pattern in japanese_patterns:
-        matches = re.finditer(pattern, image_analysis, re.IGNORECASE | re.DOTALL)
-        for match in matches:
-            ev_values = [int(x) for x in match.groups()]
-            if len(ev_values) == 6:
-                spread_dict = _create_ev_spread_dict(ev_values, "japanese_format", match.group())
-                if spread_dict:
-                    ev_spreads.append(spread_dict)
-    
-    # PRIORITY 4: Individual stat line parsing (flexible order)
-    individual_stats = {}
-    stat_patterns = {
-        'hp': [r"(?:HP|ＨＰ|ヒットポイント)[:\s]*(\d{1,3})", r"体力[:\s]*(\d{1,3})"],
-        'attack': [r"(?:Attack|こうげき|攻撃|A)[:\s]*(\d{1,3})", r"(?:アタック|物理攻撃)[:\s]*(\d{1,3})"],
-        'defense': [r"(?:Defense|ぼうぎょ|防御|B)[:\s]*(\d{1,3})", r"(?:ディフェンス|物理防御)[:\s]*(\d{1,3})"],
-        'special_attack': [r"(?:Sp\.?\s*Attack|とくこう|特攻|特殊攻撃|C)[:\s]*(\d{1,3})", r"(?:とくしゅこうげき)[:\s]*(\d{1,3})"],
-        'special_defense': [r"(?:Sp\.?\s*Defense|とくぼう|特防|特殊防御|D)[:\s]*(\d{1,3})", r"(?:とくしゅぼうぎょ)[:\s]*(\d{1,3})"],
-        'speed': [r"(?:Speed|すばやさ|素早さ|素早|S)[:\s]*(\d{1,3})", r"(?:スピード|速さ)[:\s]*(\d{1,3})"]
-    }
-    
-    for stat, patterns in stat_patterns.items():
-        for pattern in patterns:
-            matches = re.finditer(pattern, image_analysis, re.IGNORECASE)
-            for match in matches:
-                value = int(match.group(1))
-                if 0 <= value <= 252:  # Basic validation
-                    individual_stats[stat] = value
-                    break  # Take first valid match for this stat
-    
-    # If we found all 6 individual stats, create EV spread
-    if len(individual_stats) == 6:
-        ev_values = [
-            individual_stats['hp'],
-            individual_stats['attack'], 
-            individual_stats['defense'],
-            individual_stats['special_attack'],
-            individual_stats['special_defense'],
-            individual_stats['speed']
+    if not successful:
+        return analyses[0]  # Every tile failed - report the first error
+    merged = "\n\n".join(
+        f"=== TEAM CARD SECTION {number}/{len(tiles)} ===\n{analysis}" for number, analysis in successful
+    )
+    if len(successful) < len(tiles):
+        failed = len(tiles) - len(successful)
+        return f"{_PARTIAL_ANALYSIS_PREFIX} {failed} of {len(tiles)} sections failed\n\n{merged}"
+    return merged
+
+
+def _image_payload(image_info: Dict[str, Any]) -> ImagePayload:
+    """Raw bytes of an image record, or the base64 "data" of a legacy image dict"""
+    if isinstance(image_info, ImageRecord):
+        return image_info.content
+    return image_info["data"]
+
+
+def release_image_payloads(images: List[Any]):
+    """Drop the payloads of image records once vision analysis is done (dicts are left alone)"""
+    for image in images:
+        if isinstance(image, ImageRecord):
+            image.release()
+
+
+# Responses that describe a failed call rather than the image - never cached
+_VISION_FAILURE_PREFIXES = ("Vision analysis error:", "No analysis results from vision model")
+# Tiled analyses missing some sections - used for this request, never cached
+_PARTIAL_ANALYSIS_PREFIX = "Partial vision analysis:"
+
+
+def get_vision_prompt_version(vision_model=None, prepare_image: bool = True) -> str:
+    """
+    Version tag of the vision analysis setup, part of every cache key
+
+    Changes whenever the prompt text, the model or image preparation changes,
+    so cached results from an older setup are never served.
+    """
+    model_name = getattr(vision_model, "model_name", "") or ""
+    fingerprint = f"{get_vision_analysis_prompt()}\n{model_name}\n{prepare_image}\ntiles={MAX_TILES_PER_IMAGE}"
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def analyze_images_cached(images: List[Dict[str, Any]], vision_model, cache: Optional[VisionCache] = None,
+                          prepare_image: bool = True, batch: bool = True,
+                          tile_tall_images: bool = True) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Vision analysis + EV extraction for several images, served from cache when possible
+
+    Cached images skip the model entirely; their EV spreads are extracted
+    again from the cached vision text. Tall composites are analyzed tile
+    by tile (analyze_tiled_image); the remaining images are analyzed in
+    batched requests (analyze_images_with_vision) unless ``batch`` is False.
+
+    Args:
+        images: Image records from extract_images_from_url, or dicts with a
+            base64 "data" and "format" (plus "sha256"/"dhash"/"size" when available)
+        vision_model: Gemini model
+        cache: Persistent vision cache; None always calls the model
+        prepare_image: Crop/downscale/recompress before upload
+        batch: Share one request between several images
+        tile_tall_images: Split tall team cards into per-Pokemon tiles
+
+    Returns:
+        (raw vision text, EV spreads extracted from it) per image, in input order
+    """
+    prompt_version = get_vision_prompt_version(vision_model, prepare_image) if cache is not None else None
+    results: List[Optional[Tuple[str, List[Dict[str, Any]]]]] = [None] * len(images)
+    keys = [None] * len(images)
+
+    payloads = [_image_payload(image_info) for image_info in images]
+
+    for index, image_info in enumerate(images):
+        if cache is None:
+            continue
+        digest = image_info.get("sha256") or hashlib.sha256(image_bytes(payloads[index])).hexdigest()
+        keys[index] = (digest, image_info.get("dhash"), tuple(image_info.get("size") or (0, 0)))
+        try:
+            cached = cache.get(digest, prompt_version, phash=keys[index][1], size=keys[index][2])
+        except Exception:
+            cached = None  # A broken cache must not break analysis
+        if cached is not None:
+            # Only the vision text is trusted: the spreads are re-extracted, so an
+            # extractor change applies to cached images as well
+            analysis = cached["analysis"]
+            results[index] = (analysis, extract_ev_spreads_from_image_analysis(analysis))
+
+    pending = [index for index, result in enumerate(results) if result is None]
+    analyses_by_index: Dict[int, str] = {}
+
+    if tile_tall_images:
+        for index in pending:
+            size = images[index].get("size")
+            if size and not is_tall_image(tuple(size)):
+                continue  # Known not to be tall - skip decoding
+            tiled = analyze_tiled_image(payloads[index], images[index]["format"], vision_model, prepare_image)
+            if tiled is not None:
+                analyses_by_index[index] = tiled
+        pending = [index for index in pending if index not in analyses_by_index]
+
+    if batch:
+        analyses = analyze_images_with_vision(
+            [(payloads[index], images[index]["format"]) for index in pending], vision_model, prepare_image
+        )
+    else:
+        analyses = [
+            analyze_image_with_vision(payloads[index], images[index]["format"], vision_model, prepare_image)
+            for index in pending
         ]
-        spread_dict = _create_ev_spread_dict(ev_values, "individual_stats", str(individual_stats))
-        if spread_dict:
-            ev_spreads.append(spread_dict)
-    
-    # Remove duplicates (keep highest confidence)
-    ev_spreads = _remove_duplicate_ev_spreads(ev_spreads)
-    
-    return ev_spreads
 
+    analyses_by_index.update(zip(pending, analyses))
 
-def _create_ev_spread_dict(ev_values: List[int], format_type: str, raw_match: str) -> Dict[str, Any]:
-    """Create and validate EV spread dictionary with ultra-strict validation"""
-    if len(ev_values) != 6:
-        return None
-    
-    total = sum(ev_values)
-    
-    # ULTRA-STRICT validation to prevent AI generation
-    if total > 508:  # Definitely not EVs
-        return None
-    
-    if total == 0:  # All zeros - likely no data found
-        return None
-    
-    # Check if all values are multiples of 4 (EV requirement)
-    if not all(ev % 4 == 0 for ev in ev_values):
-        return None
-    
-    # Check for reasonable EV patterns (no single stat > 252)
-    if any(ev > 252 for ev in ev_values):
-        return None
-    
-    # BALANCED ANTI-GENERATION: Allow legitimate competitive patterns while catching obvious AI generation
-    non_zero_values = [ev for ev in ev_values if ev > 0]
-    
-    # Only reject if ALL of these suspicious conditions are met:
-    suspicious_indicators = 0
-    
-    # Indicator 1: Perfect 508 total with only basic competitive values
-    if total == 508 and all(ev in [0, 4, 252] for ev in ev_values):
-        suspicious_indicators += 1
-    
-    # Indicator 2: Multiple identical non-zero values (very unusual in real spreads)
-    if len(non_zero_values) >= 3 and all(ev == non_zero_values[0] for ev in non_zero_values):
-        suspicious_indicators += 1
-    
-    # Indicator 3: Exactly 6 investment stats all at 252 (impossible due to EV limit)
-    if ev_values.count(252) >= 3:  # More than 2 maxed stats is very unusual
-        suspicious_indicators += 1
-    
-    # Only reject if multiple suspicious indicators (legitimate spreads can trigger 1)
-    if suspicious_indicators >= 2:
-        return None
-    
-    # Determine confidence level (balanced approach)
-    confidence = "low"
-    
-    # High confidence: Good format + high investment
-    if total >= 500 and format_type in ["slash_format", "japanese_format"]:
-        confidence = "high"
-    elif total == 508 and format_type in ["slash_format", "japanese_format"]:  # Perfect competitive total
-        confidence = "high"
-    
-    # Medium confidence: Decent format + substantial investment
-    elif total >= 400 and format_type in ["japanese_format", "calculated_stat_format", "slash_format"]:
-        confidence = "medium"
-    elif total >= 300 and format_type == "slash_format":  # Standard format is reliable
-        confidence = "medium"
-    
-    # Bonus for realistic spreads (common competitive patterns)
-    if total in [500, 504, 508] and ev_values.count(252) <= 2:  # Common totals with reasonable distribution
-        if confidence == "medium":
-            confidence = "high"
-        elif confidence == "low":
-            confidence = "medium"
-    
-    return {
-        "hp": ev_values[0],
-        "attack": ev_values[1],
-        "defense": ev_values[2],
-        "special_attack": ev_values[3],
-        "special_defense": ev_values[4],
-        "speed": ev_values[5],
-        "total": total,
-        "format": "/".join(map(str, ev_values)),
-        "confidence": confidence,
-        "format_type": format_type,
-        "raw_match": raw_match[:100],  # Store first 100 chars of original match
-        "is_valid": True,
-        "validation_notes": f"Total: {total}, Non-zero stats: {len(non_zero_values)}, Format: {format_type}"
-    }
+    for index, analysis in sorted(analyses_by_index.items()):
+        ev_spreads = extract_ev_spreads_from_image_analysis(analysis)
+        results[index] = (analysis, ev_spreads)
+        uncacheable = _VISION_FAILURE_PREFIXES + (_PARTIAL_ANALYSIS_PREFIX,)
+        if cache is not None and analysis and not analysis.startswith(uncacheable):
+            digest, phash, size = keys[index]
+            try:
+                cache.put(digest, prompt_version, analysis, ev_spreads, phash=phash, size=size)
+            except Exception:
+                pass
 
+    return results
 
-def _remove_duplicate_ev_spreads(ev_spreads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate EV spreads, keeping the highest confidence ones"""
-    unique_spreads = {}
-    
-    for spread in ev_spreads:
-        # Use the actual EV values as key to identify duplicates
-        key = (spread["hp"], spread["attack"], spread["defense"], 
-               spread["special_attack"], spread["special_defense"], spread["speed"])
-        
-        if key not in unique_spreads:
-            unique_spreads[key] = spread
-        else:
-            # Keep the one with higher confidence
-            current_confidence = {"high": 3, "medium": 2, "low": 1}[spread["confidence"]]
-            existing_confidence = {"high": 3, "medium": 2, "low": 1}[unique_spreads[key]["confidence"]]
-            
-            if current_confidence > existing_confidence:
-                unique_spreads[key] = spread
-    
-    return list(unique_spreads.values())
+
+def analyze_image_cached(image_info: Dict[str, Any], vision_model, cache: Optional[VisionCache] = None,
+                         prepare_image: bool = True) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Vision analysis + EV extraction for one image, served from cache when possible
+
+    Returns:
+        (raw vision text, EV spreads extracted from it)
+    """
+    return analyze_images_cached([image_info], vision_model, cache, prepare_image, batch=False)[0]
+
+
+def extract_ev_spreads_from_image_analysis(image_analysis: str) -> List[Dict[str, Any]]:
+    """
+    EV spreads in vision output, one dict per spread in source order
+
+    A single pass of the spread scanner (see ev_spread_scanner): every
+    notation is recognised in the same walk over the text, each spread
+    carries its offsets ("start", "end") and the Pokemon whose header it
+    follows ("pokemon"), and repeated readings of the same Pokemon's spread
+    are collapsed to the most confident one.
+
+    Args:
+        image_analysis: Raw vision-model text
+
+    Returns:
+        Spread dicts (hp ... speed, total, format, confidence, format_type, pokemon, ...)
+    """
+    return [record.to_dict() for record in deduplicate_ev_spreads(scan_ev_spreads(image_analysis))]
+
+
+def gate_vision_candidates(images: List[Dict[str, Any]],
+                           threshold: float = DEFAULT_TEAM_CARD_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Keep only images the local pixel classifier considers likely team cards
+
+    Images without a probability (not decodable, or not scored) are kept so the
+    gate never drops what it could not look at.
+
+    Args:
+        images: Image dicts with "team_card_probability" (see image_classifier)
+        threshold: Minimum probability for a vision call; 0 disables the gate
+    """
+    return [
+        image for image in images
+        if image.get("team_card_probability") is None or image["team_card_probability"] >= threshold
+    ]
 
 
 def filter_vgc_images(images: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -0,0 +1,172 @@
+"""
+Local pixel-level team-card classifier.
+
+``is_potentially_vgc_image`` only sees URLs, alt text, file sizes and
+dimensions, so banners and photos still reach the paid vision model. This
+module scores the pixels themselves on a small downsampled copy (NumPy only,
+roughly 10-20 ms per image):
+
+- text-like edge density: stat cards have many short bands of rows dense
+  with strokes (lines of text), banners at most a title
+- edge crispness: rendered text/UI has hard edges, photos have soft gradients
+- grid regularity: panels and stat rows repeat at a regular pitch
+- colour-palette entropy: cards use a limited palette, photos use thousands
+  of colours
+- aspect ratio: extreme banner/strip shapes are rarely team cards
+
+The features are combined by a small logistic model into the probability that
+the image is a stat card or rental-team screenshot.
+"""
+
+import math
+from io import BytesIO
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+# Downsampled copy the features are computed on: short side up to 320 px (keeps
+# stat text a few pixels tall), long side up to 1280 px
+FEATURE_SHORT_SIDE = 320
+FEATURE_LONG_SIDE = 1280
+EDGE_THRESHOLD = 32.0  # Greyscale step counted as a (text) edge
+SOFT_GRADIENT_THRESHOLD = 4.0  # Smaller steps are flat areas
+TEXT_ROW_TRANSITIONS = 0.03  # Edge fraction above which a row looks like part of a text line
+MAX_TEXT_LINE_FRACTION = 0.08  # Taller bands of "text rows" are textures or large titles
+TEXT_LINES_FLOOR = 3  # A title and subtitle do not make a stat card
+TEXT_LINES_SATURATION = 12  # This many text lines count as fully text-like
+
+# The weights below are hand-set, not fitted on real article images: a phone
+# photo of a rental-team screen can score under 0.1. The gate therefore ships
+# off; enable a threshold only after benchmarks/eval_team_card_classifier.py
+# shows recall near 1 on a labelled set of real images.
+DEFAULT_TEAM_CARD_THRESHOLD = 0.0
+# Threshold the evaluation reports against (separates the synthetic fixtures)
+CANDIDATE_TEAM_CARD_THRESHOLD = 0.3
+
+# Logistic model: probability = sigmoid(bias + sum(weight * feature))
+_BIAS = -5.0
+_WEIGHTS = {
+    "text_lines": 6.0,
+    "text_row_fraction": 3.0,
+    "edge_crispness": 1.5,
+    "grid_regularity": 0.5,
+    "palette_balance": 1.0,
+    "aspect_penalty": -3.0,
+}
+
+
+def _periodicity(profile: np.ndarray) -> float:
+    """Strongest normalised autocorrelation peak of a projection (0 = none, 1 = perfectly periodic)"""
+    length = profile.size
+    if length < 16:
+        return 0.0
+    centred = profile - profile.mean()
+    energy = float(np.dot(centred, centred))
+    if energy <= 1e-9:
+        return 0.0
+    spectrum = np.fft.rfft(centred, n=2 * length)
+    autocorrelation = np.fft.irfft(spectrum * np.conj(spectrum))[:length] / energy
+    # Ignore tiny lags (adjacent pixels of one stroke) and lags without two full periods
+    window = autocorrelation[max(4, length // 32):length // 2]
+    return float(max(0.0, window.max())) if window.size else 0.0
+
+
+def _count_text_lines(text_rows: np.ndarray) -> int:
+    """Bands of consecutive text rows short enough to be lines of text"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], text_rows.view(np.int8), [0]))))
+    max_height = max(4, int(text_rows.size * MAX_TEXT_LINE_FRACTION))
+    return int(sum(1 for start, end in zip(edges[::2], edges[1::2]) if 2 <= end - start <= max_height))
+
+
+def extract_image_features(image_bytes: bytes) -> Optional[Dict[str, float]]:
+    """
+    Compute the classifier features of an encoded image
+
+    Returns:
+        Feature dict, or None if the image cannot be decoded
+    """
+    try:
+        img = Image.open(BytesIO(image_bytes))
+        width, height = img.size
+        if not (width and height):
+            return None
+        scale = min(1.0, FEATURE_SHORT_SIDE / min(width, height), FEATURE_LONG_SIDE / max(width, height))
+        target = (max(2, round(width * scale)), max(2, round(height * scale)))
+        # Decode JPEGs at reduced size directly
+        img.draft("RGB", (target[0] * 2, target[1] * 2))
+        img = img.convert("RGB").resize(target, Image.BILINEAR)
+    except Exception:
+        return None
+
+    rgb = np.asarray(img, dtype=np.uint8)
+    gray = rgb.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+    grad_x = np.abs(np.diff(gray, axis=1))
+    grad_y = np.abs(np.diff(gray, axis=0))
+    edges_x = grad_x > EDGE_THRESHOLD
+    edges_y = grad_y > EDGE_THRESHOLD
+
+    edge_count = int(edges_x.sum() + edges_y.sum())
+    edge_density = edge_count / float(grad_x.size + grad_y.size)
+
+    # Crisp edges vs soft gradients (anti-aliased text still steps sharply)
+    soft = int(((grad_x > SOFT_GRADIENT_THRESHOLD) & ~edges_x).sum()
+               + ((grad_y > SOFT_GRADIENT_THRESHOLD) & ~edges_y).sum())
+    edge_crispness = edge_count / float(edge_count + soft) if edge_count + soft else 0.0
+
+    flat = (grad_x[:-1, :] <= SOFT_GRADIENT_THRESHOLD) & (grad_y[:, :-1] <= SOFT_GRADIENT_THRESHOLD)
+    flat_fraction = float(flat.mean()) if flat.size else 0.0
+
+    row_transitions = edges_x.mean(axis=1)
+    text_rows = row_transitions > TEXT_ROW_TRANSITIONS
+    text_row_fraction = float(text_rows.mean())
+    line_count = _count_text_lines(text_rows)
+    text_lines = min(1.0, max(0, line_count - TEXT_LINES_FLOOR) / (TEXT_LINES_SATURATION - TEXT_LINES_FLOOR))
+
+    grid_regularity = max(
+        _periodicity(row_transitions.astype(np.float32)),
+        _periodicity(edges_y.mean(axis=0).astype(np.float32)),
+    )
+
+    # 12-bit colour histogram entropy, normalised to [0, 1]
+    quantized = rgb >> 4
+    codes = (quantized[..., 0].astype(np.int32) << 8) | (quantized[..., 1].astype(np.int32) << 4) | quantized[..., 2]
+    counts = np.bincount(codes.ravel(), minlength=4096).astype(np.float64)
+    probabilities = counts[counts > 0] / counts.sum()
+    palette_entropy = float(-(probabilities * np.log2(probabilities)).sum() / 12.0)
+
+    aspect_ratio = width / height
+    return {
+        "edge_density": edge_density,
+        "edge_crispness": edge_crispness,
+        "flat_fraction": flat_fraction,
+        "text_row_fraction": text_row_fraction,
+        "text_lines": text_lines,
+        "grid_regularity": grid_regularity,
+        "palette_entropy": palette_entropy,
+        # Peaks for mid-range palettes (cards), falls off for flat art and photos
+        "palette_balance": max(0.0, 1.0 - abs(palette_entropy - 0.35) / 0.35),
+        "aspect_ratio": aspect_ratio,
+        # 0 for 1:4 .. 4:1, growing for banners and strips
+        "aspect_penalty": max(0.0, abs(math.log(aspect_ratio)) - math.log(4.0)),
+    }
+
+
+def team_card_probability_from_features(features: Dict[str, float]) -> float:
+    """Combine classifier features into a team-card probability"""
+    z = _BIAS + sum(weight * features.get(name, 0.0) for name, weight in _WEIGHTS.items())
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+def team_card_probability(image_bytes: bytes) -> Optional[float]:
+    """
+    Estimate the probability that an image is a team/stat card
+
+    Returns:
+        Probability in [0, 1], or None if the image cannot be decoded
+    """
+    features = extract_image_features(image_bytes)
+    if features is None:
+        return None
+    return team_card_probability_from_features(features)
@@ -0,0 +1,118 @@
+"""
+Perceptual hashing for collapsing near-duplicate article images.
+
+Blog platforms serve the same team card several times (thumbnail, OGP image,
+full-size inline image), usually at different resolutions and JPEG qualities.
+``dhash`` reduces an image to a 64-bit difference hash that survives resizing
+and recompression; ``deduplicate_images`` groups images whose hashes are within
+a small Hamming distance and keeps the highest-resolution copy of each group.
+"""
+
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+DHASH_SIZE = 8  # 8x8 gradient bits -> 64-bit hash
+DUPLICATE_MAX_DISTANCE = 8  # Hamming distance (of 64 bits) still treated as the same image
+DUPLICATE_MAX_ASPECT_DIFFERENCE = 0.1  # Relative aspect ratio difference allowed within a group
+
+
+def dhash(image_bytes: bytes, hash_size: int = DHASH_SIZE) -> Optional[int]:
+    """
+    Compute the difference hash of an encoded image
+
+    The image is reduced to a (hash_size + 1) x hash_size greyscale thumbnail
+    and each bit records whether a pixel is brighter than its right neighbour.
+
+    Returns:
+        Hash as an int of hash_size * hash_size bits, or None if the image
+        cannot be decoded
+    """
+    try:
+        img = Image.open(BytesIO(image_bytes))
+        # Let the JPEG decoder downscale while decoding (much cheaper for large photos)
+        img.draft("L", (hash_size * 8, hash_size * 8))
+        thumbnail = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    except Exception:
+        return None
+
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two hashes"""
+    return bin(first ^ second).count("1")
+
+
+def _resolution(image: Dict[str, Any]) -> tuple:
+    width, height = image.get("size") or (0, 0)
+    return (width * height, image.get("file_size", 0))
+
+
+def _similar_aspect(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+    first_w, first_h = first.get("size") or (0, 0)
+    second_w, second_h = second.get("size") or (0, 0)
+    if not (first_w and first_h and second_w and second_h):
+        return True  # Unknown size - rely on the hash alone
+    first_ratio = first_w / first_h
+    second_ratio = second_w / second_h
+    return abs(first_ratio - second_ratio) <= DUPLICATE_MAX_ASPECT_DIFFERENCE * max(first_ratio, second_ratio)
+
+
+def is_near_duplicate(first: Dict[str, Any], second: Dict[str, Any],
+                      max_distance: int = DUPLICATE_MAX_DISTANCE) -> bool:
+    """Whether two images are copies of one picture (hashes close, same aspect ratio)"""
+    first_hash = first.get("dhash")
+    second_hash = second.get("dhash")
+    if first_hash is None or second_hash is None:
+        return False
+    return hamming_distance(first_hash, second_hash) <= max_distance and _similar_aspect(first, second)
+
+
+def deduplicate_images(images: List[Dict[str, Any]],
+                       max_distance: int = DUPLICATE_MAX_DISTANCE) -> List[Dict[str, Any]]:
+    """
+    Collapse near-duplicate images, keeping the highest-resolution copy
+
+    Images are compared by their ``dhash`` entry (computed at download time);
+    images without a hash are always kept. The kept copy inherits the best
+    team card score and priority flags of its group and lists the dropped
+    copies under ``duplicate_urls``, so ranking does not lose signals that
+    only the thumbnail's alt text or URL carried.
+
+    Args:
+        images: Image records (or dicts) from extract_images_from_url
+        max_distance: Maximum Hamming distance between duplicate hashes
+
+    Returns:
+        Deduplicated images, in the order of their first occurrence
+    """
+    # Highest resolution first, so each group is represented by its best copy
+    order = sorted(range(len(images)), key=lambda i: _resolution(images[i]), reverse=True)
+
+    groups: List[List[int]] = []
+    for index in order:
+        for group in groups:
+            if is_near_duplicate(images[group[0]], images[index], max_distance):
+                group.append(index)
+                break
+        else:
+            groups.append([index])
+
+    deduplicated = []
+    for group in sorted(groups, key=min):
+        best = images[group[0]]
+        if len(group) > 1:
+            duplicates = [images[i] for i in group[1:]]
+            best = best.copy()  # Dicts and ImageRecords alike
+            best["team_card_score"] = max(image.get("team_card_score", 0) for image in [best] + duplicates)
+            for flag in ("is_note_com_asset", "is_hatenablog_asset", "is_likely_team_card"):
+                best[flag] = any(image.get(flag, False) for image in [best] + duplicates)
+            best["duplicate_urls"] = [image.get("url") for image in duplicates]
+        deduplicated.append(best)
+
+    return deduplicated
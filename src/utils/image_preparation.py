@@ -0,0 +1,212 @@
+"""
+Image preparation before Gemini Vision analysis.
+
+Team cards are often multi-megabyte PNG screenshots, far above the resolution
+the vision model actually looks at. ``prepare_image_for_vision`` crops uniform
+borders, downsizes to ``VISION_MAX_DIMENSION`` on the long side (LANCZOS, so
+small stat text stays legible) and re-encodes to WebP or JPEG (lossless PNG
+when that is smaller for flat graphics), keeping the original bytes whenever
+re-encoding would not make the payload smaller.
+"""
+
+import base64
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional, Tuple
+
+from PIL import Image, ImageChops, features
+
+# Gemini tiles large images into 768px crops; two tiles on the long side keeps
+# team-card text readable while capping tokens and upload size
+VISION_MAX_DIMENSION = 1536
+VISION_WEBP_QUALITY = 90
+VISION_JPEG_QUALITY = 90
+
+# Border cropping: pixels within this distance of the corner colour count as border
+BORDER_TOLERANCE = 12
+BORDER_PADDING = 4
+MIN_BORDER_CROP_FRACTION = 0.03  # Ignore crops that remove less than 3% of the area
+
+
+@dataclass
+class PreparedImage:
+    """Image payload ready for the vision API"""
+
+    data: bytes
+    mime_type: str
+    size: Tuple[int, int]
+    original_size: Tuple[int, int]
+    original_bytes: int
+    cropped: bool = False
+    resized: bool = False
+    reencoded: bool = False
+
+    @property
+    def byte_savings(self) -> int:
+        return self.original_bytes - len(self.data)
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.data).decode("utf-8")
+
+
+def _webp_available() -> bool:
+    try:
+        return bool(features.check("webp"))
+    except Exception:
+        return False
+
+
+_WEBP_AVAILABLE = _webp_available()
+
+# Magic numbers for images PIL cannot decode (truncated or corrupt payloads)
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"GIF87a", "GIF"),
+    (b"GIF89a", "GIF"),
+    (b"BM", "BMP"),
+)
+
+
+def _detect_image_format(image_bytes: bytes) -> Optional[str]:
+    """Format name from the file signature, or None if it is not recognised"""
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "WEBP"
+    for signature, image_format in _IMAGE_SIGNATURES:
+        if image_bytes.startswith(signature):
+            return image_format
+    return None
+
+
+def _mime_type(image_format: str) -> str:
+    image_format = image_format.upper()
+    return f"image/{'jpeg' if image_format == 'JPG' else image_format.lower()}"
+
+
+def crop_uniform_border(img: Image.Image, tolerance: int = BORDER_TOLERANCE,
+                        padding: int = BORDER_PADDING) -> Optional[Image.Image]:
+    """
+    Crop a uniform border (letterboxing, blank margins) around the content
+
+    The border colour is taken from the top-left pixel; nothing is cropped
+    unless at least MIN_BORDER_CROP_FRACTION of the area goes away.
+
+    Returns:
+        Cropped image, or None if there is no significant border
+    """
+    rgb = img.convert("RGB")
+    background = Image.new("RGB", rgb.size, rgb.getpixel((0, 0)))
+    diff = ImageChops.difference(rgb, background).convert("L")
+    mask = diff.point(lambda value: 255 if value > tolerance else 0)
+    bbox = mask.getbbox()
+    if not bbox:
+        return None  # Entirely uniform - nothing worth keeping or cropping
+
+    left, top, right, bottom = bbox
+    left = max(0, left - padding)
+    top = max(0, top - padding)
+    right = min(img.width, right + padding)
+    bottom = min(img.height, bottom + padding)
+
+    kept_area = (right - left) * (bottom - top)
+    if kept_area >= img.width * img.height * (1 - MIN_BORDER_CROP_FRACTION):
+        return None
+    return img.crop((left, top, right, bottom))
+
+
+def prepare_image_for_vision(image_bytes: bytes, max_dimension: int = VISION_MAX_DIMENSION,
+                             crop_borders: bool = True, output_format: Optional[str] = None,
+                             image_format: Optional[str] = None) -> PreparedImage:
+    """
+    Shrink an image to the payload the vision model needs
+
+    Args:
+        image_bytes: Original encoded image
+        max_dimension: Longest side after resizing (no upscaling)
+        crop_borders: Remove uniform borders first
+        output_format: "WEBP" or "JPEG"; defaults to WebP when Pillow supports it
+        image_format: Format the caller knows the original as (e.g. "JPEG"),
+            used for the MIME type when the image cannot be decoded
+
+    Returns:
+        PreparedImage; falls back to the original bytes if it cannot be decoded
+        or if re-encoding does not reduce the payload
+    """
+    try:
+        img = Image.open(BytesIO(image_bytes))
+        original_format = (img.format or "PNG").upper()
+        img.load()
+    except Exception:
+        # Label the original by its file signature, else by what the caller says it is
+        if image_format and image_format.lower() == "unknown":
+            image_format = None
+        fallback_format = _detect_image_format(image_bytes) or image_format or "PNG"
+        return PreparedImage(
+            data=image_bytes, mime_type=_mime_type(fallback_format), size=(0, 0),
+            original_size=(0, 0), original_bytes=len(image_bytes),
+        )
+
+    original_size = img.size
+    original_mime = _mime_type(original_format)
+    cropped = resized = False
+
+    if crop_borders:
+        cropped_img = crop_uniform_border(img)
+        if cropped_img is not None:
+            img = cropped_img
+            cropped = True
+
+    if max(img.size) > max_dimension:
+        scale = max_dimension / max(img.size)
+        new_size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.resize(new_size, Image.LANCZOS)
+        resized = True
+
+    if output_format is None:
+        output_format = "WEBP" if _WEBP_AVAILABLE else "JPEG"
+    output_format = output_format.upper()
+
+    # Flatten transparency onto white - team cards are read as opaque images
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        flattened = Image.new("RGB", rgba.size, (255, 255, 255))
+        flattened.paste(rgba, mask=rgba.split()[-1])
+        img = flattened
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    buffer = BytesIO()
+    if output_format == "WEBP":
+        img.save(buffer, format="WEBP", quality=VISION_WEBP_QUALITY, method=4)
+        mime_type = "image/webp"
+    else:
+        # No chroma subsampling: coloured stat text stays sharp
+        img.save(buffer, format="JPEG", quality=VISION_JPEG_QUALITY, subsampling=0, optimize=True)
+        mime_type = "image/jpeg"
+    data = buffer.getvalue()
+
+    if len(data) >= len(image_bytes) and (cropped or resized):
+        # Flat-colour graphics compress better losslessly - keep the smaller payload
+        png_buffer = BytesIO()
+        img.save(png_buffer, format="PNG", optimize=True)
+        if png_buffer.tell() < len(data):
+            data = png_buffer.getvalue()
+            mime_type = "image/png"
+
+    if len(data) >= len(image_bytes) and not (cropped or resized):
+        # Nothing gained - send the original untouched
+        return PreparedImage(
+            data=image_bytes, mime_type=original_mime, size=original_size,
+            original_size=original_size, original_bytes=len(image_bytes),
+        )
+
+    return PreparedImage(
+        data=data,
+        mime_type=mime_type,
+        size=img.size,
+        original_size=original_size,
+        original_bytes=len(image_bytes),
+        cropped=cropped,
+        resized=resized,
+        reencoded=True,
+    )
@@ -0,0 +1,152 @@
+"""
+Slotted record for downloaded article images.
+
+Image dicts used to carry the image as a base64 ``str`` ("data"), a third
+larger than the file itself, which every consumer (PIL, hashing, tiling,
+image preparation) decoded again. ``ImageRecord`` keeps the raw bytes
+instead; base64 is only produced at the Gemini API boundary, or lazily
+through the ``data`` property for code that still expects it.
+
+Records support the mapping operations the pipeline uses on image dicts
+(``record["url"]``, ``record.get("size")``, ``"sha256" in record``), so
+plain dicts and records are interchangeable. ``release()`` drops the
+payload once vision analysis is done, so only metadata stays alive in the
+analysis result.
+"""
+
+import base64
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+# Metadata fields, in the order image dicts used to list them
+IMAGE_RECORD_FIELDS = (
+    "url",
+    "format",
+    "size",
+    "alt_text",
+    "title",
+    "content_type",
+    "is_note_com_asset",
+    "is_hatenablog_asset",
+    "is_likely_team_card",
+    "team_card_score",
+    "file_size",
+    "sha256",
+    "dhash",
+    "team_card_probability",
+    "duplicate_urls",
+    "confidence_score",
+)
+
+ImagePayload = Union[bytes, bytearray, memoryview, str]
+
+
+def image_bytes(image_data: ImagePayload) -> bytes:
+    """
+    Raw bytes of an image payload
+
+    Args:
+        image_data: Raw bytes (or a buffer over them), or a base64 string as
+            carried by legacy image dicts
+
+    Returns:
+        The encoded image file
+    """
+    if isinstance(image_data, str):
+        return base64.b64decode(image_data)
+    if isinstance(image_data, bytes):
+        return image_data
+    return bytes(image_data)
+
+
+class ImageRecord:
+    """One downloaded image: raw payload plus the metadata the pipeline ranks it by"""
+
+    __slots__ = ("content",) + IMAGE_RECORD_FIELDS
+
+    def __init__(self, content: Optional[bytes] = None, **fields: Any):
+        self.content = content
+        for name in IMAGE_RECORD_FIELDS:
+            setattr(self, name, None)
+        for name, value in fields.items():
+            self[name] = value
+
+    # Legacy base64 view of the payload
+
+    @property
+    def data(self) -> Optional[str]:
+        """Base64 payload (encoded on each access; prefer ``content``)"""
+        if self.content is None:
+            return None
+        return base64.b64encode(self.content).decode("utf-8")
+
+    @data.setter
+    def data(self, value: Optional[ImagePayload]):
+        self.content = None if value is None else image_bytes(value)
+
+    @property
+    def released(self) -> bool:
+        return self.content is None
+
+    def release(self):
+        """Drop the payload; metadata stays available"""
+        self.content = None
+
+    # Mapping-style access, compatible with the old image dicts
+
+    def _check_key(self, key: str):
+        if key not in IMAGE_RECORD_FIELDS and key not in ("data", "content"):
+            raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        self._check_key(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        self._check_key(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        if key in ("data", "content"):
+            return self.content is not None
+        return key in IMAGE_RECORD_FIELDS and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Iterator[str]:
+        if self.content is not None:
+            yield "data"
+        for name in IMAGE_RECORD_FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for key in self.keys():
+            yield key, self[key]
+
+    def copy(self) -> "ImageRecord":
+        """Shallow copy sharing the (immutable) payload"""
+        clone = ImageRecord(self.content)
+        for name in IMAGE_RECORD_FIELDS:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def to_dict(self, include_data: bool = False) -> Dict[str, Any]:
+        """
+        Plain dict of the record
+
+        Args:
+            include_data: Add the base64 payload under "data" (as the old
+                image dicts did); off by default so results and session
+                state only hold metadata
+        """
+        result = {name: getattr(self, name) for name in IMAGE_RECORD_FIELDS if getattr(self, name) is not None}
+        if include_data and self.content is not None:
+            result = {"data": self.data, **result}
+        return result
+
+    def __repr__(self) -> str:
+        payload = "released" if self.content is None else f"{len(self.content)} bytes"
+        return f"ImageRecord(url={self.url!r}, format={self.format!r}, size={self.size!r}, {payload})"
@@ -0,0 +1,150 @@
+"""
+Responsive and lazy-loaded image source resolution.
+
+Article images are rarely just ``<img src>``: blogs publish several
+renditions through ``srcset`` / ``<picture><source>``, and lazy-loading
+scripts keep the real URL in ``data-src`` / ``data-srcset`` while ``src``
+holds a tiny placeholder. ``select_image_url`` gathers every source of an
+``<img>`` tag and picks the smallest rendition that still meets the
+resolution the vision stage works at, so neither huge originals nor
+placeholders are downloaded.
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+from .image_preparation import VISION_MAX_DIMENSION
+
+# Attributes lazy-loading libraries use for the real image URL / srcset
+LAZY_SRC_ATTRIBUTES = ("data-src", "data-original", "data-lazy-src", "data-lazy", "data-url")
+LAZY_SRCSET_ATTRIBUTES = ("data-srcset", "data-lazy-srcset")
+
+# src values that are placeholders rather than the image
+_PLACEHOLDER_PATTERN = re.compile(r"(?:placeholder|spacer|blank|loading|lazy|transparent|1x1|pixel)\.(?:gif|png|svg)",
+                                  re.IGNORECASE)
+_DESCRIPTOR_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)([wx])$", re.IGNORECASE)
+
+
+class ImageSource(NamedTuple):
+    """One rendition of an image"""
+
+    url: str
+    width: Optional[int] = None  # From a "640w" descriptor
+    density: Optional[float] = None  # From a "2x" descriptor
+
+
+def is_placeholder_url(url: Optional[str]) -> bool:
+    """True for inline data URIs and well-known lazy-load placeholder files"""
+    if not url:
+        return True
+    url = url.strip()
+    return url.startswith("data:") or bool(_PLACEHOLDER_PATTERN.search(url))
+
+
+def parse_srcset(value: Optional[str]) -> List[ImageSource]:
+    """
+    Parse a srcset attribute ("a.png 640w, b.png 1280w" or "a.png 1x, b.png 2x")
+
+    Candidates are separated by commas followed by whitespace, so commas inside
+    URLs (common in image CDN parameters) are preserved.
+    """
+    sources = []
+    if not value:
+        return sources
+    for candidate in re.split(r",\s+", value.strip()):
+        parts = candidate.strip().rstrip(",").split()
+        if not parts:
+            continue
+        url, width, density = parts[0], None, None
+        for descriptor in parts[1:]:
+            match = _DESCRIPTOR_PATTERN.match(descriptor)
+            if not match:
+                continue
+            if match.group(2).lower() == "w":
+                width = int(float(match.group(1)))
+            else:
+                density = float(match.group(1))
+        if width is None and density is None:
+            density = 1.0  # A bare URL in srcset means 1x
+        sources.append(ImageSource(url, width, density))
+    return sources
+
+
+def collect_image_sources(img_tag) -> List[ImageSource]:
+    """
+    Every non-placeholder source of an <img> tag
+
+    Looks at ``srcset`` / lazy srcset attributes, the ``<source>`` elements of
+    an enclosing ``<picture>``, lazy ``data-*`` URLs and finally ``src``.
+    """
+    sources: List[ImageSource] = []
+
+    picture = img_tag.parent if getattr(img_tag.parent, "name", None) == "picture" else None
+    if picture is not None:
+        for source_tag in picture.find_all("source"):
+            media_type = (source_tag.get("type") or "").lower()
+            if media_type and not media_type.startswith("image/"):
+                continue
+            for attribute in ("srcset",) + LAZY_SRCSET_ATTRIBUTES:
+                sources.extend(parse_srcset(source_tag.get(attribute)))
+
+    for attribute in ("srcset",) + LAZY_SRCSET_ATTRIBUTES:
+        sources.extend(parse_srcset(img_tag.get(attribute)))
+
+    for attribute in LAZY_SRC_ATTRIBUTES + ("src",):
+        value = img_tag.get(attribute)
+        if value:
+            sources.append(ImageSource(value.strip()))
+
+    return [source for source in sources if not is_placeholder_url(source.url)]
+
+
+def _declared_width(img_tag) -> Optional[int]:
+    try:
+        return int(str(img_tag.get("width", "")).strip().rstrip("px"))
+    except ValueError:
+        return None
+
+
+def select_image_url(img_tag, base_url: str, target_width: int = VISION_MAX_DIMENSION) -> Optional[str]:
+    """
+    Pick the rendition of an <img> to download
+
+    Prefers the smallest rendition at least ``target_width`` pixels wide
+    (falling back to the largest available one), using "w" descriptors
+    directly and "x" descriptors scaled by the tag's declared width. Sources
+    without descriptors (lazy ``data-src`` before ``src``) are used when no
+    responsive rendition exists.
+
+    Args:
+        img_tag: BeautifulSoup <img> element
+        base_url: URL relative sources are resolved against
+        target_width: Width the vision stage needs
+
+    Returns:
+        Absolute URL, or None if the tag only has placeholders
+    """
+    sources = collect_image_sources(img_tag)
+    if not sources:
+        return None
+
+    declared_width = _declared_width(img_tag)
+    sized = []
+    for source in sources:
+        if source.width is not None:
+            sized.append((source.width, source.url))
+        elif source.density is not None and declared_width:
+            sized.append((int(declared_width * source.density), source.url))
+
+    if sized:
+        large_enough = [entry for entry in sized if entry[0] >= target_width]
+        width, url = min(large_enough) if large_enough else max(sized)
+        return urljoin(base_url, url)
+
+    # Density-only srcset without a declared width: highest density is the largest file
+    dense = [source for source in sources if source.density is not None]
+    if dense:
+        return urljoin(base_url, max(dense, key=lambda source: source.density).url)
+
+    return urljoin(base_url, sources[0].url)
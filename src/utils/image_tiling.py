@@ -0,0 +1,141 @@
+"""
+Tiling of tall team-card composites before vision analysis.
+
+Many Japanese team cards stack six Pokemon panels vertically into one very
+tall image. Downscaled as a whole to the vision resolution, the small stat
+numbers become unreadable. ``split_tall_image`` finds the panel boundaries
+from a row-variance projection (separator rows are uniform, so their pixel
+variance is close to zero), cuts the image into per-panel tiles at full
+resolution and falls back to evenly spaced, overlapping tiles when no
+separators are found.
+"""
+
+import math
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .image_preparation import VISION_MAX_DIMENSION
+
+MAX_TILES_PER_IMAGE = 6
+TILE_MIN_ASPECT_RATIO = 1.5  # height / width from which an image counts as "tall"
+SEPARATOR_ROW_VARIANCE = 25.0  # Rows below this greyscale variance are uniform
+MIN_SEPARATOR_ROWS = 3
+MIN_TILE_HEIGHT_FRACTION = 0.2  # Of the image width - smaller bands are text lines, not panels
+WEAK_SEPARATOR_FRACTION = 0.5  # Ignore gaps shorter than this fraction of the strongest one
+FALLBACK_TILE_OVERLAP = 0.08  # Overlap between evenly spaced tiles (keeps cut text readable)
+
+
+def is_tall_image(size: Tuple[int, int]) -> bool:
+    """True for images that lose detail when downscaled to the vision resolution"""
+    width, height = size
+    return bool(width and height) and height > VISION_MAX_DIMENSION and height >= width * TILE_MIN_ASPECT_RATIO
+
+
+def _uniform_runs(row_variance: np.ndarray) -> List[Tuple[int, int]]:
+    """(start, end) of every run of uniform rows at least MIN_SEPARATOR_ROWS long"""
+    uniform = row_variance < SEPARATOR_ROW_VARIANCE
+    # Run boundaries from the derivative of the padded boolean mask
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], uniform.view(np.int8), [0]))))
+    return [(start, end) for start, end in zip(edges[::2], edges[1::2]) if end - start >= MIN_SEPARATOR_ROWS]
+
+
+def find_panel_bands(gray: np.ndarray, max_tiles: int = MAX_TILES_PER_IMAGE) -> List[Tuple[int, int]]:
+    """
+    Detect vertically stacked panels from the row-variance projection
+
+    Outer margins are trimmed; inner uniform runs become cut candidates and are
+    accepted strongest (longest) first while every band stays at least
+    MIN_TILE_HEIGHT_FRACTION of the width tall, so the blank space between
+    text lines inside one panel is not mistaken for a panel boundary.
+
+    Args:
+        gray: 2-D greyscale pixel array
+        max_tiles: Maximum number of bands
+
+    Returns:
+        (top, bottom) row ranges in order; a single band when no panels are found
+    """
+    height, width = gray.shape
+    runs = _uniform_runs(gray.var(axis=1))
+
+    top, bottom = 0, height
+    inner = []
+    for start, end in runs:
+        if start == 0:
+            top = end
+        elif end == height:
+            bottom = start
+        else:
+            inner.append((start, end))
+    if bottom <= top:
+        return [(0, height)]
+
+    min_band = max(1, int(width * MIN_TILE_HEIGHT_FRACTION))
+    cuts: List[int] = []
+    strongest = None
+    for start, end in sorted(inner, key=lambda run: run[1] - run[0], reverse=True):
+        if len(cuts) + 1 >= max_tiles:
+            break
+        if strongest is not None and end - start < strongest * WEAK_SEPARATOR_FRACTION:
+            break
+        cut = (start + end) // 2
+        bounds = sorted(cuts + [cut])
+        edges = [top] + bounds + [bottom]
+        if all(later - earlier >= min_band for earlier, later in zip(edges, edges[1:])):
+            cuts = bounds
+            strongest = strongest or end - start
+
+    edges = [top] + cuts + [bottom]
+    return list(zip(edges, edges[1:]))
+
+
+def _even_bands(height: int, width: int, max_tiles: int) -> List[Tuple[int, int]]:
+    """Evenly spaced, overlapping bands (no separators found)"""
+    count = max(2, min(max_tiles, math.ceil(height / width)))
+    step = height / count
+    overlap = int(step * FALLBACK_TILE_OVERLAP)
+    return [
+        (max(0, int(index * step) - overlap), min(height, int((index + 1) * step) + overlap))
+        for index in range(count)
+    ]
+
+
+def split_tall_image(image_bytes: bytes, max_tiles: int = MAX_TILES_PER_IMAGE) -> Optional[List[bytes]]:
+    """
+    Split a tall team card into per-panel tiles
+
+    Args:
+        image_bytes: Encoded image
+        max_tiles: Cap on tiles per image
+
+    Returns:
+        PNG-encoded tiles from top to bottom, or None if the image is not tall
+        (or cannot be decoded) and should be analysed whole
+    """
+    if max_tiles < 2:
+        return None
+    try:
+        img = Image.open(BytesIO(image_bytes))
+        if not is_tall_image(img.size):
+            return None
+        img.load()
+    except Exception:
+        return None
+
+    gray = np.asarray(img.convert("L"), dtype=np.float32)
+    bands = find_panel_bands(gray, max_tiles)
+    if len(bands) < 2:
+        bands = _even_bands(img.height, img.width, max_tiles)
+
+    if img.mode not in ("RGB", "RGBA", "L"):
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+    tiles = []
+    for top, bottom in bands:
+        buffer = BytesIO()
+        img.crop((0, top, img.width, bottom)).save(buffer, format="PNG")
+        tiles.append(buffer.getvalue())
+    return tiles
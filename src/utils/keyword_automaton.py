@@ -0,0 +1,150 @@
+"""
+Precompiled multi-keyword matcher used for content and team-card scoring.
+
+Scoring code in the scraper and image analyzer used to call ``str.count`` or
+``in`` once per indicator, i.e. one full scan of the text for every keyword.
+``KeywordAutomaton`` folds the whole keyword set into a single trie-shaped
+regular expression, so a text is scanned once no matter how many keywords
+are registered.
+
+A single left-to-right scan only reports non-overlapping matches, while
+``str.count`` counts every keyword independently. The automaton therefore
+records, at build time, which keywords can be hidden inside (or straddle the
+end of) a longer match, and re-counts just those keywords when their
+"shadowing" keyword was actually seen. The results are identical to calling
+``text.count(keyword)`` for every keyword.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Union
+
+
+class KeywordAutomaton:
+    """Counts many keywords in one pass with ``str.count`` semantics"""
+
+    def __init__(self, keywords: Union[Mapping[str, int], Iterable[str]], ignore_case: bool = True):
+        """
+        Build the automaton
+
+        Args:
+            keywords: Keyword -> weight mapping, or a plain iterable of keywords
+                (each weighted 1)
+            ignore_case: Lowercase keywords (callers then pass lowercased text)
+        """
+        if isinstance(keywords, Mapping):
+            items = list(keywords.items())
+        else:
+            items = [(keyword, 1) for keyword in keywords]
+
+        self.ignore_case = ignore_case
+        self.weights: Dict[str, int] = {}
+        for keyword, weight in items:
+            if not keyword:
+                continue
+            key = keyword.lower() if ignore_case else keyword
+            self.weights[key] = self.weights.get(key, 0) + weight
+
+        self.keywords: List[str] = list(self.weights)
+        self._shadowed_by = self._build_shadow_table(self.keywords)
+        self._pattern: Optional[re.Pattern] = (
+            re.compile(self._trie_to_regex(self._build_trie(self.keywords))) if self.keywords else None
+        )
+
+    @staticmethod
+    def _build_trie(keywords: List[str]) -> Dict[str, dict]:
+        """Build a character trie; the empty-string key marks a keyword end"""
+        root: Dict[str, dict] = {}
+        for keyword in keywords:
+            node = root
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        return root
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict[str, dict]) -> str:
+        """
+        Compile a trie into a prefix-factored regex
+
+        Longer branches are tried before the terminal marker so the scan
+        always takes the longest keyword starting at a position.
+        """
+        terminal = "" in node
+        branches = []
+        for char in sorted(key for key in node if key):
+            branches.append(re.escape(char) + cls._trie_to_regex(node[char]))
+
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = "|".join(branches)
+        if terminal:
+            return f"(?:{body})?"
+        return f"(?:{body})"
+
+    @staticmethod
+    def _build_shadow_table(keywords: List[str]) -> Dict[str, Set[str]]:
+        """
+        Map each keyword to the keywords whose occurrences it can swallow
+
+        ``b`` is shadowed by ``a`` when ``b`` is a substring of ``a`` or when a
+        proper suffix of ``a`` is a prefix of ``b``; a match of ``a`` may then
+        hide an occurrence of ``b`` from the single scan.
+        """
+        shadowed_by: Dict[str, Set[str]] = {}
+        for a in keywords:
+            for b in keywords:
+                if a == b:
+                    continue
+                if b in a or any(b.startswith(a[i:]) for i in range(1, len(a))):
+                    shadowed_by.setdefault(a, set()).add(b)
+        return shadowed_by
+
+    def _prepare(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def count_all(self, text: str, prepared: bool = False) -> Dict[str, int]:
+        """
+        Count every keyword occurring in the text
+
+        Args:
+            text: Text to scan
+            prepared: True if the caller already lowercased the text
+
+        Returns:
+            Keyword -> occurrence count (keywords that do not occur are omitted)
+        """
+        if not text or self._pattern is None:
+            return {}
+        if not prepared:
+            text = self._prepare(text)
+
+        counts = dict(Counter(self._pattern.findall(text)))
+
+        # Re-count keywords that a longer/adjacent match could have hidden
+        recount: Set[str] = set()
+        for keyword in counts:
+            recount.update(self._shadowed_by.get(keyword, ()))
+        for keyword in recount:
+            occurrences = text.count(keyword)
+            if occurrences:
+                counts[keyword] = occurrences
+            else:
+                counts.pop(keyword, None)
+        return counts
+
+    def find_present(self, text: str, prepared: bool = False) -> Set[str]:
+        """Return the set of keywords that occur at least once in the text"""
+        return set(self.count_all(text, prepared=prepared))
+
+    def score(self, text: str, prepared: bool = False) -> int:
+        """Sum of ``count * weight`` over all keywords found in the text"""
+        weights = self.weights
+        return sum(weights[keyword] * count for keyword, count in self.count_all(text, prepared).items())
+
+    def score_present(self, text: str, prepared: bool = False) -> int:
+        """Sum of weights of the keywords that occur at least once in the text"""
+        weights = self.weights
+        return sum(weights[keyword] for keyword in self.count_all(text, prepared))
@@ -0,0 +1,258 @@
+"""
+Bitset learnset index for move-legality checks.
+
+Every move of ``data/learnsets.csv`` gets a bit position, and every species
+(the rows of the bundled Pokedex) the integer whose bits are the moves it
+learns. Checking a moveset is then one OR to build its mask and one AND
+against the species::
+
+    index = get_learnset_index()
+    index.illegal_moves("Calyrex-Ice", ["Ice Burn", "Protect"])   # ["Ice Burn"]
+    index.rank_species(["Ice Burn", "Freeze-Dry"])                # [("Kyurem-White", 2), ...]
+
+The same bitsets are kept as a ``(species, words)`` uint64 matrix, so
+finding the species most consistent with a moveset is a vectorised AND and
+popcount over every species at once.
+
+The learnsets are curated VGC movepools, not complete ones, so a move missing
+from a row is no evidence that the species cannot learn it. Only signature
+moves, which the source marks as exclusive to a few rows, can be illegal.
+"""
+
+import csv
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .pokedex import get_pokedex, normalize_pokedex_name
+
+DEFAULT_LEARNSET_PATH = os.path.join(os.path.dirname(__file__), "data", "learnsets.csv")
+
+# Learned by (virtually) every fully evolved species
+UNIVERSAL_MOVES = ("Protect", "Substitute", "Endure", "Tera Blast", "Rest", "Sleep Talk")
+# `inherits` value of species that learn every move (Smeargle's Sketch)
+SKETCH = "*"
+
+DEFAULT_RANK_LIMIT = 5
+
+
+def normalize_move_name(move: str) -> str:
+    """Lookup key of a move: lowercase letters and digits only ("U-turn" -> "uturn")"""
+    return re.sub(r"[^0-9a-z]", "", move.lower())
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a uint64 matrix"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+class LearnsetIndex:
+    """Species x move bitsets"""
+
+    def __init__(self, species: Sequence[str], learnsets: Mapping[str, Iterable[str]],
+                 sketchers: Iterable[str] = (), signature_moves: Iterable[str] = ()):
+        """
+        Build the bitsets
+
+        Args:
+            species: Row names (the Pokedex names)
+            learnsets: Species name -> moves it learns; species without an
+                entry have no known learnset and are never judged
+            sketchers: Species that learn every move
+            signature_moves: Moves only the species listing them learn; the
+                only moves a species can be judged not to learn
+        """
+        self.species = list(species)
+        self._rows = {normalize_pokedex_name(name): row for row, name in enumerate(self.species)}
+
+        self.moves: List[str] = []
+        self._move_bits: Dict[str, int] = {}
+        for moves in [UNIVERSAL_MOVES, *learnsets.values()]:
+            for move in moves:
+                key = normalize_move_name(move)
+                if key and key not in self._move_bits:
+                    self._move_bits[key] = len(self.moves)
+                    self.moves.append(move)
+
+        universal, _ = self.move_mask(UNIVERSAL_MOVES)
+        self.signature, _ = self.move_mask(signature_moves)
+        every_move = (1 << len(self.moves)) - 1
+        sketchers = {normalize_pokedex_name(name) for name in sketchers}
+        self.bitsets: List[int] = [0] * len(self.species)
+        self.known = np.zeros(len(self.species), dtype=bool)
+        self.sketch = np.zeros(len(self.species), dtype=bool)
+        for name, moves in learnsets.items():
+            row = self._rows.get(normalize_pokedex_name(name))
+            if row is None:
+                continue
+            self.bitsets[row] = universal | self.move_mask(moves)[0]
+            self.known[row] = True
+        for row, name in enumerate(self.species):
+            if normalize_pokedex_name(name) in sketchers:
+                self.bitsets[row] = every_move
+                self.known[row] = self.sketch[row] = True
+
+        self.words = max(1, (len(self.moves) + 63) // 64)
+        self.matrix = np.vstack([self._to_words(bits) for bits in self.bitsets]) if self.species else (
+            np.zeros((0, self.words), dtype=np.uint64))
+
+    def _to_words(self, bits: int) -> np.ndarray:
+        return np.frombuffer(bits.to_bytes(self.words * 8, "little"), dtype="<u8").astype(np.uint64)
+
+    def move_mask(self, moves: Iterable[str]) -> Tuple[int, List[str]]:
+        """
+        Bitset of a moveset
+
+        Args:
+            moves: Move names
+
+        Returns:
+            (mask of the known moves, moves the index does not know)
+        """
+        mask, unknown = 0, []
+        for move in moves:
+            if not isinstance(move, str) or not move.strip():
+                continue
+            bit = self._move_bits.get(normalize_move_name(move))
+            if bit is None:
+                unknown.append(move)
+            else:
+                mask |= 1 << bit
+        return mask, unknown
+
+    def species_row(self, name: Optional[str]) -> Optional[int]:
+        """Row of a species with a known learnset; forms without one fall back to the base species"""
+        if not name:
+            return None
+        parts = name.strip().split("-")
+        while parts:
+            row = self._rows.get(normalize_pokedex_name("-".join(parts)))
+            if row is not None and self.known[row]:
+                return row
+            parts.pop()
+        return None
+
+    def learns(self, species: str, move: str) -> Optional[bool]:
+        """Whether a species learns a move; None if the species or move is unknown"""
+        row = self.species_row(species)
+        bit = self._move_bits.get(normalize_move_name(move))
+        if row is None or bit is None:
+            return None
+        return bool(self.bitsets[row] >> bit & 1)
+
+    def illegal_moves(self, species: str, moves: Iterable[str]) -> Optional[List[str]]:
+        """
+        Signature moves of other species among a species' moves
+
+        Args:
+            species: Species name
+            moves: Its moves
+
+        Returns:
+            The illegal moves in input order, or None if the species has no
+            known learnset
+        """
+        row = self.species_row(species)
+        if row is None:
+            return None
+        moves = list(moves)
+        mask, _ = self.move_mask(moves)
+        illegal = mask & self.signature & ~self.bitsets[row]
+        if not illegal:
+            return []
+        return [move for move in moves if self.move_mask([move])[0] & illegal]
+
+    def is_legal(self, species: str, moves: Iterable[str]) -> bool:
+        """True unless one of the moves is another species' signature move"""
+        return not self.illegal_moves(species, moves)
+
+    def rank_species(self, moves: Iterable[str], limit: int = DEFAULT_RANK_LIMIT) -> List[Tuple[str, int]]:
+        """
+        Species most consistent with a moveset
+
+        Sketch users learn everything and are left out: they fit every moveset.
+
+        Args:
+            moves: Observed moves
+            limit: Maximum number of species
+
+        Returns:
+            (species, number of the known moves it learns), best first; ties
+            keep Pokedex order
+        """
+        mask, _ = self.move_mask(moves)
+        if not mask or limit <= 0:
+            return []
+        counts = _popcount(self.matrix & self._to_words(mask))
+        counts[~self.known | self.sketch] = 0
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return [(self.species[row], int(counts[row])) for row in order if counts[row] > 0]
+
+
+def read_learnset_source(path: str = DEFAULT_LEARNSET_PATH) -> Tuple[Dict[str, List[str]], List[str], List[str]]:
+    """
+    Learnsets of the CSV source with inheritance resolved
+
+    Returns:
+        (species name -> moves, species that learn every move, signature moves)
+
+    Raises:
+        ValueError: If a row inherits from an unknown or circular parent, or
+            a signature move is also listed as an ordinary move
+    """
+    with open(path, encoding="utf-8") as f:
+        rows = {
+            row["name"].strip(): row
+            for row in csv.DictReader(line for line in f if not line.startswith("#") and line.strip())
+        }
+
+    def split(row: Dict[str, str], column: str) -> List[str]:
+        return [move.strip() for move in (row.get(column) or "").split(";") if move.strip()]
+
+    signature_moves = list(dict.fromkeys(move for row in rows.values() for move in split(row, "signature")))
+    signature_keys = {normalize_move_name(move) for move in signature_moves}
+    for name, row in rows.items():
+        for move in split(row, "moves"):
+            if normalize_move_name(move) in signature_keys:
+                raise ValueError(f"Signature move {move} listed as an ordinary move of {name}")
+
+    resolved: Dict[str, List[str]] = {}
+    sketchers: List[str] = []
+
+    def resolve(name: str, chain: Tuple[str, ...] = ()) -> List[str]:
+        if name in resolved:
+            return resolved[name]
+        if name in chain:
+            raise ValueError(f"Circular learnset inheritance: {' -> '.join(chain + (name,))}")
+        if name not in rows:
+            raise ValueError(f"Unknown learnset parent: {name}")
+        row = rows[name]
+        parent = (row.get("inherits") or "").strip()
+        moves = split(row, "moves") + split(row, "signature")
+        if parent == SKETCH:
+            sketchers.append(name)
+        elif parent:
+            moves = resolve(parent, chain + (name,)) + moves
+        resolved[name] = moves
+        return moves
+
+    for name in rows:
+        resolve(name)
+    return resolved, sketchers, signature_moves
+
+
+def load_learnset_index(path: str = DEFAULT_LEARNSET_PATH) -> LearnsetIndex:
+    """Learnset index over the bundled Pokedex species"""
+    learnsets, sketchers, signature_moves = read_learnset_source(path)
+    return LearnsetIndex(get_pokedex().names, learnsets, sketchers, signature_moves)
+
+
+@lru_cache(maxsize=1)
+def get_learnset_index() -> LearnsetIndex:
+    """Shared index over the bundled learnsets (built on first use)"""
+    return load_learnset_index()
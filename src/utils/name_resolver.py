@@ -0,0 +1,134 @@
+"""
+Indexed Pokemon name resolution.
+
+Name correction used to be a chain of exact dictionary checks followed by
+``in name`` tests for every known confusion (Gholdengo spellings, Treasures
+of Ruin, Ogerpon masks, the genies, Ursaluna, Hisuian forms), i.e. one scan
+of the name per keyword. ``PokemonNameResolver`` builds two indexes once:
+
+- a dict from normalised keys (NFKC, case-folded, without spaces, dashes or
+  middle dots) to the corrected name, so ``ｵｰｶﾞﾎﾟﾝ (いどのめん)`` and
+  ``オーガポン(いどのめん)`` hit the same entry;
+- one ``KeywordAutomaton`` over every keyword of the substring rules, so the
+  rules are decided from a single scan of the name.
+
+``resolve`` returns the corrected name together with the rule that fired and
+memoises it, so a name seen before costs one dict lookup.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Mapping, Optional, Sequence, Set, Tuple
+
+from .keyword_automaton import KeywordAutomaton
+
+_KEY_SEPARATORS = re.compile(r"[\s\-_・]+")
+# Resolved names are memoised; the same few dozen names recur in every result
+MAX_CACHED_NAMES = 4096
+
+
+def _lowered(words: Sequence[str]) -> FrozenSet[str]:
+    return frozenset(word.lower() for word in words)
+
+
+def normalize_name_key(name: str) -> str:
+    """
+    Lookup key for a Pokemon name
+
+    Args:
+        name: Name as written in an article or by the model
+
+    Returns:
+        NFKC-normalised, case-folded name without spaces, dashes or middle dots
+    """
+    return _KEY_SEPARATORS.sub("", unicodedata.normalize("NFKC", name).casefold())
+
+
+@dataclass(frozen=True)
+class SubstringRule:
+    """
+    A correction that applies when any trigger keyword occurs in the name
+
+    ``forms`` are tried in order; the first one whose keywords occur picks the
+    result. Without a matching form the rule returns ``default``, or does not
+    fire at all when ``default`` is None.
+    """
+
+    name: str
+    triggers: Tuple[str, ...]
+    default: Optional[str] = None
+    forms: Tuple[Tuple[Tuple[str, ...], str], ...] = ()
+
+
+class PokemonNameResolver:
+    """Exact and substring name corrections decided with one lookup and one scan"""
+
+    def __init__(self, exact_tables: Sequence[Tuple[str, Mapping[str, str]]],
+                 rules: Sequence[SubstringRule] = ()):
+        """
+        Build the indexes
+
+        Args:
+            exact_tables: (table name, original -> corrected) pairs in priority
+                order; an earlier table wins when two keys normalise alike
+            rules: Substring rules in priority order
+        """
+        self._exact: Dict[str, Tuple[str, str]] = {}
+        for table_name, table in exact_tables:
+            for original, corrected in table.items():
+                self._exact.setdefault(normalize_name_key(original), (corrected, f"exact:{table_name}"))
+
+        self.rules = tuple(rules)
+        # Keywords lowercased once, matching what the automaton reports
+        self._rule_keywords = [
+            (rule, _lowered(rule.triggers), [(_lowered(words), form) for words, form in rule.forms])
+            for rule in self.rules
+        ]
+        keywords: Set[str] = set()
+        for _, triggers, forms in self._rule_keywords:
+            keywords.update(triggers)
+            for words, _ in forms:
+                keywords.update(words)
+        self._automaton = KeywordAutomaton(keywords)
+        self._resolved: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def resolve(self, name: str) -> Tuple[str, Optional[str]]:
+        """
+        Correct a Pokemon name
+
+        Args:
+            name: Original Pokemon name
+
+        Returns:
+            (corrected name, rule) where rule is ``exact:<table>`` or
+            ``substring:<rule>``; (name, None) when no rule applies
+        """
+        if not name:
+            return name, None
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            if len(self._resolved) >= MAX_CACHED_NAMES:
+                self._resolved.clear()
+            resolved = self._resolved[name] = self._resolve_uncached(name)
+        return resolved
+
+    def _resolve_uncached(self, name: str) -> Tuple[str, Optional[str]]:
+        exact = self._exact.get(normalize_name_key(name))
+        if exact is not None:
+            return exact
+
+        present = self._automaton.find_present(name)
+        if not present:
+            return name, None
+        for rule, triggers, forms in self._rule_keywords:
+            if present.isdisjoint(triggers):
+                continue
+            result = rule.default
+            for words, form in forms:
+                if not present.isdisjoint(words):
+                    result = form
+                    break
+            if result is not None:
+                return result, f"substring:{rule.name}"
+        return name, None
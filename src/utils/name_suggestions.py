@@ -0,0 +1,247 @@
+"""
+Prefix-indexed, typo-tolerant Pokemon name suggestions.
+
+``get_pokemon_suggestions`` used to test ``partial in name`` against every
+entry of the translation tables on each query and missed anything typed
+differently from the table: katakana vs hiragana, half-width kana, romaji,
+a typo. ``SuggestionIndex`` normalises every alias and every query to one
+search key, so all of these meet:
+
+- NFKC folds full-/half-width forms, then the text is case-folded
+- hiragana becomes katakana and katakana becomes Hepburn-style romaji
+  (ハバタクカミ, はばたくかみ and ﾊﾊﾞﾀｸｶﾐ all read ``habatakukami``)
+- everything but letters, digits and kanji is dropped
+
+The keys are kept in a sorted suffix list, so prefix and substring matches
+are one ``bisect`` lookup and a walk over the matching range. Queries that match nothing that way fall back to
+a trigram index: the candidates sharing the most trigrams are checked with a
+bounded edit distance against the start of each key ("flutr" → Flutter Mane).
+
+Results are ranked by match kind (exact, prefix, substring, fuzzy), edit
+distance, then popularity - how often a Pokemon appears in stored analyses -
+and finally name.
+"""
+
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Match kinds, best first
+EXACT, PREFIX, SUBSTRING, FUZZY = range(4)
+
+DEFAULT_SUGGESTION_LIMIT = 10
+# Substring and fuzzy matching need this many characters of query
+MIN_SUBSTRING_QUERY = 2
+MIN_FUZZY_QUERY = 3
+# Keys checked with the edit distance, most shared trigrams first
+FUZZY_CANDIDATES = 40
+
+_KANA_ROMAJI = dict(zip(
+    "アイウエオカキクケコガギグゲゴサシスセソザジズゼゾタチツテトダヂヅデドナニヌネノ"
+    "ハヒフヘホバビブベボパピプペポマミムメモヤユヨラリルレロワヲンヴ",
+    "a i u e o ka ki ku ke ko ga gi gu ge go sa shi su se so za ji zu ze zo ta chi tsu te to "
+    "da ji zu de do na ni nu ne no ha hi fu he ho ba bi bu be bo pa pi pu pe po ma mi mu me mo "
+    "ya yu yo ra ri ru re ro wa o n vu".split(),
+))
+_SMALL_Y = {"ャ": "a", "ュ": "u", "ョ": "o"}
+_SMALL_VOWELS = {"ァ": "a", "ィ": "i", "ゥ": "u", "ェ": "e", "ォ": "o", "ヮ": "a"}
+_SOKUON = "ッ"
+_LONG_VOWEL = "ー"
+_HIRAGANA_OFFSET = ord("ア") - ord("あ")
+
+
+def kana_to_romaji(text: str) -> str:
+    """
+    Romanise the hiragana and katakana in a text (Hepburn, long vowels dropped)
+
+    Args:
+        text: Text in any mix of kana, Latin and kanji
+
+    Returns:
+        The text with every kana syllable replaced by its romaji
+    """
+    out: List[str] = []
+    double_next = False
+    for char in text:
+        if "ぁ" <= char <= "ゖ":
+            char = chr(ord(char) + _HIRAGANA_OFFSET)
+
+        if char == _SOKUON:
+            double_next = True
+            continue
+        if char == _LONG_VOWEL:
+            continue
+
+        if char in _SMALL_Y and out and out[-1].endswith("i") and len(out[-1]) > 1:
+            # キャ kya, シャ sha, ジョ jo
+            base = out[-1][:-1]
+            out[-1] = base + ("" if base.endswith(("sh", "ch", "j")) else "y") + _SMALL_Y[char]
+            continue
+        if char in _SMALL_VOWELS and out and out[-1][-1:] in "aiueo":
+            # ファ fa, ティ ti, ウィ wi, ジェ je
+            previous = out[-1]
+            out[-1] = ("w" if previous == "u" else previous[:-1]) + _SMALL_VOWELS[char]
+            continue
+
+        syllable = _KANA_ROMAJI.get(char) or _SMALL_Y.get(char) or _SMALL_VOWELS.get(char) or char
+        if double_next and syllable[:1].isalpha() and syllable[:1] not in "aiueon":
+            syllable = syllable[0] + syllable
+        double_next = False
+        out.append(syllable)
+    return "".join(out)
+
+
+def normalize_search_key(text: str) -> str:
+    """
+    Search key shared by aliases and queries
+
+    Args:
+        text: Pokemon name or partial query in any script or width
+
+    Returns:
+        Case-folded romaji/Latin/kanji key without spaces or punctuation
+    """
+    text = kana_to_romaji(unicodedata.normalize("NFKC", text).casefold())
+    return "".join(char for char in text if char.isalnum())
+
+
+def _trigrams(key: str) -> List[str]:
+    # Anchored at the start, so typos in the first letters still count
+    padded = f"^{key}"
+    return [padded[i:i + 3] for i in range(max(1, len(padded) - 2))]
+
+
+def prefix_edit_distance(query: str, key: str, max_distance: int) -> Optional[int]:
+    """
+    Edit distance between a query and the closest prefix of a key
+
+    Args:
+        query: Normalised query
+        key: Normalised key
+        max_distance: Largest distance of interest
+
+    Returns:
+        The distance, or None when it exceeds ``max_distance``
+    """
+    key = key[:len(query) + max_distance]
+    previous = list(range(len(key) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        for j, key_char in enumerate(key, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (query_char != key_char)))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    distance = min(previous)
+    return distance if distance <= max_distance else None
+
+
+class SuggestionIndex:
+    """Ranked name suggestions with prefix, substring and fuzzy matching"""
+
+    def __init__(self, aliases: Iterable[Tuple[str, str]], popularity: Optional[Mapping[str, float]] = None):
+        """
+        Build the index
+
+        Args:
+            aliases: (alias, canonical name) pairs; every canonical name is
+                also indexed under itself
+            popularity: Canonical name -> weight, e.g. appearance counts
+        """
+        self.names: List[str] = []
+        name_ids: Dict[str, int] = {}
+        entries: Dict[Tuple[str, int], None] = {}
+        for alias, name in aliases:
+            if name not in name_ids:
+                name_ids[name] = len(self.names)
+                self.names.append(name)
+                entries[(normalize_search_key(name), name_ids[name])] = None
+            entries[(normalize_search_key(alias), name_ids[name])] = None
+
+        self._keys: List[str] = []
+        self._key_names: List[int] = []
+        for key, name_id in entries:
+            if key:
+                self._keys.append(key)
+                self._key_names.append(name_id)
+
+        suffixes = sorted(
+            (key[offset:], offset, key_id)
+            for key_id, key in enumerate(self._keys)
+            for offset in range(len(key))
+        )
+        self._suffixes = [suffix for suffix, _, _ in suffixes]
+        self._suffix_entries = [(offset, key_id) for _, offset, key_id in suffixes]
+
+        self._trigram_keys: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(self._keys):
+            for gram in set(_trigrams(key)):
+                self._trigram_keys.setdefault(gram, []).append(key_id)
+
+        self._popularity: List[float] = [0.0] * len(self.names)
+        if popularity:
+            self.set_popularity(popularity)
+
+    def set_popularity(self, popularity: Mapping[str, float]):
+        """
+        Replace the popularity weights
+
+        Args:
+            popularity: Name -> weight; names are matched by search key
+        """
+        weights: Dict[str, float] = Counter()
+        for name, weight in popularity.items():
+            weights[normalize_search_key(name)] += weight
+        self._popularity = [weights.get(normalize_search_key(name), 0.0) for name in self.names]
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTION_LIMIT) -> List[str]:
+        """
+        Suggest Pokemon names for a (partial) query
+
+        Args:
+            query: What the user typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Canonical names, best match first
+        """
+        key = normalize_search_key(query or "")
+        if not key or limit <= 0:
+            return []
+
+        # Name id -> (match kind, edit distance); the best match per name counts
+        matches: Dict[int, Tuple[int, int]] = {}
+
+        def add(name_id: int, kind: int, distance: int = 0):
+            if (kind, distance) < matches.get(name_id, (FUZZY + 1, 0)):
+                matches[name_id] = (kind, distance)
+
+        position = bisect_left(self._suffixes, key)
+        while position < len(self._suffixes) and self._suffixes[position].startswith(key):
+            offset, key_id = self._suffix_entries[position]
+            position += 1
+            if offset == 0:
+                add(self._key_names[key_id], EXACT if len(self._keys[key_id]) == len(key) else PREFIX)
+            elif len(key) >= MIN_SUBSTRING_QUERY:
+                add(self._key_names[key_id], SUBSTRING)
+
+        if len(matches) < limit and len(key) >= MIN_FUZZY_QUERY:
+            max_distance = 1 if len(key) <= 5 else 2
+            shared = Counter()
+            for gram in set(_trigrams(key)):
+                shared.update(self._trigram_keys.get(gram, ()))
+            for key_id, _ in shared.most_common(FUZZY_CANDIDATES):
+                name_id = self._key_names[key_id]
+                if name_id in matches:
+                    continue
+                distance = prefix_edit_distance(key, self._keys[key_id], max_distance)
+                if distance is not None:
+                    add(name_id, FUZZY, distance)
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (item[1], -self._popularity[item[0]], self.names[item[0]]),
+        )
+        return [self.names[name_id] for name_id, _ in ranked[:limit]]
@@ -0,0 +1,90 @@
+"""
+Fetched-page artifact shared between article scraping and image discovery.
+"""
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+
+@dataclass
+class PageArtifact:
+    """
+    One downloaded and parsed HTML page
+
+    ``ArticleScraper`` produces it while processing a response; image discovery
+    (``extract_images_from_url``) consumes it so an analysis downloads and
+    parses the article HTML once.
+    """
+
+    url: str
+    final_url: str
+    content: bytes
+    text: str
+    encoding: Optional[str] = None
+    status_code: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Source JSON when the page came from a structured API rather than HTML
+    structured: Optional[Dict[str, Any]] = None
+
+    _soup: Optional[BeautifulSoup] = field(default=None, repr=False)
+    _image_tags: Optional[List[Any]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_response(cls, response, text: Optional[str] = None, url: Optional[str] = None) -> "PageArtifact":
+        """
+        Build an artifact from a ``requests.Response``-like object
+
+        Args:
+            response: HTTP response (needs ``content`` and ``url``)
+            text: Already-decoded HTML (defaults to ``response.text``)
+            url: Originally requested URL (defaults to the first redirect's URL)
+        """
+        history = getattr(response, "history", None) or []
+        requested_url = url or (history[0].url if history else response.url)
+        return cls(
+            url=requested_url,
+            final_url=response.url,
+            content=response.content,
+            text=text if text is not None else response.text,
+            encoding=getattr(response, "encoding", None),
+            status_code=getattr(response, "status_code", None),
+            headers=dict(getattr(response, "headers", {}) or {}),
+        )
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Parsed tree (parsed on first access, then reused)"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.text, "html.parser")
+        return self._soup
+
+    def matches(self, url: Optional[str]) -> bool:
+        """True if this page was fetched for (or redirected to) the given URL"""
+        return bool(url) and url in (self.url, self.final_url)
+
+    def image_tags(self) -> List[Any]:
+        """All ``<img>`` tags of the page, in document order"""
+        if self._image_tags is None:
+            self._image_tags = self.soup.find_all("img")
+        return self._image_tags
+
+    def snapshot_images(self):
+        """
+        Detach copies of the image tags before the tree is mutated
+
+        The generic text pipeline decompose()s nav/header/footer/noscript
+        elements; image discovery must still see the page as downloaded.
+        """
+        snapshots = []
+        for tag in self.soup.find_all("img"):
+            parent = tag.parent
+            if getattr(parent, "name", None) == "picture":
+                # Keep the <picture> around the copy: its <source> renditions matter too
+                index = parent.find_all("img", recursive=False).index(tag)
+                snapshots.append(copy.copy(parent).find_all("img", recursive=False)[index])
+            else:
+                snapshots.append(copy.copy(tag))
+        self._image_tags = snapshots
@@ -0,0 +1,334 @@
+"""
+Bundled, memory-mapped Pokedex.
+
+Species data (national dex and PokeAPI ids, English and Japanese names,
+forms, types, abilities, base stats) is maintained in ``data/pokedex.csv``
+and compiled into ``data/pokedex.bin``::
+
+    cd src && python -m utils.pokedex build
+
+The binary file is what the app loads. It is memory-mapped read-only, so
+opening it costs one ``mmap`` call, nothing is parsed up front, and every
+worker process on a machine shares the same page-cache copy. Layout
+(little-endian)::
+
+    header     magic "PDEX", format version (u16), data version length (u16),
+               record count (u32), string count (u32), data version (UTF-8),
+               padded to 8 bytes
+    records    RECORD_DTYPE * record count (fixed width, numbers and string ids)
+    strings    u32 offsets * (string count + 1), then the UTF-8 string blob
+
+Records are read with ``np.frombuffer`` straight from the mapping; strings
+are decoded when asked for. ``Pokedex`` is the query API shared by the
+validator, the sprite resolver and the stat engine.
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import re
+import struct
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_POKEDEX_SOURCE = os.path.join(DATA_DIR, "pokedex.csv")
+DEFAULT_POKEDEX_PATH = os.path.join(DATA_DIR, "pokedex.bin")
+
+MAGIC = b"PDEX"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+
+TYPES = (
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice", "Fighting", "Poison", "Ground",
+    "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+)
+NO_TYPE = 255
+STAT_COLUMNS = ("hp", "atk", "def", "spa", "spd", "spe")
+
+RECORD_DTYPE = np.dtype([
+    ("dex", "<u2"),
+    ("pokeapi_id", "<u2"),
+    ("base_stats", "u1", (6,)),
+    ("types", "u1", (2,)),
+    # String ids; 0 is the empty string
+    ("name", "<u4"),
+    ("name_ja", "<u4"),
+    ("species", "<u4"),
+    ("form", "<u4"),
+    ("slug", "<u4"),
+    ("abilities", "<u4", (3,)),
+])
+
+OFFICIAL_ARTWORK_URL = (
+    "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork/{id}.png"
+)
+
+_VERSION_LINE = re.compile(r"#\s*version:\s*(\S+)")
+
+
+def normalize_pokedex_name(name: str) -> str:
+    """Lookup key: lowercase, without spaces, dashes, dots, apostrophes, colons or brackets"""
+    return re.sub(r"[\s\-_.'’:()（）]", "", name).lower()
+
+
+@dataclass(frozen=True)
+class PokedexEntry:
+    """One species or form"""
+
+    dex: int
+    pokeapi_id: int
+    name: str
+    name_ja: str
+    species: str
+    form: str
+    slug: str
+    types: Tuple[str, ...]
+    abilities: Tuple[str, ...]  # Regular abilities first, hidden ability last
+    base_stats: Tuple[int, int, int, int, int, int]
+
+    @property
+    def sprite_url(self) -> str:
+        return OFFICIAL_ARTWORK_URL.format(id=self.pokeapi_id)
+
+
+class Pokedex:
+    """Read-only view of a compiled Pokedex file"""
+
+    def __init__(self, buffer: Union[bytes, memoryview, mmap.mmap]):
+        """
+        Wrap a compiled Pokedex
+
+        Args:
+            buffer: Contents of a file written by ``build_pokedex``
+
+        Raises:
+            ValueError: If the buffer is not a Pokedex of this format version
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Not a Pokedex file: too short")
+        magic, format_version, version_length, count, string_count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a Pokedex file: bad magic")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported Pokedex format version {format_version}")
+
+        self._buffer = buffer
+        offset = _HEADER.size
+        self.data_version = bytes(buffer[offset:offset + version_length]).decode("utf-8")
+        offset = _align(offset + version_length)
+
+        self.records = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=count, offset=offset)
+        offset += RECORD_DTYPE.itemsize * count
+        self._string_offsets = np.frombuffer(buffer, dtype="<u4", count=string_count + 1, offset=offset)
+        self._blob_start = offset + 4 * (string_count + 1)
+
+        self._strings: Dict[int, str] = {}
+        self._index: Dict[str, int] = {}
+        for row in range(count):
+            for field in ("name", "slug", "name_ja"):
+                key = normalize_pokedex_name(self._string(int(self.records[field][row])))
+                if key:
+                    self._index.setdefault(key, row)
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_POKEDEX_PATH) -> "Pokedex":
+        """Memory-map a compiled Pokedex file"""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _string(self, string_id: int) -> str:
+        text = self._strings.get(string_id)
+        if text is None:
+            start = self._blob_start + int(self._string_offsets[string_id])
+            end = self._blob_start + int(self._string_offsets[string_id + 1])
+            text = self._strings[string_id] = bytes(self._buffer[start:end]).decode("utf-8")
+        return text
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[PokedexEntry]:
+        return (self.entry(row) for row in range(len(self)))
+
+    @property
+    def names(self) -> List[str]:
+        """English name of every record, in file order"""
+        return [self._string(int(string_id)) for string_id in self.records["name"]]
+
+    @property
+    def base_stats(self) -> np.ndarray:
+        """(records, 6) base stat array, a read-only view of the mapped file"""
+        return self.records["base_stats"]
+
+    def row(self, name: Optional[str]) -> Optional[int]:
+        """
+        Record number of a Pokemon
+
+        Args:
+            name: English name ("Landorus-Therian"), PokeAPI slug
+                ("landorus-therian") or Japanese name ("ランドロス(れいじゅうフォルム)")
+
+        Returns:
+            The record number, or None for an unknown name
+        """
+        if not name:
+            return None
+        return self._index.get(normalize_pokedex_name(name))
+
+    def entry(self, row: int) -> PokedexEntry:
+        record = self.records[row]
+        return PokedexEntry(
+            dex=int(record["dex"]),
+            pokeapi_id=int(record["pokeapi_id"]),
+            name=self._string(int(record["name"])),
+            name_ja=self._string(int(record["name_ja"])),
+            species=self._string(int(record["species"])),
+            form=self._string(int(record["form"])),
+            slug=self._string(int(record["slug"])),
+            types=tuple(TYPES[code] for code in record["types"] if code != NO_TYPE),
+            abilities=tuple(self._string(int(string_id)) for string_id in record["abilities"] if string_id),
+            base_stats=tuple(int(stat) for stat in record["base_stats"]),
+        )
+
+    def find(self, name: Optional[str]) -> Optional[PokedexEntry]:
+        """Entry for an English, PokeAPI or Japanese name; None if unknown"""
+        row = self.row(name)
+        return None if row is None else self.entry(row)
+
+    def __contains__(self, name: str) -> bool:
+        return self.row(name) is not None
+
+    def japanese_names(self) -> Dict[str, str]:
+        """Japanese name -> English name"""
+        return {
+            self._string(int(record["name_ja"])): self._string(int(record["name"]))
+            for record in self.records if record["name_ja"]
+        }
+
+    def sprite_url(self, name: Optional[str]) -> Optional[str]:
+        """Official artwork URL, without a PokeAPI request; None if unknown"""
+        row = self.row(name)
+        return None if row is None else OFFICIAL_ARTWORK_URL.format(id=int(self.records["pokeapi_id"][row]))
+
+
+def _align(offset: int, boundary: int = 8) -> int:
+    return (offset + boundary - 1) // boundary * boundary
+
+
+def read_pokedex_source(path: str = DEFAULT_POKEDEX_SOURCE) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Rows of the CSV source
+
+    Returns:
+        (data version, rows)
+    """
+    version = "unversioned"
+    lines = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                match = _VERSION_LINE.match(line)
+                if match:
+                    version = match.group(1)
+            elif line.strip():
+                lines.append(line)
+    return version, list(csv.DictReader(lines))
+
+
+def encode_pokedex(version: str, rows: Sequence[Dict[str, str]]) -> bytes:
+    """
+    Compile Pokedex rows into the binary format
+
+    Raises:
+        ValueError: For unknown types, out-of-range numbers or duplicate names
+    """
+    strings: Dict[str, int] = {"": 0}
+
+    def string_id(text: str) -> int:
+        return strings.setdefault(text.strip(), len(strings))
+
+    records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+    seen = set()
+    for i, row in enumerate(rows):
+        name = row["name"].strip()
+        if normalize_pokedex_name(name) in seen:
+            raise ValueError(f"Duplicate Pokedex name: {name}")
+        seen.add(normalize_pokedex_name(name))
+
+        types = [row["type1"].strip(), row["type2"].strip()]
+        for type_name in filter(None, types):
+            if type_name not in TYPES:
+                raise ValueError(f"Unknown type {type_name!r} for {name}")
+        stats = [int(row[column]) for column in STAT_COLUMNS]
+        if not all(1 <= stat <= 255 for stat in stats):
+            raise ValueError(f"Base stat out of range for {name}")
+
+        records[i]["dex"] = int(row["dex"])
+        records[i]["pokeapi_id"] = int(row["pokeapi_id"] or row["dex"])
+        records[i]["base_stats"] = stats
+        records[i]["types"] = [TYPES.index(t) if t else NO_TYPE for t in types]
+        for field in ("name", "name_ja", "species", "form", "slug"):
+            records[i][field] = string_id(row[field])
+        records[i]["abilities"] = [string_id(row[field]) for field in ("ability1", "ability2", "hidden_ability")]
+
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(text) for text in encoded])
+
+    version_bytes = version.encode("utf-8")
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(version_bytes), len(rows), len(encoded)) + version_bytes
+    header += b"\0" * (_align(len(header)) - len(header))
+    return header + records.tobytes() + offsets.tobytes() + b"".join(encoded)
+
+
+def build_pokedex(source: str = DEFAULT_POKEDEX_SOURCE, output: str = DEFAULT_POKEDEX_PATH) -> int:
+    """
+    Compile the CSV source into the binary file
+
+    Returns:
+        Number of records written
+    """
+    version, rows = read_pokedex_source(source)
+    data = encode_pokedex(version, rows)
+    with open(output, "wb") as f:
+        f.write(data)
+    return len(rows)
+
+
+@lru_cache(maxsize=1)
+def get_pokedex() -> Pokedex:
+    """The bundled Pokedex, mapped once per process"""
+    return Pokedex.open(DEFAULT_POKEDEX_PATH)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bundled Pokedex tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Compile the CSV source into the binary Pokedex")
+    build.add_argument("--source", default=DEFAULT_POKEDEX_SOURCE)
+    build.add_argument("--output", default=DEFAULT_POKEDEX_PATH)
+    show = subparsers.add_parser("show", help="Print the entry for a name")
+    show.add_argument("name")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = build_pokedex(args.source, args.output)
+        print(f"Wrote {count} records to {args.output}")
+        return 0
+
+    entry = get_pokedex().find(args.name)
+    if entry is None:
+        print(f"Unknown Pokemon: {args.name}")
+        return 1
+    print(entry)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
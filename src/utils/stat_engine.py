@@ -0,0 +1,340 @@
+"""
+Level-50 stat calculation with inverse lookup tables.
+
+Japanese articles often give calculated stats (実数値) instead of, or next
+to, EVs: ``H181(148)-A×↓-B131(124)`` or a stat-only ``H207 B101 C143 D105``.
+With the species' base stats, the nature and the usual IV assumption (31,
+or 0 for a minimised stat) the EVs behind such a stat are exact, not a
+guess.
+
+``StatEngine`` precomputes, for every species in the bundled Pokedex,
+stat and nature multiplier, the level-50 stat reached by each EV step and
+the inverse table: the range of EVs producing each stat value. Looking up
+the EVs of a stat is then a single array index, and whole batches of stat
+lines are converted with NumPy fancy indexing.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config import NATURE_TRANSLATIONS, POKEMON_NAME_TRANSLATIONS
+from .ev_grammar import EVScan, STAT_KEYS
+from .pokedex import DEFAULT_POKEDEX_PATH, Pokedex, get_pokedex
+
+LEVEL = 50
+DEFAULT_IV = 31
+MINIMIZED_IV = 0  # Trick Room speed / unused attack
+IV_OPTIONS = (DEFAULT_IV, MINIMIZED_IV)
+# Stats that may use IV 0 when IV 31 cannot reach the value, marked × or not:
+# special attackers minimise Attack, Trick Room sets minimise Speed
+MINIMIZABLE_STATS = ("Atk", "Def", "SpA", "SpD", "Spe")
+MAX_EV = 252
+MAX_TOTAL_EVS = 510
+EV_STEPS = np.arange(0, MAX_EV + 1, 4)  # floor(EV / 4) is all that matters
+
+# Nature multiplier index: hindered (x0.9), neutral, boosted (x1.1)
+HINDERED, NEUTRAL, BOOSTED = 0, 1, 2
+_NATURE_PERCENT = np.array([90, 100, 110])
+
+# Boosted and hindered stat of every nature (None for neutral natures)
+NATURE_MODIFIERS = {
+    "Lonely": ("Atk", "Def"), "Brave": ("Atk", "Spe"), "Adamant": ("Atk", "SpA"), "Naughty": ("Atk", "SpD"),
+    "Bold": ("Def", "Atk"), "Relaxed": ("Def", "Spe"), "Impish": ("Def", "SpA"), "Lax": ("Def", "SpD"),
+    "Modest": ("SpA", "Atk"), "Mild": ("SpA", "Def"), "Quiet": ("SpA", "Spe"), "Rash": ("SpA", "SpD"),
+    "Calm": ("SpD", "Atk"), "Gentle": ("SpD", "Def"), "Sassy": ("SpD", "Spe"), "Careful": ("SpD", "SpA"),
+    "Timid": ("Spe", "Atk"), "Hasty": ("Spe", "Def"), "Jolly": ("Spe", "SpA"), "Naive": ("Spe", "SpD"),
+    "Hardy": (None, None), "Docile": (None, None), "Serious": (None, None),
+    "Bashful": (None, None), "Quirky": (None, None),
+}
+
+Nature = Union[str, Tuple[Optional[str], Optional[str]], None]
+
+
+def _normalize_name(name: str) -> str:
+    return re.sub(r"[\s\-_.'’:]", "", name).lower()
+
+
+def nature_multipliers(nature: Nature) -> List[int]:
+    """
+    Nature multiplier index (HINDERED / NEUTRAL / BOOSTED) for each stat
+
+    Args:
+        nature: English or Japanese nature name, a (boosted, hindered) stat
+            pair as read from ↑/↓ marks, or None for neutral
+
+    Raises:
+        ValueError: For unknown nature names
+    """
+    if isinstance(nature, str):
+        english = NATURE_TRANSLATIONS.get(nature.strip(), nature.strip()).capitalize()
+        if english not in NATURE_MODIFIERS:
+            raise ValueError(f"Unknown nature: {nature}")
+        boosted, hindered = NATURE_MODIFIERS[english]
+    elif nature is None:
+        boosted, hindered = None, None
+    else:
+        boosted, hindered = nature
+    codes = [NEUTRAL] * len(STAT_KEYS)
+    if boosted is not None and boosted != hindered:
+        codes[STAT_KEYS.index(boosted)] = BOOSTED
+    if hindered is not None and boosted != hindered:
+        codes[STAT_KEYS.index(hindered)] = HINDERED
+    codes[0] = NEUTRAL  # HP is never affected
+    return codes
+
+
+def calculate_stat_array(base: np.ndarray, evs: np.ndarray, ivs: np.ndarray, multipliers: np.ndarray,
+                         level: int = LEVEL) -> np.ndarray:
+    """
+    Stat formula, broadcast over arrays whose last axis is the six stats
+
+    Args:
+        base: Base stats
+        evs: EVs
+        ivs: IVs
+        multipliers: Nature multiplier indexes (HINDERED / NEUTRAL / BOOSTED)
+        level: Pokemon level
+
+    Returns:
+        Calculated stats (int32)
+    """
+    base, evs, ivs = np.broadcast_arrays(np.asarray(base), np.asarray(evs), np.asarray(ivs))
+    core = ((2 * base.astype(np.int32) + ivs + evs // 4) * level) // 100
+    hp = core[..., :1] + level + 10
+    others = ((core[..., 1:] + 5) * _NATURE_PERCENT[np.asarray(multipliers)[..., 1:]]) // 100
+    return np.concatenate([hp, others], axis=-1).astype(np.int32)
+
+
+def load_base_stats(path: str = DEFAULT_POKEDEX_PATH) -> Tuple[List[str], np.ndarray]:
+    """Species names and an (n_species, 6) base-stat array from a compiled Pokedex"""
+    pokedex = get_pokedex() if path == DEFAULT_POKEDEX_PATH else Pokedex.open(path)
+    return pokedex.names, np.array(pokedex.base_stats, dtype=np.int16)
+
+
+class StatEngine:
+    """Forward and inverse level-50 stat tables for every bundled species"""
+
+    def __init__(self, names: Sequence[str], base_stats: np.ndarray, level: int = LEVEL,
+                 aliases: Optional[Mapping[str, str]] = None):
+        self.names = list(names)
+        self.base_stats = np.asarray(base_stats, dtype=np.int16)
+        self.level = level
+        self._index = {_normalize_name(name): i for i, name in enumerate(self.names)}
+        for alias, english in [*(aliases or {}).items(), *POKEMON_NAME_TRANSLATIONS.items()]:
+            target = self._index.get(_normalize_name(english))
+            if target is not None:
+                self._index.setdefault(_normalize_name(alias), target)
+
+        # Forward table: stat[species, stat, multiplier, iv option, ev step]
+        species_count = len(self.names)
+        shape = (species_count, len(STAT_KEYS), 3, len(IV_OPTIONS), EV_STEPS.size)
+        base = self.base_stats[:, :, None, None, None]
+        ivs = np.array(IV_OPTIONS)[None, None, None, :, None]
+        multiplier_percent = _NATURE_PERCENT[None, None, :, None, None]
+        core = ((2 * base.astype(np.int32) + ivs + EV_STEPS[None, None, None, None, :] // 4) * level) // 100
+        stats = ((core + 5) * multiplier_percent) // 100
+        stats[:, 0] = core[:, 0] + level + 10  # HP: no nature, different constant
+        self.stats = np.broadcast_to(stats, shape).astype(np.int16)
+
+        # Inverse table: EV range per stat value, offset by the lowest reachable value
+        self.lowest = self.stats[..., 0].astype(np.int32)
+        span = int((self.stats[..., -1] - self.stats[..., 0]).max()) + 1
+        self.min_ev = np.full(shape[:-1] + (span,), -1, dtype=np.int16)
+        self.max_ev = np.full(shape[:-1] + (span,), -1, dtype=np.int16)
+        offsets = self.stats - self.lowest[..., None]
+        grid = np.indices(shape[:-1])
+        # Stats never decrease with EVs: ascending steps leave the largest EV per
+        # value in max_ev, descending steps the smallest in min_ev
+        for step in range(EV_STEPS.size):
+            self.max_ev[(*grid, offsets[..., step])] = EV_STEPS[step]
+        for step in reversed(range(EV_STEPS.size)):
+            self.min_ev[(*grid, offsets[..., step])] = EV_STEPS[step]
+
+    # Lookups
+
+    def species_index(self, name: Optional[str]) -> Optional[int]:
+        """Row of a species (English, Japanese or alias name); forms fall back to the base species"""
+        if not name:
+            return None
+        key = _normalize_name(name)
+        if key in self._index:
+            return self._index[key]
+        translated = POKEMON_NAME_TRANSLATIONS.get(name.strip())
+        if translated and _normalize_name(translated) in self._index:
+            return self._index[_normalize_name(translated)]
+        parts = name.strip().split("-")
+        while len(parts) > 1:
+            parts.pop()
+            key = _normalize_name("-".join(parts))
+            if key in self._index:
+                return self._index[key]
+        return None
+
+    def calculate_stats(self, species: str, evs: Union[Mapping[str, int], Sequence[int]],
+                        nature: Nature = None, ivs: Union[int, Sequence[int]] = DEFAULT_IV) -> Dict[str, int]:
+        """
+        Level-50 stats of a species
+
+        Raises:
+            ValueError: For unknown species or natures
+        """
+        index = self._require_species(species)
+        if isinstance(evs, Mapping):
+            evs = [int(evs.get(stat, 0)) for stat in STAT_KEYS]
+        stats = calculate_stat_array(self.base_stats[index], np.array(evs), np.array(ivs),
+                                     np.array(nature_multipliers(nature)), self.level)
+        return dict(zip(STAT_KEYS, stats.tolist()))
+
+    def ev_range(self, species: str, stat: str, value: int, nature: Nature = None,
+                 iv: int = DEFAULT_IV) -> Optional[Tuple[int, int]]:
+        """
+        EVs that give a species exactly ``value`` in ``stat``
+
+        Returns:
+            (smallest, largest) consistent EV, or None if no EV gives that stat
+        """
+        index = self._require_species(species)
+        stat_index = STAT_KEYS.index(stat)
+        multiplier = nature_multipliers(nature)[stat_index]
+        iv_index = IV_OPTIONS.index(iv)
+        offset = int(value) - int(self.lowest[index, stat_index, multiplier, iv_index])
+        if not 0 <= offset < self.min_ev.shape[-1]:
+            return None
+        low = int(self.min_ev[index, stat_index, multiplier, iv_index, offset])
+        if low < 0:
+            return None
+        return low, int(self.max_ev[index, stat_index, multiplier, iv_index, offset])
+
+    def evs_from_stats_batch(self, species: np.ndarray, stats: np.ndarray, multipliers: np.ndarray,
+                             iv_index: Union[int, np.ndarray] = 0) -> np.ndarray:
+        """
+        Smallest EVs behind many stat lines at once
+
+        Args:
+            species: (N,) species rows
+            stats: (N, 6) calculated stats; negative for unknown
+            multipliers: (N, 6) nature multiplier indexes
+            iv_index: Index into IV_OPTIONS, scalar or (N, 6)
+
+        Returns:
+            (N, 6) int16 EVs; -1 where the stat is unknown or no EV reaches it
+        """
+        species = np.asarray(species)[:, None]
+        stats = np.asarray(stats, dtype=np.int32)
+        multipliers = np.asarray(multipliers)
+        stat_columns = np.arange(len(STAT_KEYS))[None, :]
+        iv_index = np.broadcast_to(np.asarray(iv_index), stats.shape)
+        offsets = stats - self.lowest[species, stat_columns, multipliers, iv_index]
+        valid = (stats >= 0) & (offsets >= 0) & (offsets < self.min_ev.shape[-1])
+        clipped = np.clip(offsets, 0, self.min_ev.shape[-1] - 1)
+        evs = self.min_ev[species, stat_columns, multipliers, iv_index, clipped]
+        return np.where(valid, evs, -1).astype(np.int16)
+
+    def evs_from_stats(self, species: str, stats: Mapping[str, Optional[int]], nature: Nature = None,
+                       minimized: Sequence[str] = ()) -> Optional[Dict[str, int]]:
+        """
+        Exact EVs behind a (partial) stat line
+
+        Stats that are missing or None are taken as uninvested (0 EVs). Without
+        a nature every nature is tried and the one needing the fewest EVs wins;
+        stats in ``minimized`` (marked ×) may use IV 0 as well as IV 31.
+
+        Returns:
+            EV dict, or None if no nature/IV makes every given stat reachable
+            within the EV limits
+        """
+        index = self._require_species(species)
+        values = np.array([-1 if stats.get(stat) is None else int(stats[stat]) for stat in STAT_KEYS])
+        candidates = _ALL_NATURE_CODES if nature is None else np.array([nature_multipliers(nature)])
+        rows = np.full(len(candidates), index)
+        tiled = np.broadcast_to(values, (len(candidates), len(STAT_KEYS)))
+        evs = self.evs_from_stats_batch(rows, tiled, candidates, 0)
+        if minimized:
+            minimized_columns = [STAT_KEYS.index(stat) for stat in minimized]
+            iv_zero = self.evs_from_stats_batch(rows, tiled, candidates, IV_OPTIONS.index(MINIMIZED_IV))
+            fill = (evs[:, minimized_columns] < 0)
+            evs[:, minimized_columns] = np.where(fill, iv_zero[:, minimized_columns], evs[:, minimized_columns])
+
+        given = values >= 0
+        totals = np.where(given, evs, 0).sum(axis=1)
+        feasible = ((evs >= 0) | ~given).all(axis=1) & (totals <= MAX_TOTAL_EVS)
+        if not feasible.any():
+            return None
+        best = int(np.flatnonzero(feasible)[np.argmin(totals[feasible])])
+        return {stat: int(ev) if known else 0 for stat, ev, known in zip(STAT_KEYS, evs[best], given)}
+
+    def is_stat_line(self, species: str, numbers: Sequence[Optional[int]]) -> bool:
+        """True if six numbers (None for unknown) are a reachable stat line of the species"""
+        if len(numbers) != len(STAT_KEYS) or self.species_index(species) is None:
+            return False
+        stats = {stat: value for stat, value in zip(STAT_KEYS, numbers)}
+        return self.evs_from_stats(species, stats, minimized=MINIMIZABLE_STATS) is not None
+
+    def _require_species(self, species: str) -> int:
+        index = self.species_index(species)
+        if index is None:
+            raise ValueError(f"No base stats for {species}")
+        return index
+
+
+# Every distinct multiplier pattern: neutral plus the 20 boosting/hindering natures
+_ALL_NATURE_CODES = np.array(
+    [nature_multipliers(None)]
+    + [nature_multipliers(pair) for pair in sorted({pair for pair in NATURE_MODIFIERS.values() if pair[0]})]
+)
+
+
+@lru_cache(maxsize=1)
+def get_stat_engine() -> StatEngine:
+    """Shared engine built from the bundled Pokedex (built on first use)"""
+    pokedex = get_pokedex()
+    return StatEngine(*load_base_stats(), aliases=pokedex.japanese_names())
+
+
+def evs_from_stat_scan(scan: EVScan, pokemon_name: Optional[str],
+                       nature: Optional[str] = None) -> Optional[Dict[str, int]]:
+    """
+    Exact EVs of a letter-labelled calculated-stat line of a known species
+
+    The numbers after the stat letters (H181(148) -> 181, H207 B101 -> 207,
+    101) are read as level-50 stats. Stats marked × count as uninvested. Any
+    stat but HP may use the minimised IV when IV 31 cannot reach it (0 Attack
+    IV special attackers, Trick Room speed), as in ``StatEngine.is_stat_line``.
+    EVs written in parentheses are kept as given; the stat engine fills in the
+    others.
+
+    Args:
+        scan: ``ev_grammar.scan_ev_string`` result of the line
+        pokemon_name: Species the line belongs to (English or Japanese)
+        nature: Nature of the Pokemon, if known
+
+    Returns:
+        EVs for the stats found, or None if the species is unknown, fewer
+        than four stats are given or the numbers are not a reachable stat line
+    """
+    if not pokemon_name or len(scan.letters_any) + len(scan.uninvested) < 4:
+        return None
+    engine = get_stat_engine()
+    if engine.species_index(pokemon_name) is None:
+        return None
+
+    natures = []
+    if nature:
+        try:
+            nature_multipliers(nature)
+            natures.append(nature)
+        except ValueError:
+            pass
+    if scan.nature_boosts and scan.nature_reductions:
+        natures.append((scan.nature_boosts[0], scan.nature_reductions[0]))
+    natures.append(None)  # Infer the nature from the stats
+
+    for candidate in natures:
+        evs = engine.evs_from_stats(pokemon_name, scan.letters_any, candidate, minimized=MINIMIZABLE_STATS)
+        if evs is not None:
+            given = set(scan.letters_any) | set(scan.uninvested) | set(scan.calculated)
+            return {stat: scan.calculated.get(stat, ev) for stat, ev in evs.items() if stat in given}
+    return None
@@ -0,0 +1,165 @@
+"""
+Single-pass translation of Japanese stat abbreviations in EV explanations.
+
+Strategic reasoning comes back with the Japanese shorthand left in: "CS振り",
+"H252", "Sを最速に", "lower B". The old translator walked the abbreviation
+table longest-first and, for every entry, ran seven context regexes over the
+whole text, each one re-scanned after every substitution (and a translation
+could be picked up again by a later, shorter entry: "CSを" became
+"Special Attack and Speedを" and then "SpeeSpecial Defenseを").
+
+``StatAbbreviationTranslator`` compiles the table once into a single
+alternation. Branches are ordered by abbreviation length and then by context
+rule, so at any position the longest abbreviation whose context fits wins,
+as before; the text is scanned once and replaced text is never revisited.
+The context rules are unchanged:
+
+1. followed by a colon ("S: fastest Urshifu")
+2. followed by a number ("H252", "B4")
+3. followed by an investment word ("CS max", "H極振り")
+4. after lower / raise / invest ("lower B.")
+5. at the very start of the text ("S: ..." / "H ...")
+6. followed by a Japanese particle ("Sを", "Bに")
+
+Single letters are left alone in a text that uses them as English ("a lot",
+"such a ", "about"), and the clean-up pass (spacing, "max" placement,
+technical terms) runs with precompiled patterns afterwards.
+"""
+
+import re
+from typing import Callable, Dict, List, Mapping, Set, Tuple, Union
+
+# Abbreviations longer than this are not shorthand and are not translated
+MAX_ABBREVIATION_LENGTH = 10
+
+_CONTEXT_VERBS = r"lower|raise|invest"
+_VERB_PREFIX = re.compile(rf"({_CONTEXT_VERBS})\s+", re.IGNORECASE)
+
+# Context rules 1-6, applied to an alternation of abbreviations of one length
+_CONTEXT_RULES = (
+    r"\b(?:{terms}):",
+    r"\b(?:{terms})(?=\d)",
+    r"\b(?:{terms})(?=\s+(?:max|極|振り|投資|調整|意識))",
+    rf"(?:{_CONTEXT_VERBS})\s+(?:{{terms}})(?=\s|$|\.)",
+    r"^(?:{terms})(?=\s|:)",
+    r"(?:{terms})(?=[をにはがと])",
+)
+_VERB_RULE = 3
+
+# A single letter in any of these contexts is English, not a stat
+_ENGLISH_LETTER_CONTEXTS = (
+    r"\b(?P<letter>{letters})\s+(?:lot|bit|few|many|good|bad|great|strong|weak|nice|cool)",
+    r"\b(?:what|such|quite|very|really|pretty|rather)\s+(?P<letter>{letters})\s",
+    r"\b(?P<letter>{letters})(?:bout|way|fter|gain|lso|ccording|nd)\b",
+    r"\b(?:as|is|was|am|are|be|an|or|of|to|in|on|at|by|for|with|about)\s+(?P<letter>{letters})\s+"
+    r"(?:and|or|the|a|an|of|to|in|on|at|by|for|with|about|but|so|if|when|where|while|because|though"
+    r"|although|since|unless|until|before|after|during)",
+)
+
+_MAX_FIRST = {
+    "Special Attack and Speed": "max Special Attack and Speed",
+    "Attack and Speed": "max Attack and Speed",
+    "HP and Defense": "max HP and Defense",
+}
+_HP_FIRST = ("multiple of 11", "1 less than multiple of 16")
+
+# Clean-up applied to the translated text, in order
+_CLEANUP: List[Tuple[re.Pattern, Union[str, Callable[[re.Match], str]]]] = [
+    # Collapse whitespace and drop it before punctuation
+    (re.compile(r"\s+([,.!?;:])?"), lambda m: m.group(1) or " "),
+    (re.compile(r"([,.!?;:])\s*([a-zA-Z])"), r"\1 \2"),
+    # Capitalize first letter after periods
+    (re.compile(r"(\. )([a-z])"), lambda m: m.group(1) + m.group(2).upper()),
+    # "CS max" reads "max Special Attack and Speed"
+    (re.compile("(" + "|".join(_MAX_FIRST) + ") max"), lambda m: _MAX_FIRST[m.group(1)]),
+    (re.compile(r"(\w+) max\."), r"max \1."),
+    # Technical terms lead with the stat
+    (re.compile("(" + "|".join(_HP_FIRST) + ") HP"), r"HP \1"),
+]
+
+
+class StatAbbreviationTranslator:
+    """Translates every stat abbreviation of a text in one regex scan"""
+
+    def __init__(self, abbreviations: Mapping[str, str]):
+        """
+        Compile the abbreviation table
+
+        Args:
+            abbreviations: Japanese abbreviation -> English stat wording
+        """
+        terms = sorted(
+            (term for term in abbreviations if term and len(term) <= MAX_ABBREVIATION_LENGTH),
+            key=len, reverse=True,
+        )
+        self._english: Dict[str, str] = {term.casefold(): abbreviations[term] for term in terms}
+
+        branches: List[str] = []
+        self._branch_rules: List[int] = []
+        for length in sorted({len(term) for term in terms}, reverse=True):
+            alternation = "|".join(re.escape(term) for term in terms if len(term) == length)
+            for rule, template in enumerate(_CONTEXT_RULES):
+                branches.append(f"(?P<b{len(branches)}>{template.format(terms=alternation)})")
+                self._branch_rules.append(rule)
+        self._pattern = re.compile("|".join(branches), re.IGNORECASE) if branches else None
+
+        letters = [term for term in terms if len(term) == 1]
+        self._letter_contexts = [
+            re.compile(f"(?={context.format(letters='|'.join(map(re.escape, letters)))})", re.IGNORECASE)
+            for context in _ENGLISH_LETTER_CONTEXTS
+        ] if letters else []
+
+    def english_letters(self, text: str) -> Set[str]:
+        """Single-letter abbreviations the text uses as English words"""
+        return {
+            match.group("letter").casefold()
+            for context in self._letter_contexts
+            for match in context.finditer(text)
+        }
+
+    def translate(self, text: str) -> str:
+        """
+        Translate the stat abbreviations in a text and tidy the result
+
+        Args:
+            text: Text containing potential stat abbreviations
+
+        Returns:
+            Text with stat abbreviations translated to English
+        """
+        if not text:
+            return text
+
+        if self._pattern is not None:
+            skipped = self.english_letters(text)
+            text = self._pattern.sub(lambda match: self._replace(match, skipped), text)
+
+        for pattern, replacement in _CLEANUP:
+            text = pattern.sub(replacement, text)
+        return text.strip()
+
+    def _replace(self, match: re.Match, skipped: Set[str]) -> str:
+        matched = match.group()
+        rule = self._branch_rules[int(match.lastgroup[1:])]
+
+        verb = ""
+        term = matched
+        if rule == _VERB_RULE:
+            prefix = _VERB_PREFIX.match(matched)
+            verb, term = prefix.group(1), matched[prefix.end():]
+        elif matched.endswith(":"):
+            term = matched[:-1]
+
+        key = term.casefold()
+        if key in skipped:
+            return matched
+        english = self._english[key]
+
+        if matched.endswith(":"):
+            return f"{english}:"
+        number = re.search(r"\d+", matched)
+        if number:
+            return f"{number.group()} {english}"
+        if verb:
+            return f"{verb} {english}"
+        return english
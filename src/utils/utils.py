@@ -6,10 +6,14 @@ import hashlib
 import os
 import re
 import requests
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 import streamlit as st
 
+from .ev_grammar import classify_ev_scan, is_calculated_stat_match, scan_ev_string
+from .pokedex import get_pokedex
+from .stat_engine import evs_from_stat_scan, get_stat_engine
+
 
 def create_content_hash(content: str) -> str:
     """Create hash for content caching with validation version"""
@@ -70,6 +74,11 @@ def _fetch_pokemon_sprite_with_fallbacks(pokemon_name: str, form: str = None) ->
     Returns:
         URL to Pokemon sprite or placeholder
     """
+    # Strategy 0: Bundled Pokedex id, no network request
+    sprite_url = _bundled_sprite_url(pokemon_name, form)
+    if sprite_url:
+        return sprite_url
+
     # Strategy 1: Try exact name with form handling
     sprite_url = _try_fetch_sprite(_normalize_pokemon_name(pokemon_name, form))
     if sprite_url:
@@ -101,6 +110,25 @@ def _fetch_pokemon_sprite_with_fallbacks(pokemon_name: str, form: str = None) ->
     return _create_pokemon_placeholder(pokemon_name)
 
 
+def _bundled_sprite_url(pokemon_name: str, form: str = None) -> Optional[str]:
+    """
+    Official artwork URL from the PokeAPI id in the bundled Pokedex
+    
+    Args:
+        pokemon_name: Name of the Pokemon
+        form: Form variant (optional)
+        
+    Returns:
+        Sprite URL, or None if the Pokemon is not bundled
+    """
+    pokedex = get_pokedex()
+    for name in (_normalize_pokemon_name(pokemon_name, form), _apply_pokeapi_name_fixes(pokemon_name, form)):
+        sprite_url = pokedex.sprite_url(name)
+        if sprite_url:
+            return sprite_url
+    return None
+
+
 def _normalize_pokemon_name(pokemon_name: str, form: str = None) -> str:
     """
     Normalize Pokemon name for PokeAPI compatibility
@@ -354,18 +382,21 @@ def _create_pokemon_placeholder(pokemon_name: str) -> str:
     return f"https://via.placeholder.com/180x180/{bg_color}/{text_color}?text={abbrev}"
 
 
-def safe_parse_ev_spread(ev_string: str) -> Tuple[Dict[str, int], str]:
+def safe_parse_ev_spread(ev_string: str, pokemon_name: Optional[str] = None,
+                         nature: Optional[str] = None) -> Tuple[Dict[str, int], str]:
     """
     Safely parse EV spread from string format
 
     Args:
         ev_string: EV spread string (e.g., "252/0/0/252/4/0")
+        pokemon_name: Species the spread belongs to (see parse_ev_spread_detailed)
+        nature: Nature of the Pokemon, if known
 
     Returns:
         Tuple of (EV dict, source indicator)
     """
     try:
-        return parse_ev_spread(ev_string)
+        return parse_ev_spread(ev_string, pokemon_name, nature)
     except Exception:
         # Return default spread if parsing fails
         return {
@@ -378,103 +409,80 @@ def safe_parse_ev_spread(ev_string: str) -> Tuple[Dict[str, int], str]:
         }, "default_error"
 
 
-def parse_ev_spread(ev_string: str) -> Tuple[Dict[str, int], str]:
+def parse_ev_spread(ev_string: str, pokemon_name: Optional[str] = None,
+                    nature: Optional[str] = None) -> Tuple[Dict[str, int], str]:
     """
     Parse EV spread from various string formats including calculated stat formats
 
     Args:
         ev_string: EV spread in format like "252/0/0/252/4/0" or "H252 A0 B0 C252 D4 S0" or "H181(148)-A×↓-B131(124)"
+        pokemon_name: Species the spread belongs to; lets calculated stats
+            (H207 B101 C143 D105) be converted to exact EVs
+        nature: Nature of the Pokemon, if known (otherwise read from ↑/↓ marks or inferred)
 
     Returns:
         Tuple of (EV dictionary, source type)
     """
+    ev_dict, status, _ = parse_ev_spread_detailed(ev_string, pokemon_name, nature)
+    return ev_dict, status
+
+
+def parse_ev_spread_detailed(ev_string: str, pokemon_name: Optional[str] = None,
+                             nature: Optional[str] = None) -> Tuple[Dict[str, int], str, str]:
+    """
+    Parse an EV spread and report which notation it was written in
+
+    The string is tokenized once (see ev_grammar); the notation is chosen with
+    the priorities of the original parser: calculated stats, Japanese/labelled
+    grid, "value stat-name" pairs, slash-separated values, stat letters.
+
+    When the species is known, letter-labelled numbers that form a reachable
+    level-50 stat line are read as calculated stats and converted to exact EVs
+    with the stat engine (source type "calculated_stat_exact_<status>").
+
+    Args:
+        ev_string: EV spread in any supported notation
+        pokemon_name: Species the spread belongs to (English or Japanese)
+        nature: Nature of the Pokemon, if known
+
+    Returns:
+        Tuple of (EV dictionary, source type, format name). The format is one
+        of ev_grammar.EV_FORMATS, "empty" or "unrecognized".
+    """
     if not ev_string or ev_string.strip() == "":
-        return {
-            "HP": 0,
-            "Atk": 0,
-            "Def": 0,
-            "SpA": 0,
-            "SpD": 0,
-            "Spe": 0,
-        }, "default_empty"
-
-    ev_dict = {"HP": 0, "Atk": 0, "Def": 0, "SpA": 0, "SpD": 0, "Spe": 0}
-
-    # PRIORITY 1: Try Japanese grid format (most common in note.com team cards)
-    japanese_grid_result = parse_japanese_grid_format(ev_string)
-    if japanese_grid_result[1] != "default_empty":
-        return japanese_grid_result
-
-    # PRIORITY 2: Try calculated stat format (H181(148)-A×↓-B131(124)-C184↑(116)-D112(4)-S119(116))
-    calculated_format_result = parse_calculated_stat_format(ev_string)
-    if calculated_format_result[1] != "default_empty":
-        return calculated_format_result
-
-    # PRIORITY 3: Try "Number StatName" format (44 HP / 4 Def / 252 SpA / 28 SpD / 180 Spe)
-    # Enhanced with Japanese stat names
-    stat_name_indicators = [
-        "HP", "Atk", "Def", "SpA", "SpD", "Spe", 
-        "ＨＰ", "こうげき", "ぼうぎょ", "とくこう", "とくぼう", "すばやさ"
-    ]
-    
-    if any(stat in ev_string for stat in stat_name_indicators):
-        stat_name_patterns = {
-            r"(\d+)\s*(?:HP|ＨＰ)": "HP",
-            r"(\d+)\s*(?:Atk|こうげき|攻撃)": "Atk",
-            r"(\d+)\s*(?:Def|ぼうぎょ|防御)": "Def", 
-            r"(\d+)\s*(?:SpA|とくこう|特攻|特殊攻撃)": "SpA",
-            r"(\d+)\s*(?:SpD|とくぼう|特防|特殊防御)": "SpD",
-            r"(\d+)\s*(?:Spe|すばやさ|素早さ|Speed)": "Spe",
-        }
-        
-        for pattern, stat in stat_name_patterns.items():
-            matches = re.findall(pattern, ev_string, re.IGNORECASE | re.UNICODE)
-            if matches:
-                try:
-                    value = int(matches[0])
-                    if 0 <= value <= 252:
-                        ev_dict[stat] = value
-                except ValueError:
-                    continue
-        
-        # If we found any valid stats, return the result
-        if any(v > 0 for v in ev_dict.values()):
-            return validate_and_fix_evs(ev_dict)
-
-    # PRIORITY 4: Try slash-separated format (252/0/0/252/4/0)
-    if "/" in ev_string:
-        parts = ev_string.split("/")
-        if len(parts) == 6:
-            try:
-                stats = ["HP", "Atk", "Def", "SpA", "SpD", "Spe"]
-                for i, value in enumerate(parts):
-                    # Clean the value - remove any non-numeric characters except leading/trailing spaces
-                    clean_value = re.sub(r'[^\d]', '', value.strip())
-                    if clean_value:
-                        ev_dict[stats[i]] = int(clean_value)
-                return validate_and_fix_evs(ev_dict)
-            except ValueError:
-                pass
-
-    # PRIORITY 5: Try format with stat labels (H252 A0 B0 C252 D4 S0)
-    stat_patterns = {
-        r"H(\d+)": "HP",
-        r"A(\d+)": "Atk",
-        r"B(\d+)": "Def",
-        r"C(\d+)": "SpA",
-        r"D(\d+)": "SpD",
-        r"S(\d+)": "Spe",
-    }
+        return _empty_ev_dict(), "default_empty", "empty"
+
+    scan = scan_ev_string(ev_string)
+    exact = evs_from_stat_scan(scan, pokemon_name, nature)
+    if exact is not None:
+        return _format_ev_result("calculated_stat", exact, len(exact), exact=True) + ("calculated_stat",)
 
-    for pattern, stat in stat_patterns.items():
-        matches = re.findall(pattern, ev_string, re.IGNORECASE)
-        if matches:
-            ev_dict[stat] = int(matches[0])
+    ev_format, ev_dict, found_stats = classify_ev_scan(scan)
+    if ev_format is None:
+        return validate_and_fix_evs(ev_dict) + ("unrecognized",)
+    return _format_ev_result(ev_format, ev_dict, found_stats) + (ev_format,)
 
-    return validate_and_fix_evs(ev_dict)
 
+def _empty_ev_dict() -> Dict[str, int]:
+    return {"HP": 0, "Atk": 0, "Def": 0, "SpA": 0, "SpD": 0, "Spe": 0}
 
-def parse_calculated_stat_format(ev_string: str) -> Tuple[Dict[str, int], str]:
+
+def _format_ev_result(ev_format: str, ev_dict: Dict[str, int], found_stats: int,
+                      exact: bool = False) -> Tuple[Dict[str, int], str]:
+    """Validate a parsed spread and build its source type (notation + confidence + validation status)"""
+    validated_evs, status = validate_and_fix_evs({**_empty_ev_dict(), **ev_dict})
+    if exact:
+        return validated_evs, f"{ev_format}_exact_{status}"
+    if ev_format == "calculated_stat":
+        confidence = "high" if found_stats >= 5 else "medium" if found_stats >= 4 else "low"
+        return validated_evs, f"calculated_stat_{confidence}_{status}"
+    if ev_format == "japanese_grid":
+        confidence = "high" if found_stats >= 6 else "medium" if found_stats >= 5 else "low"
+        return validated_evs, f"japanese_grid_{confidence}_{status}"
+    return validated_evs, status
+
+
+def parse_calculated_stat_format(ev_string: str, pokemon_name: Optional[str] = None) -> Tuple[Dict[str, int], str]:
     """
     ULTRA-ENHANCED calculated stat format parser for note.com and Japanese VGC articles
     
@@ -486,130 +494,27 @@ def parse_calculated_stat_format(ev_string: str) -> Tuple[Dict[str, int], str]:
     
     Args:
         ev_string: EV string in calculated stat format
+        pokemon_name: Species the stats belong to; when known, the stats
+            are converted to exact EVs (also for stat-only lines)
         
     Returns:
         Tuple of (EV dictionary, source type)
     """
     if not ev_string or ev_string.strip() == "":
-        return {
-            "HP": 0,
-            "Atk": 0,
-            "Def": 0,
-            "SpA": 0,
-            "SpD": 0,
-            "Spe": 0,
-        }, "default_empty"
+        return _empty_ev_dict(), "default_empty"
+
+    scan = scan_ev_string(ev_string)
+    exact = evs_from_stat_scan(scan, pokemon_name)
+    if exact is not None:
+        return _format_ev_result("calculated_stat", exact, len(exact), exact=True)
+    # Values in parentheses are the EVs; without parentheses the letter values are
+    for values in ((scan.calculated if scan.has_parentheses else {}), scan.letters):
+        if is_calculated_stat_match(values):
+            ev_dict = {stat: values.get(stat, 0) for stat in _empty_ev_dict()}
+            return _format_ev_result("calculated_stat", ev_dict, len(values))
 
-    ev_dict = {"HP": 0, "Atk": 0, "Def": 0, "SpA": 0, "SpD": 0, "Spe": 0}
-    nature_info = {"boosts": [], "reductions": []}
-    
-    # ULTRA-ENHANCED regex patterns for all calculated stat variations
-    calc_patterns = [
-        # PRIORITY 1: Note.com standard format with parentheses
-        r'([HABCDS])(?:\d{2,3})?\((\d{1,3})\)([↑↓×]?)',  # H181(148)↑
-        
-        # PRIORITY 2: Compact format with parentheses
-        r'([HABCDS])\((\d{1,3})\)([↑↓×]?)',  # H(148)×
-        
-        # PRIORITY 3: Without parentheses but with nature symbols
-        r'([HABCDS])(\d{1,3})([↑↓×]+)',  # H148↑
-        
-        # PRIORITY 4: Simple letter + number format
-        r'([HABCDS])(\d{1,3})(?:\s|$|[^0-9])',  # H148 (followed by space or end)
-        
-        # PRIORITY 5: Space-separated format
-        r'([HABCDS])\s*(\d{1,3})(?:\s+|$)',  # H 148 or H148 
-    ]
-    
-    matches = []
-    best_pattern_matches = None
-    best_match_count = 0
-    
-    # Try all patterns and use the one with most matches
-    for pattern in calc_patterns:
-        pattern_matches = re.findall(pattern, ev_string, re.UNICODE | re.IGNORECASE)
-        if len(pattern_matches) > best_match_count:
-            best_match_count = len(pattern_matches)
-            best_pattern_matches = pattern_matches
-    
-    matches = best_pattern_matches or []
-    
-    # If no matches with strict patterns, try ultra-flexible patterns
-    if not matches:
-        # Try to find any H/A/B/C/D/S followed by numbers
-        ultra_flexible_pattern = r'([HABCDS])[^\d]*?(\d{1,3})'
-        matches = re.findall(ultra_flexible_pattern, ev_string, re.UNICODE | re.IGNORECASE)
-    
-    if matches:
-        stat_mapping = {
-            'H': 'HP',
-            'A': 'Atk', 
-            'B': 'Def',
-            'C': 'SpA',
-            'D': 'SpD',
-            'S': 'Spe'
-        }
-        
-        found_stats = 0
-        total_ev_value = 0
-        
-        for match_data in matches:
-            if len(match_data) >= 2:
-                stat_letter = match_data[0].upper()
-                ev_value_str = match_data[1]
-                nature_symbol = match_data[2] if len(match_data) > 2 else ''
-                
-                if stat_letter in stat_mapping:
-                    try:
-                        ev_int = int(ev_value_str)
-                        
-                        # Ultra-enhanced validation
-                        if 0 <= ev_int <= 252:
-                            ev_dict[stat_mapping[stat_letter]] = ev_int
-                            found_stats += 1
-                            total_ev_value += ev_int
-                            
-                            # Process nature symbols
-                            if '↑' in nature_symbol:
-                                nature_info["boosts"].append(stat_mapping[stat_letter])
-                            elif '↓' in nature_symbol:
-                                nature_info["reductions"].append(stat_mapping[stat_letter])
-                        elif ev_int > 252:
-                            # This might be a calculated stat value, try to infer EV
-                            # Common calculated stat ranges for level 50 Pokemon
-                            if 100 <= ev_int <= 200:
-                                # Rough estimation: calculated stat to EV
-                                estimated_ev = min(252, max(0, (ev_int - 80) * 8))
-                                if estimated_ev % 4 == 0:  # Prefer multiples of 4
-                                    ev_dict[stat_mapping[stat_letter]] = estimated_ev
-                                    found_stats += 1
-                                    total_ev_value += estimated_ev
-                                    
-                    except ValueError:
-                        continue
-        
-        # Enhanced success criteria
-        success_criteria = [
-            found_stats >= 4,  # Found at least 4 stats
-            found_stats >= 6 and total_ev_value <= 508,  # All stats and valid total
-            found_stats >= 3 and total_ev_value >= 400,  # Reasonable investment pattern
-        ]
-        
-        if any(success_criteria):
-            # Additional validation for calculated stat format
-            validated_evs, status = validate_and_fix_evs(ev_dict)
-            confidence = "high" if found_stats >= 5 else "medium" if found_stats >= 4 else "low"
-            return validated_evs, f"calculated_stat_{confidence}_{status}"
-    
     # No matches found
-    return {
-        "HP": 0,
-        "Atk": 0,
-        "Def": 0,
-        "SpA": 0,
-        "SpD": 0,
-        "Spe": 0,
-    }, "default_empty"
+    return _empty_ev_dict(), "default_empty"
 
 
 def parse_japanese_grid_format(text: str) -> Tuple[Dict[str, int], str]:
@@ -626,46 +531,12 @@ def parse_japanese_grid_format(text: str) -> Tuple[Dict[str, int], str]:
     Returns:
         Tuple of (EV dictionary, source type)
     """
-    ev_dict = {"HP": 0, "Atk": 0, "Def": 0, "SpA": 0, "SpD": 0, "Spe": 0}
-    
-    # Japanese stat name mappings (comprehensive)
-    japanese_stat_patterns = {
-        'HP': [r'(?:ＨＰ|HP|H|ヒットポイント|体力)[:\s]*(\d{1,3})', r'HP[:\s]*(\d{1,3})'],
-        'Atk': [r'(?:こうげき|攻撃|A|アタック|物理攻撃)[:\s]*(\d{1,3})', r'(?:Attack|ATK)[:\s]*(\d{1,3})'],
-        'Def': [r'(?:ぼうぎょ|防御|B|ディフェンス|物理防御)[:\s]*(\d{1,3})', r'(?:Defense|DEF)[:\s]*(\d{1,3})'],
-        'SpA': [r'(?:とくこう|特攻|特殊攻撃|C|とくしゅこうげき)[:\s]*(\d{1,3})', r'(?:Sp\.?\s*A|Special\s*Attack)[:\s]*(\d{1,3})'],
-        'SpD': [r'(?:とくぼう|特防|特殊防御|D|とくしゅぼうぎょ)[:\s]*(\d{1,3})', r'(?:Sp\.?\s*D|Special\s*Defense)[:\s]*(\d{1,3})'],
-        'Spe': [r'(?:すばやさ|素早さ|素早|S|スピード|速さ)[:\s]*(\d{1,3})', r'(?:Speed|SPE)[:\s]*(\d{1,3})']
-    }
-    
-    found_stats = 0
-    
-    for stat, patterns in japanese_stat_patterns.items():
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.UNICODE)
-            for match in matches:
-                try:
-                    value = int(match.group(1))
-                    if 0 <= value <= 252:
-                        ev_dict[stat] = value
-                        found_stats += 1
-                        break  # Take first valid match for this stat
-                except (ValueError, IndexError):
-                    continue
-    
-    if found_stats >= 4:  # Need at least 4 stats for success
-        validated_evs, status = validate_and_fix_evs(ev_dict)
-        confidence = "high" if found_stats >= 6 else "medium" if found_stats >= 5 else "low"
-        return validated_evs, f"japanese_grid_{confidence}_{status}"
-    
-    return {
-        "HP": 0,
-        "Atk": 0,
-        "Def": 0,
-        "SpA": 0,
-        "SpD": 0,
-        "Spe": 0,
-    }, "default_empty"
+    scan = scan_ev_string(text or "")
+    if len(scan.labelled) >= 4:  # Need at least 4 stats for success
+        ev_dict = {stat: scan.labelled.get(stat, 0) for stat in _empty_ev_dict()}
+        return _format_ev_result("japanese_grid", ev_dict, len(scan.labelled))
+
+    return _empty_ev_dict(), "default_empty"
 
 
 def validate_and_fix_evs(ev_dict: Dict[str, int]) -> Tuple[Dict[str, int], str]:
@@ -799,12 +670,15 @@ def analyze_competitive_ev_pattern(ev_dict: Dict[str, int], total: int) -> Dict[
     return analysis
 
 
-def is_calculated_stats(numbers: List[int]) -> bool:
+def is_calculated_stats(numbers: List[int], pokemon_name: Optional[str] = None) -> bool:
     """
     Check if numbers look like calculated stats rather than EVs
 
     Args:
         numbers: List of 6 numbers
+        pokemon_name: Species the numbers belong to; when its base stats are
+            known the answer is exact (some nature/EV/IV combination reaches
+            every number) instead of a heuristic
 
     Returns:
         True if they look like calculated stats
@@ -812,6 +686,10 @@ def is_calculated_stats(numbers: List[int]) -> bool:
     if len(numbers) != 6:
         return False
 
+    engine = get_stat_engine()
+    if pokemon_name and engine.species_index(pokemon_name) is not None:
+        return engine.is_stat_line(pokemon_name, numbers)
+
     # Calculated stats are typically in range 50-200+ for level 50
     # EVs are 0-252 and often include many zeros
     zero_count = numbers.count(0)
@@ -921,7 +799,7 @@ def create_pokepaste(pokemon_team: List[Dict], team_name: str = "VGC Team") -> s
             if isinstance(evs, str):
                 # Parse EV string format like "252/0/0/252/4/0"
                 try:
-                    ev_dict, _ = safe_parse_ev_spread(evs)
+                    ev_dict, _ = safe_parse_ev_spread(evs, name, pokemon.get("nature") or None)
                     for stat, value in ev_dict.items():
                         if value > 0:
                             ev_parts.append(f"{value} {stat}")
@@ -0,0 +1,189 @@
+"""
+Persistent cache of Gemini Vision results for team card images.
+
+The same team card reappears in reposts, in an author's later articles and in
+repeat analyses of one URL. ``VisionCache`` stores the raw vision text and the
+EV spreads extracted from it in a SQLite file, keyed by the SHA-256 digest of
+the image bytes plus the vision prompt version (prompt and model), so a hit
+skips the model call entirely. Misses on the exact digest fall back to the
+image's perceptual hash: a re-encoded copy of the same card reuses a result
+analysed from an equal or larger copy.
+
+Entries expire after ``ttl_seconds`` and the least recently used entries are
+evicted once ``max_entries`` is exceeded.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VISION_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "vgc_analyzer", "vision_cache.sqlite")
+DEFAULT_VISION_CACHE_MAX_ENTRIES = 5000
+DEFAULT_VISION_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vision_results (
+    digest TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    phash TEXT,
+    width INTEGER NOT NULL DEFAULT 0,
+    height INTEGER NOT NULL DEFAULT 0,
+    analysis TEXT NOT NULL,
+    ev_spreads TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (digest, prompt_version)
+);
+CREATE INDEX IF NOT EXISTS idx_vision_results_phash ON vision_results(phash, prompt_version);
+CREATE INDEX IF NOT EXISTS idx_vision_results_accessed ON vision_results(last_accessed);
+"""
+
+
+class VisionCache:
+    """Disk-backed LRU/TTL cache of vision analyses keyed by image digest"""
+
+    def __init__(self, path: str = DEFAULT_VISION_CACHE_PATH,
+                 max_entries: int = DEFAULT_VISION_CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_VISION_CACHE_TTL_SECONDS):
+        """
+        Open (or create) a cache file
+
+        Args:
+            path: SQLite file
+            max_entries: Entries kept before least recently used ones are evicted
+            ttl_seconds: Age after which an entry is no longer served
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _phash_key(phash: Optional[int]) -> Optional[str]:
+        # SQLite integers are signed 64-bit; store the unsigned hash as hex
+        return f"{phash:016x}" if phash is not None else None
+
+    def get(self, digest: str, prompt_version: str, phash: Optional[int] = None,
+            size: Tuple[int, int] = (0, 0)) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis
+
+        Args:
+            digest: SHA-256 hex digest of the image bytes
+            prompt_version: Vision prompt version the result must have been produced with
+            phash: Perceptual hash of the image, for re-encoded copies
+            size: Image dimensions; a perceptual-hash match must be at least this large
+
+        Returns:
+            Dict with "analysis" and "ev_spreads", or None on a miss
+        """
+        now = time.time()
+        oldest = now - self.ttl_seconds
+        width, height = size or (0, 0)
+
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT rowid, analysis, ev_spreads FROM vision_results "
+                "WHERE digest = ? AND prompt_version = ? AND created_at >= ?",
+                (digest, prompt_version, oldest),
+            ).fetchone()
+
+            if row is None and phash is not None:
+                row = conn.execute(
+                    "SELECT rowid, analysis, ev_spreads FROM vision_results "
+                    "WHERE phash = ? AND prompt_version = ? AND created_at >= ? AND width >= ? AND height >= ? "
+                    "ORDER BY width * height DESC LIMIT 1",
+                    (self._phash_key(phash), prompt_version, oldest, width, height),
+                ).fetchone()
+
+            if row is None:
+                return None
+
+            rowid, analysis, ev_spreads = row
+            conn.execute(
+                "UPDATE vision_results SET last_accessed = ?, hits = hits + 1 WHERE rowid = ?",
+                (now, rowid),
+            )
+
+        return {"analysis": analysis, "ev_spreads": json.loads(ev_spreads)}
+
+    def put(self, digest: str, prompt_version: str, analysis: str, ev_spreads: List[Dict[str, Any]],
+            phash: Optional[int] = None, size: Tuple[int, int] = (0, 0)):
+        """Store (or replace) the analysis of an image and evict expired/excess entries"""
+        now = time.time()
+        width, height = size or (0, 0)
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO vision_results "
+                "(digest, prompt_version, phash, width, height, analysis, ev_spreads, created_at, last_accessed, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (digest, prompt_version, self._phash_key(phash), width, height, analysis,
+                 json.dumps(ev_spreads, ensure_ascii=False), now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM vision_results WHERE created_at < ?", (now - self.ttl_seconds,))
+        excess = conn.execute("SELECT COUNT(*) FROM vision_results").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM vision_results WHERE rowid IN "
+                "(SELECT rowid FROM vision_results ORDER BY last_accessed ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM vision_results")
+
+    def pokemon_counts(self) -> Dict[str, int]:
+        """
+        How often each Pokemon appears in the cached team cards
+
+        Every EV spread tied to a Pokemon counts once per time its card was
+        stored or served from the cache.
+
+        Returns:
+            Pokemon name -> weighted count
+        """
+        counts: Dict[str, int] = {}
+        with self._connect() as conn:
+            for ev_spreads, hits in conn.execute("SELECT ev_spreads, hits FROM vision_results"):
+                try:
+                    spreads = json.loads(ev_spreads)
+                except ValueError:
+                    continue
+                for spread in spreads:
+                    pokemon = spread.get("pokemon") if isinstance(spread, dict) else None
+                    if pokemon:
+                        counts[pokemon] = counts.get(pokemon, 0) + 1 + hits
+        return counts
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and total hits served"""
+        with self._connect() as conn:
+            entries, hits = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM vision_results"
+            ).fetchone()
+        return {"entries": entries, "hits": hits}
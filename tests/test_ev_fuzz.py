@@ -0,0 +1,45 @@
+"""
+Fuzz tests for the EV parsers: no crashes, width invariance
+
+A reduced run of benchmarks/ev_fuzz.py. Wall-clock checks are too noisy for
+the unit suite; run that script for timings and the linear-scaling gate.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import ev_fuzz
+
+
+@pytest.fixture(scope="module")
+def targets():
+    return ev_fuzz.load_targets()
+
+
+def test_corpus_covers_every_variant():
+    kinds = {kind for kind, _ in ev_fuzz.build_corpus(variants=1, long_length=500)}
+    assert kinds == {
+        "ev_string", "snippet", "full_width_digits", "full_width_ascii",
+        "mixed_separators", "noise", "truncated", "long_noisy",
+    }
+
+
+def test_no_target_raises(targets):
+    corpus = ev_fuzz.build_corpus(seed=3, variants=2, long_length=3000)
+    for name, target in targets.items():
+        assert ev_fuzz.run_corpus(target, corpus)["errors"] == [], name
+
+
+def test_full_width_digits_parse_the_same(targets):
+    ev_strings = ev_fuzz.load_lines(ev_fuzz.EV_STRINGS)
+    for name in ("parse_ev_spread", "parse_calculated_stat_format", "parse_japanese_grid_format"):
+        assert ev_fuzz.width_mismatches(targets[name], ev_strings, ev_fuzz.FULL_WIDTH_DIGITS) == [], name
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
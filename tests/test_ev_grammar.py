@@ -0,0 +1,103 @@
+"""
+Tests for the single-pass EV spread grammar behind parse_ev_spread
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_ev_parsing
+from utils.ev_grammar import scan_ev_string
+from utils.utils import (
+    parse_calculated_stat_format,
+    parse_ev_spread,
+    parse_ev_spread_detailed,
+    parse_japanese_grid_format,
+)
+
+
+def _spread(hp, atk, defense, spa, spd, spe):
+    return {"HP": hp, "Atk": atk, "Def": defense, "SpA": spa, "SpD": spd, "Spe": spe}
+
+
+@pytest.mark.parametrize("text, expected, ev_format", [
+    ("252/0/4/252/0/0", _spread(252, 0, 4, 252, 0, 0), "slash"),
+    ("H252 A0 B4 C252 D0 S0", _spread(252, 0, 4, 252, 0, 0), "japanese_grid"),
+    ("H252-A4-B0-C0-D0-S252", _spread(252, 4, 0, 0, 0, 252), "japanese_grid"),
+    ("ＨＰ：252　こうげき：0　ぼうぎょ：4　とくこう：252　とくぼう：0　すばやさ：0", _spread(252, 0, 4, 252, 0, 0), "japanese_grid"),
+    ("HP: 4, Attack: 252, Defense: 0, Sp. Atk: 0, Sp. Def: 0, Speed: 252", _spread(4, 252, 0, 0, 0, 252), "japanese_grid"),
+    ("H181(148)-A×↓-B131(124)-C184↑(116)-D112(4)-S119(116)", _spread(148, 0, 124, 116, 4, 116), "calculated_stat"),
+    ("H175(252)-A120(252)↑-B100(4)-C95×-D95×-S70×", _spread(252, 252, 4, 0, 0, 0), "calculated_stat"),
+    ("H(252)-A(252)-B(4)-C(0)-D(0)-S(0)", _spread(252, 252, 4, 0, 0, 0), "calculated_stat"),
+    ("H252 A252 S4", _spread(252, 252, 0, 0, 0, 4), "calculated_stat"),
+    ("44 HP / 4 Def / 252 SpA / 28 SpD / 180 Spe", _spread(44, 0, 4, 252, 28, 180), "stat_names"),
+    ("252 HP / 252 Atk / 4 Spe", _spread(252, 252, 0, 0, 0, 4), "stat_names"),
+    ("H252 S252", _spread(252, 0, 0, 0, 0, 252), "stat_labels"),
+])
+def test_every_notation_in_one_pass(text, expected, ev_format):
+    evs, status, detected = parse_ev_spread_detailed(text)
+    assert evs == expected
+    assert detected == ev_format
+    assert parse_ev_spread(text) == (evs, status)
+
+
+def test_source_types_keep_their_prefixes():
+    assert parse_ev_spread("H252 A0 B4 C252 D0 S0")[1] == "japanese_grid_high_valid_high"
+    assert parse_ev_spread("H(252)-A(252)↑-B(4)-C×-D×-S×")[1] == "calculated_stat_low_valid_high"
+    assert parse_ev_spread("252/0/4/252/0/0")[1] == "valid_high"
+    assert parse_ev_spread("   ") == (_spread(0, 0, 0, 0, 0, 0), "default_empty")
+    assert parse_ev_spread_detailed("None")[2] == "unrecognized"
+
+
+def test_nature_symbols_are_recorded():
+    scan = scan_ev_string("H181(148)-A×↓-B131(124)-C184↑(116)-D112(4)-S119(116)")
+    assert scan.nature_boosts == ["SpA"]
+    assert scan.nature_reductions == ["Atk"]
+
+
+def test_format_specific_parsers():
+    calculated = parse_calculated_stat_format("H181(148)-A×↓-B131(124)-C184↑(116)-D112(4)-S119(116)")
+    assert calculated == (_spread(148, 0, 124, 116, 4, 116), "calculated_stat_high_valid_high")
+    assert parse_calculated_stat_format("H148 A0 B124 C116 D4 S116")[0] == _spread(148, 0, 124, 116, 4, 116)
+    assert parse_calculated_stat_format("252/0/4/252/0/0")[1] == "default_empty"
+
+    grid = parse_japanese_grid_format("ＨＰ: 252 こうげき: 0 ぼうぎょ: 4 とくこう: 252 とくぼう: 0 すばやさ: 0")
+    assert grid == (_spread(252, 0, 4, 252, 0, 0), "japanese_grid_high_valid_high")
+    assert parse_japanese_grid_format("HP 252 Atk 252")[1] == "default_empty"
+
+
+def test_three_labels_are_not_a_grid():
+    # The legacy parser counted "HP" twice and reported "japanese_grid_low_valid_high"
+    assert parse_ev_spread_detailed("HP 252 Atk 252 Spe 4") == (
+        _spread(252, 252, 0, 0, 0, 4), "valid_high", "stat_labels"
+    )
+
+
+def test_combined_letter_prefixes():
+    # Japanese shorthand: CS252 is C252 S252
+    assert parse_ev_spread("CS252") == (_spread(0, 0, 0, 252, 0, 252), "valid_high")
+    assert parse_ev_spread("HB252 S4")[0] == _spread(252, 0, 252, 0, 0, 4)
+    assert parse_ev_spread("AS252 H4")[0] == _spread(4, 252, 0, 0, 0, 252)
+    # Out-of-order pairs and lower-case words are not prefixes
+    assert parse_ev_spread("SA252 H4")[0] == _spread(4, 0, 0, 0, 0, 0)
+    assert parse_ev_spread("as 252 HP")[0] == _spread(252, 0, 0, 0, 0, 0)
+
+
+def test_only_documented_differences_from_the_legacy_parser():
+    corpus = bench_ev_parsing.load_corpus(bench_ev_parsing.DEFAULT_CORPUS)
+    differing = {text for text, _, _ in bench_ev_parsing.compare_with_legacy(corpus)}
+
+    assert differing == set(bench_ev_parsing.DOCUMENTED_DIFFERENCES)
+
+
+def test_letters_inside_words_are_not_stat_labels():
+    scan = scan_ev_string("Hasty 252, Choice Scarf, Dazzling Gleam 4")
+    assert scan.labelled == {} and scan.letters_any == {}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,120 @@
+"""
+Tests for the single-pass EV spread scanner over vision output
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.ev_spread_scanner import deduplicate_ev_spreads, scan_ev_spreads
+from utils.image_analyzer import extract_ev_spreads_from_image_analysis
+from core.analyzer import GeminiVGCAnalyzer
+
+TEAM_CARD = """POKEMON #1: Flutter Mane
+- Japanese Name: ハバタクカミ
+- EV Spread: H4 A0 B0 C252 D0 S252 → Validated: 4/0/0/252/0/252
+- Nature: Timid
+POKEMON #2: 白バドレックス
+- EV Spread: H175(252)-A120(252)↑-B100(4)-C95×-D95×-S70×
+POKEMON #3: Incineroar
+- 実数値: 202-135-111-90-156-80
+- 努力値: 252-0-4-0-252-0
+POKEMON #4: Amoonguss
+- EV Spread: ＨＰ: 252 こうげき: 0 ぼうぎょ: 4 とくこう: 0 とくぼう: 252 すばやさ: 0
+"""
+
+
+def _summary(text):
+    return [(spread["format"], spread["format_type"], spread["pokemon"])
+            for spread in extract_ev_spreads_from_image_analysis(text)]
+
+
+def test_spreads_are_tied_to_their_pokemon():
+    assert _summary(TEAM_CARD) == [
+        ("4/0/0/252/0/252", "slash_format", "Flutter Mane"),
+        ("252/252/4/0/0/0", "calculated_stat_format", "Calyrex-Ice"),
+        ("252/0/4/0/252/0", "slash_format", "Incineroar"),
+        ("252/0/4/0/252/0", "japanese_format", "Amoonguss"),
+    ]
+
+
+def test_offsets_point_into_the_source():
+    for record in scan_ev_spreads(TEAM_CARD):
+        assert TEAM_CARD[record.start:record.end] == record.raw_match
+    spread = extract_ev_spreads_from_image_analysis(TEAM_CARD)[1]
+    assert TEAM_CARD[spread["start"]:spread["end"]] == "H175(252)-A120(252)↑-B100(4)-C95×-D95×-S70×"
+
+
+def test_notations():
+    assert _summary("H181(148)-A×↓-B131(124)-C184↑(116)-D112(4)-S119(116)") == [
+        ("148/0/124/116/4/116", "calculated_stat_format", None)
+    ]
+    # Bare letters next to parenthesised EVs are uninvested stats
+    assert _summary("H198(252)-A204(252)↑-B115-C×-D120(4)-S101")[0][0] == "252/252/0/0/4/0"
+    # Stats on the header line itself are still scanned
+    assert _summary("Pokemon 1: H248/A0/B4/C252/D0/S4\nPOKEMON 2: Incineroar H252/A4/B0/C0/D252/S0") == [
+        ("248/0/4/252/0/4", "slash_format", None), ("252/4/0/0/252/0", "slash_format", "Incineroar")
+    ]
+    assert _summary("card20: H232/A0/B4/C252/D0/S20") == [("232/0/4/252/0/20", "slash_format", None)]
+    assert _summary("252HP 0Atk 4Def 252SpA 0SpD 0Spe") == [("252/0/4/252/0/0", "space_format", None)]
+    assert _summary("HP: 4\nAttack: 252\nDefense: 0\nSp. Atk: 0\nSp. Def: 0\nSpeed: 252")[0][:2] == (
+        "4/252/0/0/0/252", "japanese_format"
+    )
+    # Three stats are enough right after an EV keyword
+    assert _summary("努力値：B4 C252 S252") == [("0/0/4/252/0/252", "space_format", None)]
+    assert _summary("B4 C252 S252") == []
+
+
+def test_non_spreads_are_rejected():
+    assert _summary("実数値：H207 B101 C143 D105 S100") == []
+    assert _summary("2024/01/05 Regulation H 1234567/0/0/0/0/0") == []
+    assert _summary("Moves: Moonblast, Shadow Ball, Icy Wind, Protect") == []
+    assert _summary("") == []
+
+
+def test_list_items_only_name_known_pokemon():
+    text = "1. 白バドレックス @ こだわりハチマキ\nH252 A252 B4 C0 D0 S0\n2. H4 A0 B0 C252 D0 S252"
+    assert [spread["pokemon"] for spread in extract_ev_spreads_from_image_analysis(text)] == [
+        "Calyrex-Ice", "Calyrex-Ice"
+    ]
+    assert _summary("【ガオガエン】\n努力値：252-0-4-0-252-0")[0][2] == "Incineroar"
+
+
+def test_stat_lines_of_known_pokemon_are_converted():
+    # A136 is a stat, not an uninvested Attack: Incineroar needs 4 EVs for it
+    records = list(scan_ev_spreads("1. ガオガエン\nH202(252)-A136-B110-C×-D156(252)-S80"))
+    assert [(record.values, record.format_type) for record in records] == [
+        ((252, 4, 0, 0, 252, 0), "calculated_stat_format")
+    ]
+    records = list(scan_ev_spreads("1. ガオガエン\n実数値：H202 A136 B110 C90 D156 S80"))
+    assert [record.values for record in records] == [(252, 4, 0, 0, 252, 0)]
+
+    # EV lines and lines of an unknown Pokemon are read as before
+    assert list(scan_ev_spreads("1. ガオガエン\nH252 A4 B0 C0 D252 S0"))[0].format_type == "space_format"
+    assert list(scan_ev_spreads("H202(252)-A136-B110-C×-D156(252)-S80"))[0].values == (252, 0, 0, 0, 252, 0)
+
+
+def test_duplicates_collapse_per_pokemon():
+    records = list(scan_ev_spreads("POKEMON #1: Dragonite\nH252 A252 B0 C0 D4 S0\n252/252/0/0/4/0"))
+    assert [record.format_type for record in records] == ["space_format", "slash_format"]
+
+    kept = deduplicate_ev_spreads(records)
+    assert len(kept) == 1 and kept[0].format_type == "slash_format" and kept[0].start == records[0].start
+
+
+def test_merge_uses_the_scanner_association():
+    analyzer = object.__new__(GeminiVGCAnalyzer)
+    # Confidence order alone would hand Flutter Mane's spread to the first member
+    team = [{"name": name, "evs": "Not specified"} for name in ("Incineroar", "Calyrex-Ice")]
+    image_data = {"ev_spreads": extract_ev_spreads_from_image_analysis(TEAM_CARD)}
+
+    merged = analyzer._merge_text_and_image_analysis({"pokemon_team": team}, image_data)
+
+    assert [member["evs"] for member in merged["pokemon_team"]] == ["252/0/4/0/252/0", "252/252/4/0/0/0"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,86 @@
+"""
+Equivalence tests: batch EV validation vs the scalar validate_and_fix_evs
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.ev_validation import (
+    EV_STATUSES,
+    analyze_competitive_ev_pattern_batch,
+    spreads_to_array,
+    status_names,
+    validate_ev_batch,
+)
+from utils.utils import analyze_competitive_ev_pattern, validate_and_fix_evs
+
+STATS = ("HP", "Atk", "Def", "SpA", "SpD", "Spe")
+
+EDGE_CASES = [
+    [252, 0, 4, 252, 0, 0],
+    [0, 0, 0, 0, 0, 0],
+    [252, 252, 252, 252, 252, 252],
+    [181, 148, 131, 184, 112, 119],  # calculated stats
+    [-4, 300, 0, 255, 2, 1],
+    [253, 0, 0, 0, 0, 0],
+    [250, 250, 6, 0, 0, 0],
+    [244, 0, 12, 252, 0, 0],
+    [252, 252, 0, 0, 0, 0],
+    [212, 0, 0, 0, 0, 0],
+    [3, 0, 0, 0, 0, 0],
+    [99, 1, 0, 0, 0, 0],
+]
+
+
+def _random_spreads(count):
+    rng = np.random.default_rng(42)
+    competitive = rng.integers(0, 64, (count, 6)) * 4 * (rng.random((count, 6)) < 0.5)
+    noisy = rng.integers(-20, 400, (count, 6))
+    return np.concatenate([competitive, noisy, np.array(EDGE_CASES)])
+
+
+def test_batch_matches_scalar_validation():
+    spreads = _random_spreads(2000)
+
+    fixed, codes, scores = validate_ev_batch(spreads)
+
+    for row, batch_evs, status in zip(spreads, fixed, status_names(codes)):
+        expected_evs, expected_status = validate_and_fix_evs(dict(zip(STATS, row.tolist())))
+        assert list(expected_evs.values()) == batch_evs.tolist(), row
+        assert expected_status == status, row
+    assert scores.shape == codes.shape == (len(spreads),)
+
+
+def test_batch_matches_scalar_patterns():
+    spreads = _random_spreads(500).clip(0, 252)
+
+    patterns = analyze_competitive_ev_pattern_batch(spreads)
+
+    for i, row in enumerate(spreads):
+        expected = analyze_competitive_ev_pattern(dict(zip(STATS, row.tolist())), int(row.sum()))
+        assert expected == {key: bool(values[i]) for key, values in patterns.items()}
+
+
+def test_scores_and_codes():
+    fixed, codes, scores = validate_ev_batch([[252, 0, 4, 252, 0, 0], [181, 148, 131, 184, 112, 119]])
+    assert status_names(codes) == ["valid_high", "questionable_low"]
+    assert scores.tolist() == [120, 5]
+    assert EV_STATUSES[codes[0]] == "valid_high"
+    assert fixed.dtype == np.int64
+
+
+def test_input_helpers():
+    assert spreads_to_array([{"HP": 252, "Spe": 4}]).tolist() == [[252, 0, 0, 0, 0, 4]]
+    assert spreads_to_array([]).shape == (0, 6)
+    assert validate_ev_batch(spreads_to_array([]))[0].shape == (0, 6)
+    with pytest.raises(ValueError):
+        validate_ev_batch([252, 0, 4, 252, 0, 0])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the raw HTML archive and offline re-extraction
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.html_archive import HTMLArchive, reextract_archive, main
+from core.scraper import ArticleScraper
+
+
+ARTICLE_HTML = (
+    "<html><head><title>構築記事</title></head><body><nav>menu login</nav>"
+    "<article><p>" + "ポケモンVGCダブルバトルの構築紹介です。努力値調整はH252 S252。ガブリアス採用。" * 12
+    + "</p></article><footer>footer</footer></body></html>"
+).encode("utf-8")
+
+
+class FakeResponse:
+    """Just the attributes the scraper reads from requests.Response"""
+
+    def __init__(self, content, url):
+        self.content = content
+        self.url = url
+        self.status_code = 200
+        self.encoding = "utf-8"
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding)
+
+
+def test_store_and_load_roundtrip_deduplicates_blobs():
+    with tempfile.TemporaryDirectory() as root:
+        archive = HTMLArchive(root, codec="gzip")
+        first = archive.store_response(FakeResponse(ARTICLE_HTML, "https://example.com/a"))
+        second = archive.store_response(FakeResponse(ARTICLE_HTML, "https://example.com/a?ref=x"))
+
+        loaded = archive.load_response(first)
+        assert loaded.content == ARTICLE_HTML
+        assert loaded.url == "https://example.com/a"
+        assert loaded.headers["Content-Type"].startswith("text/html")
+        assert archive.load_response(second).content == ARTICLE_HTML
+
+        stats = archive.stats()
+        assert stats["records"] == 2
+        assert stats["blobs"] == 1
+        assert stats["stored_bytes"] < stats["raw_bytes"]
+
+
+def test_scraper_archives_processed_responses():
+    with tempfile.TemporaryDirectory() as root:
+        scraper = ArticleScraper(archive=HTMLArchive(root))
+        live = scraper._process_response_content(FakeResponse(ARTICLE_HTML, "https://example.com/post"))
+
+        replayed = list(reextract_archive(root, workers=1))
+        assert len(replayed) == 1
+        assert replayed[0]["error"] is None
+        assert replayed[0]["content"] == live
+        # Replays never add records of their own
+        assert HTMLArchive(root).stats()["records"] == 1
+
+
+def test_reextract_across_worker_processes():
+    with tempfile.TemporaryDirectory() as root:
+        archive = HTMLArchive(root)
+        for i in range(3):
+            archive.store_response(FakeResponse(ARTICLE_HTML, f"https://example.com/{i}"))
+        # Older duplicate of /0 is skipped in favour of the latest record
+        archive.store_response(FakeResponse(ARTICLE_HTML, "https://example.com/0"))
+
+        results = list(reextract_archive(root, workers=2))
+        assert sorted(r["url"] for r in results) == [f"https://example.com/{i}" for i in range(3)]
+        assert all(r["content"] for r in results)
+
+        output = os.path.join(root, "out.jsonl")
+        assert main(["reextract", root, "--workers", "2", "--all-records", "--output", output]) == 0
+        with open(output, encoding="utf-8") as f:
+            assert len(f.readlines()) == 4
+
+
+if __name__ == "__main__":
+    test_store_and_load_roundtrip_deduplicates_blobs()
+    test_scraper_archives_processed_responses()
+    test_reextract_across_worker_processes()
+    print("All HTML archive tests passed")
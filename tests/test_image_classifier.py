@@ -0,0 +1,101 @@
+"""
+Tests for the local pixel-level team-card classifier and the vision gate
+"""
+
+import os
+import sys
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_classifier import (
+    CANDIDATE_TEAM_CARD_THRESHOLD,
+    DEFAULT_TEAM_CARD_THRESHOLD,
+    extract_image_features,
+    team_card_probability,
+)
+from utils.image_analyzer import gate_vision_candidates
+
+
+def _encode(img, image_format="PNG"):
+    buffer = BytesIO()
+    img.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def _stat_card():
+    img = Image.new("RGB", (1280, 720), (30, 34, 60))
+    draw = ImageDraw.Draw(img)
+    for column in range(3):
+        for row in range(2):
+            x, y = column * 426, row * 360
+            draw.rectangle([x + 8, y + 8, x + 418, y + 352], fill=(60, 70, 110), outline=(220, 220, 230))
+            for line in range(8):
+                draw.text((x + 20, y + 20 + line * 40), "H252 A4 B0 C0 D0 S252 Protect", fill=(255, 255, 255))
+    return img
+
+
+def _photo():
+    rng = np.random.default_rng(11)
+    small = rng.integers(0, 255, size=(50, 75, 3), dtype=np.uint8)
+    return Image.fromarray(small).resize((1200, 800), Image.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+
+
+def _avatar():
+    img = Image.new("RGB", (400, 400), (255, 255, 255))
+    ImageDraw.Draw(img).ellipse([50, 50, 350, 350], fill=(200, 80, 80))
+    return img
+
+
+def test_stat_card_scores_above_threshold():
+    assert team_card_probability(_encode(_stat_card())) > 0.8
+
+
+def test_photos_and_plain_graphics_score_below_threshold():
+    assert team_card_probability(_encode(_photo(), "JPEG")) < CANDIDATE_TEAM_CARD_THRESHOLD
+    assert team_card_probability(_encode(_avatar())) < CANDIDATE_TEAM_CARD_THRESHOLD
+
+
+def test_features_describe_the_image():
+    card = extract_image_features(_encode(_stat_card()))
+    photo = extract_image_features(_encode(_photo(), "JPEG"))
+
+    assert card["text_lines"] > photo["text_lines"]
+    assert card["edge_crispness"] > photo["edge_crispness"]
+    assert photo["palette_entropy"] > card["palette_entropy"]
+    assert card["aspect_ratio"] == 1280 / 720
+
+
+def test_undecodable_image_has_no_probability():
+    assert team_card_probability(b"not an image") is None
+    assert extract_image_features(b"") is None
+
+
+def test_gate_keeps_unscored_images_and_honours_threshold():
+    images = [
+        {"url": "card", "team_card_probability": 0.9},
+        {"url": "banner", "team_card_probability": 0.1},
+        {"url": "unknown", "team_card_probability": None},
+        {"url": "legacy"},
+    ]
+    assert [image["url"] for image in gate_vision_candidates(images, threshold=0.3)] == ["card", "unknown", "legacy"]
+    assert len(gate_vision_candidates(images, threshold=0.0)) == 4
+
+
+def test_gate_is_off_by_default():
+    # A phone photo of a team card (blurred, rotated, noisy JPEG) scores far below a clean card
+    rng = np.random.default_rng(5)
+    photo = _stat_card().rotate(4, expand=True, fillcolor=(90, 90, 90)).filter(ImageFilter.GaussianBlur(2))
+    noisy = np.clip(np.asarray(photo, dtype=np.int16) + rng.integers(-25, 25, (photo.height, photo.width, 3)), 0, 255)
+    probability = team_card_probability(_encode(Image.fromarray(noisy.astype(np.uint8)), "JPEG"))
+
+    assert DEFAULT_TEAM_CARD_THRESHOLD == 0.0
+    assert gate_vision_candidates([{"url": "photo", "team_card_probability": probability}]) != []
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
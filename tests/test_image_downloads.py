@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent, bounded image downloading in extract_images_from_url
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import utils.image_analyzer as image_analyzer
+from utils.image_analyzer import extract_images_from_url, iter_images_from_url, sniff_image_header
+from utils.image_hashing import deduplicate_images
+from utils.page_artifact import PageArtifact
+
+
+def _noise_png(seed, size=(120, 120)):
+    rng = random.Random(seed)
+    img = Image.new("RGB", size)
+    img.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(size[0] * size[1])])
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+PNG = _noise_png(31)
+# Distinct images per path (identical ones would be collapsed as duplicates)
+TEAM_PNGS = {f"/img/team{i}.png": _noise_png(100 + i) for i in range(10)}
+
+
+class SlowImageHandler(BaseHTTPRequestHandler):
+    """Serves a distinct PNG for every path after a short delay, tracking concurrency"""
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    served = []
+    delays = {}
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            cls.served.append(self.path)
+        try:
+            time.sleep(cls.delays.get(self.path, 0.1))
+            body = TEAM_PNGS.get(self.path, PNG)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def image_server():
+    SlowImageHandler.active = SlowImageHandler.peak = 0
+    SlowImageHandler.served = []
+    SlowImageHandler.delays = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _page(base, count):
+    html = "<html><body>" + "".join(
+        f"<img src='/img/team{i}.png' alt='構築 {i}'>" for i in range(count)
+    ) + "</body></html>"
+    return PageArtifact(url=f"{base}/article", final_url=f"{base}/article", content=html.encode(), text=html)
+
+
+def test_per_host_limit_is_respected(image_server):
+    images = list(iter_images_from_url(
+        f"{image_server}/article", max_images=8, page=_page(image_server, 8), max_workers=8, per_host_limit=2
+    ))
+    assert len(images) == 8
+    assert SlowImageHandler.peak <= 2
+
+
+def test_downloads_run_concurrently(image_server):
+    start = time.perf_counter()
+    images = extract_images_from_url(f"{image_server}/article", max_images=6, page=_page(image_server, 6))
+    elapsed = time.perf_counter() - start
+    assert len(images) == 6
+    assert all(image["format"] == "PNG" for image in images)
+    # Six 100 ms downloads, four at a time on one host: well under the sequential 0.6 s
+    assert elapsed < 0.5
+    assert SlowImageHandler.peak > 1
+
+
+def test_stops_after_max_images(image_server):
+    # Ten candidates on the page, but only two images are wanted
+    images = list(iter_images_from_url(
+        f"{image_server}/article", max_images=2, page=_page(image_server, 10), max_workers=2, per_host_limit=2
+    ))
+    assert len(images) == 2
+    time.sleep(0.3)
+    # Queued downloads were cancelled instead of fetching every candidate
+    assert len(SlowImageHandler.served) < 10
+
+
+def test_keeps_best_ranked_images_not_fastest(image_server):
+    # The best candidate is the slowest download
+    SlowImageHandler.delays = {"/img/team0.png": 0.4}
+    images = list(iter_images_from_url(
+        f"{image_server}/article", max_images=2, page=_page(image_server, 4), max_workers=4, per_host_limit=4
+    ))
+    assert [image["url"].rsplit("/", 1)[-1] for image in images] == ["team0.png", "team1.png"]
+
+
+def test_duplicates_do_not_count_towards_max_images(image_server):
+    # Three copies of one picture (thumbnail, OGP, inline) ahead of three distinct team cards
+    html = "<html><body>" + "".join(
+        f"<img src='/img/team_copy{i}.png' alt='構築'>" for i in range(3)
+    ) + "".join(f"<img src='/img/team{i}.png' alt='構築'>" for i in range(3)) + "</body></html>"
+    page = PageArtifact(url=f"{image_server}/article", final_url=f"{image_server}/article",
+                        content=html.encode(), text=html)
+
+    images = list(iter_images_from_url(
+        f"{image_server}/article", max_images=3, page=page, max_workers=1, per_host_limit=1
+    ))
+
+    assert len(images) == 5
+    assert len(deduplicate_images(images)) == 3
+
+
+def test_byte_budget_limits_transfer(image_server):
+    images = list(iter_images_from_url(
+        f"{image_server}/article", max_images=10, page=_page(image_server, 10),
+        max_workers=1, per_host_limit=1, byte_budget=len(PNG) * 3
+    ))
+    assert len(images) == 3
+
+
+class CountingStreamResponse:
+    """Streams a payload in chunks and records how much of it was read"""
+
+    def __init__(self, payload, headers=None):
+        self.payload = payload
+        self.status_code = 200
+        self.headers = headers or {"content-type": "image/png"}
+        self.bytes_read = 0
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.payload), chunk_size):
+            chunk = self.payload[start:start + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def close(self):
+        pass
+
+
+def _stream_single_image(monkeypatch, response, alt="構築"):
+    monkeypatch.setattr(image_analyzer.requests, "get", lambda *args, **kwargs: response)
+    html = f"<img src='https://img.example.com/a.png' alt='{alt}'>"
+    page = PageArtifact(url="https://example.com/a", final_url="https://example.com/a", content=html.encode(), text=html)
+    return list(iter_images_from_url("https://example.com/a", max_images=1, page=page))
+
+
+def test_sniff_image_header_from_prefix():
+    large = _noise_png(32, size=(640, 360))
+    assert sniff_image_header(large[:1024]) == ("PNG", (640, 360))
+    assert sniff_image_header(b"not an image") is None
+
+
+def test_small_dimensions_rejected_before_full_transfer(monkeypatch):
+    # Tall, narrow decoration: plenty of bytes, but only 60 px wide
+    payload = _noise_png(33, size=(60, 1500))
+    response = CountingStreamResponse(payload)
+    assert _stream_single_image(monkeypatch, response) == []
+    assert response.bytes_read < len(payload) / 4
+
+
+def test_declared_small_size_rejected_without_reading(monkeypatch):
+    response = CountingStreamResponse(PNG, headers={"content-type": "image/png", "content-length": "4000"})
+    assert _stream_single_image(monkeypatch, response) == []
+    assert response.bytes_read == 0
+
+
+def test_sniffed_header_fills_format_and_size(monkeypatch):
+    payload = _noise_png(34, size=(320, 240))
+    images = _stream_single_image(monkeypatch, CountingStreamResponse(payload))
+    assert images[0]["format"] == "PNG"
+    assert images[0]["size"] == (320, 240)
+    assert images[0]["file_size"] == len(payload)
+
+
+def test_classifier_only_runs_while_the_gate_is_on(monkeypatch):
+    payload = _noise_png(35, size=(320, 240))
+    monkeypatch.setattr(image_analyzer.Config, "VISION_CLASSIFIER_THRESHOLD", 0.0)
+    monkeypatch.setattr(image_analyzer, "team_card_probability", lambda content: pytest.fail("classifier ran"))
+    assert _stream_single_image(monkeypatch, CountingStreamResponse(payload))[0]["team_card_probability"] is None
+
+    monkeypatch.setattr(image_analyzer.Config, "VISION_CLASSIFIER_THRESHOLD", 0.5)
+    monkeypatch.setattr(image_analyzer, "team_card_probability", lambda content: 0.25)
+    assert _stream_single_image(monkeypatch, CountingStreamResponse(payload))[0]["team_card_probability"] == 0.25
+
+
+if __name__ == "__main__":
+    print("Run with pytest (uses a local image server fixture)")
@@ -0,0 +1,105 @@
+"""
+Tests for perceptual-hash deduplication of candidate images
+"""
+
+import os
+import random
+import sys
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_hashing import dhash, deduplicate_images, hamming_distance
+
+
+def _team_card(seed, size=(1200, 675)):
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, (30, 30, 50))
+    draw = ImageDraw.Draw(img)
+    for _ in range(40):
+        x0, y0 = rng.randrange(size[0]), rng.randrange(size[1])
+        x1, y1 = x0 + rng.randrange(20, 300), y0 + rng.randrange(20, 200)
+        draw.rectangle([x0, y0, x1, y1], fill=(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    return img
+
+
+def _encode(img, image_format="PNG", **kwargs):
+    buffer = BytesIO()
+    img.save(buffer, format=image_format, **kwargs)
+    return buffer.getvalue()
+
+
+def _image_dict(url, img, image_format="PNG", **extra):
+    data = _encode(img, image_format, **({"quality": 60} if image_format == "JPEG" else {}))
+    info = {
+        "url": url,
+        "size": img.size,
+        "file_size": len(data),
+        "dhash": dhash(data),
+        "team_card_score": 0,
+        "is_note_com_asset": False,
+        "is_hatenablog_asset": False,
+        "is_likely_team_card": False,
+    }
+    info.update(extra)
+    return info
+
+
+def test_dhash_survives_resize_and_recompression():
+    card = _team_card(1)
+    full = dhash(_encode(card))
+    thumbnail = dhash(_encode(card.resize((320, 180)), "JPEG", quality=50))
+    other = dhash(_encode(_team_card(2)))
+
+    assert full is not None and thumbnail is not None
+    assert hamming_distance(full, thumbnail) <= 8
+    assert hamming_distance(full, other) > 16
+
+
+def test_dhash_of_undecodable_data_is_none():
+    assert dhash(b"not an image") is None
+
+
+def test_keeps_highest_resolution_copy():
+    card = _team_card(3)
+    images = [
+        _image_dict("https://example.com/thumb.jpg", card.resize((400, 225)), "JPEG",
+                    team_card_score=5, is_likely_team_card=True),
+        _image_dict("https://example.com/ogp.jpg", card.resize((800, 450)), "JPEG"),
+        _image_dict("https://example.com/full.png", card),
+        _image_dict("https://example.com/other.png", _team_card(4)),
+    ]
+
+    result = deduplicate_images(images)
+    assert [image["url"] for image in result] == ["https://example.com/full.png", "https://example.com/other.png"]
+
+    kept = result[0]
+    assert kept["size"] == (1200, 675)
+    # Signals carried only by the thumbnail survive the merge
+    assert kept["team_card_score"] == 5
+    assert kept["is_likely_team_card"]
+    assert sorted(kept["duplicate_urls"]) == ["https://example.com/ogp.jpg", "https://example.com/thumb.jpg"]
+    # Input dicts are not modified
+    assert "duplicate_urls" not in images[2]
+
+
+def test_different_aspect_ratios_are_not_merged():
+    card = _team_card(5, size=(1200, 1200))
+    images = [
+        _image_dict("https://example.com/square.png", card),
+        _image_dict("https://example.com/wide.png", card.resize((1200, 600))),
+    ]
+    images[1]["dhash"] = images[0]["dhash"]  # Force a hash collision
+    assert len(deduplicate_images(images)) == 2
+
+
+def test_images_without_hash_are_kept():
+    images = [{"url": "a", "dhash": None}, {"url": "b", "dhash": None}]
+    assert [image["url"] for image in deduplicate_images(images)] == ["a", "b"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,136 @@
+"""
+Tests for the vision payload preparation stage (crop / downscale / recompress)
+"""
+
+import base64
+import os
+import sys
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_preparation import (
+    VISION_MAX_DIMENSION,
+    crop_uniform_border,
+    prepare_image_for_vision,
+)
+from utils.image_analyzer import analyze_image_with_vision
+
+
+def _encode(img, image_format="PNG"):
+    buffer = BytesIO()
+    img.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def _noisy_card(width, height):
+    # Random noise defeats PNG compression, like real screenshots
+    return Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+
+
+def test_large_image_is_downscaled_within_bounds():
+    original = _encode(_noisy_card(3000, 2000))
+    prepared = prepare_image_for_vision(original, crop_borders=False)
+
+    assert prepared.resized
+    assert prepared.original_size == (3000, 2000)
+    assert max(prepared.size) == VISION_MAX_DIMENSION
+    assert prepared.size[0] / prepared.size[1] == 1.5
+    assert len(prepared.data) < len(original)
+    assert Image.open(BytesIO(prepared.data)).size == prepared.size
+
+
+def test_small_image_is_not_upscaled():
+    prepared = prepare_image_for_vision(_encode(_noisy_card(400, 300)), crop_borders=False)
+    assert not prepared.resized
+    assert prepared.size == (400, 300)
+
+
+def test_uniform_border_is_cropped():
+    img = Image.new("RGB", (1000, 800), (255, 255, 255))
+    ImageDraw.Draw(img).rectangle([200, 150, 799, 649], fill=(30, 30, 60))
+
+    cropped = crop_uniform_border(img, padding=0)
+    assert cropped is not None
+    assert cropped.size == (600, 500)
+
+    prepared = prepare_image_for_vision(_encode(img))
+    assert prepared.cropped
+    assert prepared.size[0] < 1000 and prepared.size[1] < 800
+
+
+def test_no_crop_without_border():
+    assert crop_uniform_border(_noisy_card(200, 200)) is None
+    assert crop_uniform_border(Image.new("RGB", (200, 200), (0, 0, 0))) is None
+
+
+def test_transparency_is_flattened():
+    img = _noisy_card(2000, 1000).convert("RGBA")
+    ImageDraw.Draw(img).rectangle([0, 500, 1999, 999], fill=(0, 0, 0, 0))
+
+    prepared = prepare_image_for_vision(_encode(img), crop_borders=False, output_format="JPEG")
+    result = Image.open(BytesIO(prepared.data))
+    assert prepared.mime_type == "image/jpeg"
+    assert result.mode == "RGB"
+    assert result.getpixel((10, result.height - 10)) > (245, 245, 245)
+
+
+def test_original_kept_when_not_smaller():
+    # Low-quality JPEG: re-encoding at vision quality only grows it
+    buffer = BytesIO()
+    _noisy_card(300, 200).save(buffer, format="JPEG", quality=20)
+    original = buffer.getvalue()
+    prepared = prepare_image_for_vision(original, crop_borders=False, output_format="JPEG")
+    assert prepared.data == original
+    assert prepared.mime_type == "image/jpeg"
+    assert not prepared.reencoded
+
+
+def test_undecodable_bytes_are_passed_through():
+    prepared = prepare_image_for_vision(b"not an image")
+    assert prepared.data == b"not an image"
+    assert prepared.byte_savings == 0
+
+
+def test_undecodable_bytes_keep_their_format():
+    # A truncated JPEG: the signature is still there
+    truncated = _encode(_noisy_card(400, 300), "JPEG")[:600]
+    assert prepare_image_for_vision(truncated).mime_type == "image/jpeg"
+    # No signature: the caller's format is trusted
+    assert prepare_image_for_vision(b"not an image", image_format="WEBP").mime_type == "image/webp"
+    assert prepare_image_for_vision(b"not an image", image_format="unknown").mime_type == "image/png"
+
+
+class FakeVisionModel:
+    def __init__(self):
+        self.calls = []
+
+    def generate_content(self, parts):
+        self.calls.append(parts)
+
+        class Response:
+            text = "Garchomp H4/A252/B0/C0/D0/S252"
+
+        return Response()
+
+
+def test_analyze_image_with_vision_sends_prepared_payload():
+    original = _encode(_noisy_card(2400, 1600))
+    encoded = base64.b64encode(original).decode("utf-8")
+
+    model = FakeVisionModel()
+    analyze_image_with_vision(encoded, "PNG", model)
+    image_part = model.calls[0][1]
+    assert image_part["mime_type"] in ("image/webp", "image/jpeg")
+    assert len(image_part["data"]) < len(encoded)
+
+    model = FakeVisionModel()
+    analyze_image_with_vision(encoded, "PNG", model, prepare_image=False)
+    assert model.calls[0][1] == {"mime_type": "image/png", "data": encoded}
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,106 @@
+"""
+Tests for slotted image records carrying raw bytes instead of base64 strings
+"""
+
+import base64
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_record import ImageRecord, image_bytes
+from utils.image_analyzer import analyze_images_cached, release_image_payloads
+from utils.image_hashing import deduplicate_images
+
+
+def _record(label, **fields):
+    return ImageRecord(label.encode(), url=f"https://example.com/{label}.png", format="PNG", **fields)
+
+
+class EchoVisionModel:
+    """Answers with the decoded payload of every image part it receives"""
+
+    model_name = "models/fake-vision"
+
+    def __init__(self):
+        self.parts = []
+
+    def generate_content(self, contents):
+        images = [part for part in contents if isinstance(part, dict)]
+        self.parts.extend(images)
+
+        class Response:
+            pass
+
+        response = Response()
+        response.text = "\n".join(
+            f"<<<IMAGE {number}>>>\n{base64.b64decode(part['data']).decode()}: H252/A0/B4/C252/D0/S0"
+            for number, part in enumerate(images, 1)
+        )
+        return response
+
+
+def test_record_behaves_like_an_image_dict():
+    record = _record("card", team_card_score=12, size=(1200, 675))
+
+    assert record["url"] == "https://example.com/card.png"
+    assert record.get("team_card_score") == 12
+    assert record.get("dhash") is None and "dhash" not in record
+    assert record.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(AttributeError):
+        record.extra = 1  # Slotted: no per-instance __dict__
+
+    record["team_card_score"] = 15
+    assert record.team_card_score == 15
+    assert set(record.keys()) == {"data", "url", "format", "team_card_score", "size"}
+
+
+def test_base64_only_on_demand():
+    record = _record("card")
+    assert record.content == b"card"
+    assert record.data == base64.b64encode(b"card").decode("utf-8")
+    assert "data" not in record.to_dict()
+    assert record.to_dict(include_data=True)["data"] == record.data
+
+    record["data"] = base64.b64encode(b"other").decode("utf-8")
+    assert record.content == b"other"
+    assert image_bytes(memoryview(b"raw")) == b"raw"
+
+
+def test_release_keeps_metadata():
+    record = _record("card", sha256="abc")
+    release_image_payloads([record, {"data": "Y2FyZA==", "format": "PNG"}])
+
+    assert record.released and record.get("data") is None and "data" not in record
+    assert record["sha256"] == "abc"
+
+
+def test_records_are_encoded_only_for_the_model():
+    model = EchoVisionModel()
+    records = [_record("card4"), _record("card12")]
+    legacy = {"data": base64.b64encode(b"card20").decode("utf-8"), "format": "PNG"}
+
+    results = analyze_images_cached(records + [legacy], model, prepare_image=False, tile_tall_images=False)
+
+    assert [analysis.split(":")[0] for analysis, _ in results] == ["card4", "card12", "card20"]
+    assert all(isinstance(part["data"], str) for part in model.parts)
+
+
+def test_deduplication_copies_records():
+    first = _record("a", dhash=0, size=(100, 100), team_card_score=3)
+    second = _record("b", dhash=1, size=(200, 200), team_card_score=9)
+
+    kept = deduplicate_images([first, second])
+
+    assert len(kept) == 1 and isinstance(kept[0], ImageRecord)
+    assert kept[0]["url"] == second["url"] and kept[0]["team_card_score"] == 9
+    assert second["team_card_score"] == 9 and second.get("duplicate_urls") is None
+    assert kept[0].content is second.content
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
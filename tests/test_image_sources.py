@@ -0,0 +1,81 @@
+"""
+Tests for srcset / <picture> / lazy-load aware image source selection
+"""
+
+import os
+import sys
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_sources import is_placeholder_url, parse_srcset, select_image_url
+from utils.image_analyzer import _collect_image_candidates
+from utils.page_artifact import PageArtifact
+
+BASE = "https://example.com/blog/entry"
+
+
+def _img(html):
+    return BeautifulSoup(html, "html.parser").find("img")
+
+
+def test_parse_srcset_keeps_commas_inside_urls():
+    sources = parse_srcset("https://cdn.example.com/x.png?crop=0,0,800,600 2x, /y.png 1x")
+    assert [(s.url, s.width, s.density) for s in sources] == [
+        ("https://cdn.example.com/x.png?crop=0,0,800,600", None, 2.0),
+        ("/y.png", None, 1.0),
+    ]
+
+
+def test_parse_srcset_standard_candidates():
+    sources = parse_srcset("small.jpg 480w, medium.jpg 1024w, large.jpg 2048w")
+    assert [(s.url, s.width) for s in sources] == [("small.jpg", 480), ("medium.jpg", 1024), ("large.jpg", 2048)]
+    assert parse_srcset("only.png")[0].density == 1.0
+    assert parse_srcset("") == []
+
+
+def test_smallest_rendition_meeting_target_is_chosen():
+    img = _img("<img src='/orig.png' srcset='/s.png 480w, /m.png 1600w, /l.png 3200w'>")
+    assert select_image_url(img, BASE, target_width=1536) == "https://example.com/m.png"
+    # Nothing large enough: take the largest rendition
+    assert select_image_url(img, BASE, target_width=4000) == "https://example.com/l.png"
+
+
+def test_density_descriptors_use_declared_width():
+    img = _img("<img width='800' srcset='/a.png 1x, /b.png 2x, /c.png 3x'>")
+    assert select_image_url(img, BASE, target_width=1536) == "https://example.com/b.png"
+
+
+def test_lazy_loaded_image_is_resolved():
+    img = _img("<img src='data:image/gif;base64,R0lGODlhAQABAAAAACw=' data-src='/real/team.png'>")
+    assert select_image_url(img, BASE) == "https://example.com/real/team.png"
+
+    img = _img("<img src='/img/placeholder.gif' data-srcset='/t-800.png 800w, /t-1600.png 1600w'>")
+    assert select_image_url(img, BASE) == "https://example.com/t-1600.png"
+
+
+def test_placeholder_only_tag_is_skipped():
+    assert select_image_url(_img("<img src='data:image/png;base64,AAAA'>"), BASE) is None
+    assert is_placeholder_url("/assets/spacer.gif")
+    assert not is_placeholder_url("/uploads/team.png")
+
+
+def test_picture_sources_survive_page_snapshot():
+    html = (
+        "<html><body><nav>menu</nav><picture>"
+        "<source type='image/webp' srcset='/team-1024.webp 1024w, /team-2048.webp 2048w'>"
+        "<source type='video/mp4' srcset='/clip.mp4 4000w'>"
+        "<img src='/team-small.jpg' alt='構築'></picture></body></html>"
+    )
+    page = PageArtifact(url=BASE, final_url=BASE, content=html.encode(), text=html)
+    page.snapshot_images()
+    page.soup.find("picture").decompose()  # The text pipeline mutating the tree
+
+    candidates = _collect_image_candidates(page.image_tags(), BASE, 10)
+    assert [candidate["url"] for candidate in candidates] == ["https://example.com/team-2048.webp"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
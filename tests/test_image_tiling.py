@@ -0,0 +1,159 @@
+"""
+Tests for tiling tall team-card composites before vision analysis
+"""
+
+import base64
+import os
+import sys
+import threading
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_tiling import find_panel_bands, is_tall_image, split_tall_image
+from utils.image_analyzer import analyze_images_cached, analyze_tiled_image
+from utils.vision_cache import VisionCache
+
+WIDTH = 600
+PANEL_HEIGHT = 320
+GAP = 24
+
+
+def _stacked_card(panels=6, margin=30):
+    """Tall composite: panels with several text-like lines, separated by uniform gaps"""
+    height = 2 * margin + panels * PANEL_HEIGHT + (panels - 1) * GAP
+    img = Image.new("RGB", (WIDTH, height), (245, 245, 245))
+    draw = ImageDraw.Draw(img)
+    rng = np.random.default_rng(7)
+    for panel in range(panels):
+        top = margin + panel * (PANEL_HEIGHT + GAP)
+        draw.rectangle([20, top, WIDTH - 20, top + PANEL_HEIGHT - 1], fill=(40, 50, 90))
+        # Text lines with small blank gaps between them (must not become cuts)
+        for line in range(6):
+            y = top + 20 + line * 48
+            noise = rng.integers(0, 255, size=(30, WIDTH - 80, 3), dtype=np.uint8)
+            img.paste(Image.fromarray(noise), (40, y))
+    return img
+
+
+def _encode(img):
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_is_tall_image():
+    assert is_tall_image((600, 2000))
+    assert not is_tall_image((1200, 1600))  # Not tall enough
+    assert not is_tall_image((600, 1000))  # Fits the vision resolution already
+    assert not is_tall_image((0, 0))
+
+
+def test_panels_are_detected_from_row_variance():
+    img = _stacked_card()
+    bands = find_panel_bands(np.asarray(img.convert("L"), dtype=np.float32))
+
+    assert len(bands) == 6
+    for index, (top, bottom) in enumerate(bands):
+        panel_top = 30 + index * (PANEL_HEIGHT + GAP)
+        # Every band contains its whole panel and nothing of the neighbours
+        assert top <= panel_top and bottom >= panel_top + PANEL_HEIGHT
+        assert top > panel_top - GAP and bottom < panel_top + PANEL_HEIGHT + GAP
+
+
+def test_tile_count_is_capped():
+    tiles = split_tall_image(_encode(_stacked_card(panels=8)), max_tiles=6)
+    assert len(tiles) == 6
+    assert all(Image.open(BytesIO(tile)).width == WIDTH for tile in tiles)
+
+
+def test_even_split_without_separators():
+    noise = np.random.default_rng(3).integers(0, 255, size=(2400, 600, 3), dtype=np.uint8)
+    tiles = split_tall_image(_encode(Image.fromarray(noise)), max_tiles=6)
+    heights = [Image.open(BytesIO(tile)).height for tile in tiles]
+
+    assert len(tiles) == 4
+    # Overlapping tiles cover the whole image
+    assert sum(heights) > 2400
+
+
+def test_wide_images_are_not_tiled():
+    assert split_tall_image(_encode(Image.new("RGB", (1920, 1080), (10, 10, 10)))) is None
+    assert split_tall_image(b"not an image") is None
+
+
+class TileVisionModel:
+    model_name = "models/fake-vision"
+
+    def __init__(self, failing_calls=()):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.failing_calls = set(failing_calls)
+
+    def generate_content(self, contents):
+        images = [part for part in contents if isinstance(part, dict)]
+        with self.lock:
+            self.calls.append(len(images))
+            number = len(self.calls)
+        if number in self.failing_calls:
+            raise RuntimeError("500 Internal error")
+
+        class Response:
+            pass
+
+        response = Response()
+        response.text = f"Pokemon {number}: H{252 - number * 4}/A0/B4/C252/D0/S{number * 4}"
+        return response
+
+
+def test_tiles_are_analyzed_and_merged():
+    model = TileVisionModel()
+    data = base64.b64encode(_encode(_stacked_card())).decode("utf-8")
+
+    merged = analyze_tiled_image(data, "PNG", model)
+
+    assert len(model.calls) == 6
+    assert merged.count("=== TEAM CARD SECTION") == 6
+    assert "SECTION 6/6" in merged
+
+
+def test_cached_analysis_tiles_tall_images_only():
+    model = TileVisionModel()
+    tall = _stacked_card()
+    wide = Image.fromarray(np.random.default_rng(5).integers(0, 255, size=(400, 700, 3), dtype=np.uint8))
+    images = [
+        {"data": base64.b64encode(_encode(tall)).decode("utf-8"), "format": "PNG", "size": tall.size},
+        {"data": base64.b64encode(_encode(wide)).decode("utf-8"), "format": "PNG", "size": wide.size},
+    ]
+
+    results = analyze_images_cached(images, model)
+
+    # Six single-tile calls for the tall card, one call for the other image
+    assert sorted(model.calls) == [1] * 7
+    assert len(results[0][1]) == 6
+    assert len(results[1][1]) == 1
+
+
+def test_partly_failed_tiled_analysis_is_not_cached(tmp_path):
+    model = TileVisionModel(failing_calls={3})
+    cache = VisionCache(str(tmp_path / "vision.sqlite"))
+    card = _stacked_card()
+    image = {"data": base64.b64encode(_encode(card)).decode("utf-8"), "format": "PNG", "size": card.size}
+
+    analysis, spreads = analyze_images_cached([image], model, cache=cache, prepare_image=False)[0]
+
+    # The other five sections are still used for this request
+    assert analysis.startswith("Partial vision analysis: 1 of 6 sections failed")
+    assert len(spreads) == 5
+    assert cache.stats()["entries"] == 0
+
+    analyze_images_cached([image], model, cache=cache, prepare_image=False)
+    assert len(model.calls) == 12 and cache.stats()["entries"] == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
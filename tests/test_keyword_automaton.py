@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass keyword automaton used by content and team-card scoring
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.keyword_automaton import KeywordAutomaton
+from core.scraper import ArticleScraper, VGC_CONTENT_INDICATORS, UI_INDICATORS
+
+
+def _reference_counts(keywords, text):
+    """Per-keyword str.count, the behaviour the automaton must reproduce"""
+    return {k: text.count(k) for k in keywords if text.count(k)}
+
+
+def test_counts_match_str_count_with_overlaps():
+    """Overlapping, nested and adjacent keywords are all counted like str.count"""
+    automaton = KeywordAutomaton(["ダブルバトル", "ダブル", "バトル", "ev", "double", "とくこう", "こうげき"])
+    text = "ダブルバトルでダブル、doubleeveventとくこうげき"
+    assert automaton.count_all(text) == _reference_counts(automaton.keywords, text)
+
+
+def test_randomized_equivalence_with_vgc_indicators():
+    """Random concatenations of keyword fragments score exactly like the old loop"""
+    automaton = KeywordAutomaton(VGC_CONTENT_INDICATORS)
+    keywords = list(VGC_CONTENT_INDICATORS)
+    fragments = keywords + ['a', 'e', 'v', ' ', 'ン', 'ー']
+    rng = random.Random(26)
+
+    for _ in range(500):
+        text = ''.join(rng.choice(fragments)[rng.randint(0, 2):] for _ in range(25))
+        expected = sum(weight * text.count(k) for k, weight in VGC_CONTENT_INDICATORS.items())
+        assert automaton.score(text, prepared=True) == expected, text
+
+
+def test_presence_and_case_folding():
+    """Keywords are lowercased and presence scoring ignores repeat counts"""
+    automaton = KeywordAutomaton({"VGC": 3, "note": 1, "st-note": 1})
+    text = "https://assets.st-note.com/vgc/VGC_team.png"
+    assert automaton.find_present(text) == {"vgc", "note", "st-note"}
+    assert automaton.score_present(text) == 5
+    assert automaton.score(text) == 3 * 2 + 1 + 1
+
+
+def test_content_score_unchanged():
+    """ArticleScraper._calculate_content_score keeps its original scoring"""
+    def legacy_score(text):
+        if not text or len(text) < 50:
+            return 0
+        score = min(len(text) // 100, 10)
+        text_lower = text.lower()
+        for indicator, value in VGC_CONTENT_INDICATORS.items():
+            score += text_lower.count(indicator.lower()) * value
+        score += sum(1 for char in text[:1000] if ord(char) > 127) // 10
+        for indicator in UI_INDICATORS:
+            if indicator in text_lower:
+                score -= 10
+        words = text_lower.split()
+        if len(words) > 10 and len(set(words)) / len(words) < 0.3:
+            score -= 20
+        return max(0, score)
+
+    scraper = ArticleScraper()
+    samples = [
+        "今回はポケモンVGCのダブルバトル構築を紹介します。努力値調整はH252 A4 S252です。" * 3,
+        "Login to follow and share this menu. The team uses Garchomp, Flutter Mane and Incineroar with EVs.",
+        "spam " * 40,
+    ]
+    for sample in samples:
+        assert scraper._calculate_content_score(sample) == legacy_score(sample)
+
+
+def test_element_scores_are_memoized():
+    """Repeated lookups of the same element reuse the cached text and score"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup("<div><p>" + "ポケモン構築 VGC team " * 10 + "</p></div>", "html.parser")
+    div = soup.find("div")
+    scraper = ArticleScraper()
+    calls = []
+    original = scraper._calculate_content_score
+    scraper._calculate_content_score = lambda text: calls.append(text) or original(text)
+
+    first = scraper._get_element_score(div)
+    second = scraper._get_element_score(div)
+    assert first == second > 0
+    assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    test_counts_match_str_count_with_overlaps()
+    test_randomized_equivalence_with_vgc_indicators()
+    test_presence_and_case_folding()
+    test_content_score_unchanged()
+    test_element_scores_are_memoized()
+    print("All keyword automaton tests passed")
@@ -0,0 +1,130 @@
+"""
+Tests for the bitset learnset index and move-based identification checks
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.learnsets import LearnsetIndex, get_learnset_index, read_learnset_source
+from utils.pokedex import get_pokedex
+from core.pokemon_validator import PokemonValidator
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return PokemonValidator()
+
+
+def test_every_pokedex_species_has_a_learnset():
+    index = get_learnset_index()
+
+    assert index.known.all()
+    assert index.species == get_pokedex().names
+    assert index.matrix.shape == (len(index.species), index.words)
+
+
+def test_forms_inherit_and_universal_moves_are_added():
+    learnsets, sketchers, signature_moves = read_learnset_source()
+    assert set(learnsets["Calyrex"]) < set(learnsets["Calyrex-Ice"])
+    assert sketchers == ["Smeargle"]
+    assert {"Glacial Lance", "Ice Burn", "Ruination"} <= set(signature_moves)
+    assert "Ice Beam" not in signature_moves
+
+    index = get_learnset_index()
+    assert index.learns("Calyrex-Ice", "Glacial Lance") and not index.learns("Calyrex", "Glacial Lance")
+    assert index.learns("Urshifu-Rapid-Strike", "Surging Strikes")
+    assert not index.learns("Urshifu-Rapid-Strike", "Wicked Blow")
+    assert index.learns("Dondozo", "Tera Blast") and index.learns("Smeargle", "Astral Barrage")
+    assert index.learns("Pikachu", "Thunderbolt") is None and index.learns("Incineroar", "Splash") is None
+
+
+def test_illegal_moves():
+    index = get_learnset_index()
+
+    assert index.illegal_moves("Calyrex-Ice", ["Glacial Lance", "Ice Burn", "Protect", "trick room"]) == ["Ice Burn"]
+    assert index.is_legal("Incineroar", ["Fake Out", "Flare Blitz", "Knock Off", "Parting Shot"])
+    # Unknown moves are not evidence; unknown species are never judged
+    assert index.illegal_moves("Incineroar", ["Fake Out", "Mistranslated Move"]) == []
+    assert index.illegal_moves("Pikachu", ["Ice Burn"]) is None
+    # Curated rows are incomplete: only signature moves are evidence
+    assert index.illegal_moves("Incineroar", ["Helping Hand", "Moonblast"]) == []
+    assert index.illegal_moves("Dragonite", ["Superpower"]) == []
+    assert index.illegal_moves("Calyrex-Ice", ["Ice Beam"]) == []
+
+
+def test_rank_species_by_popcount():
+    index = LearnsetIndex(
+        ["Kyurem-White", "Calyrex-Ice", "Smeargle", "Pikachu"],
+        {"Kyurem-White": ["Ice Burn", "Freeze-Dry"], "Calyrex-Ice": ["Glacial Lance", "Trick Room"]},
+        sketchers=["Smeargle"],
+    )
+
+    assert index.rank_species(["Ice Burn", "Freeze-Dry", "Protect"]) == [("Kyurem-White", 3), ("Calyrex-Ice", 1)]
+    assert index.rank_species(["Glacial Lance"], limit=1) == [("Calyrex-Ice", 1)]
+    assert index.rank_species(["Splash"]) == []
+    assert index.illegal_moves("Smeargle", ["Ice Burn", "Glacial Lance"]) == []
+
+
+def test_misidentified_pokemon_is_corrected(validator):
+    result = {"pokemon_team": [
+        {"name": "Calyrex-Ice", "moves": ["Ice Burn", "Freeze-Dry", "Fusion Flare", "Protect"]},
+        {"name": "Kyurem-Black", "moves": ["Astral Barrage", "Nasty Plot", "Psyshock", "Protect"]},
+        {"name": "Kyurem-White", "moves": ["Glacial Lance", "Trick Room"]},
+        {"name": "Calyrex-Shadow", "moves": ["Freeze Shock", "Fusion Bolt"]},
+        {"name": "Incineroar", "moves": ["Fake Out", "Flare Blitz", "Knock Off", "Parting Shot"]},
+    ]}
+
+    result = validator.validate_pokemon_moves_consistency(result)
+
+    assert [pokemon["name"] for pokemon in result["pokemon_team"]] == [
+        "Kyurem-White", "Calyrex-Shadow", "Calyrex-Ice", "Kyurem-Black", "Incineroar"
+    ]
+    notes = result["translation_notes"]
+    assert "Corrected Calyrex-Ice → Kyurem-White based on moves" in notes
+    assert "Corrected Kyurem-Black → Calyrex-Shadow based on moves" in notes
+    assert "Corrected Kyurem-White → Calyrex-Ice based on moves" in notes
+    assert "Corrected Calyrex-Shadow → Kyurem-Black based on moves" in notes
+    assert "Incineroar" not in notes
+
+
+def test_shared_signature_move_is_resolved_by_the_movepools(validator):
+    # Reshiram and Kyurem-White both learn Fusion Flare; only Kyurem-White learns Freeze-Dry
+    result = {"pokemon_team": [
+        {"name": "Calyrex-Ice", "moves": ["Fusion Flare", "Freeze-Dry", "Protect"]},
+        {"name": "Calyrex-Shadow", "moves": ["Fusion Flare", "Protect"]},
+    ]}
+
+    result = validator.validate_pokemon_moves_consistency(result)
+
+    assert [pokemon["name"] for pokemon in result["pokemon_team"]] == ["Kyurem-White", "Calyrex-Shadow"]
+    assert "Calyrex-Shadow: WARNING - cannot learn Fusion Flare" in result["translation_notes"]
+
+
+def test_ambiguous_signature_move_is_only_flagged(validator):
+    # Four species share Ruination
+    result = {"pokemon_team": [{"name": "Incineroar", "moves": ["Fake Out", "Ruination"]}]}
+
+    result = validator.validate_pokemon_moves_consistency(result)
+
+    assert result["translation_notes"] == "Move Validation: Incineroar: WARNING - cannot learn Ruination"
+
+
+def test_moves_missing_from_curated_rows_are_not_flagged(validator):
+    result = {"pokemon_team": [
+        {"name": "Incineroar", "moves": ["Fake Out", "Helping Hand", "Moonblast", "Dazzling Gleam"]},
+        {"name": "Dragonite", "moves": ["Extreme Speed", "Superpower"]},
+        {"name": "Calyrex-Ice", "moves": ["Glacial Lance", "Ice Beam"]},
+    ]}
+
+    result = validator.validate_pokemon_moves_consistency(result)
+
+    assert [pokemon["name"] for pokemon in result["pokemon_team"]] == ["Incineroar", "Dragonite", "Calyrex-Ice"]
+    assert "cannot learn" not in result.get("translation_notes", "")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,93 @@
+"""
+Tests for the indexed Pokemon name resolver behind PokemonValidator._correct_pokemon_name
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.name_resolver import PokemonNameResolver, SubstringRule, normalize_name_key
+from core.pokemon_validator import PokemonValidator
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return PokemonValidator()
+
+
+@pytest.mark.parametrize("name, expected", [
+    # Substring rules, including the form picked inside a rule
+    ("gholdengo", ("Gholdengo", "substring:gholdengo")),
+    ("Chi-Yu (Fire)", ("Chi-Yu", "substring:chi-yu")),
+    ("Ogerpon-Wellspring Mask", ("Ogerpon-Wellspring", "substring:ogerpon")),
+    ("Ogerpon Teal", ("Ogerpon", "substring:ogerpon")),
+    ("Tornadus-Therian Forme", ("Tornadus-Therian", "substring:tornadus")),
+    ("Landorus", ("Landorus-Therian", "substring:landorus")),
+    ("Ursaluna Blood Moon form", ("Ursaluna-Bloodmoon", "substring:ursaluna")),
+    ("Zoroark (Hisui form)", ("Zoroark-Hisui", "substring:hisui")),
+    # Exact tables, form corrections first
+    ("オーガポン (かまどのめん)", ("Ogerpon-Hearthflame", "exact:form_corrections")),
+    ("ハバタクカミ", ("Flutter Mane", "exact:pokemon_name_translations")),
+    ("ガオガエン", ("Incineroar", "exact:config")),
+    # Left alone
+    ("Hisuian Qwilfish", ("Hisuian Qwilfish", None)),
+    ("Incineroar", ("Incineroar", None)),
+    ("Unknown", ("Unknown", None)),
+    ("", ("", None)),
+])
+def test_resolve_reports_the_rule(validator, name, expected):
+    assert validator.resolve_pokemon_name(name) == expected
+    assert validator._correct_pokemon_name(name) == expected[0]
+
+
+def test_exact_lookup_ignores_width_case_and_separators(validator):
+    assert normalize_name_key("ｵｰｶﾞﾎﾟﾝ（いどのめん）") == normalize_name_key("オーガポン (いどのめん)")
+    assert validator._correct_pokemon_name("ｵｰｶﾞﾎﾟﾝ（いどのめん）") == "Ogerpon-Wellspring"
+    assert validator._correct_pokemon_name("パオ・ジアン") == "Chien-Pao"
+    assert validator._correct_pokemon_name("UGATSU HOMURA") == "Gouging Fire"
+
+
+def test_rules_apply_in_priority_order():
+    rules = [
+        SubstringRule("hisui", ("hisui",), None, ((("zoroark",), "Zoroark-Hisui"),)),
+        SubstringRule("zoroark", ("zoroark",), "Zoroark"),
+    ]
+    resolver = PokemonNameResolver([("exact", {"Zorua": "Zorua-Hisui"})], rules)
+
+    assert resolver.resolve("Hisui Zoroark") == ("Zoroark-Hisui", "substring:hisui")
+    # A rule without a default that finds no form falls through to the next one
+    assert resolver.resolve("Zoroark (not Hisui)") == ("Zoroark-Hisui", "substring:hisui")
+    assert resolver.resolve("Hisui Zorua") == ("Hisui Zorua", None)
+    assert resolver.resolve("zorua") == ("Zorua-Hisui", "exact:exact")
+
+    fallthrough = PokemonNameResolver([], rules[:1] + [SubstringRule("zorua", ("zorua",), "Zorua")])
+    assert fallthrough.resolve("Hisui Zorua") == ("Zorua", "substring:zorua")
+
+
+def test_config_only_corrects_to_pokedex_species(validator):
+    # Non-species terms and species the Pokedex does not know are left alone
+    for name in ("テラ", "メガ", "ダイマックス", "ドオー", "マフィティフ"):
+        assert validator.resolve_pokemon_name(name) == (name, None)
+    # Official Japanese names win over the old wrong table entries
+    assert validator._correct_pokemon_name("ヘイラッシャ") == "Dondozo"
+    assert validator._correct_pokemon_name("イーユイ") == "Chi-Yu"
+    assert validator._correct_pokemon_name("チオンジェン") == "Wo-Chien"
+    assert validator._correct_pokemon_name("サケブシッポ") == "Scream Tail"
+    assert validator._correct_pokemon_name("テツノコウベ") == "Iron Jugulis"
+    assert validator._correct_pokemon_name("テツノイサハ") == "Iron Leaves"
+
+
+def test_fix_pokemon_name_translations_uses_the_resolver(validator):
+    result = {"pokemon_team": [{"name": "サーフゴー"}, {"name": "Ursaluna (アカツキ)"}, {"name": "Amoonguss"}]}
+
+    fixed = validator.fix_pokemon_name_translations(result)
+
+    assert [pokemon["name"] for pokemon in fixed["pokemon_team"]] == ["Gholdengo", "Ursaluna-Bloodmoon", "Amoonguss"]
+    assert "Corrected サーフゴー → Gholdengo" in fixed["translation_notes"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
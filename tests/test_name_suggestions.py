@@ -0,0 +1,98 @@
+"""
+Tests for the prefix-indexed, fuzzy Pokemon name suggestion engine
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.name_suggestions import SuggestionIndex, kana_to_romaji, normalize_search_key, prefix_edit_distance
+from utils.vision_cache import VisionCache
+from core.pokemon_validator import PokemonValidator
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return PokemonValidator()
+
+
+def test_search_keys_fold_script_width_and_case():
+    assert kana_to_romaji("ハバタクカミ") == "habatakukami"
+    assert kana_to_romaji("ジャラランガ") == "jararanga"
+    assert kana_to_romaji("テツノツツミ") == "tetsunotsutsumi"
+    assert kana_to_romaji("イエッサン") == "iessan"
+    assert kana_to_romaji("ウィッシュ") == "wisshu"
+    assert {normalize_search_key(text) for text in ("ハバタクカミ", "はばたくかみ", "ﾊﾊﾞﾀｸｶﾐ", "Habatakukami")} == {
+        "habatakukami"
+    }
+    assert normalize_search_key("Ｆｌｕｔｔｅｒ　Ｍａｎｅ") == normalize_search_key("flutter-mane") == "fluttermane"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("flutter", "Flutter Mane"),
+    ("はばたく", "Flutter Mane"),
+    ("ﾊﾊﾞﾀｸ", "Flutter Mane"),
+    ("habataku", "Flutter Mane"),
+    ("gaogaen", "Incineroar"),
+    # Typos
+    ("flutr mane", "Flutter Mane"),
+    ("incinerar", "Incineroar"),
+    ("sa-fugo-", "Gholdengo"),
+])
+def test_suggestions_match_any_script_and_typos(validator, query, expected):
+    assert validator.get_pokemon_suggestions(query)[0] == expected
+
+
+def test_ranking_by_match_kind_then_popularity():
+    index = SuggestionIndex([("カイリュー", "Dragonite"), ("イルカマン", "Palafin"), ("ドラパルト", "Dragapult")])
+
+    # Prefix matches come before substring matches, ties are alphabetical
+    assert index.suggest("dra") == ["Dragapult", "Dragonite"]
+    assert index.suggest("ka") == ["Dragonite", "Palafin"]
+    assert index.suggest("dragonite") == ["Dragonite"]
+
+    index.set_popularity({"dragonite": 12, "Dragapult": 3})
+    assert index.suggest("dra") == ["Dragonite", "Dragapult"]
+    assert index.suggest("dra", limit=1) == ["Dragonite"]
+    assert index.suggest("") == [] and index.suggest("zzz") == []
+
+
+def test_prefix_edit_distance():
+    assert prefix_edit_distance("flutr", "fluttermane", 1) == 1
+    assert prefix_edit_distance("incin", "incineroar", 1) == 0
+    assert prefix_edit_distance("xyz", "incineroar", 2) is None
+
+
+def test_popularity_from_the_vision_cache(tmp_path, validator):
+    cache = VisionCache(str(tmp_path / "vision.sqlite"))
+    cache.put("a", "v1", "", [{"pokemon": "Calyrex-Shadow"}, {"pokemon": None}])
+    cache.put("b", "v1", "", [{"pokemon": "Calyrex-Shadow"}, {"pokemon": "Calyrex-Ice"}])
+    cache.get("a", "v1")
+
+    counts = cache.pokemon_counts()
+    assert counts == {"Calyrex-Shadow": 3, "Calyrex-Ice": 1}
+
+    validator.update_suggestion_popularity(counts)
+    assert validator.get_pokemon_suggestions("calyrex") == ["Calyrex", "Calyrex-Shadow", "Calyrex-Ice"]
+    validator.update_suggestion_popularity({})
+
+
+def test_interactive_latency(validator):
+    queries = ["f", "fl", "flu", "はばた", "ｵｰｶﾞ", "incinerar", "urshfu", "ガチグマ", "calyrex", "zzzz"]
+    validator.get_pokemon_suggestions("warm up")
+
+    start = time.perf_counter()
+    for _ in range(20):
+        for query in queries:
+            validator.get_pokemon_suggestions(query)
+    per_query = (time.perf_counter() - start) / (20 * len(queries))
+
+    assert per_query < 0.001
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the note.com structured-data fast path, served from a local stand-in
+server that replays recorded note API responses
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import core.note_api as note_api
+from core.note_api import extract_note_key, fetch_note_article
+from core.scraper import ArticleScraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'note_api')
+NOTE_URL = "https://note.com/vgc_player/n/n3f9a1c2b7d4e"
+
+
+class RecordedNoteAPIHandler(BaseHTTPRequestHandler):
+    """Serves fixtures/note_api/<key>.json at /api/v3/notes/<key>"""
+
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        key = self.path.rsplit("/", 1)[-1]
+        path = os.path.join(FIXTURE_DIR, f"{key}.json")
+        if not self.path.startswith("/api/v3/notes/") or not os.path.exists(path):
+            self.send_response(404)
+            self.end_headers()
+            return
+        with open(path, "rb") as f:
+            payload = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def note_api_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedNoteAPIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/api/v3/notes/"
+    monkeypatch.setattr(note_api, "NOTE_API_BASE", base)
+    RecordedNoteAPIHandler.requests_seen = []
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def test_extract_note_key():
+    assert extract_note_key(NOTE_URL) == "n3f9a1c2b7d4e"
+    assert extract_note_key("https://note.com/vgc_player/n/n3f9a1c2b7d4e?magazine_key=m1") == "n3f9a1c2b7d4e"
+    assert extract_note_key("https://note.com/vgc_player") is None
+
+
+def test_fetch_note_article_from_recorded_response(note_api_server):
+    page = fetch_note_article(NOTE_URL)
+    assert page is not None
+    assert page.structured["key"] == "n3f9a1c2b7d4e"
+    assert page.final_url == NOTE_URL
+
+    image_urls = [tag.get("src") for tag in page.image_tags()]
+    assert image_urls[0].endswith("rectangle_large_type_2_eyecatch.png")
+    assert image_urls[1].endswith("TeamCard01.png")
+
+
+def test_scraper_uses_fast_path_before_html(note_api_server):
+    scraper = ArticleScraper()
+    scraper.validate_url = lambda url: True
+
+    def html_strategy(url):
+        raise AssertionError("HTML pipeline should not run when the note API answers")
+
+    scraper._scrape_with_standard_headers = html_strategy
+    content = scraper.scrape_article(NOTE_URL)
+
+    assert RecordedNoteAPIHandler.requests_seen == ["/api/v3/notes/n3f9a1c2b7d4e"]
+    assert "ガオガエン+ハバタクカミ構築" in content
+    assert "努力値: H4 C252 S252" in content
+    # Line-based note.com boilerplate removal still applies
+    assert "フォロー" not in content
+    assert scraper.get_page(NOTE_URL).structured is not None
+
+
+def test_missing_note_falls_back_to_html(note_api_server):
+    assert fetch_note_article("https://note.com/someone/n/n000000000000") is None
+
+    scraper = ArticleScraper()
+    scraper.validate_url = lambda url: True
+    fallback_text = "ポケモン構築記事 " * 20
+    scraper._scrape_with_standard_headers = lambda url: fallback_text
+    assert scraper.scrape_article("https://note.com/someone/n/n000000000000") == fallback_text
+
+
+if __name__ == "__main__":
+    test_extract_note_key()
+    print("Run with pytest for the stand-in server tests")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for sharing one fetched page between text scraping and image discovery
+"""
+
+import os
+import random
+import sys
+from io import BytesIO
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import utils.image_analyzer as image_analyzer
+from core.scraper import ArticleScraper
+
+ARTICLE_URL = "https://example.com/vgc/team-report"
+
+HTML = (
+    "<html><body><nav><img src='/img/nav-team.png' alt='team'></nav>"
+    "<main><p>" + "ポケモンVGCダブルバトルの構築紹介です。努力値調整はH252 S252。" * 10 + "</p>"
+    "<img src='/img/party.png' alt='構築 team card'></main></body></html>"
+)
+
+
+def _noise_png(seed=29, size=(160, 120)):
+    rng = random.Random(seed)
+    img = Image.new("RGB", size)
+    img.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(size[0] * size[1])])
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, content, url, content_type="text/html"):
+        self.content = content
+        self.url = url
+        self.encoding = "utf-8"
+        self.status_code = 200
+        self.headers = {"content-type": content_type}
+        self.history = []
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def test_scraper_exposes_page_artifact():
+    scraper = ArticleScraper()
+    scraper._process_response_content(FakeResponse(HTML.encode("utf-8"), ARTICLE_URL))
+
+    page = scraper.get_page(ARTICLE_URL)
+    assert page is not None
+    assert page.final_url == ARTICLE_URL
+    assert page.content == HTML.encode("utf-8")
+    assert scraper.get_page("https://example.com/other") is None
+    # The generic pipeline decomposes <nav>, but image discovery still sees its images
+    assert [tag.get("src") for tag in page.image_tags()] == ["/img/nav-team.png", "/img/party.png"]
+
+
+def test_image_discovery_reuses_page(monkeypatch):
+    scraper = ArticleScraper()
+    scraper._process_response_content(FakeResponse(HTML.encode("utf-8"), ARTICLE_URL))
+    page = scraper.get_page(ARTICLE_URL)
+
+    # Distinct images per URL (identical ones would be collapsed as duplicates)
+    requested = []
+
+    def fake_get(url, headers=None, timeout=None, stream=False):
+        requested.append(url)
+        return FakeResponse(_noise_png(seed=len(url)), url, content_type="image/png")
+
+    monkeypatch.setattr(image_analyzer.requests, "get", fake_get)
+    images = image_analyzer.extract_images_from_url(ARTICLE_URL, max_images=5, page=page)
+
+    # Only the images are downloaded - the article HTML is not fetched again
+    assert ARTICLE_URL not in requested
+    assert sorted(requested) == ["https://example.com/img/nav-team.png", "https://example.com/img/party.png"]
+    assert images[0]["url"] == "https://example.com/img/party.png"
+    assert all(image["format"] == "PNG" for image in images)
+
+
+if __name__ == "__main__":
+    test_scraper_exposes_page_artifact()
+    print("Page artifact tests passed (run with pytest for the image discovery test)")
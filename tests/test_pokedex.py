@@ -0,0 +1,91 @@
+"""
+Tests for the bundled, memory-mapped Pokedex
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.pokedex import (
+    DEFAULT_POKEDEX_PATH, Pokedex, build_pokedex, encode_pokedex, get_pokedex, read_pokedex_source,
+)
+from utils.stat_engine import get_stat_engine
+from utils.utils import _bundled_sprite_url
+from core.pokemon_validator import PokemonValidator
+
+
+def test_bundled_binary_matches_the_source():
+    # Rebuild with `cd src && python -m utils.pokedex build` after editing pokedex.csv
+    with open(DEFAULT_POKEDEX_PATH, "rb") as f:
+        assert f.read() == encode_pokedex(*read_pokedex_source())
+
+
+def test_lookup_by_english_slug_and_japanese_name():
+    pokedex = get_pokedex()
+
+    entry = pokedex.find("Landorus-Therian")
+    assert entry == pokedex.find("landorus-therian") == pokedex.find("ランドロス(れいじゅうフォルム)")
+    assert (entry.dex, entry.species, entry.form) == (645, "Landorus", "Therian")
+    assert entry.types == ("Ground", "Flying")
+    assert entry.abilities == ("Intimidate",)
+    assert entry.base_stats == (89, 145, 90, 105, 80, 91)
+
+    flutter = pokedex.find("ハバタクカミ")
+    assert flutter.name == "Flutter Mane" and flutter.types == ("Ghost", "Fairy")
+    assert pokedex.find("Pikachu") is None and pokedex.find("") is None
+
+
+def test_records_are_read_from_the_mapping():
+    pokedex = get_pokedex()
+
+    assert pokedex.data_version
+    assert len(pokedex.names) == len(pokedex) == pokedex.base_stats.shape[0]
+    assert pokedex.base_stats.shape[1] == 6 and not pokedex.base_stats.flags.writeable
+    assert not pokedex.base_stats.flags.owndata
+
+
+def test_build_and_reject_bad_input(tmp_path):
+    source = tmp_path / "dex.csv"
+    source.write_text(
+        "# version: test\n"
+        "dex,pokeapi_id,name,species,form,name_ja,slug,type1,type2,ability1,ability2,hidden_ability,"
+        "hp,atk,def,spa,spd,spe\n"
+        "727,727,Incineroar,Incineroar,,ガオガエン,incineroar,Fire,Dark,Blaze,,Intimidate,95,115,90,80,90,60\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "dex.bin"
+    assert build_pokedex(str(source), str(output)) == 1
+
+    pokedex = Pokedex.open(str(output))
+    assert pokedex.data_version == "test"
+    assert pokedex.find("ガオガエン").abilities == ("Blaze", "Intimidate")
+
+    with pytest.raises(ValueError):
+        Pokedex(b"NOPE" + bytes(32))
+    row = dict(read_pokedex_source(str(source))[1][0], type2="Shadow")
+    with pytest.raises(ValueError):
+        encode_pokedex("test", [row])
+
+
+def test_stat_engine_validator_and_sprites_share_the_pokedex():
+    pokedex = get_pokedex()
+    engine = get_stat_engine()
+    assert engine.names == pokedex.names
+    assert np.array_equal(engine.base_stats, pokedex.base_stats)
+    assert engine.species_index("ガオガエン") == pokedex.row("Incineroar")
+
+    validator = PokemonValidator()
+    # Only the Pokedex knows this Japanese name
+    assert validator.resolve_pokemon_name("ピッピ") == ("Clefairy", "exact:pokedex")
+    assert validator.is_valid_pokemon_name("Ogerpon-Wellspring")
+
+    assert _bundled_sprite_url("Urshifu", "Rapid Strike").endswith("/10191.png")
+    assert _bundled_sprite_url("Pikachu") is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
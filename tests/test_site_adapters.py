@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for host-suffix site adapter dispatch and adapter-driven extraction
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.scraper import ArticleScraper
+from core.site_adapters import (
+    DEFAULT_REGISTRY, HATENABLOG_ADAPTER, NOTE_COM_ADAPTER, SiteAdapter, SiteAdapterRegistry
+)
+
+VGC_PARAGRAPH = "ポケモンVGCダブルバトルの構築紹介です。努力値調整はH252 S252。ガブリアス採用。"
+
+
+class FakeResponse:
+    def __init__(self, html, url):
+        self.content = html.encode("utf-8")
+        self.url = url
+        self.encoding = "utf-8"
+        self.status_code = 200
+        self.headers = {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+
+def test_dispatch_by_host_suffix():
+    assert DEFAULT_REGISTRY.for_url("https://note.com/user/n/n123") is NOTE_COM_ADAPTER
+    assert DEFAULT_REGISTRY.for_url("https://vgc-player.hatenablog.com/entry/2024/01/01") is HATENABLOG_ADAPTER
+    assert DEFAULT_REGISTRY.for_url("https://a.b.hatenadiary.jp/") is HATENABLOG_ADAPTER
+    # Substring matches elsewhere in the URL no longer trigger an adapter
+    assert DEFAULT_REGISTRY.for_url("https://assets.st-note.com/img/x.png") is None
+    assert DEFAULT_REGISTRY.for_url("https://example.com/?from=note.com") is None
+    assert DEFAULT_REGISTRY.for_url("") is None
+
+
+def test_builtin_cleaners():
+    text = "\n".join([
+        "フォローする",
+        "12/34",
+        "ok",
+        VGC_PARAGRAPH,
+        "はてなブログ トップ",
+        "2024-01-01 12:00",
+    ])
+    assert NOTE_COM_ADAPTER.clean(text) == VGC_PARAGRAPH + " はてなブログ トップ 2024-01-01 12:00"
+    assert HATENABLOG_ADAPTER.clean(text) == "フォローする " + VGC_PARAGRAPH
+    assert not NOTE_COM_ADAPTER.validate("   ")
+
+
+def test_plugin_adapter_extraction_and_tuning():
+    registry = SiteAdapterRegistry([NOTE_COM_ADAPTER])
+    registry.register(SiteAdapter(
+        name="Ameblo",
+        host_suffixes=("ameblo.jp",),
+        selectors=(".skin-entryBody",),
+        min_element_chars=50,
+        removal_patterns=(r"^いいね",),
+        preferred_strategy="japanese_headers",
+        timeout=7,
+    ))
+    scraper = ArticleScraper(adapters=registry)
+
+    html = (
+        "<html><body><div class='sidebar'>" + "ランキング " * 20 + "</div>"
+        "<div class='skin-entryBody'><p>" + VGC_PARAGRAPH * 3 + "</p></div>"
+        "</body></html>"
+    )
+    content = scraper._process_response_content(FakeResponse(html, "https://ameblo.jp/user/entry-1.html"))
+    assert content == VGC_PARAGRAPH * 3
+    assert "ランキング" not in content
+
+    assert scraper._request_timeout("https://ameblo.jp/x", 20) == 7
+    assert scraper._request_timeout("https://example.com/x", 20) == 20
+
+
+def test_preferred_strategy_runs_first():
+    registry = SiteAdapterRegistry([SiteAdapter(
+        name="Example", host_suffixes=("example.jp",), preferred_strategy="session_retry"
+    )])
+    scraper = ArticleScraper(adapters=registry)
+    scraper.validate_url = lambda url: True
+    called = []
+
+    def record(name):
+        def strategy(url):
+            called.append(name)
+            return VGC_PARAGRAPH * 2
+        strategy.__name__ = name
+        return strategy
+
+    for name in ["standard_headers", "mobile_headers", "japanese_headers", "session_retry"]:
+        setattr(scraper, f"_scrape_with_{name}", record(name))
+
+    scraper.scrape_article("https://blog.example.jp/post")
+    assert called == ["session_retry"]
+
+
+if __name__ == "__main__":
+    test_dispatch_by_host_suffix()
+    test_builtin_cleaners()
+    test_plugin_adapter_extraction_and_tuning()
+    test_preferred_strategy_runs_first()
+    print("All site adapter tests passed")
@@ -0,0 +1,119 @@
+"""
+Tests for the level-50 stat engine and exact EV recovery from calculated stats
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.stat_engine import (
+    BOOSTED,
+    HINDERED,
+    NEUTRAL,
+    get_stat_engine,
+    nature_multipliers,
+)
+from utils.utils import is_calculated_stats, parse_calculated_stat_format, parse_ev_spread
+
+STATS = ("HP", "Atk", "Def", "SpA", "SpD", "Spe")
+
+
+def _spread(*values):
+    return dict(zip(STATS, values))
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return get_stat_engine()
+
+
+def test_forward_formula(engine):
+    # Careful Incineroar 252 HP / 4 Def / 252 SpD
+    assert engine.calculate_stats("Incineroar", _spread(252, 0, 4, 0, 252, 0), "Careful") == _spread(
+        202, 135, 111, 90, 156, 80
+    )
+    # Japanese species and nature names, minimised speed IV
+    stats = engine.calculate_stats("ガオガエン", {}, "ゆうかん", ivs=[31, 31, 31, 31, 31, 0])
+    assert stats["Atk"] == 148 and stats["Spe"] == 58  # Brave: Atk up, Spe down
+
+
+def test_nature_multipliers():
+    assert nature_multipliers("Timid") == [NEUTRAL, HINDERED, NEUTRAL, NEUTRAL, NEUTRAL, BOOSTED]
+    assert nature_multipliers(("SpA", "Atk")) == nature_multipliers("Modest")
+    assert nature_multipliers("Serious") == nature_multipliers(None)
+    with pytest.raises(ValueError):
+        nature_multipliers("Grumpy")
+
+
+def test_inverse_table_round_trip(engine):
+    for ev in range(0, 253, 4):
+        for nature in ("Adamant", "Modest", "Hardy"):
+            value = engine.calculate_stats("Urshifu-Rapid-Strike", {"Atk": ev}, nature)["Atk"]
+            low, high = engine.ev_range("Urshifu-Rapid-Strike", "Atk", value, nature)
+            assert low <= ev <= high
+            assert engine.calculate_stats("Urshifu-Rapid-Strike", {"Atk": low}, nature)["Atk"] == value
+    assert engine.ev_range("Incineroar", "HP", 1) is None
+
+
+def test_evs_from_stats_infers_nature_and_minimised_ivs(engine):
+    stats = engine.calculate_stats("Amoonguss", _spread(252, 0, 156, 0, 100, 0), "Relaxed",
+                                   ivs=[31, 0, 31, 31, 31, 0])
+    assert engine.evs_from_stats("Amoonguss", stats, minimized=["Atk", "Spe"]) == _spread(252, 0, 156, 0, 100, 0)
+    assert engine.evs_from_stats("Amoonguss", {"HP": 500}) is None
+
+
+def test_batch_matches_scalar(engine):
+    rng = np.random.default_rng(0)
+    species = rng.integers(0, len(engine.names), 200)
+    natures = rng.choice(["Adamant", "Timid", "Bold", "Quiet", "Hardy"], 200)
+    evs = rng.integers(0, 64, (200, 6)) * 4
+    multipliers = np.array([nature_multipliers(nature) for nature in natures])
+    stats = np.array([
+        list(engine.calculate_stats(engine.names[s], list(row), nature).values())
+        for s, row, nature in zip(species, evs, natures)
+    ])
+
+    batch = engine.evs_from_stats_batch(species, stats, multipliers)
+
+    for s, row, nature, result in zip(species, stats, natures, batch):
+        for stat, value, ev in zip(STATS, row, result):
+            assert ev == engine.ev_range(engine.names[s], stat, int(value), nature)[0]
+
+
+def test_stat_only_lines_parse_to_exact_evs():
+    stat_line = "H202 A135 B111 C90 D156 S80"
+    assert parse_ev_spread(stat_line, "Incineroar") == (
+        _spread(252, 0, 4, 0, 252, 0), "calculated_stat_exact_valid_high"
+    )
+    assert parse_calculated_stat_format("H202 B111 D156 S80", "ガオガエン")[0] == _spread(252, 0, 4, 0, 252, 0)
+    # Without a species the old reading stays
+    assert parse_ev_spread(stat_line)[1] == "japanese_grid_high_questionable_low"
+
+
+def test_partial_calculated_lines_are_filled_in():
+    evs, status = parse_ev_spread("H202(252)-A135-B111(4)-C×↓-D156↑(252)-S80", "Incineroar")
+    assert evs == _spread(252, 0, 4, 0, 252, 0) and status.startswith("calculated_stat_exact")
+
+
+def test_unmarked_minimised_ivs_agree_with_is_stat_line():
+    # Timid Flutter Mane with 0 Attack IV, written without ×
+    numbers = [131, 54, 75, 187, 155, 205]
+    assert is_calculated_stats(numbers, "Flutter Mane")
+    assert parse_ev_spread("H131 A54 B75 C187 D155 S205", "ハバタクカミ") == (
+        _spread(4, 0, 0, 252, 0, 252), "calculated_stat_exact_valid_high"
+    )
+
+
+def test_ev_lines_are_not_stat_lines():
+    assert parse_ev_spread("H252 A0 B4 C0 D252 S0", "Incineroar")[1] == "japanese_grid_high_valid_high"
+    assert is_calculated_stats([202, 135, 111, 90, 156, 80], "Incineroar")
+    assert not is_calculated_stats([252, 0, 4, 0, 252, 0], "Incineroar")
+    assert not is_calculated_stats([180, 180, 180, 180, 180, 180], "Incineroar")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,74 @@
+"""
+Tests for the single-pass stat abbreviation translator used on EV explanations
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.stat_translator import StatAbbreviationTranslator
+from core.pokemon_validator import PokemonValidator
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return PokemonValidator()
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Investment words, numbers and colons
+    ("CS max. B investment was tested so it survives",
+     "max Special Attack and Speed. B investment was tested so it survives"),
+    ("Then H252 B4 C252 for bulk. S: fastest Urshifu",
+     "Then HP252 Defense4 Special Attack252 for bulk. Speed: fastest Urshifu"),
+    ("H: 16n-1 for Life Orb. B: rest", "HP: 16n-1 for Life Orb. Defense: rest"),
+    # Japanese particles; 振り only counts after a space
+    ("H 極振り、Sを最速にしてCS振り。余りはDに",
+     "HP 極振り、Speedを最速にしてCS振り。余りはSpecial Defenseに"),
+    # After lower / raise / invest
+    ("raise B. invest C", "raise Defense. Invest Special Attack"),
+    # Letters used as English words stay
+    ("This is a lot of bulk and speed about right", "This is a lot of bulk and speed about right"),
+    ("", ""),
+])
+def test_translations(validator, text, expected):
+    assert validator._translate_stat_abbreviations(text) == expected
+
+
+def test_translated_text_is_not_translated_again(validator):
+    # The old per-abbreviation passes turned the "d" of "Speed" into "Special Defense"
+    assert validator._translate_stat_abbreviations("CSを最大に、Bを少し") == "Special Attack and Speedを最大に、Defenseを少し"
+
+
+def test_longest_abbreviation_with_a_matching_context_wins():
+    translator = StatAbbreviationTranslator({"H": "HP", "H252": "252 HP", "HB": "HP and Defense"})
+
+    assert translator.translate("H252: rest") == "252 HP: rest"
+    # "H252" has no context here; "H" before a number does
+    assert translator.translate("then H252 B4") == "then HP252 B4"
+    assert translator.translate("HB 振り") == "HP and Defense 振り"
+
+
+def test_clean_up_runs_after_translation():
+    translator = StatAbbreviationTranslator({"H": "HP"})
+
+    assert translator.translate("  Attack and Speed max ,  then  16n-1  multiple of 11 HP.") == (
+        "max Attack and Speed, then 16n-1 HP multiple of 11."
+    )
+
+
+def test_strategic_reasoning_notes(validator):
+    result = {"pokemon_team": [{"name": "Flutter Mane", "ev_explanation": "CS max"},
+                               {"name": "Amoonguss", "ev_explanation": "Not specified"}]}
+
+    result = validator.translate_strategic_reasoning_stats(result)
+
+    assert result["pokemon_team"][0]["ev_explanation"] == "max Special Attack and Speed"
+    assert result["translation_notes"] == "Stat Translation: Translated stat abbreviations for Flutter Mane"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
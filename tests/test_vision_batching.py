@@ -0,0 +1,144 @@
+"""
+Tests for batched multi-image vision requests
+"""
+
+import base64
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.image_analyzer import (
+    analyze_images_cached,
+    analyze_images_with_vision,
+    plan_vision_batches,
+    split_batch_response,
+)
+from utils.vision_cache import VisionCache
+
+
+def _image(label):
+    # Not decodable as an image: preparation falls back to the original payload
+    return (base64.b64encode(label.encode()).decode("utf-8"), "PNG")
+
+
+class BatchVisionModel:
+    """Answers each image with a spread derived from its payload"""
+
+    model_name = "models/fake-vision"
+
+    def __init__(self, skip=(), fail_batches_larger_than=None, error=None):
+        self.requests = []
+        self.skip = set(skip)
+        self.fail_batches_larger_than = fail_batches_larger_than
+        self.error = error
+
+    def generate_content(self, contents):
+        images = [part for part in contents if isinstance(part, dict)]
+        self.requests.append(len(images))
+        if self.error:
+            raise self.error
+        if self.fail_batches_larger_than and len(images) > self.fail_batches_larger_than:
+            raise ValueError("400 Request payload size exceeds the limit")
+
+        labels = [base64.b64decode(part["data"]).decode() for part in images]
+        if len(images) == 1:
+            text = self._answer(labels[0])
+        else:
+            assert "<<<IMAGE n>>>" in contents[0]
+            text = "\n".join(
+                f"<<<IMAGE {number}>>>\n{self._answer(label)}"
+                for number, label in enumerate(labels, 1) if label not in self.skip
+            )
+
+        class Response:
+            pass
+
+        response = Response()
+        response.text = text
+        return response
+
+    @staticmethod
+    def _answer(label):
+        speed = int(re.search(r"\d+", label).group())
+        return f"{label}: H{252 - speed}/A0/B4/C252/D0/S{speed}"
+
+
+def test_plan_respects_count_and_bytes():
+    assert plan_vision_batches([10] * 5, max_images=2, max_bytes=100) == [[0, 1], [2, 3], [4]]
+    assert plan_vision_batches([60, 30, 30, 10], max_images=4, max_bytes=100) == [[0, 1], [2, 3]]
+    # An oversized image still gets analysed, alone
+    assert plan_vision_batches([10, 500, 10], max_images=4, max_bytes=100) == [[0], [1], [2]]
+    assert plan_vision_batches([]) == []
+
+
+def test_split_batch_response_maps_sections_to_images():
+    text = "preamble\n<<<IMAGE 2>>>\nsecond\n**<<<IMAGE 1>>>**\nfirst\n<<<IMAGE 9>>>\nbogus"
+    assert split_batch_response(text, 3) == ["first", "second", None]
+
+
+def test_one_request_for_several_images():
+    model = BatchVisionModel()
+    images = [_image(f"card{speed}") for speed in (4, 12, 20, 28)]
+
+    results = analyze_images_with_vision(images, model, max_batch_images=4)
+
+    assert model.requests == [4]
+    assert results == [f"card{speed}: H{252 - speed}/A0/B4/C252/D0/S{speed}" for speed in (4, 12, 20, 28)]
+
+
+def test_skipped_images_fall_back_to_single_requests():
+    model = BatchVisionModel(skip={"card12"})
+    results = analyze_images_with_vision([_image("card4"), _image("card12"), _image("card20")], model)
+
+    assert model.requests == [3, 1]
+    assert results[1] == "card12: H240/A0/B4/C252/D0/S12"
+
+
+def test_failed_batches_are_split():
+    model = BatchVisionModel(fail_batches_larger_than=2)
+    images = [_image(f"card{speed}") for speed in (4, 12, 20, 28)]
+
+    results = analyze_images_with_vision(images, model, max_batch_images=4)
+
+    assert model.requests == [4, 2, 2]
+    assert results[3] == "card28: H224/A0/B4/C252/D0/S28"
+
+
+def test_rate_limited_batches_are_not_retried():
+    model = BatchVisionModel(error=RuntimeError("429 Resource has been exhausted (e.g. check quota)."))
+    images = [_image(f"card{speed}") for speed in (4, 12, 20, 28, 36, 44)]
+
+    results = analyze_images_with_vision(images, model, max_batch_images=4)
+
+    # Neither split nor followed by the next batch
+    assert model.requests == [4]
+    assert all(result.startswith("Vision analysis error: 429") for result in results)
+
+
+def test_other_batch_errors_are_not_split():
+    model = BatchVisionModel(error=RuntimeError("500 Internal error"))
+    results = analyze_images_with_vision([_image("card4"), _image("card12")], model)
+
+    assert model.requests == [2]
+    assert results == ["Vision analysis error: 500 Internal error"] * 2
+
+
+def test_cached_images_are_left_out_of_the_batch(tmp_path):
+    cache = VisionCache(str(tmp_path / "vision.sqlite"))
+    model = BatchVisionModel()
+    infos = [{"data": data, "format": fmt} for data, fmt in (_image("card4"), _image("card12"))]
+
+    first = analyze_images_cached(infos, model, cache=cache)
+    infos.append({"data": _image("card20")[0], "format": "PNG"})
+    second = analyze_images_cached(infos, model, cache=cache)
+
+    assert model.requests == [2, 1]
+    assert second[:2] == first
+    assert second[2][1][0]["speed"] == 20
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,140 @@
+"""
+Tests for the persistent vision-analysis cache
+"""
+
+import base64
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.vision_cache import VisionCache
+from utils.image_analyzer import analyze_image_cached, get_vision_prompt_version
+
+ANALYSIS = "Garchomp: H4/A252/B0/C0/D0/S252"
+
+
+def _cache(tmp_path, **kwargs):
+    return VisionCache(str(tmp_path / "vision.sqlite"), **kwargs)
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = _cache(tmp_path)
+    spreads = [{"hp": 4, "attack": 252, "format": "4/252/0/0/0/252"}]
+    cache.put("digest-a", "v1", ANALYSIS, spreads, phash=0xFFFF000000000001, size=(1200, 675))
+
+    assert cache.get("digest-a", "v1") == {"analysis": ANALYSIS, "ev_spreads": spreads}
+    assert cache.get("digest-a", "v2") is None  # Different prompt version
+    assert cache.get("digest-b", "v1") is None
+    assert cache.stats() == {"entries": 1, "hits": 1}
+
+
+def test_perceptual_hash_match_requires_equal_or_larger_copy(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("full", "v1", ANALYSIS, [], phash=0xABCDEF, size=(1200, 675))
+
+    # Re-encoded thumbnail of the same card reuses the full-size analysis
+    assert cache.get("thumb", "v1", phash=0xABCDEF, size=(400, 225))["analysis"] == ANALYSIS
+    # A larger copy deserves its own (more legible) analysis
+    assert cache.get("huge", "v1", phash=0xABCDEF, size=(2400, 1350)) is None
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    cache = _cache(tmp_path, ttl_seconds=0.05)
+    cache.put("digest-a", "v1", ANALYSIS, [])
+    time.sleep(0.1)
+    assert cache.get("digest-a", "v1") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.put("a", "v1", "A", [])
+    time.sleep(0.01)
+    cache.put("b", "v1", "B", [])
+    time.sleep(0.01)
+    assert cache.get("a", "v1") is not None  # "a" is now more recent than "b"
+    time.sleep(0.01)
+    cache.put("c", "v1", "C", [])
+
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") is not None
+    assert cache.get("c", "v1") is not None
+
+
+class CountingVisionModel:
+    model_name = "models/fake-vision"
+
+    def __init__(self, text=ANALYSIS):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, parts):
+        self.calls += 1
+        text = self.text
+
+        class Response:
+            pass
+
+        response = Response()
+        response.text = text
+        return response
+
+
+def _image_info(payload=b"team card bytes"):
+    return {"data": base64.b64encode(payload).decode("utf-8"), "format": "PNG", "size": (1200, 675)}
+
+
+def test_cache_hit_skips_model_call(tmp_path):
+    cache = _cache(tmp_path)
+    model = CountingVisionModel()
+
+    first = analyze_image_cached(_image_info(), model, cache=cache, prepare_image=False)
+    second = analyze_image_cached(_image_info(), model, cache=cache, prepare_image=False)
+
+    assert model.calls == 1
+    assert first == second
+    assert first[0] == ANALYSIS
+    assert any(spread["format"] == "4/252/0/0/0/252" for spread in first[1])
+
+    # Reopening the file (a new process) still hits
+    reopened = _cache(tmp_path)
+    analyze_image_cached(_image_info(), model, cache=reopened, prepare_image=False)
+    assert model.calls == 1
+
+
+def test_cache_hit_extracts_spreads_again(tmp_path):
+    # An entry written by an older extractor: spreads not tied to a Pokemon
+    cache = _cache(tmp_path)
+    model = CountingVisionModel()
+    analysis = "POKEMON #1: Garchomp\nH4 A252 B0 C0 D0 S252"
+    digest = hashlib.sha256(b"team card bytes").hexdigest()
+    cache.put(digest, get_vision_prompt_version(model, False), analysis, [{"format": "4/252/0/0/0/252"}])
+
+    cached_analysis, spreads = analyze_image_cached(_image_info(), model, cache=cache, prepare_image=False)
+
+    assert model.calls == 0 and cached_analysis == analysis
+    assert [spread["pokemon"] for spread in spreads] == ["Garchomp"]
+
+
+def test_failed_analyses_are_not_cached(tmp_path):
+    cache = _cache(tmp_path)
+    model = CountingVisionModel(text="")
+
+    analyze_image_cached(_image_info(), model, cache=cache, prepare_image=False)
+    analyze_image_cached(_image_info(), model, cache=cache, prepare_image=False)
+    assert model.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_prompt_version_depends_on_model_and_preparation():
+    model = CountingVisionModel()
+    assert get_vision_prompt_version(model) == get_vision_prompt_version(model)
+    assert get_vision_prompt_version(model) != get_vision_prompt_version(model, prepare_image=False)
+    assert get_vision_prompt_version(model) != get_vision_prompt_version(None)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))